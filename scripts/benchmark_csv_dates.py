@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSV date handling on a generated 100k-row receipts file.
+
+Times the previous strptime chain (normalise with up to seven formats, then
+strptime each date again in _parse_row and in validation) against the
+DateParser used by CSVHandler, and the full CSVHandler.load_csv for reference.
+
+Usage:
+    python scripts/benchmark_csv_dates.py [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from csv_handler import CSVHandler
+from utils.date_parser import DateParser
+
+LEGACY_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%Y-%m-%d',
+]
+
+
+def legacy_normalize(date_str: str) -> str:
+    """The previous CSVHandler._normalize_date."""
+    if not date_str:
+        return ''
+    date_str = str(date_str).strip()
+    if len(date_str) == 10 and date_str.count('-') == 2:
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+            return date_str
+        except ValueError:
+            pass
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return date_str
+
+
+def legacy_dates(values):
+    """Normalise, then strptime twice more as _parse_row and validation did."""
+    normalized = [legacy_normalize(v) for v in values]
+    for _ in range(2):
+        for value in normalized:
+            datetime.strptime(value, '%Y-%m-%d')
+    return normalized
+
+
+def fast_dates(values):
+    parser = DateParser()
+    return [parser.parse(v).isoformat() for v in values]
+
+
+def write_csv(path: str, rows: int, date_format: str):
+    start = date(2024, 1, 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('contractId,fromDate,toDate,paymentDate,value\n')
+        for i in range(rows):
+            month = start + timedelta(days=30 * random.randint(0, 20))
+            first = month.replace(day=1)
+            last = first + timedelta(days=27)
+            f.write(f"{100000 + i % 500},{first.strftime(date_format)},{last.strftime(date_format)},"
+                    f"{last.strftime(date_format)},{random.randint(300, 1500)}.00\n")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(1)
+
+    print(f"{rows} rows")
+    print(f"{'Format':<22}{'Legacy dates (s)':>18}{'DateParser (s)':>16}{'Speedup':>10}{'load_csv (s)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, date_format in (('YYYY-MM-DD', '%Y-%m-%d'), ('DD/MM/YYYY', '%d/%m/%Y'),
+                                   ('Excel datetime', '%Y-%m-%d 00:00:00')):
+            path = os.path.join(tmp, 'receipts.csv')
+            write_csv(path, rows, date_format)
+            with open(path, encoding='utf-8') as f:
+                next(f)
+                values = [cell for line in f for cell in line.split(',')[1:4]]
+
+            legacy, legacy_s = timed(legacy_dates, values)
+            fast, fast_s = timed(fast_dates, values)
+            assert legacy == fast
+
+            handler = CSVHandler()
+            (success, errors), load_s = timed(handler.load_csv, path)
+            assert success, errors[:3]
+
+            print(f"{label:<22}{legacy_s:>18.3f}{fast_s:>16.3f}{legacy_s / fast_s:>9.1f}x{load_s:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
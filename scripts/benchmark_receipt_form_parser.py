@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the receipt form extractor against the previous BeautifulSoup + regex parsing.
+
+Builds criarRecibo-style pages from the saved portal page (login_page_full.html)
+with an embedded receipt script, checks both parsers agree, and times them.
+
+Usage:
+    python scripts/benchmark_receipt_form_parser.py [iterations]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bs4 import BeautifulSoup
+from utils.receipt_form_parser import parse_receipt_form
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+
+def build_page(tenants: int, properties: int) -> str:
+    """Saved portal page with a receipt script for the given number of parties."""
+    with open(os.path.join(ROOT_DIR, 'login_page_full.html'), 'r', encoding='utf-8') as f:
+        page = f.read()
+
+    recibo = {
+        "numContrato": 123456,
+        "versaoContrato": 1,
+        "nifEmitente": 123456789,
+        "nomeEmitente": "TEST LANDLORD",
+        "valorRenda": 750.0,
+        "locadores": [{"nif": 123456789, "nome": "TEST LANDLORD", "quotaParte": "1/1", "sujeitoPassivo": "V"}],
+        "locatarios": [
+            {"nif": 200000000 + i, "nome": f"TENANT {i}", "pais": {"codigo": "2724", "label": "PORTUGAL"},
+             "retencao": {"taxa": 0, "codigo": "RIRS03", "label": "Dispensa de retenção"}}
+            for i in range(tenants)
+        ],
+        "imoveis": [
+            {"morada": f"RUA {i}, 1", "tipo": {"codigo": "U", "label": "Urbano"}, "artigo": str(i), "ordem": i + 1}
+            for i in range(properties)
+        ],
+        "hasNifHerancaIndivisa": False
+    }
+    script = f'<script>$scope.recibo = {json.dumps(recibo, indent=4, ensure_ascii=False)};</script>'
+    return page.replace('</body>', script + '</body>', 1)
+
+
+def legacy_parse(html: str) -> dict:
+    """The previous get_receipt_form parsing: full HTML tree plus one regex per field."""
+    soup = BeautifulSoup(html, 'html.parser')
+    details = {}
+    for script in soup.find_all('script'):
+        if not (script.string and 'recibo' in script.string and 'numContrato' in script.string):
+            continue
+        content = script.string
+        for key in ('numContrato', 'nifEmitente', 'versaoContrato'):
+            match = re.search(rf'"{key}":\s*(\d+)', content)
+            if match:
+                details[key] = int(match.group(1))
+        match = re.search(r'"nomeEmitente":\s*"([^"]+)"', content)
+        if match:
+            details['nomeEmitente'] = match.group(1).strip()
+        match = re.search(r'"valorRenda":\s*([0-9]+\.?[0-9]*)', content)
+        if match:
+            details['valorRenda'] = float(match.group(1))
+        for key in ('locatarios', 'locadores', 'imoveis'):
+            if re.search(rf'"{key}":\s*\[(.*?)\]', content, re.DOTALL):
+                match = re.search(rf'"{key}":\s*(\[.*?\])', content, re.DOTALL)
+                array_json = re.sub(r',\s*}', '}', match.group(1))
+                array_json = re.sub(r',\s*]', ']', array_json)
+                try:
+                    details[key] = json.loads(array_json)
+                except ValueError:
+                    details[key] = None
+        match = re.search(r'"hasNifHerancaIndivisa":\s*(true|false)', content)
+        details['hasNifHerancaIndivisa'] = bool(match and match.group(1) == 'true')
+        break
+    return details
+
+
+def time_parser(parser, html: str, iterations: int) -> float:
+    """Average milliseconds per parse."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parser(html)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'Page':<28}{'Legacy (ms)':>14}{'Extractor (ms)':>16}{'Speedup':>10}")
+    for tenants, properties in ((1, 1), (4, 2), (20, 10)):
+        html = build_page(tenants, properties)
+        legacy = legacy_parse(html)
+        current = parse_receipt_form(html)
+
+        for key in ('numContrato', 'versaoContrato', 'nifEmitente', 'valorRenda', 'hasNifHerancaIndivisa'):
+            assert legacy[key] == current[key], key
+        assert len(current['locatarios']) == tenants
+
+        legacy_ms = time_parser(legacy_parse, html, iterations)
+        current_ms = time_parser(parse_receipt_form, html, iterations)
+        label = f"{tenants} tenants, {properties} properties"
+        print(f"{label:<28}{legacy_ms:>14.3f}{current_ms:>16.3f}{legacy_ms / current_ms:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""
+Asyncio client for the Portal das Finanças receipt endpoints.
+
+AsyncWebClient runs the portal calls of a logged-in WebClient on an event loop,
+so a batch can keep many requests in flight on one thread. It shares the sync
+client's rate limiter, caches and response handling, and works on a copy of the
+sync session's cookies (import_cookies / export_cookies). Login and the SICI
+portal handshake stay on the synchronous client.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+try:
+    from .web_client import WebClient, CONTRACTS_API_URL
+    from .utils.logger import get_logger
+    from .utils.http_profiles import NAVIGATE_HEADERS, XHR_JSON_HEADERS, PAGE_TIMEOUT, API_TIMEOUT, SUBMIT_TIMEOUT
+    from .utils.retry_policy import is_transient_status
+except ImportError:
+    from web_client import WebClient, CONTRACTS_API_URL
+    from utils.logger import get_logger
+    from utils.http_profiles import NAVIGATE_HEADERS, XHR_JSON_HEADERS, PAGE_TIMEOUT, API_TIMEOUT, SUBMIT_TIMEOUT
+    from utils.retry_policy import is_transient_status
+
+logger = get_logger(__name__)
+
+# Requests allowed in flight at once (on top of the shared rate limiter)
+DEFAULT_MAX_IN_FLIGHT = 50
+
+
+@dataclass
+class PortalResponse:
+    """Fully read response, with the attributes WebClient's response handlers use."""
+    status_code: int
+    text: str
+    url: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    elapsed: timedelta = field(default_factory=timedelta)
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncWebClient:
+    """Async versions of WebClient's portal calls for an authenticated WebClient."""
+
+    def __init__(self, web_client: WebClient, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """
+        Initialize AsyncWebClient.
+
+        Args:
+            web_client: Logged-in client whose session, caches and rate limiter are used
+            max_in_flight: Maximum number of concurrent requests
+
+        Raises:
+            ImportError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp library not installed. Please install it with: pip install aiohttp")
+
+        self.web_client = web_client
+        self.rate_limiter = web_client.rate_limiter
+        self.max_in_flight = max_in_flight
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> 'AsyncWebClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def authenticated(self) -> bool:
+        return self.web_client.authenticated
+
+    async def open(self):
+        """Create the HTTP session (call from the event loop that will use it)."""
+        if self._session is not None:
+            return
+
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._session = aiohttp.ClientSession(
+            headers=dict(self.web_client.session.headers),
+            cookie_jar=aiohttp.CookieJar(),
+            connector=aiohttp.TCPConnector(limit=self.max_in_flight)
+        )
+        self.import_cookies()
+
+    async def close(self):
+        """Hand the cookies back to the sync session and close the HTTP session."""
+        if self._session is None:
+            return
+
+        self.export_cookies()
+        await self._session.close()
+        self._session = None
+
+    def import_cookies(self):
+        """Copy the sync session's cookies into the async cookie jar."""
+        for cookie in self.web_client.session.cookies:
+            if cookie.is_expired():
+                continue
+            morsel = SimpleCookie()
+            morsel[cookie.name] = cookie.value or ''
+            if cookie.domain_specified:
+                morsel[cookie.name]['domain'] = cookie.domain
+            morsel[cookie.name]['path'] = cookie.path or '/'
+            if cookie.secure:
+                morsel[cookie.name]['secure'] = True
+            host = cookie.domain.lstrip('.')
+            self._session.cookie_jar.update_cookies(morsel, response_url=URL(f"https://{host}/"))
+
+    def export_cookies(self):
+        """Copy the async cookie jar back into the sync session."""
+        for morsel in self._session.cookie_jar:
+            self.web_client.session.cookies.set(
+                morsel.key,
+                morsel.value,
+                domain=morsel['domain'] or None,
+                path=morsel['path'] or '/',
+                secure=bool(morsel['secure'])
+            )
+
+    async def _request(self, method: str, url: str, headers: Mapping[str, str],
+                       timeout: Tuple[float, float], **kwargs) -> PortalResponse:
+        """
+        Send one rate-limited request and read its body.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers (merged over the session headers)
+            timeout: (connect, read) timeout in seconds
+            **kwargs: Passed to aiohttp (params, json, data)
+
+        Returns:
+            PortalResponse
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: If no response was received
+        """
+        if self._session is None:
+            await self.open()
+
+        async with self._semaphore:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            connect_timeout, read_timeout = timeout
+            started = time.monotonic()
+            try:
+                async with self._session.request(
+                    method, url,
+                    headers=dict(headers),
+                    timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                    **kwargs
+                ) as response:
+                    text = await response.text(errors='replace')
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.rate_limiter.record_failure()
+                raise
+
+            elapsed = time.monotonic() - started
+            self.rate_limiter.record_response(response.status, elapsed, response.headers.get('Retry-After'))
+            return PortalResponse(
+                status_code=response.status,
+                text=text,
+                url=str(response.url),
+                headers=response.headers,
+                elapsed=timedelta(seconds=elapsed)
+            )
+
+    async def get_receipt_form(self, contract_id: str, use_cache: bool = True) -> Tuple[bool, Dict]:
+        """
+        Get receipt form data for a specific contract (see WebClient.get_receipt_form).
+
+        Args:
+            contract_id: Contract ID to get form data for
+            use_cache: Return a cached form for the contract's current version if available
+
+        Returns:
+            Tuple of (success, form_data)
+        """
+        if not self.authenticated:
+            logger.error("FORM REQUEST FAILED: Not authenticated")
+            return False, None
+
+        try:
+            if use_cache:
+                cached_form = self.web_client.form_cache.get(contract_id)
+                if cached_form is not None:
+                    logger.info(f"Using cached receipt form for contract {contract_id} (version {cached_form.get('versaoContrato')})")
+                    return True, cached_form
+
+            form_url = f"{self.web_client.receipts_base_url}/arrendamento/criarRecibo/{contract_id}"
+            logger.info(f"Fetching receipt form from: {form_url}")
+
+            response = await self._request('GET', form_url, NAVIGATE_HEADERS, API_TIMEOUT)
+            return self.web_client._process_receipt_form_response(contract_id, form_url, response)
+
+        except Exception as e:
+            logger.error(f"Error getting receipt form for contract {contract_id}: {str(e)}")
+            return False, None
+
+    async def issue_receipt(self, submission_data: Dict) -> Tuple[bool, Dict]:
+        """
+        Issue a receipt with the provided data (see WebClient.issue_receipt).
+        
+        As in the sync client, a timeout, dropped connection or transient status after
+        the POST is never retried: the failure is returned as ambiguous.
+
+        Args:
+            submission_data: Receipt data to submit
+
+        Returns:
+            Tuple of (success, response_data)
+        """
+        if not self.authenticated:
+            logger.error(" RECEIPT ISSUE FAILED: Not authenticated")
+            return False, None
+
+        contract_id = submission_data.get('numContrato', 'UNKNOWN')
+        receipt_value = submission_data.get('valor', 'UNKNOWN')
+
+        duplicate_result, dedup_key = self.web_client._claim_submission(submission_data)
+        if duplicate_result is not None:
+            return duplicate_result
+
+        client = self.web_client
+        success, response_data = False, None
+        try:
+            api_url, headers, payload = client._prepare_receipt_submission(submission_data)
+            try:
+                response = await self._request('POST', api_url, headers, SUBMIT_TIMEOUT, json=payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                _, response_data = client._issue_exception_result(e, submission_data, contract_id, receipt_value)
+                success, response_data = client._ambiguous_submission_result(response_data, type(e).__name__, contract_id)
+            else:
+                success, response_data = client._process_issue_response(response, payload, contract_id, receipt_value)
+                if not success and is_transient_status(response.status_code):
+                    success, response_data = client._ambiguous_submission_result(
+                        response_data, f"HTTP {response.status_code}", contract_id)
+
+        except Exception as e:
+            success, response_data = client._issue_exception_result(e, submission_data, contract_id, receipt_value)
+
+        finally:
+            client._release_submission(dedup_key, success, response_data)
+
+        return success, response_data
+
+    async def issue_receipts(self, submissions: Iterable[Dict]) -> List[Tuple[bool, Dict]]:
+        """
+        Issue several receipts concurrently (at most max_in_flight requests at once).
+
+        Args:
+            submissions: Receipt data to submit
+
+        Returns:
+            (success, response_data) per submission, in input order
+        """
+        return list(await asyncio.gather(*(self.issue_receipt(data) for data in submissions)))
+
+    async def get_contract_rent_value(self, contract_id: str) -> Tuple[bool, float]:
+        """
+        Get rent value for a specific contract (see WebClient.get_contract_rent_value).
+
+        Args:
+            contract_id: Contract ID to get rent value for
+
+        Returns:
+            Tuple of (success, rent_value)
+        """
+        if not self.authenticated:
+            logger.error("Not authenticated")
+            return False, 0.0
+
+        try:
+            response = await self._request('GET', CONTRACTS_API_URL, XHR_JSON_HEADERS, API_TIMEOUT,
+                                           params={'contractId': contract_id})
+            return self.web_client._process_rent_value_response(contract_id, response)
+
+        except Exception as e:
+            logger.error(f" Error getting rent value for contract {contract_id}: {str(e)}")
+            return False, 0.0
+
+    async def verify_receipt_in_portal(self, contract_id: str, receipt_number: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        Verify that a receipt exists in the portal (see WebClient.verify_receipt_in_portal).
+
+        Args:
+            contract_id: The contract ID
+            receipt_number: The receipt number to verify
+
+        Returns:
+            Tuple of (success, receipt_details_dict or None)
+        """
+        if not self.authenticated:
+            logger.error("Cannot verify receipt: Not authenticated")
+            return False, {'error': 'Not authenticated'}
+
+        logger.info(f"Verifying receipt in portal: Contract {contract_id}, Receipt #{receipt_number}")
+
+        try:
+            receipt_url = f"{self.web_client.receipts_base_url}/arrendamento/detalheRecibo/{contract_id}/{receipt_number}"
+            response = await self._request('GET', receipt_url, NAVIGATE_HEADERS, API_TIMEOUT)
+            return self.web_client._process_verify_response(contract_id, receipt_number, receipt_url, response)
+
+        except asyncio.TimeoutError:
+            logger.error("   Request timeout")
+            return False, {'error': 'Request timeout'}
+
+        except aiohttp.ClientConnectionError as e:
+            logger.error(f"   Connection error: {str(e)}")
+            return False, {'error': f'Connection error: {str(e)}'}
+
+        except Exception as e:
+            logger.error(f"   Exception during verification: {str(e)}")
+            return False, {'error': f'Exception: {str(e)}'}
+
+    async def get_contracts_with_tenant_data(self, force_refresh: bool = False) -> Tuple[bool, List[Dict], str]:
+        """
+        Get contract data including tenant names (see WebClient.get_contracts_with_tenant_data).
+
+        With an established portal session the contracts call is made here. Otherwise
+        the SICI handshake is a chain of redirects on the sync session, so the sync
+        method runs in a worker thread and its cookies are imported afterwards.
+
+        Args:
+            force_refresh: Skip the TTL check and revalidate with the portal
+        """
+        if not self.authenticated:
+            return False, [], "Not authenticated"
+
+        client = self.web_client
+        try:
+            cache_key, cached, cached_result = client._cached_contracts(force_refresh)
+            if cached_result is not None:
+                return cached_result
+
+            if self._session is None:
+                await self.open()
+
+            if client._has_portal_session():
+                response = await self._request('GET', CONTRACTS_API_URL,
+                                               client._contracts_request_headers(cached), PAGE_TIMEOUT)
+                if not ('login' in response.url.lower() or 'acesso.gov.pt' in response.url):
+                    result = client._process_contracts_response(response, cache_key, cached)
+                    if result is None:
+                        result = await asyncio.to_thread(client._fallback_html_parsing, client.portal_page_url,
+                                                         client._portal_navigation_headers())
+                        self.import_cookies()
+                    return result
+
+                logger.warning("Portal session no longer valid - falling back to SICI redirect handshake")
+                client._portal_session_established = False
+
+            self.export_cookies()
+            result = await asyncio.to_thread(client.get_contracts_with_tenant_data, force_refresh)
+            self.import_cookies()
+            return result
+
+        except Exception as e:
+            logger.error(f"Error fetching contract data: {str(e)}")
+            return False, [], f"Error: {str(e)}"
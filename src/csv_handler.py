@@ -1,23 +1,45 @@
 """
 CSV Handler for processing receipt data from CSV files and Excel files.
-Supports automatic conversion from Excel (.xlsx, .xls) to CSV format.
+Excel sheets (.xlsx, .xls) are read directly, with typed cell values.
 """
 
 import csv
 import os
-import tempfile
-from datetime import datetime
-from typing import List, Dict, Tuple
+from datetime import date, datetime
+from typing import Any, Callable, List, Dict, Tuple, Iterator, Optional, Union
 from dataclasses import dataclass
 
 try:
     from .utils.logger import get_logger
+    from .utils.date_parser import DateParser, parse_iso_date
+    from .utils.xlsx_reader import XlsxReader
+    from .utils.session_report_log import SessionReportLog
+    from .receipt_batch import ReceiptBatch
 except ImportError:
     # Fallback for when imported directly
     from utils.logger import get_logger
+    from utils.date_parser import DateParser, parse_iso_date
+    from utils.xlsx_reader import XlsxReader
+    from utils.session_report_log import SessionReportLog
+    from receipt_batch import ReceiptBatch
 
 logger = get_logger(__name__)
 
+
+def _cell_text(value: Any) -> str:
+    """Cell value as stripped text; whole-number floats (Excel numeric IDs) lose their '.0'."""
+    if isinstance(value, str):
+        return value.strip()
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _is_blank_row(values: Tuple[Any, ...]) -> bool:
+    return all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in values)
+
 @dataclass
 class ReceiptData:
     """Data class for receipt information."""
@@ -32,6 +54,13 @@ class ReceiptData:
     receipt_type_defaulted: bool = False  # Track if receipt_type was defaulted to 'rent'
     row_number: int = 0
 
+@dataclass
+class ReceiptRowError:
+    """Error record yielded by CSVHandler.iter_receipts for a row that could not be loaded."""
+    row_number: int
+    message: str
+    fatal: bool = False  # The file itself could not be read; no further rows follow
+
 class CSVHandler:
     """Handles CSV file operations for receipt data."""
     
@@ -52,178 +81,197 @@ class CSVHandler:
         self.receipts: List[ReceiptData] = []
         self.validation_errors: List[str] = []
         self.column_mapping: Dict[str, str] = {}  # Maps CSV columns to standard names
-        self.temp_csv_file: str = None  # Track temporary CSV file from Excel conversion
+        self._date_parser = DateParser()  # Learns each file's dominant date format
     
-    def _convert_excel_to_csv(self, excel_path: str) -> Tuple[bool, str, str]:
+    def load_csv(self, file_path: str, columnar: bool = False) -> Tuple[bool, List[str]]:
         """
-        Convert Excel file to CSV format.
+        Load and validate CSV file or Excel file (with automatic conversion).
+        Column order is flexible - uses header names.
         
         Args:
-            excel_path: Path to the Excel file (.xlsx or .xls)
+            file_path: Path to the CSV or Excel file (.csv, .xlsx, .xls)
+            columnar: Store the receipts as a ReceiptBatch instead of a list of
+                      ReceiptData (compact for large files; rows are ReceiptRow views)
             
         Returns:
-            Tuple of (success, csv_path, error_message)
+            Tuple of (success, error_messages)
         """
-        try:
-            import openpyxl
-            
-            logger.info(f"Converting Excel file to CSV: {excel_path}")
-            
-            # Load the Excel workbook
-            try:
-                workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
-            except Exception as e:
-                return False, "", f"Failed to open Excel file: {str(e)}"
-            
-            # Get the first sheet
-            sheet = workbook.active
-            logger.info(f"Reading from sheet: {sheet.title}")
-            
-            # Create a temporary CSV file
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.csv', text=True)
-            os.close(temp_fd)  # Close the file descriptor
-            
-            try:
-                # Write Excel data to CSV
-                with open(temp_path, 'w', newline='', encoding='utf-8-sig') as csv_file:
-                    csv_writer = csv.writer(csv_file)
-                    
-                    row_count = 0
-                    for row in sheet.iter_rows(values_only=True):
-                        # Skip completely empty rows
-                        if all(cell is None or str(cell).strip() == '' for cell in row):
-                            continue
-                        
-                        # Convert None values to empty strings
-                        cleaned_row = ['' if cell is None else str(cell) for cell in row]
-                        csv_writer.writerow(cleaned_row)
-                        row_count += 1
-                    
-                    logger.info(f"Converted {row_count} rows from Excel to CSV")
-                
-                workbook.close()
-                
-                if row_count == 0:
-                    os.unlink(temp_path)
-                    return False, "", "Excel file is empty"
-                
-                self.temp_csv_file = temp_path
-                return True, temp_path, ""
-                
-            except Exception as e:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                workbook.close()
-                return False, "", f"Failed to write CSV: {str(e)}"
-                
-        except ImportError:
-            return False, "", "openpyxl library not installed. Please install it with: pip install openpyxl"
-        except Exception as e:
-            return False, "", f"Excel conversion error: {str(e)}"
-    
-    def _cleanup_temp_csv(self):
-        """Clean up temporary CSV file created from Excel conversion."""
-        if self.temp_csv_file and os.path.exists(self.temp_csv_file):
-            try:
-                os.unlink(self.temp_csv_file)
-                logger.info(f"Cleaned up temporary CSV file: {self.temp_csv_file}")
-                self.temp_csv_file = None
-            except Exception as e:
-                logger.warning(f"Failed to clean up temporary CSV file: {str(e)}")
+        self.receipts = ReceiptBatch() if columnar else []
+        self.validation_errors.clear()
+        
+        rows_processed = 0
+        for item in self.iter_receipts(file_path):
+            if isinstance(item, ReceiptRowError):
+                if item.fatal:
+                    return False, [item.message]
+                self.validation_errors.append(item.message)
+            else:
+                self.receipts.append(item)
+            rows_processed = max(rows_processed, item.row_number - 1)
+        
+        # Final validation summary
+        logger.info(f"CSV processing completed:")
+        logger.info(f"  Total rows processed: {rows_processed}")
+        logger.info(f"  Valid receipts loaded: {len(self.receipts)}")
+        logger.info(f"  Validation errors: {len(self.validation_errors)}")
+        
+        if self.validation_errors:
+            return False, self.validation_errors
+        
+        logger.info(f"Successfully loaded {len(self.receipts)} receipts from {file_path}")
+        return True, []
     
-    def load_csv(self, file_path: str) -> Tuple[bool, List[str]]:
+    def iter_receipts(self, file_path: str) -> Iterator[Union[ReceiptData, ReceiptRowError]]:
         """
-        Load and validate CSV file or Excel file (with automatic conversion).
-        Column order is flexible - uses header names.
+        Stream validated receipts from a CSV or Excel file row by row.
+        
+        Nothing is accumulated in self.receipts or self.validation_errors, so memory use
+        does not grow with the file. Rows that fail parsing or validation are yielded as
+        ReceiptRowError records (one per error message) in row order. Problems with the
+        file itself (missing file, unreadable file, missing required columns) are yielded
+        as fatal errors and end the stream.
         
         Args:
             file_path: Path to the CSV or Excel file (.csv, .xlsx, .xls)
             
-        Returns:
-            Tuple of (success, error_messages)
+        Yields:
+            ReceiptData for valid rows, ReceiptRowError for invalid ones
         """
         if not os.path.exists(file_path):
-            return False, ["File does not exist"]
-        
-        # Clean up any previous temporary CSV file
-        self._cleanup_temp_csv()
+            yield ReceiptRowError(0, "File does not exist", fatal=True)
+            return
         
-        # Check if file is Excel format
         file_ext = os.path.splitext(file_path)[1].lower()
+        close_source: Optional[Callable[[], None]] = None
         if file_ext in ['.xlsx', '.xls']:
             logger.info(f"Detected Excel file: {file_path}")
-            success, csv_path, error_msg = self._convert_excel_to_csv(file_path)
+            try:
+                sheet_rows, close_source = self._open_excel_sheet(file_path)
+            except ValueError as e:
+                yield ReceiptRowError(0, str(e), fatal=True)
+                return
+            records = self._iter_excel_records(sheet_rows)
+        else:
+            records = self._iter_csv_records(file_path)
+        
+        self.column_mapping.clear()
+        self._date_parser = DateParser()
+        row_num = 1
+        try:
+            fieldnames = next(records)
+            if fieldnames is None and close_source is not None:
+                yield ReceiptRowError(0, "Excel file is empty", fatal=True)
+                return
+            
+            # Build column mapping from file headers to standard names
+            success, mapping_errors = self._build_column_mapping(fieldnames)
             if not success:
-                return False, [error_msg]
+                for message in mapping_errors:
+                    yield ReceiptRowError(1, message, fatal=True)
+                return
             
-            logger.info(f"Excel converted to temporary CSV: {csv_path}")
-            # Use the converted CSV file for the rest of the processing
-            file_path = csv_path
-        
-        try:
-            self.receipts.clear()
-            self.validation_errors.clear()
-            self.column_mapping.clear()
-            
-            with open(file_path, 'r', encoding='utf-8-sig') as file:
-                # Try to detect dialect, with fallback to standard comma-separated
-                sample = file.read(1024)
-                file.seek(0)
-                
+            logger.info(f"Column mapping: {self.column_mapping}")
+            
+            # Process each row
+            for row_num, row in records:
                 try:
-                    dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
-                except csv.Error:
-                    # Fallback to standard CSV dialect if detection fails
-                    logger.warning("Could not detect CSV dialect, using default comma-separated format")
-                    dialect = csv.excel  # Standard comma-separated
-                
-                reader = csv.DictReader(file, dialect=dialect)
-                
-                # Build column mapping from CSV headers to standard names
-                success, mapping_errors = self._build_column_mapping(reader.fieldnames)
-                if not success:
-                    return False, mapping_errors
-                
-                logger.info(f"Column mapping: {self.column_mapping}")
+                    receipt, dates = self._parse_row_with_dates(row, row_num)
+                except Exception as e:
+                    yield ReceiptRowError(row_num, f"Row {row_num}: {str(e)}")
+                    continue
                 
-                # Process each row
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 for header
-                    try:
-                        receipt = self._parse_row(row, row_num)
-                        if receipt:
-                            # Validate the receipt before adding it
-                            temp_errors = []
-                            original_errors = self.validation_errors.copy()
-                            self.validation_errors = temp_errors
-                            
-                            self._validate_receipt(receipt)
-                            
-                            # If validation passed, add the receipt
-                            if not temp_errors:
-                                self.receipts.append(receipt)
-                            
-                            # Add any validation errors to the main list
-                            original_errors.extend(temp_errors)
-                            self.validation_errors = original_errors
-                            
-                    except Exception as e:
-                        self.validation_errors.append(f"Row {row_num}: {str(e)}")
-            
-            # Final validation summary
-            logger.info(f"CSV processing completed:")
-            logger.info(f"  Total rows processed: {row_num - 1 if 'row_num' in locals() else 0}")
-            logger.info(f"  Valid receipts loaded: {len(self.receipts)}")
-            logger.info(f"  Validation errors: {len(self.validation_errors)}")
-            
-            if self.validation_errors:
-                return False, self.validation_errors
-            
-            logger.info(f"Successfully loaded {len(self.receipts)} receipts from {file_path}")
-            return True, []
-            
+                if receipt:
+                    errors = self._receipt_errors(receipt, dates)
+                    if errors:
+                        for message in errors:
+                            yield ReceiptRowError(row_num, message)
+                    else:
+                        yield receipt
+                        
         except Exception as e:
             logger.error(f"Error loading CSV file: {str(e)}")
-            return False, [f"Error reading file: {str(e)}"]
+            yield ReceiptRowError(row_num, f"Error reading file: {str(e)}", fatal=True)
+        finally:
+            records.close()
+            if close_source is not None:
+                close_source()
+    
+    def _iter_csv_records(self, file_path: str) -> Iterator:
+        """
+        Read a delimited text file: yields the header first, then (row_number, row dict) pairs.
+        """
+        with open(file_path, 'r', encoding='utf-8-sig') as file:
+            # Try to detect dialect, with fallback to standard comma-separated
+            sample = file.read(1024)
+            file.seek(0)
+            
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                # Fallback to standard CSV dialect if detection fails
+                logger.warning("Could not detect CSV dialect, using default comma-separated format")
+                dialect = csv.excel  # Standard comma-separated
+            
+            reader = csv.DictReader(file, dialect=dialect)
+            yield reader.fieldnames
+            yield from enumerate(reader, start=2)  # Start at 2 for header
+    
+    def _open_excel_sheet(self, file_path: str) -> Tuple[Iterator[Tuple[Any, ...]], Callable[[], None]]:
+        """
+        Open the active sheet of an Excel file for streaming.
+        
+        Uses openpyxl in read-only mode; workbooks it cannot open (or in which it
+        finds no sheets) are read from the raw sheet XML with XlsxReader.
+        
+        Args:
+            file_path: Path to the Excel file
+            
+        Returns:
+            Tuple of (row value tuples, close callback)
+            
+        Raises:
+            ValueError: If the file cannot be opened as a workbook
+        """
+        open_error = None
+        try:
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as e:
+            open_error = e
+        else:
+            if workbook.sheetnames:
+                sheet = workbook.active
+                logger.info(f"Reading from sheet: {sheet.title}")
+                return sheet.iter_rows(values_only=True), workbook.close
+            workbook.close()
+        
+        try:
+            reader = XlsxReader(file_path)
+        except ValueError as e:
+            raise ValueError(f"Failed to open Excel file: {str(open_error or e)}")
+        if reader.active_sheet is None:
+            reader.close()
+            raise ValueError("Excel file is empty")
+        logger.info(f"Reading from sheet: {reader.active_sheet} (raw workbook XML)")
+        return reader.iter_rows(), reader.close
+    
+    def _iter_excel_records(self, sheet_rows: Iterator[Tuple[Any, ...]]) -> Iterator:
+        """
+        Turn sheet rows into records: yields the header first (None for a sheet
+        with no data), then (row_number, row dict) pairs with the cells' typed
+        values. Blank rows are skipped; row numbers are the sheet's own.
+        """
+        header = None
+        for row_num, values in enumerate(sheet_rows, start=1):
+            if _is_blank_row(values):
+                continue
+            if header is None:
+                header = ['' if cell is None else str(cell) for cell in values]
+                yield header
+                continue
+            yield row_num, dict(zip(header, values))
+        if header is None:
+            yield None
     
     def _build_column_mapping(self, csv_columns: List[str]) -> Tuple[bool, List[str]]:
         """
@@ -283,58 +331,43 @@ class CSVHandler:
             date_str: Date string in various formats
             
         Returns:
-            Date in YYYY-MM-DD format
+            Date in YYYY-MM-DD format, or the original string if it cannot be parsed
         """
-        if not date_str:
-            return ''
-        
-        date_str = str(date_str).strip()
-        
-        # If already in correct format, return as-is
-        if len(date_str) == 10 and date_str.count('-') == 2:
-            try:
-                datetime.strptime(date_str, '%Y-%m-%d')
-                return date_str
-            except ValueError:
-                pass
-        
-        # Try to parse common date formats (including with time)
-        formats_to_try = [
-            '%Y-%m-%d %H:%M:%S',      # Excel: 2025-11-01 00:00:00
-            '%Y-%m-%d %H:%M:%S.%f',   # With microseconds
-            '%d/%m/%Y',                # European: 01/11/2025
-            '%m/%d/%Y',                # American: 11/01/2025
-            '%Y/%m/%d',                # ISO variant: 2025/11/01
-            '%d-%m-%Y',                # European with dashes
-            '%Y-%m-%d',                # ISO standard
-        ]
-        
-        for fmt in formats_to_try:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        # If all parsing fails, return original (will fail validation later)
-        return date_str
+        return self._date_parser.normalize(date_str)
     
-    def _parse_row(self, row: Dict[str, str], row_num: int) -> ReceiptData:
+    def _parse_row(self, row: Dict[str, Any], row_num: int) -> ReceiptData:
         """Parse a single CSV row into ReceiptData using flexible column mapping."""
+        receipt, _ = self._parse_row_with_dates(row, row_num)
+        return receipt
+    
+    def _parse_row_with_dates(self, row: Dict[str, Any],
+                              row_num: int) -> Tuple[ReceiptData, Tuple[Optional[date], ...]]:
+        """
+        Parse a single CSV row, also returning the parsed (from, to, payment) dates
+        so validation does not have to parse them again.
+        
+        Cells are strings for CSV files; Excel rows carry typed values (datetime,
+        int, float), which are used as they are.
+        """
         try:
             # Use column mapping to get values
-            def get_mapped_value(standard_col: str) -> str:
+            def get_mapped_value(standard_col: str) -> Any:
                 csv_col = self.column_mapping.get(standard_col)
                 if csv_col and csv_col in row:
-                    return row[csv_col].strip()
+                    cell = row[csv_col]
+                    if isinstance(cell, str):
+                        return cell.strip()
+                    return '' if cell is None else cell
                 return ''
             
             # Handle optional value with fallback
-            value_str = get_mapped_value('value')
+            raw_value = get_mapped_value('value')
             value_defaulted = False
-            if value_str:
+            if isinstance(raw_value, (int, float)) and not isinstance(raw_value, bool):
+                value = float(raw_value)
+            elif raw_value != '':
                 # Parse provided value
-                value = float(value_str.replace(',', '.'))
+                value = float(_cell_text(raw_value).replace(',', '.'))
             else:
                 # Use fallback value - will be filled from contract data later
                 # Use -1.0 to indicate missing value (easier to detect than 0.0)
@@ -342,9 +375,11 @@ class CSVHandler:
                 value_defaulted = True
             
             # Handle and normalize dates (strip time if present)
-            from_date = self._normalize_date(get_mapped_value('fromDate'))
-            to_date = self._normalize_date(get_mapped_value('toDate'))
-            payment_date = self._normalize_date(get_mapped_value('paymentDate'))
+            raw_dates = [get_mapped_value(col) for col in ('fromDate', 'toDate', 'paymentDate')]
+            dates = tuple(self._date_parser.parse(raw) for raw in raw_dates)
+            from_date, to_date, payment_date = (
+                parsed.isoformat() if parsed else _cell_text(raw) for parsed, raw in zip(dates, raw_dates)
+            )
             
             payment_date_defaulted = False
             if not payment_date:
@@ -352,7 +387,7 @@ class CSVHandler:
                 raise ValueError(f"Row {row_num}: Payment date is required but missing")
             
             # Handle receipt type (optional - defaults to 'rent' if not provided)
-            receipt_type = get_mapped_value('receiptType')
+            receipt_type = _cell_text(get_mapped_value('receiptType'))
             receipt_type_defaulted = False
             if not receipt_type:
                 # Default to 'rent' if not provided
@@ -360,15 +395,13 @@ class CSVHandler:
                 receipt_type_defaulted = True
             
             # Validate date formats (should now all be YYYY-MM-DD)
-            for date_field, date_val in [('fromDate', from_date), ('toDate', to_date), ('paymentDate', payment_date)]:
-                if date_val:
-                    try:
-                        datetime.strptime(date_val, '%Y-%m-%d')
-                    except ValueError:
-                        raise ValueError(f"Row {row_num}: {date_field} has invalid format '{date_val}', expected YYYY-MM-DD")
-            
-            return ReceiptData(
-                contract_id=get_mapped_value('contractId'),
+            for date_field, date_val, parsed in zip(('fromDate', 'toDate', 'paymentDate'),
+                                                    (from_date, to_date, payment_date), dates):
+                if date_val and parsed is None:
+                    raise ValueError(f"Row {row_num}: {date_field} has invalid format '{date_val}', expected YYYY-MM-DD")
+            
+            receipt = ReceiptData(
+                contract_id=_cell_text(get_mapped_value('contractId')),
                 from_date=from_date,
                 to_date=to_date,
                 receipt_type=receipt_type,
@@ -379,47 +412,67 @@ class CSVHandler:
                 receipt_type_defaulted=receipt_type_defaulted,
                 row_number=row_num
             )
+            return receipt, dates
         except ValueError as e:
             raise ValueError(f"Invalid data format: {str(e)}")
     
     def _validate_data(self):
         """Validate all receipt data."""
+        if isinstance(self.receipts, ReceiptBatch):
+            self.validation_errors.extend(self.receipts.validate())
+            return
         for receipt in self.receipts:
             self._validate_receipt(receipt)
     
     def _validate_receipt(self, receipt: ReceiptData):
         """Validate a single receipt."""
+        self.validation_errors.extend(self._receipt_errors(receipt))
+    
+    def _receipt_errors(self, receipt: ReceiptData,
+                        dates: Optional[Tuple[Optional[date], ...]] = None) -> List[str]:
+        """
+        Validate a single receipt and return its error messages.
+        
+        Args:
+            receipt: Receipt to validate
+            dates: (from, to, payment) dates already parsed from the row, if available
+        """
+        errors = []
+        
         # Validate contract ID
         if not receipt.contract_id:
-            self.validation_errors.append(f"Row {receipt.row_number}: Contract ID cannot be empty")
+            errors.append(f"Row {receipt.row_number}: Contract ID cannot be empty")
         
         # Validate dates
         try:
-            from_date = datetime.strptime(receipt.from_date, '%Y-%m-%d')
-            to_date = datetime.strptime(receipt.to_date, '%Y-%m-%d')
-            payment_date = datetime.strptime(receipt.payment_date, '%Y-%m-%d')
+            if dates and all(dates):
+                from_date, to_date, payment_date = dates
+            else:
+                from_date = parse_iso_date(receipt.from_date)
+                to_date = parse_iso_date(receipt.to_date)
+                payment_date = parse_iso_date(receipt.payment_date)
             current_date = datetime.now()
             
             # Check if from_date is later than to_date
             if from_date > to_date:
-                self.validation_errors.append(
+                errors.append(
                     f"Row {receipt.row_number}: From date ({receipt.from_date}) cannot be later than to date ({receipt.to_date})"
                 )
             
             # Check if payment date is in the future
-            if payment_date.date() > current_date.date():
-                self.validation_errors.append(
+            if payment_date > current_date.date():
+                errors.append(
                     f"Row {receipt.row_number}: Payment date ({receipt.payment_date}) cannot be in the future"
                 )
                 
         except ValueError as e:
-            self.validation_errors.append(
+            errors.append(
                 f"Row {receipt.row_number}: Invalid date format. Use YYYY-MM-DD. Error: {str(e)}"
             )
         
         # Validate value (allow -1.0 as fallback indicator, but other negative values are invalid)
         if receipt.value < 0 and receipt.value != -1.0:
-            self.validation_errors.append(
+            errors.append(
                 f"Row {receipt.row_number}: Value cannot be negative (got {receipt.value})"
             )
         elif receipt.value == 0.0 and not receipt.value_defaulted:
@@ -428,12 +481,16 @@ class CSVHandler:
         
         # Validate receipt type
         if not receipt.receipt_type:
-            self.validation_errors.append(
+            errors.append(
                 f"Row {receipt.row_number}: Receipt type cannot be empty"
             )
+        
+        return errors
     
     def get_receipts(self) -> List[ReceiptData]:
-        """Get the list of loaded receipts."""
+        """Get the list of loaded receipts (the ReceiptBatch itself when loaded columnar)."""
+        if isinstance(self.receipts, ReceiptBatch):
+            return self.receipts
         return self.receipts.copy()
     
     def clear_data(self):
@@ -441,12 +498,6 @@ class CSVHandler:
         self.receipts = []
         self.validation_errors = []
         self.column_mapping = {}
-        if self.temp_csv_file and os.path.exists(self.temp_csv_file):
-            try:
-                os.remove(self.temp_csv_file)
-            except:
-                pass
-        self.temp_csv_file = None
     
     def filter_receipts_by_contracts(self, valid_contract_ids: List[str]) -> int:
         """
@@ -463,7 +514,7 @@ class CSVHandler:
         if not valid_contract_ids:
             logger.warning("No valid contract IDs provided - all receipts will be removed")
             removed_count = len(self.receipts)
-            self.receipts.clear()
+            self.receipts = ReceiptBatch() if isinstance(self.receipts, ReceiptBatch) else []
             return removed_count
         
         # Convert to strings for comparison
@@ -471,10 +522,13 @@ class CSVHandler:
         
         # Filter receipts
         original_count = len(self.receipts)
-        self.receipts = [
-            receipt for receipt in self.receipts
-            if str(receipt.contract_id).strip() in valid_ids_set
-        ]
+        if isinstance(self.receipts, ReceiptBatch):
+            self.receipts = self.receipts.filter(self.receipts.contract_mask(valid_ids_set))
+        else:
+            self.receipts = [
+                receipt for receipt in self.receipts
+                if str(receipt.contract_id).strip() in valid_ids_set
+            ]
         removed_count = original_count - len(self.receipts)
         
         logger.info(f"Filtered receipts: kept {len(self.receipts)} receipts, removed {removed_count} receipts")
@@ -495,7 +549,10 @@ class CSVHandler:
             logger.warning("No receipt data loaded")
             return []
         
-        contract_ids = list(set(receipt.contract_id for receipt in self.receipts))
+        if isinstance(self.receipts, ReceiptBatch):
+            contract_ids = self.receipts.contract_ids()
+        else:
+            contract_ids = list(set(receipt.contract_id for receipt in self.receipts))
         logger.info(f"Extracted {len(contract_ids)} unique contract IDs from CSV: {contract_ids}")
         return sorted(contract_ids)
     
@@ -506,10 +563,13 @@ class CSVHandler:
         Returns:
             Dictionary mapping contract IDs to number of receipts
         """
-        summary = {}
-        for receipt in self.receipts:
-            contract_id = receipt.contract_id
-            summary[contract_id] = summary.get(contract_id, 0) + 1
+        if isinstance(self.receipts, ReceiptBatch):
+            summary = self.receipts.contract_counts()
+        else:
+            summary = {}
+            for receipt in self.receipts:
+                contract_id = receipt.contract_id
+                summary[contract_id] = summary.get(contract_id, 0) + 1
         
         logger.info(f"Contract summary: {summary}")
         return summary
@@ -594,82 +654,52 @@ class CSVHandler:
             logger.error(f"Error exporting session report: {str(e)}")
             return False
     
-    def export_session_report_excel(self, report_data: List[Dict], file_path: str, append: bool = True) -> bool:
+    def export_session_report_excel(self, report_data: List[Dict], file_path: str, append: bool = True,
+                                    materialize: bool = True) -> bool:
         """
         Export session report data to Excel with option to append to existing file.
         
+        Rows are kept in a sidecar log (see utils.session_report_log), so appending
+        never reloads the workbook; the .xlsx is rebuilt from the log in write-only
+        mode. Reports created before the log existed, or changed on disk since the
+        log last wrote them, are read once to seed it.
+        
         Args:
             report_data: List of dictionaries containing report data
             file_path: Path to save the report (.xlsx)
-            append: If True and file exists, append data to existing sheet;
-                   If False, overwrite file
+            append: If True and the report or its row log exists, append data
+                   to it; if False, overwrite file
+            materialize: Write the .xlsx now; pass False when appending several
+                         batches and call materialize_session_report_excel once
             
         Returns:
             Success status
         """
         try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.utils import get_column_letter
-            
             if not report_data:
                 logger.warning("No report data to export")
                 return False
             
-            # Check if file exists
-            file_exists = os.path.exists(file_path)
+            report_log = SessionReportLog(file_path)
             
-            if append and file_exists:
-                # Load existing workbook and append data
+            # The log decides: with deferred materialisation the .xlsx may not exist yet
+            if append and (report_log.exists() or os.path.exists(file_path)):
                 logger.info(f"Appending {len(report_data)} rows to existing Excel file: {file_path}")
-                workbook = openpyxl.load_workbook(file_path)
-                sheet = workbook.active
-                
-                # Find the next empty row
-                next_row = sheet.max_row + 1
-                
-                # Append data rows
-                for data_row in report_data:
-                    for col_idx, key in enumerate(data_row.keys(), start=1):
-                        cell = sheet.cell(row=next_row, column=col_idx)
-                        cell.value = data_row[key]
-                    next_row += 1
+                if not report_log.exists():
+                    report_log.seed_from_workbook()
+                elif report_log.is_stale():
+                    report_log.resync()
+                if not report_log.headers:
+                    report_log.reset(list(report_data[0].keys()))
             else:
-                # Create new workbook
                 logger.info(f"Creating new Excel file with {len(report_data)} rows: {file_path}")
-                workbook = openpyxl.Workbook()
-                sheet = workbook.active
-                sheet.title = "Session Report"
-                
-                # Write header
-                headers = list(report_data[0].keys())
-                for col_idx, header in enumerate(headers, start=1):
-                    cell = sheet.cell(row=1, column=col_idx)
-                    cell.value = header
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="3B82F6", end_color="3B82F6", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Write data rows
-                for row_idx, data_row in enumerate(report_data, start=2):
-                    for col_idx, key in enumerate(headers, start=1):
-                        cell = sheet.cell(row=row_idx, column=col_idx)
-                        cell.value = data_row[key]
-                
-                # Auto-size columns
-                for col_idx in range(1, len(headers) + 1):
-                    column_letter = get_column_letter(col_idx)
-                    max_length = len(str(headers[col_idx - 1]))
-                    for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row, min_col=col_idx, max_col=col_idx):
-                        for cell in row:
-                            if cell.value:
-                                max_length = max(max_length, len(str(cell.value)))
-                    adjusted_width = min(max_length + 2, 50)
-                    sheet.column_dimensions[column_letter].width = adjusted_width
+                report_log.reset(list(report_data[0].keys()))
             
-            # Save workbook
-            workbook.save(file_path)
-            logger.info(f"Session report exported successfully to {file_path}")
+            report_log.append(report_data)
+            
+            if materialize:
+                report_log.materialize()
+                logger.info(f"Session report exported successfully to {file_path}")
             return True
             
         except ImportError:
@@ -679,6 +709,32 @@ class CSVHandler:
             logger.error(f"Error exporting session report to Excel: {str(e)}")
             return False
     
+    def materialize_session_report_excel(self, file_path: str) -> bool:
+        """
+        Write the Excel session report from its row log.
+        
+        Args:
+            file_path: Path of the report (.xlsx)
+            
+        Returns:
+            Success status
+        """
+        report_log = SessionReportLog(file_path)
+        if not report_log.exists():
+            logger.warning(f"No session report log for {file_path}")
+            return False
+        try:
+            if report_log.is_stale():
+                report_log.resync()
+            report_log.materialize()
+            return True
+        except ImportError:
+            logger.error("openpyxl library not installed. Cannot export to Excel.")
+            return False
+        except Exception as e:
+            logger.error(f"Error exporting session report to Excel: {str(e)}")
+            return False
+    
     def export_errors_report(self, results: List, file_path: str) -> bool:
         """
         Export failed receipts with detailed error information.
@@ -13,14 +13,17 @@ Key Features:
 - Produces CSV-compatible receipt data
 """
 
+import itertools
+import os
 import openpyxl
-from openpyxl.worksheet.worksheet import Worksheet
 from datetime import date
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Tuple, Optional
 from pathlib import Path
 
 from utils.logger import get_logger
+from utils.xlsx_reader import XlsxReader
 
 try:
     from date_calculator import RentPeriodCalculator
@@ -61,6 +64,7 @@ class TenantData:
         months_late: Months behind on payment (0 if on time)
         paid_current_month: True if paying for current month instead of future
         row_number: Excel row number (for error reporting)
+        month_cells: Raw month column values by month number, captured while scanning the row
     """
     contract_number: str
     name: str
@@ -70,6 +74,7 @@ class TenantData:
     months_late: int
     paid_current_month: bool
     row_number: int
+    month_cells: Dict[int, Any] = field(default_factory=dict, repr=False)
 
 
 @dataclass
@@ -137,6 +142,40 @@ class ReceiptData:
     months_late: int = 0
 
 
+@dataclass
+class ImportedReceipt:
+    """
+    Receipt produced by a batch import, with the source it came from.
+    
+    Attributes:
+        receipt: The receipt record
+        source_file: Workbook the receipt was generated from
+        sheet_name: Sheet of the workbook (None for the active sheet)
+        month: Month column the payment was read from
+    """
+    receipt: ReceiptData
+    source_file: str
+    sheet_name: Optional[str]
+    month: int
+
+
+@dataclass
+class BatchImportResult:
+    """
+    Merged result of parse_excel_batch.
+    
+    Attributes:
+        receipts: Receipts in source order, one per contract and rent period
+        duplicates: Receipts dropped because an earlier source had the same contract and period
+        alerts: Processing alerts from all sources
+        errors: Sources that could not be parsed ("file [sheet]: reason")
+    """
+    receipts: List[ImportedReceipt] = field(default_factory=list)
+    duplicates: List[ImportedReceipt] = field(default_factory=list)
+    alerts: List[ProcessingAlert] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
 class LandlordExcelProcessor:
     """
     Processes landlord Excel files to generate receipt records.
@@ -180,16 +219,108 @@ class LandlordExcelProcessor:
         self.validation_errors = []
         self.processing_alerts = []
         
+        tenants, col_map = self._load_tenants(file_path, sheet_name)
+        
+        # Prepare receipt data records (NOT submitting to portal)
+        receipts = self._prepare_receipt_records(tenants, selected_month, selected_year, col_map)
+        logger.info(f"Prepared {len(receipts)} receipt data records, {len(self.processing_alerts)} alerts")
+        
+        return receipts, self.processing_alerts
+    
+    def parse_excel_months(
+        self,
+        file_path: str,
+        selected_year: int,
+        months: Optional[Iterable[int]] = None,
+        sheet_name: Optional[str] = None
+    ) -> Tuple[Dict[int, List[ReceiptData]], List[ProcessingAlert]]:
+        """
+        Parse Excel file once and generate receipts for several months.
+        
+        Each month is prepared exactly as parse_excel would prepare it, so
+        back-filling a quarter or a year needs a single workbook load.
+        
+        Args:
+            file_path: Path to Excel file
+            selected_year: Year to process
+            months: Months to process (1-12), e.g. range(1, 4) for Q1; if None,
+                    every month column with at least one payment cell filled in
+            sheet_name: Name of sheet/tab to read (if None, uses first sheet)
+        
+        Returns:
+            Tuple of (receipts by month in month order, alert_list for all months)
+        
+        Raises:
+            ValueError: If a month is out of range, the file cannot be parsed or validation fails
+            FileNotFoundError: If file doesn't exist
+        """
+        if months is not None:
+            months = sorted(set(int(month) for month in months))
+            invalid = [month for month in months if not 1 <= month <= 12]
+            if invalid:
+                raise ValueError(f"Invalid month(s): {', '.join(map(str, invalid))} (must be 1-12)")
+        
+        logger.info(f"Smart Import: Processing months {months or 'with payments'} of {selected_year}")
+        logger.info(f"Source file: {file_path}")
+        
+        # Reset state
+        self.validation_errors = []
+        self.processing_alerts = []
+        
+        tenants, col_map = self._load_tenants(file_path, sheet_name)
+        
+        if months is None:
+            months = [month for month in sorted(col_map['month_columns'])
+                      if any(self._has_payment_cell(tenant.month_cells.get(month)) for tenant in tenants)]
+            logger.info(f"Months with payments: {months}")
+        
+        receipts_by_month: Dict[int, List[ReceiptData]] = {}
+        for month in months:
+            receipts_by_month[month] = self._prepare_receipt_records(tenants, month, selected_year, col_map)
+        
+        total = sum(len(receipts) for receipts in receipts_by_month.values())
+        logger.info(f"Prepared {total} receipt data records for {len(receipts_by_month)} month(s), "
+                    f"{len(self.processing_alerts)} alerts")
+        
+        return receipts_by_month, self.processing_alerts
+    
+    def _load_tenants(self, file_path: str, sheet_name: Optional[str]) -> Tuple[List[TenantData], dict]:
+        """
+        Open the workbook and scan its tenants in a single read-only pass.
+        
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Name of sheet/tab to read (if None, uses first sheet)
+        
+        Returns:
+            Tuple of (tenants with their month cells, column map)
+        
+        Raises:
+            ValueError: If file cannot be parsed or validation fails
+            FileNotFoundError: If file doesn't exist
+        """
         # Validate file exists
         if not Path(file_path).exists():
             raise FileNotFoundError(f"Excel file not found: {file_path}")
         
-        # Load workbook
+        # Load workbook in read-only mode: rows are streamed, never held as a whole sheet
+        try:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as e:
+            logger.warning(f"openpyxl cannot open the file ({e}), reading the sheet XML directly")
+            return self._load_tenants_raw(file_path, sheet_name, e)
+        
+        if not workbook.sheetnames:
+            # Some third-party exports open in openpyxl without any sheets
+            workbook.close()
+            logger.warning("openpyxl found no sheets in the file, reading the sheet XML directly")
+            return self._load_tenants_raw(file_path, sheet_name)
+        
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
             # Use specified sheet or active sheet
             if sheet_name:
                 if sheet_name not in workbook.sheetnames:
+                    workbook.close()
                     raise ValueError(f"Sheet '{sheet_name}' not found in workbook. Available sheets: {', '.join(workbook.sheetnames)}")
                 worksheet = workbook[sheet_name]
                 logger.info(f"Using sheet: {sheet_name}")
@@ -202,44 +333,91 @@ class LandlordExcelProcessor:
             logger.error(f"Failed to load Excel file: {e}")
             raise ValueError(f"Cannot open Excel file: {e}")
         
+        try:
+            return self._scan_rows(worksheet.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+    
+    def _load_tenants_raw(
+        self,
+        file_path: str,
+        sheet_name: Optional[str],
+        openpyxl_error: Optional[Exception] = None
+    ) -> Tuple[List[TenantData], dict]:
+        """
+        Scan tenants straight from the sheet XML when openpyxl cannot read the workbook.
+        
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Name of sheet/tab to read (if None, uses the active sheet)
+            openpyxl_error: Error raised by openpyxl, reported if the file is unreadable here too
+        
+        Returns:
+            Tuple of (tenants with their month cells, column map)
+        
+        Raises:
+            ValueError: If the file or sheet cannot be read, or validation fails
+        """
+        try:
+            reader = XlsxReader(file_path)
+        except ValueError as e:
+            logger.error(f"Failed to load Excel file: {openpyxl_error or e}")
+            raise ValueError(f"Cannot open Excel file: {openpyxl_error or e}")
+        
+        with reader:
+            rows = reader.iter_rows(sheet_name)
+            logger.info(f"Using sheet: {sheet_name or reader.active_sheet} (raw XML)")
+            return self._scan_rows(rows)
+    
+    def _scan_rows(self, rows: Iterable) -> Tuple[List[TenantData], dict]:
+        """
+        Validate the header and parse tenants from a single pass over the sheet rows.
+        
+        Args:
+            rows: Iterable of row value tuples, starting with the header row
+        
+        Returns:
+            Tuple of (tenants with their month cells, column map)
+        
+        Raises:
+            ValueError: If validation fails
+        """
+        rows = iter(rows)
+        header_row = list(next(rows, None) or [])
+        first_data_row = next(rows, None)
+        
         # Validate structure
-        self._validate_excel_structure(worksheet)
+        self._validate_header(header_row, has_data_rows=first_data_row is not None)
         
         if self.validation_errors:
             error_msg = "\n".join(self.validation_errors)
             logger.error(f"Validation failed:\n{error_msg}")
             raise ValueError(f"Excel validation failed:\n\n{error_msg}")
         
-        # Parse tenants
-        tenants = self._parse_tenants(worksheet)
-        logger.info(f"Loaded {len(tenants)} tenant records from Excel")
-        
-        # Get column map for reading payment dates
-        header_row = [cell.value for cell in worksheet[1]]
+        # Parse tenants, capturing their month cells on the way
         col_map = self._build_column_map(header_row)
+        tenants = self._parse_tenant_rows(itertools.chain([first_data_row], rows), col_map)
+        logger.info(f"Loaded {len(tenants)} tenant records from Excel")
         
-        # Prepare receipt data records (NOT submitting to portal)
-        receipts = self._prepare_receipt_records(tenants, selected_month, selected_year, worksheet, col_map)
-        logger.info(f"Prepared {len(receipts)} receipt data records, {len(self.processing_alerts)} alerts")
-        
-        workbook.close()
-        return receipts, self.processing_alerts
+        return tenants, col_map
+    
+    @staticmethod
+    def _has_payment_cell(cell_value) -> bool:
+        """Whether a month cell holds anything (empty cells mean no payment)."""
+        return cell_value is not None and not (isinstance(cell_value, str) and cell_value.strip() == "")
     
-    def _validate_excel_structure(self, worksheet: Worksheet) -> None:
+    def _validate_header(self, header_row: List, has_data_rows: bool = True) -> None:
         """
-        Validate Excel file has expected structure.
+        Validate the header row has the expected columns.
         
         Args:
-            worksheet: Excel worksheet to validate
+            header_row: List of header cell values
+            has_data_rows: Whether any row follows the header
         """
-        # Check header row exists
-        if worksheet.max_row < 2:
+        if not header_row or not has_data_rows:
             self.validation_errors.append("Excel file is empty or has no data rows")
             return
         
-        # Get header row
-        header_row = [cell.value for cell in worksheet[1]]
-        
         # Required columns with Portuguese alternatives
         required_columns = {
             'contract': ['contract', 'contrato'],
@@ -280,28 +458,24 @@ class LandlordExcelProcessor:
             else:
                 month_count = numeric_months
     
-    def _parse_tenants(self, worksheet: Worksheet) -> List[TenantData]:
+    def _parse_tenant_rows(self, rows: Iterable, col_map: dict) -> List[TenantData]:
         """
-        Parse tenant data from Excel worksheet.
+        Parse tenant data from data rows (row 2 onwards), keeping each tenant's month cells.
         
         Args:
-            worksheet: Excel worksheet to parse
+            rows: Iterable of row values
+            col_map: Column mapping dictionary
         
         Returns:
             List of TenantData objects
         """
         tenants = []
-        
-        # Get header row to map column names
-        header_row = [cell.value for cell in worksheet[1]]
-        col_map = self._build_column_map(header_row)
-        
         logger.info(f"Column mapping: {col_map}")
-        logger.info(f"Total rows in worksheet: {worksheet.max_row}")
+        month_columns = col_map['month_columns'].items()
         
         # Parse data rows
-        for row_idx, row in enumerate(worksheet.iter_rows(min_row=2), start=2):
-            row_values = [cell.value for cell in row]
+        for row_idx, row_values in enumerate(rows, start=2):
+            row_values = list(row_values)
             
             # Skip landlord separator rows
             if self._is_landlord_separator_row(row_values):
@@ -317,6 +491,8 @@ class LandlordExcelProcessor:
             try:
                 tenant = self._parse_tenant_row(row_values, col_map, row_idx)
                 if tenant:
+                    tenant.month_cells = {month: row_values[idx] for month, idx in month_columns
+                                          if idx < len(row_values)}
                     tenants.append(tenant)
                     logger.debug(f"Row {row_idx}: Parsed tenant '{tenant.name}'")
                 else:
@@ -583,7 +759,6 @@ class LandlordExcelProcessor:
         tenants: List[TenantData],
         selected_month: int,
         selected_year: int,
-        worksheet: Worksheet,
         col_map: dict
     ) -> List[ReceiptData]:
         """
@@ -594,7 +769,6 @@ class LandlordExcelProcessor:
             tenants: List of tenant data
             selected_month: Target month (1-12)
             selected_year: Target year
-            worksheet: Excel worksheet to read payment dates from
             col_map: Column mapping dictionary
         
         Returns:
@@ -624,10 +798,9 @@ class LandlordExcelProcessor:
             payment_day = None
             
             if month_col_idx is not None:
-                # Get the cell value from the selected month column for this tenant's row
-                # month_col_idx is 0-based, openpyxl uses 1-based columns
+                # Month cells were captured for this tenant's row during the scan
                 try:
-                    cell_value = worksheet.cell(row=tenant.row_number, column=month_col_idx + 1).value
+                    cell_value = tenant.month_cells.get(selected_month)
                     logger.debug(f"  Reading from row {tenant.row_number}, column {month_col_idx + 1}, value: {cell_value}")
                     
                     # Skip this tenant if cell is empty - no payment date means no payment
@@ -764,12 +937,104 @@ def validate_excel_file(file_path: str) -> Tuple[bool, List[str]]:
     processor = LandlordExcelProcessor()
     
     try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        worksheet = workbook.active
-        processor._validate_excel_structure(worksheet)
-        workbook.close()
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = iter(workbook.active.iter_rows(max_row=2, values_only=True))
+            header_row = list(next(rows, None) or [])
+            processor._validate_header(header_row, has_data_rows=next(rows, None) is not None)
+        finally:
+            workbook.close()
         
         return (len(processor.validation_errors) == 0, processor.validation_errors)
     
     except Exception as e:
         return (False, [f"Cannot open file: {str(e)}"])
+
+
+def _year_from_sheet_name(sheet_name: Optional[str]) -> int:
+    """Year of a yearly sheet ("2026", "Year 2026"), as Smart Import reads it."""
+    digits = ''.join(filter(str.isdigit, sheet_name or ''))
+    if not digits:
+        raise ValueError(f"Cannot extract year from sheet name '{sheet_name}'")
+    return int(digits)
+
+
+def _parse_source(
+    file_path: str,
+    sheet_name: Optional[str],
+    year: Optional[int],
+    months: Optional[List[int]]
+) -> Tuple[Dict[int, List[ReceiptData]], List[ProcessingAlert]]:
+    """Parse one (file, sheet) source; runs in a worker process."""
+    if year is None:
+        year = _year_from_sheet_name(sheet_name)
+    return LandlordExcelProcessor().parse_excel_months(file_path, year, months, sheet_name)
+
+
+def parse_excel_batch(
+    sources: Iterable[Tuple[str, Optional[str]]],
+    months: Optional[Iterable[int]] = None,
+    year: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> BatchImportResult:
+    """
+    Parse many (file, sheet) sources in parallel worker processes and merge the receipts.
+    
+    openpyxl parsing is CPU-bound, so sources are spread over a process pool
+    rather than threads. Results are merged in source order; when the same
+    contract and rent period comes from more than one source, the first one is
+    kept and the others are reported as duplicates.
+    
+    Args:
+        sources: (file path, sheet name) pairs; a None sheet name means the active sheet
+        months: Months to process (see parse_excel_months); None for all months with payments
+        year: Year of every sheet; if None, taken from each sheet name (e.g. "2026")
+        max_workers: Maximum worker processes (default: CPU count)
+    
+    Returns:
+        BatchImportResult with receipts, duplicates, alerts and per-source errors
+    """
+    sources = [(str(file_path), sheet_name) for file_path, sheet_name in sources]
+    months = sorted(set(months)) if months is not None else None
+    result = BatchImportResult()
+    if not sources:
+        return result
+    
+    workers = max(1, min(len(sources), max_workers or os.cpu_count() or 1))
+    logger.info(f"Batch import: {len(sources)} source(s) with {workers} worker process(es)")
+    
+    def collect(outcomes):
+        seen = set()
+        for (file_path, sheet_name), outcome in zip(sources, outcomes):
+            label = f"{Path(file_path).name} [{sheet_name or 'active sheet'}]"
+            try:
+                receipts_by_month, alerts = outcome()
+            except Exception as e:
+                logger.error(f"Batch import: {label} failed: {e}")
+                result.errors.append(f"{label}: {e}")
+                continue
+            
+            result.alerts.extend(alerts)
+            for month, receipts in receipts_by_month.items():
+                for receipt in receipts:
+                    imported = ImportedReceipt(receipt, file_path, sheet_name, month)
+                    key = (receipt.contract_id, receipt.from_date, receipt.to_date)
+                    if key in seen:
+                        logger.warning(f"Batch import: contract {receipt.contract_id} period {receipt.from_date} "
+                                       f"from {label} already imported from an earlier source, skipped")
+                        result.duplicates.append(imported)
+                    else:
+                        seen.add(key)
+                        result.receipts.append(imported)
+    
+    if workers == 1:
+        collect((lambda source=source: _parse_source(*source, year, months)) for source in sources)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_parse_source, file_path, sheet_name, year, months)
+                       for file_path, sheet_name in sources]
+            collect(future.result for future in futures)
+    
+    logger.info(f"Batch import: {len(result.receipts)} receipts, {len(result.duplicates)} duplicates, "
+                f"{len(result.errors)} failed source(s)")
+    return result
@@ -15,12 +15,13 @@ from web_client import WebClient
 from receipt_processor import ReceiptProcessor, ProcessingResult
 from receipt_verifier import ReceiptVerifier
 # Removed CSV template dialog import - replaced with pre-filled CSV generation
-from utils.logger import get_logger
+from utils.logger import get_logger, BufferedGUIHandler
 from utils.version import format_version_string, get_version
 from utils.multilingual_localization import get_text, switch_language, get_language_button_text
 from gui.api_monitor_dialog import show_api_monitor_dialog
 from gui.smart_import_tab import SmartImportTab
 from gui.api_monitor_tab import APIMonitorTab
+from gui.unconfirmed_receipts_dialog import ask_release_unconfirmed
 from gui.theme import ReceiptsTheme
 from gui.themed_button import ThemedButton
 
@@ -308,33 +309,8 @@ class MainWindow:
         self.log_text = scrolledtext.ScrolledText(self.root, height=1, width=1)
         # Don't pack it - it's only for capturing logs
         
-        class GUILogHandler(logging.Handler):
-            def __init__(self, text_widget, root):
-                super().__init__()
-                self.text_widget = text_widget
-                self.root = root
-                
-            def emit(self, record):
-                try:
-                    msg = self.format(record)
-                    # Schedule update on main thread
-                    self.root.after(0, lambda: self._append_log(msg))
-                except Exception:
-                    self.handleError(record)
-            
-            def _append_log(self, msg):
-                try:
-                    self.text_widget.insert(tk.END, msg + '\n')
-                    self.text_widget.see(tk.END)
-                    # Keep only last 1000 lines to prevent memory issues
-                    lines = int(self.text_widget.index('end-1c').split('.')[0])
-                    if lines > 1000:
-                        self.text_widget.delete('1.0', f'{lines-1000}.0')
-                except Exception:
-                    pass
-        
-        # Create and configure the handler
-        gui_handler = GUILogHandler(self.log_text, self.root)
+        # Create and configure the handler; lines reach the widget in batches
+        gui_handler = BufferedGUIHandler(self._append_log_lines)
         gui_handler.setLevel(logging.DEBUG)  # Capture all levels
         
         # Use a detailed formatter
@@ -349,6 +325,19 @@ class MainWindow:
         receipts_logger = logging.getLogger('receipts_app')
         if gui_handler not in receipts_logger.handlers:
             receipts_logger.addHandler(gui_handler)
+            gui_handler.start(self.root)
+    
+    def _append_log_lines(self, lines: List[str]):
+        """Append buffered log lines to the hidden log widget (runs on the main thread)."""
+        try:
+            self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+            self.log_text.see(tk.END)
+            # Keep only last 1000 lines to prevent memory issues
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > 1000:
+                self.log_text.delete('1.0', f'{line_count-1000}.0')
+        except Exception:
+            pass
     
     def _create_tooltip(self, widget, text):
         """Create a tooltip for a widget."""
@@ -442,9 +431,9 @@ class MainWindow:
         """Start periodic session status monitoring."""
         def check_session():
             if self.web_client.is_authenticated():
-                # Test session by trying to get contracts list
+                # Test session by trying to get contracts list (bypass the contract cache)
                 # get_contracts_list returns 3 values: (success, data, message)
-                result = self.web_client.get_contracts_list()
+                result = self.web_client.get_contracts_list(force_refresh=True)
                 if isinstance(result, tuple) and len(result) == 3:
                     success, _, _ = result
                 elif isinstance(result, tuple) and len(result) == 2:
@@ -692,7 +681,7 @@ class MainWindow:
     def _validate_csv_file(self, file_path: str):
         """Validate the selected CSV file."""
         def validate():
-            success, errors = self.csv_handler.load_csv(file_path)
+            success, errors = self.csv_handler.load_csv(file_path, columnar=True)
             self.root.after(0, lambda: self._handle_csv_validation(success, errors))
         
         self.log("INFO", f"Validating CSV file: {file_path}")
@@ -984,6 +973,9 @@ class MainWindow:
             messagebox.showwarning("Processing Complete", summary_message)
         else:
             messagebox.showinfo("Processing Complete", summary_message)
+        
+        # Receipts that may have been issued stay blocked until checked on the portal
+        ask_release_unconfirmed(self.root, self.web_client, results, self.log)
     
     def _processing_error(self, error_message: str):
         """Handle processing error."""
@@ -1167,7 +1159,11 @@ class MainWindow:
                 
                 # Verify all processing results
                 self.root.after(0, lambda: self.log("INFO", f"Verifying {len(results)} processed receipts..."))
-                verified_receipts = verifier.verify_processing_results(results)
+                
+                def on_verified(completed, total, verified_receipt):
+                    self.root.after(0, lambda: self.status_var.set(f"Verifying receipts in portal... {completed}/{total}"))
+                
+                verified_receipts = verifier.verify_processing_results(results, result_callback=on_verified)
                 
                 # Export to CSV
                 self.root.after(0, lambda: self.log("INFO", "Exporting verification results to CSV..."))
@@ -15,8 +15,6 @@ from datetime import datetime
 import threading
 import os
 import sys
-import zipfile
-import xml.etree.ElementTree as ET
 import openpyxl
 
 try:
@@ -24,17 +22,21 @@ try:
     from csv_handler import CSVHandler
     from web_client import WebClient
     from receipt_processor import ReceiptProcessor
-    from utils.logger import get_logger
+    from utils.logger import get_logger, BufferedGUIHandler
+    from utils.xlsx_reader import XlsxReader
     from utils.multilingual_localization import get_text
     from gui.themed_button import ThemedButton
+    from gui.unconfirmed_receipts_dialog import ask_release_unconfirmed
 except ImportError:
     from src.excel_preprocessor import LandlordExcelProcessor, ProcessingAlert, ReceiptData
     from src.csv_handler import CSVHandler
     from src.web_client import WebClient
     from src.receipt_processor import ReceiptProcessor
-    from src.utils.logger import get_logger
+    from src.utils.logger import get_logger, BufferedGUIHandler
+    from src.utils.xlsx_reader import XlsxReader
     from src.utils.multilingual_localization import get_text
     from src.gui.themed_button import ThemedButton
+    from src.gui.unconfirmed_receipts_dialog import ask_release_unconfirmed
 
 logger = get_logger(__name__)
 
@@ -300,36 +302,8 @@ class SmartImportTab(tk.Frame):
         """Setup logging handler to capture logs in the log text widget."""
         import logging
         
-        class GUILogHandler(logging.Handler):
-            """Custom logging handler that writes to a tkinter Text widget."""
-            def __init__(self, text_widget, root_widget):
-                super().__init__()
-                self.text_widget = text_widget
-                self.root_widget = root_widget
-            
-            def emit(self, record):
-                """Emit a log record to the text widget."""
-                try:
-                    msg = self.format(record)
-                    # Schedule the GUI update on the main thread
-                    self.root_widget.after(0, lambda: self._append_log(msg))
-                except Exception:
-                    pass
-            
-            def _append_log(self, msg):
-                """Append log message to text widget (must run on main thread)."""
-                try:
-                    self.text_widget.insert(tk.END, msg + '\n')
-                    self.text_widget.see(tk.END)
-                    # Limit log size to prevent memory issues
-                    lines = int(self.text_widget.index('end-1c').split('.')[0])
-                    if lines > 1000:
-                        self.text_widget.delete('1.0', f'{lines-1000}.0')
-                except Exception:
-                    pass
-        
-        # Create and configure the handler
-        gui_handler = GUILogHandler(self.log_text, self.winfo_toplevel())
+        # Create and configure the handler; lines reach the widget in batches
+        gui_handler = BufferedGUIHandler(self._append_log_lines)
         gui_handler.setLevel(logging.DEBUG)
         
         # Use a detailed formatter
@@ -344,85 +318,19 @@ class SmartImportTab(tk.Frame):
         if gui_handler not in receipts_logger.handlers:
             receipts_logger.addHandler(gui_handler)
             self._log_handler = gui_handler  # Store reference for cleanup
+            gui_handler.start(self)
     
-    def _create_compatible_excel(self, source_path, dest_path, sheet_name):
-        """Create an openpyxl-compatible Excel file from a problematic source file."""
+    def _append_log_lines(self, lines: List[str]):
+        """Append buffered log lines to the log widget (runs on the main thread)."""
         try:
-            # Create new workbook
-            new_wb = openpyxl.Workbook()
-            new_wb.remove(new_wb.active)  # Remove default sheet
-            new_ws = new_wb.create_sheet(sheet_name)
-            
-            # Read all data from source ZIP
-            with zipfile.ZipFile(source_path, 'r') as zip_ref:
-                # Load shared strings
-                shared_strings = []
-                if 'xl/sharedStrings.xml' in zip_ref.namelist():
-                    with zip_ref.open('xl/sharedStrings.xml') as ss_file:
-                        ss_tree = ET.parse(ss_file)
-                        for elem in ss_tree.iter():
-                            if elem.tag.endswith('t'):
-                                if elem.text:
-                                    shared_strings.append(elem.text)
-                
-                # Read worksheet data
-                sheet_xml_path = 'xl/worksheets/sheet1.xml'
-                if sheet_xml_path in zip_ref.namelist():
-                    with zip_ref.open(sheet_xml_path) as sheet_file:
-                        sheet_tree = ET.parse(sheet_file)
-                        sheet_root = sheet_tree.getroot()
-                        
-                        # Process each row
-                        row_num = 1
-                        for row_elem in sheet_root.iter():
-                            if not row_elem.tag.endswith('row'):
-                                continue
-                            
-                            col_num = 1
-                            for cell_elem in row_elem:
-                                if not cell_elem.tag.endswith('c'):
-                                    continue
-                                
-                                # Get cell value
-                                cell_type = cell_elem.attrib.get('t', '')
-                                v_elem = None
-                                for child in cell_elem:
-                                    if child.tag.endswith('v'):
-                                        v_elem = child
-                                        break
-                                
-                                if v_elem is not None and v_elem.text:
-                                    if cell_type == 's':
-                                        # Shared string
-                                        idx = int(v_elem.text)
-                                        if 0 <= idx < len(shared_strings):
-                                            value = shared_strings[idx]
-                                        else:
-                                            value = v_elem.text
-                                    else:
-                                        # Try to convert to number
-                                        try:
-                                            value = float(v_elem.text)
-                                            if value.is_integer():
-                                                value = int(value)
-                                        except:
-                                            value = v_elem.text
-                                    
-                                    # Write to new sheet
-                                    new_ws.cell(row=row_num, column=col_num, value=value)
-                                
-                                col_num += 1
-                            row_num += 1
-            
-            # Save the new workbook
-            new_wb.save(dest_path)
-            self.on_log("INFO", f"Created compatible Excel file with {row_num-1} rows")
-            
-        except Exception as e:
-            self.on_log("ERROR", f"Failed to create compatible file: {e}")
-            import traceback
-            self.on_log("ERROR", traceback.format_exc())
-            raise
+            self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+            self.log_text.see(tk.END)
+            # Limit log size to prevent memory issues
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > 1000:
+                self.log_text.delete('1.0', f'{line_count-1000}.0')
+        except Exception:
+            pass
     
     def _on_month_year_selected(self, event=None):
         """Handle month/year selection - update selection only, don't auto-process."""
@@ -444,53 +352,13 @@ class SmartImportTab(tk.Frame):
                 file_ext = os.path.splitext(file_path)[1].lower()
                 self.on_log("INFO", f"File extension: {file_ext}")
                 
-                # First, inspect the xlsx file structure directly using zipfile
+                # Read sheet names straight from the package (some files show no sheets in openpyxl)
                 try:
-                    with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                        file_list = zip_ref.namelist()
-                        self.on_log("INFO", f"ZIP contents ({len(file_list)} files): {file_list[:10]}...")
-                        
-                        # Try to read workbook.xml to get sheet names
-                        if 'xl/workbook.xml' in file_list:
-                            with zip_ref.open('xl/workbook.xml') as xml_file:
-                                content = xml_file.read()
-                                self.on_log("DEBUG", f"workbook.xml size: {len(content)} bytes")
-                                
-                                tree = ET.fromstring(content)
-                                
-                                # Try multiple namespace approaches
-                                # Method 1: With namespace
-                                ns = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-                                sheets = tree.findall('.//main:sheet', ns)
-                                self.on_log("DEBUG", f"Method 1 (with namespace): found {len(sheets)} sheets")
-                                
-                                # Method 2: Without namespace (any sheet tag)
-                                if not sheets:
-                                    # Find all elements ending with 'sheet'
-                                    for elem in tree.iter():
-                                        if elem.tag.endswith('sheet'):
-                                            sheets.append(elem)
-                                    self.on_log("DEBUG", f"Method 2 (any 'sheet' tag): found {len(sheets)} sheets")
-                                
-                                # Method 3: Direct search for any 'sheets' parent
-                                if not sheets:
-                                    for elem in tree.iter():
-                                        if elem.tag.endswith('sheets'):
-                                            sheets = list(elem)
-                                            self.on_log("DEBUG", f"Method 3 (children of 'sheets'): found {len(sheets)} sheets")
-                                            break
-                                
-                                self.available_sheets = [sheet.attrib.get('name', f"Sheet{i+1}") 
-                                                       for i, sheet in enumerate(sheets) 
-                                                       if hasattr(sheet, 'attrib')]
-                                self.on_log("INFO", f"✓ Extracted {len(self.available_sheets)} sheets from XML: {self.available_sheets}")
-                        else:
-                            self.on_log("ERROR", "xl/workbook.xml not found in file!")
-                            
+                    with XlsxReader(file_path) as reader:
+                        self.available_sheets = reader.sheet_names
+                    self.on_log("INFO", f"✓ Extracted {len(self.available_sheets)} sheets from XML: {self.available_sheets}")
                 except Exception as zip_error:
                     self.on_log("ERROR", f"ZIP inspection failed: {zip_error}")
-                    import traceback
-                    self.on_log("ERROR", traceback.format_exc())
                     self.available_sheets = []
                 
                 # If ZIP method worked, continue; otherwise try openpyxl as fallback
@@ -540,85 +408,29 @@ class SmartImportTab(tk.Frame):
                     self.excel_file_path.set("")
                     return
                 
-                # Read month columns directly from ZIP (openpyxl can't load this file properly)
-                self.on_log("INFO", "Reading first row to detect month columns...")
+                # Read month columns from the header of the year sheet
+                current_year_str = str(datetime.now().year)
+                header_sheet = current_year_str if current_year_str in year_sheets else year_sheets[0]
+                self.on_log("INFO", f"Reading first row of sheet '{header_sheet}' to detect month columns...")
                 month_columns = []
                 
                 try:
-                    with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                        # First, load shared strings if they exist
-                        shared_strings = []
-                        if 'xl/sharedStrings.xml' in zip_ref.namelist():
-                            with zip_ref.open('xl/sharedStrings.xml') as ss_file:
-                                ss_tree = ET.parse(ss_file)
-                                ss_root = ss_tree.getroot()
-                                # Extract all string values
-                                for elem in ss_root.iter():
-                                    if elem.tag.endswith('t'):  # text element
-                                        if elem.text:
-                                            shared_strings.append(elem.text)
-                                self.on_log("INFO", f"Loaded {len(shared_strings)} shared strings")
-                        
-                        # Read the first worksheet (sheet1.xml)
-                        sheet_xml_path = 'xl/worksheets/sheet1.xml'
-                        if sheet_xml_path in zip_ref.namelist():
-                            with zip_ref.open(sheet_xml_path) as sheet_file:
-                                sheet_tree = ET.parse(sheet_file)
-                                sheet_root = sheet_tree.getroot()
-                                
-                                # Find first row
-                                first_row = None
-                                for elem in sheet_root.iter():
-                                    if elem.tag.endswith('row'):
-                                        first_row = elem
-                                        break
-                                
-                                if first_row:
-                                    self.on_log("INFO", f"Found first row")
-                                    header_values = []
-                                    
-                                    # Get all cells (c elements) in first row
-                                    for cell in first_row:
-                                        if cell.tag.endswith('c'):
-                                            # Check cell type - 's' means shared string
-                                            cell_type = cell.attrib.get('t', '')
-                                            
-                                            # Get cell value
-                                            v_elem = None
-                                            for child in cell:
-                                                if child.tag.endswith('v'):
-                                                    v_elem = child
-                                                    break
-                                            
-                                            if v_elem is not None and v_elem.text:
-                                                if cell_type == 's':
-                                                    # Shared string - index into shared_strings
-                                                    idx = int(v_elem.text)
-                                                    if 0 <= idx < len(shared_strings):
-                                                        value = shared_strings[idx]
-                                                    else:
-                                                        value = v_elem.text
-                                                else:
-                                                    # Direct value
-                                                    value = v_elem.text
-                                                
-                                                header_values.append(str(value).strip())
-                                    
-                                    self.on_log("INFO", f"Header values: {header_values}")
-                                    
-                                    # Find month columns (01-12)
-                                    for val in header_values:
-                                        if val.isdigit() and len(val) == 2:
-                                            month_num = int(val)
-                                            if 1 <= month_num <= 12:
-                                                month_columns.append(val)
-                                    
-                                    self.on_log("INFO", f"Detected month columns: {month_columns}")
-                        else:
-                            self.on_log("ERROR", f"{sheet_xml_path} not found in ZIP")
-                            
+                    with XlsxReader(file_path) as reader:
+                        header_row = next(reader.iter_rows(header_sheet, max_row=1), ())
+                    header_values = [str(value).strip() for value in header_row if value is not None]
+                    self.on_log("INFO", f"Header values: {header_values}")
+                    
+                    # Find month columns (01-12)
+                    for val in header_values:
+                        if val.isdigit() and len(val) == 2:
+                            month_num = int(val)
+                            if 1 <= month_num <= 12:
+                                month_columns.append(val)
+                    
+                    self.on_log("INFO", f"Detected month columns: {month_columns}")
+                    
                 except Exception as month_error:
-                    self.on_log("ERROR", f"Failed to read month columns from ZIP: {month_error}")
+                    self.on_log("ERROR", f"Failed to read month columns: {month_error}")
                     import traceback
                     self.on_log("ERROR", traceback.format_exc())
                 
@@ -697,30 +509,8 @@ class SmartImportTab(tk.Frame):
             
             self.on_log("INFO", f"Processing Excel sheet '{sheet_name}' for month {month}")
             
-            # Create a temporary compatible Excel file if openpyxl can't read the original
-            temp_file = None
-            try:
-                # Test if openpyxl can read the file
-                test_wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-                if not test_wb.sheetnames:
-                    # File needs conversion
-                    self.on_log("WARNING", "Original file not compatible with openpyxl, creating temporary copy...")
-                    test_wb.close()
-                    
-                    # Create a new workbook and copy data from ZIP
-                    import tempfile
-                    temp_file = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
-                    temp_file.close()
-                    
-                    self._create_compatible_excel(file_path, temp_file.name, sheet_name)
-                    file_path = temp_file.name
-                    self.on_log("INFO", f"Created temporary file: {temp_file.name}")
-                else:
-                    test_wb.close()
-            except Exception as test_error:
-                self.on_log("WARNING", f"File compatibility check failed: {test_error}")
-            
-            # Parse Excel to generate receipt data
+            # Parse Excel to generate receipt data (files openpyxl cannot read are
+            # streamed from the sheet XML by the processor)
             receipts, alerts = self.excel_processor.parse_excel(file_path, month, year, sheet_name)
             
             # Store the results
@@ -1446,7 +1236,11 @@ class SmartImportTab(tk.Frame):
                 
                 # Verify all processing results
                 self.after(0, lambda: self.on_log("INFO", f"Verifying {len(results)} processed receipts..."))
-                verified_receipts = verifier.verify_processing_results(results)
+                
+                def on_verified(completed, total, verified_receipt):
+                    self.after(0, lambda: self.status_var.set(f"Verifying receipts in portal... {completed}/{total}"))
+                
+                verified_receipts = verifier.verify_processing_results(results, result_callback=on_verified)
                 
                 # Export to CSV
                 self.after(0, lambda: self.on_log("INFO", "Exporting verification results to CSV..."))
@@ -1681,6 +1475,9 @@ class SmartImportTab(tk.Frame):
             summary_parts.append(f"Failed: {failed}")
         
         messagebox.showinfo("Processing Complete", "\n".join(summary_parts))
+        
+        # Receipts that may have been issued stay blocked until checked on the portal
+        ask_release_unconfirmed(self.winfo_toplevel(), self.web_client, results, self.on_log)
     
     def _processing_stopped(self):
         """Handle processing stop."""
@@ -0,0 +1,60 @@
+"""
+Prompts for receipts whose submission could not be confirmed.
+
+A receipt whose submission ended without a clear answer (timeout, dropped
+connection, transient server error) is never submitted again in the session,
+since the portal may have issued it. After checking the portal, the user can
+mark each one that is not there as not issued so a later run may submit it.
+"""
+
+from tkinter import messagebox
+from typing import Callable, List, Optional
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def ask_release_unconfirmed(parent, web_client, results: List,
+                            log: Optional[Callable[[str, str], None]] = None) -> int:
+    """
+    Ask, receipt by receipt, whether ambiguous results were issued on the portal.
+
+    Args:
+        parent: Parent window of the prompts
+        web_client: WebClient whose submission registry holds the receipts
+        results: ProcessingResult objects of the run
+        log: Optional GUI log callback taking (level, message)
+
+    Returns:
+        Number of receipts marked as not issued
+    """
+    unconfirmed = [result for result in results if getattr(result, 'ambiguous', False)]
+    released = 0
+
+    for index, result in enumerate(unconfirmed, start=1):
+        answer = messagebox.askyesnocancel(
+            f"Unconfirmed Receipt ({index}/{len(unconfirmed)})",
+            f"The submission of the receipt for contract {result.contract_id} "
+            f"({result.from_date} to {result.to_date}) could not be confirmed.\n\n"
+            f"Check the portal first. Was this receipt NOT issued?\n\n"
+            f"Yes - not issued, allow submitting it again\n"
+            f"No - it was issued or is still unknown, keep blocking it\n"
+            f"Cancel - stop asking",
+            icon=messagebox.WARNING,
+            parent=parent
+        )
+        if answer is None:
+            break
+        if answer and web_client.mark_not_issued(result.contract_id, result.from_date, result.to_date):
+            released += 1
+            if log:
+                log("INFO", f"Contract {result.contract_id} ({result.from_date} to {result.to_date}) "
+                            f"marked as not issued")
+
+    if unconfirmed:
+        logger.info(f"{released} of {len(unconfirmed)} unconfirmed receipts marked as not issued")
+    return released
@@ -8,6 +8,7 @@ from tkinter import ttk, filedialog, messagebox
 import sys
 import os
 import platform
+import multiprocessing
 
 # Add src to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -63,4 +64,6 @@ def main():
     logger.info("Application closed")
 
 if __name__ == "__main__":
+    # Needed for worker processes (batch Excel import) in the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,353 @@
+"""
+Column-oriented in-memory representation of receipt batches.
+
+A ReceiptBatch stores receipts as parallel typed arrays instead of one object
+per row: dictionary-encoded contract IDs and receipt types, ordinal dates,
+float values and bit-packed *_defaulted flags. Validation and contract
+filtering run column by column, and ReceiptRow gives the GUI and processor a
+ReceiptData-compatible view of a row without copying it.
+"""
+
+import itertools
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .utils.logger import get_logger
+    from .utils.date_parser import parse_iso_date
+except ImportError:
+    # Fallback for when imported directly
+    from utils.logger import get_logger
+    from utils.date_parser import parse_iso_date
+
+logger = get_logger(__name__)
+
+# Bits of the flags column
+PAYMENT_DATE_DEFAULTED = 1
+VALUE_DEFAULTED = 2
+RECEIPT_TYPE_DEFAULTED = 4
+
+# Ordinal stored for a missing or unparseable date
+MISSING_DATE = 0
+
+# Value marking "take the rent from the contract" (see CSVHandler._parse_row)
+FALLBACK_VALUE = -1.0
+
+
+def _to_ordinal(value) -> int:
+    """Ordinal of a date given as a date object or YYYY-MM-DD string."""
+    if isinstance(value, date):
+        return value.toordinal()
+    if not value:
+        return MISSING_DATE
+    try:
+        return parse_iso_date(str(value).strip()).toordinal()
+    except ValueError:
+        return MISSING_DATE
+
+
+def _missing_date_error() -> str:
+    """Error parse_iso_date raises for the empty string a missing date reads back as."""
+    try:
+        parse_iso_date('')
+    except ValueError as e:
+        return str(e)
+    return ''
+
+
+def _from_ordinal(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat() if ordinal != MISSING_DATE else ''
+
+
+def _date_property(column: str):
+    def getter(self) -> str:
+        return _from_ordinal(getattr(self._batch, column)[self._index])
+
+    def setter(self, value):
+        getattr(self._batch, column)[self._index] = _to_ordinal(value)
+
+    return property(getter, setter)
+
+
+def _flag_property(bit: int):
+    def getter(self) -> bool:
+        return bool(self._batch.flags[self._index] & bit)
+
+    def setter(self, value: bool):
+        if value:
+            self._batch.flags[self._index] |= bit
+        else:
+            self._batch.flags[self._index] &= ~bit & 0xFF
+
+    return property(getter, setter)
+
+
+class ReceiptRow:
+    """
+    View of one row of a ReceiptBatch with the attributes of csv_handler.ReceiptData.
+
+    Reads and writes go straight to the batch columns. A view stays bound to its
+    batch; filtering returns a new batch and leaves existing views untouched.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'ReceiptBatch', index: int):
+        self._batch = batch
+        self._index = index
+
+    from_date = _date_property('from_ordinals')
+    to_date = _date_property('to_ordinals')
+    payment_date = _date_property('payment_ordinals')
+    payment_date_defaulted = _flag_property(PAYMENT_DATE_DEFAULTED)
+    value_defaulted = _flag_property(VALUE_DEFAULTED)
+    receipt_type_defaulted = _flag_property(RECEIPT_TYPE_DEFAULTED)
+
+    @property
+    def contract_id(self) -> str:
+        return self._batch._contract_names[self._batch.contract_codes[self._index]]
+
+    @contract_id.setter
+    def contract_id(self, value: str):
+        self._batch.contract_codes[self._index] = self._batch._contract_code(value)
+
+    @property
+    def receipt_type(self) -> str:
+        return self._batch._type_names[self._batch.type_codes[self._index]]
+
+    @receipt_type.setter
+    def receipt_type(self, value: str):
+        self._batch.type_codes[self._index] = self._batch._type_code(value)
+
+    @property
+    def value(self) -> float:
+        return self._batch.values[self._index]
+
+    @value.setter
+    def value(self, value: float):
+        self._batch.values[self._index] = float(value)
+
+    @property
+    def row_number(self) -> int:
+        return self._batch.row_numbers[self._index]
+
+    def to_receipt(self):
+        """Copy of the row as a csv_handler.ReceiptData."""
+        try:
+            from .csv_handler import ReceiptData
+        except ImportError:
+            from csv_handler import ReceiptData
+
+        return ReceiptData(
+            contract_id=self.contract_id,
+            from_date=self.from_date,
+            to_date=self.to_date,
+            receipt_type=self.receipt_type,
+            value=self.value,
+            payment_date=self.payment_date,
+            payment_date_defaulted=self.payment_date_defaulted,
+            value_defaulted=self.value_defaulted,
+            receipt_type_defaulted=self.receipt_type_defaulted,
+            row_number=self.row_number
+        )
+
+    def __eq__(self, other) -> bool:
+        fields = ('contract_id', 'from_date', 'to_date', 'receipt_type', 'value', 'payment_date',
+                  'payment_date_defaulted', 'value_defaulted', 'receipt_type_defaulted', 'row_number')
+        try:
+            return all(getattr(self, name) == getattr(other, name) for name in fields)
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"ReceiptRow(contract_id={self.contract_id!r}, from_date={self.from_date!r}, "
+                f"to_date={self.to_date!r}, receipt_type={self.receipt_type!r}, value={self.value!r}, "
+                f"payment_date={self.payment_date!r}, row_number={self.row_number!r})")
+
+
+class ReceiptBatch(Sequence):
+    """Columnar batch of receipts; indexing and iteration yield ReceiptRow views."""
+
+    def __init__(self):
+        self._contract_names: List[str] = []
+        self._contract_index: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._type_index: Dict[str, int] = {}
+
+        self.contract_codes = array('I')
+        self.type_codes = array('H')
+        self.from_ordinals = array('i')
+        self.to_ordinals = array('i')
+        self.payment_ordinals = array('i')
+        self.values = array('d')
+        self.flags = array('B')
+        self.row_numbers = array('I')
+
+    @classmethod
+    def from_receipts(cls, receipts: Iterable) -> 'ReceiptBatch':
+        """
+        Build a batch from receipt objects.
+
+        Args:
+            receipts: csv_handler.ReceiptData, excel_preprocessor.ReceiptData or ReceiptRow
+                      objects (string or date dates; missing flags default to False)
+
+        Returns:
+            New ReceiptBatch
+        """
+        batch = cls()
+        for receipt in receipts:
+            batch.append(receipt)
+        return batch
+
+    def append(self, receipt):
+        """Append a receipt object as a new row."""
+        flags = 0
+        if getattr(receipt, 'payment_date_defaulted', False):
+            flags |= PAYMENT_DATE_DEFAULTED
+        if getattr(receipt, 'value_defaulted', False):
+            flags |= VALUE_DEFAULTED
+        if getattr(receipt, 'receipt_type_defaulted', False):
+            flags |= RECEIPT_TYPE_DEFAULTED
+
+        self.contract_codes.append(self._contract_code(receipt.contract_id))
+        self.type_codes.append(self._type_code(receipt.receipt_type))
+        self.from_ordinals.append(_to_ordinal(receipt.from_date))
+        self.to_ordinals.append(_to_ordinal(receipt.to_date))
+        self.payment_ordinals.append(_to_ordinal(getattr(receipt, 'payment_date', '')))
+        self.values.append(float(receipt.value))
+        self.flags.append(flags)
+        self.row_numbers.append(int(getattr(receipt, 'row_number', 0) or 0))
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ReceiptBatch index out of range")
+        return ReceiptRow(self, index)
+
+    def __iter__(self) -> Iterator[ReceiptRow]:
+        return (ReceiptRow(self, index) for index in range(len(self)))
+
+    def to_receipts(self) -> List:
+        """Copy the batch into a list of csv_handler.ReceiptData."""
+        return [row.to_receipt() for row in self]
+
+    def contract_ids(self) -> List[str]:
+        """Sorted unique contract IDs present in the batch."""
+        return sorted(self._contract_names[code] for code in set(self.contract_codes))
+
+    def contract_counts(self) -> Dict[str, int]:
+        """Number of receipts per contract ID."""
+        return {self._contract_names[code]: count for code, count in Counter(self.contract_codes).items()}
+
+    def contract_mask(self, contract_ids: Iterable[str]) -> bytes:
+        """
+        Row mask selecting receipts whose contract is in contract_ids.
+
+        Each distinct contract is checked once; rows are then mapped through a
+        per-contract lookup table.
+
+        Returns:
+            One byte per row, 1 where the contract is wanted
+        """
+        wanted = set(str(cid).strip() for cid in contract_ids)
+        table = bytes(1 if name.strip() in wanted else 0 for name in self._contract_names)
+        return bytes(map(table.__getitem__, self.contract_codes))
+
+    def filter(self, mask: Iterable) -> 'ReceiptBatch':
+        """New batch with the rows where mask is truthy."""
+        mask = bytes(1 if keep else 0 for keep in mask) if not isinstance(mask, (bytes, bytearray)) else mask
+        return self._select(lambda column: itertools.compress(column, mask))
+
+    def take(self, indices: Iterable[int]) -> 'ReceiptBatch':
+        """New batch with the rows at the given indices, in that order."""
+        indices = list(indices)
+        return self._select(lambda column: (column[i] for i in indices))
+
+    def validate(self, today: Optional[date] = None) -> List[str]:
+        """
+        Check every row, one column at a time.
+
+        Performs the checks of CSVHandler._receipt_errors (non-empty contract and
+        receipt type, from <= to, no future payment dates, non-negative values
+        other than the -1.0 fallback) with the same messages. A missing or
+        unparseable date reads back as an empty string and is reported as the
+        row check reports an empty date.
+
+        Args:
+            today: Reference date for the future payment check (default: today)
+
+        Returns:
+            Error messages ordered by row
+        """
+        today_ordinal = (today or date.today()).toordinal()
+        missing_date_error = _missing_date_error()
+        found = []  # (row index, check order, message)
+
+        empty_contracts = {code for code, name in enumerate(self._contract_names) if not name}
+        if empty_contracts:
+            found.extend((i, 0, f"Row {self.row_numbers[i]}: Contract ID cannot be empty")
+                         for i, code in enumerate(self.contract_codes) if code in empty_contracts)
+
+        dates = zip(self.from_ordinals, self.to_ordinals, self.payment_ordinals)
+        for i, (from_ord, to_ord, payment_ord) in enumerate(dates):
+            if MISSING_DATE in (from_ord, to_ord, payment_ord):
+                found.append((i, 1, f"Row {self.row_numbers[i]}: Invalid date format. Use YYYY-MM-DD. "
+                                    f"Error: {missing_date_error}"))
+                continue
+            if from_ord > to_ord:
+                found.append((i, 1, f"Row {self.row_numbers[i]}: From date ({_from_ordinal(from_ord)}) "
+                                    f"cannot be later than to date ({_from_ordinal(to_ord)})"))
+            if payment_ord > today_ordinal:
+                found.append((i, 2, f"Row {self.row_numbers[i]}: Payment date ({_from_ordinal(payment_ord)}) "
+                                    f"cannot be in the future"))
+
+        found.extend((i, 3, f"Row {self.row_numbers[i]}: Value cannot be negative (got {value})")
+                     for i, value in enumerate(self.values) if value < 0 and value != FALLBACK_VALUE)
+
+        empty_types = {code for code, name in enumerate(self._type_names) if not name}
+        if empty_types:
+            found.extend((i, 4, f"Row {self.row_numbers[i]}: Receipt type cannot be empty")
+                         for i, code in enumerate(self.type_codes) if code in empty_types)
+
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [message for _, _, message in found]
+
+    def _select(self, pick) -> 'ReceiptBatch':
+        selected = ReceiptBatch()
+        selected._contract_names = list(self._contract_names)
+        selected._contract_index = dict(self._contract_index)
+        selected._type_names = list(self._type_names)
+        selected._type_index = dict(self._type_index)
+        for name in ('contract_codes', 'type_codes', 'from_ordinals', 'to_ordinals',
+                     'payment_ordinals', 'values', 'flags', 'row_numbers'):
+            column = getattr(self, name)
+            setattr(selected, name, array(column.typecode, pick(column)))
+        return selected
+
+    def _contract_code(self, contract_id) -> int:
+        contract_id = str(contract_id)
+        code = self._contract_index.get(contract_id)
+        if code is None:
+            code = self._contract_index[contract_id] = len(self._contract_names)
+            self._contract_names.append(contract_id)
+        return code
+
+    def _type_code(self, receipt_type) -> int:
+        receipt_type = str(receipt_type)
+        code = self._type_index.get(receipt_type)
+        if code is None:
+            code = self._type_index[receipt_type] = len(self._type_names)
+            self._type_names.append(receipt_type)
+        return code
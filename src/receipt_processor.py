@@ -2,27 +2,35 @@
 Receipt processor - handles the main business logic for issuing receipts.
 """
 
-from typing import List, Dict, Any, Callable
-from dataclasses import dataclass
+from collections.abc import Sequence
+from typing import List, Dict, Any, Callable, Optional, Tuple, Iterable, Union
+from dataclasses import dataclass, fields
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 try:
-    from .csv_handler import ReceiptData
-    from .web_client import WebClient
+    from .csv_handler import ReceiptData, ReceiptRowError
+    from .web_client import WebClient, active_contracts
 except ImportError:
     # Fallback for when imported directly
-    from csv_handler import ReceiptData
-    from web_client import WebClient
+    from csv_handler import ReceiptData, ReceiptRowError
+    from web_client import WebClient, active_contracts
 
 try:
     from .utils.logger import get_logger
+    from .utils.form_prefetcher import FormPrefetcher, DEFAULT_PREFETCH_LOOKAHEAD
+    from .utils.run_journal import RunJournal
 except ImportError:
     # Fallback for when imported directly
     from utils.logger import get_logger
+    from utils.form_prefetcher import FormPrefetcher, DEFAULT_PREFETCH_LOOKAHEAD
+    from utils.run_journal import RunJournal
 
 logger = get_logger(__name__)
 
+# Default number of receipts issued in parallel during bulk processing
+DEFAULT_MAX_WORKERS = 4
+
 @dataclass
 class ProcessingResult:
     """Result of processing a single receipt."""
@@ -41,21 +49,35 @@ class ProcessingResult:
     months_late: int = 0  # Months behind on payment (from Excel)
     months_in_advance: int = 0  # Same as rent_deposit, for clarity
     field_errors: str = ""  # Field-specific error messages from API
+    ambiguous: bool = False  # Submission failed without a clear answer; may have been issued
 
 class ReceiptProcessor:
     """Main processor for handling receipt issuance."""
     
-    def __init__(self, web_client: WebClient):
+    def __init__(self, web_client: WebClient, max_workers: int = DEFAULT_MAX_WORKERS):
         self.web_client = web_client
         self.results: List[ProcessingResult] = []
         self.dry_run = False
+        self.max_workers = max(1, int(max_workers))  # Max receipts in flight during bulk processing
         self._contracts_data_cache: Dict[str, Dict] = {}  # Cache contract data from validation
+        self.prefetch_lookahead = DEFAULT_PREFETCH_LOOKAHEAD  # Forms fetched ahead in step-by-step mode (0 disables)
+        self._form_prefetcher: Optional[FormPrefetcher] = None
     
     def set_dry_run(self, dry_run: bool):
         """Enable or disable dry run mode."""
         self.dry_run = dry_run
         logger.info(f"Dry run mode: {'enabled' if dry_run else 'disabled'}")
     
+    def set_max_workers(self, max_workers: int):
+        """Set how many receipts may be in flight at once during bulk processing."""
+        self.max_workers = max(1, int(max_workers))
+        logger.info(f"Bulk processing concurrency: {self.max_workers} worker(s)")
+    
+    def set_prefetch_lookahead(self, lookahead: int):
+        """Set how many upcoming receipt forms are fetched ahead in step-by-step mode (0 disables)."""
+        self.prefetch_lookahead = max(0, int(lookahead))
+        logger.info(f"Step-by-step form prefetch lookahead: {self.prefetch_lookahead}")
+    
     def validate_contracts(self, receipts: List[ReceiptData]) -> Dict[str, Any]:
         """
         Validate contract IDs from receipts against Portal das Finanças.
@@ -86,25 +108,7 @@ class ReceiptProcessor:
         logger.info(f"Validation report success: {validation_report.get('success')}")
         logger.info(f"Portal contracts data available: {bool(validation_report.get('portal_contracts_data'))}")
         
-        if validation_report.get('success') and validation_report.get('portal_contracts_data'):
-            self._contracts_data_cache.clear()
-            portal_contracts = validation_report['portal_contracts_data']
-            logger.info(f"Attempting to cache {len(portal_contracts)} contracts")
-            
-            for contract in portal_contracts:
-                contract_id = str(contract.get('numero', ''))
-                if contract_id:
-                    locatarios = contract.get('locatarios', [])
-                    tenant_names = [t.get('nome', '') for t in locatarios] if locatarios else []
-                    logger.info(f"  Caching contract {contract_id} with {len(locatarios)} tenants: {tenant_names[:2]}")
-                    self._contracts_data_cache[contract_id] = contract
-                else:
-                    logger.warning(f"  Skipping contract with no 'numero' field: {contract.keys()}")
-            
-            logger.info(f" Cached {len(self._contracts_data_cache)} contracts with tenant data")
-            logger.info(f"   Cache keys (first 5): {list(self._contracts_data_cache.keys())[:5]}")
-        else:
-            logger.error(f" Failed to cache contract data - success: {validation_report.get('success')}, has data: {bool(validation_report.get('portal_contracts_data'))}")
+        self._cache_portal_contracts(validation_report)
         
         # Add detailed analysis
         validation_report['receipts_count'] = len(receipts)
@@ -127,37 +131,85 @@ class ReceiptProcessor:
         
         return validation_report
     
-    def process_receipts_bulk(self, receipts: List[ReceiptData], 
+    def _cache_portal_contracts(self, validation_report: Dict[str, Any]):
+        """Cache contract data with tenant information from a validation report for later use."""
+        if validation_report.get('success') and validation_report.get('portal_contracts_data'):
+            self._contracts_data_cache.clear()
+            portal_contracts = validation_report['portal_contracts_data']
+            logger.info(f"Attempting to cache {len(portal_contracts)} contracts")
+            
+            for contract in portal_contracts:
+                contract_id = str(contract.get('numero', ''))
+                if contract_id:
+                    locatarios = contract.get('locatarios', [])
+                    tenant_names = [t.get('nome', '') for t in locatarios] if locatarios else []
+                    logger.info(f"  Caching contract {contract_id} with {len(locatarios)} tenants: {tenant_names[:2]}")
+                    self._contracts_data_cache[contract_id] = contract
+                else:
+                    logger.warning(f"  Skipping contract with no 'numero' field: {contract.keys()}")
+            
+            logger.info(f" Cached {len(self._contracts_data_cache)} contracts with tenant data")
+            logger.info(f"   Cache keys (first 5): {list(self._contracts_data_cache.keys())[:5]}")
+        else:
+            logger.error(f" Failed to cache contract data - success: {validation_report.get('success')}, has data: {bool(validation_report.get('portal_contracts_data'))}")
+    
+    def process_receipts_bulk(self, receipts: Iterable[Union[ReceiptData, ReceiptRowError]], 
                             progress_callback: Callable[[int, int, str], None] = None,
                             validate_contracts: bool = True,
-                            stop_check: Callable[[], bool] = None) -> List[ProcessingResult]:
+                            stop_check: Callable[[], bool] = None,
+                            journal: Optional[RunJournal] = None) -> List[ProcessingResult]:
         """
         Process all receipts in bulk mode.
         
+        ``receipts`` may also be a stream such as CSVHandler.iter_receipts(path): issuing
+        then starts while the rest of the file is still being parsed, contracts are checked
+        against the portal list as receipts arrive, and row errors become Failed results.
+        
+        With a journal, every submission is recorded before and after it is made, receipts
+        the journal shows as issued are not issued again, and receipts whose outcome is
+        unknown are reported as ambiguous instead of being issued (see resume_run).
+        
         Args:
-            receipts: List of receipts to process
+            receipts: List (or iterable) of receipts to process
             progress_callback: Optional callback for progress updates (current, total, message)
             validate_contracts: Whether to validate contract IDs before processing
             stop_check: Optional callback to check if processing should stop
+            journal: Optional run journal (ignored in dry run mode)
             
         Returns:
             List of processing results
         """
+        if journal is not None and self.dry_run:
+            logger.info("Dry run: run journal not used")
+            journal = None
+        
+        if not isinstance(receipts, Sequence):
+            return self._process_receipts_stream(receipts, progress_callback, validate_contracts, stop_check, journal)
+        
         logger.info(f"Starting bulk processing of {len(receipts)} receipts")
         self.results.clear()
         
+        if journal is not None:
+            journal.plan(r for r in receipts if not isinstance(r, ReceiptRowError))
+        
         # Validate contracts if requested
         if validate_contracts:
             if progress_callback:
                 progress_callback(0, len(receipts), "Validating contract IDs...")
             
-            validation_report = self.validate_contracts(receipts)
+            # Row errors carry no contract; they become Failed results in the workers
+            validation_report = self.validate_contracts(
+                [r for r in receipts if not isinstance(r, ReceiptRowError)]
+            )
             
             # Check for validation errors that should stop processing
             if not validation_report['success']:
                 logger.error("Contract validation failed - stopping processing")
                 # Create error results for all receipts
                 for receipt in receipts:
+                    if isinstance(receipt, ReceiptRowError):
+                        self.results.append(self._ready_result(receipt, None))
+                        continue
                     error_result = ProcessingResult(
                         contract_id=receipt.contract_id,
                         success=False,
@@ -175,7 +227,7 @@ class ReceiptProcessor:
                 # Create error results for invalid contracts
                 invalid_contracts_set = set(validation_report['invalid_contracts'])
                 for receipt in receipts:
-                    if receipt.contract_id in invalid_contracts_set:
+                    if not isinstance(receipt, ReceiptRowError) and receipt.contract_id in invalid_contracts_set:
                         error_result = ProcessingResult(
                             contract_id=receipt.contract_id,
                             success=False,
@@ -187,30 +239,289 @@ class ReceiptProcessor:
                         logger.warning(f"Skipping receipt for invalid contract: {receipt.contract_id}")
                 
                 # Filter out invalid contracts from processing
-                valid_receipts = [r for r in receipts if r.contract_id not in invalid_contracts_set]
+                valid_receipts = [r for r in receipts
+                                  if isinstance(r, ReceiptRowError) or r.contract_id not in invalid_contracts_set]
                 logger.info(f"Processing {len(valid_receipts)} receipts with valid contracts (skipping {len(receipts) - len(valid_receipts)})")
                 receipts = valid_receipts
         
-        # Process valid receipts
-        for i, receipt in enumerate(receipts):
-            # Check if stop was requested
-            if stop_check and stop_check():
-                logger.info("Processing stopped by user request")
-                break
-                
+        # Process valid receipts (in parallel, results kept in input order)
+        if journal is not None:
+            self.results.extend(self._run_bulk_workers(receipts, progress_callback, stop_check,
+                                                       self._journal_precheck(journal),
+                                                       lambda receipt: self._process_journaled(receipt, journal)))
+        else:
+            self.results.extend(self._run_bulk_workers(receipts, progress_callback, stop_check))
+        
+        logger.info(f"Bulk processing completed. Success: {self._count_successful()}, Failed: {self._count_failed()}")
+        return self.results.copy()
+    
+    def _process_receipts_stream(self, receipts: Iterable[Union[ReceiptData, ReceiptRowError]],
+                                 progress_callback: Optional[Callable[[int, int, str], None]],
+                                 validate_contracts: bool,
+                                 stop_check: Optional[Callable[[], bool]],
+                                 journal: Optional[RunJournal] = None) -> List[ProcessingResult]:
+        """
+        Bulk-process receipts as they are produced (see process_receipts_bulk).
+        
+        Returns:
+            List of processing results in input order
+        """
+        logger.info("Starting streaming bulk processing")
+        self.results.clear()
+        
+        portal_contract_ids = None
+        validation_failure = None
+        if validate_contracts:
             if progress_callback:
-                progress_callback(i + 1, len(receipts), f"Processing contract {receipt.contract_id}")
+                progress_callback(0, 0, "Validating contract IDs...")
+            
+            # The portal contract list does not depend on the file, so it is fetched once up front
+            success, contracts_data, message = self.web_client.get_contracts_with_tenant_data()
+            if success:
+                portal_contracts = active_contracts(contracts_data)
+                self._contracts_data_cache.clear()
+                if portal_contracts:
+                    self._cache_portal_contracts({'success': True, 'portal_contracts_data': portal_contracts})
+                else:
+                    logger.warning("No active contracts found in Portal das Finanças - no receipts will be issued")
+                # An empty set (no active contracts) rejects every row
+                portal_contract_ids = {
+                    str(contract.get('numero') or contract.get('referencia')).strip()
+                    for contract in portal_contracts
+                    if contract.get('numero') or contract.get('referencia')
+                }
+            else:
+                logger.error("Contract validation failed - receipts will not be issued")
+                validation_failure = f"Contract validation failed: {message}"
+        
+        def precheck(receipt: ReceiptData) -> Optional[ProcessingResult]:
+            if validation_failure:
+                return ProcessingResult(
+                    contract_id=receipt.contract_id,
+                    success=False,
+                    error_message=validation_failure,
+                    timestamp=datetime.now().isoformat(),
+                    status="Failed"
+                )
+            if portal_contract_ids is not None and str(receipt.contract_id).strip() not in portal_contract_ids:
+                logger.warning(f"Skipping receipt for invalid contract: {receipt.contract_id}")
+                return ProcessingResult(
+                    contract_id=receipt.contract_id,
+                    success=False,
+                    error_message=f"Contract ID '{receipt.contract_id}' not found in Portal das Finanças",
+                    timestamp=datetime.now().isoformat(),
+                    status="Skipped"
+                )
+            return None
+        
+        process = None
+        if journal is not None:
+            journal_precheck = self._journal_precheck(journal)
+            checks = precheck
             
-            result = self._process_single_receipt(receipt)
-            self.results.append(result)
+            def precheck(receipt: ReceiptData) -> Optional[ProcessingResult]:
+                return journal_precheck(receipt) or checks(receipt)
             
-            # Small delay to avoid overwhelming the server (only in real mode)
-            if not self.dry_run:
-                time.sleep(1)
+            def process(receipt: ReceiptData) -> ProcessingResult:
+                journal.plan([receipt])
+                return self._process_journaled(receipt, journal)
+        
+        self.results.extend(self._run_bulk_workers(receipts, progress_callback, stop_check, precheck, process))
         
         logger.info(f"Bulk processing completed. Success: {self._count_successful()}, Failed: {self._count_failed()}")
         return self.results.copy()
     
+    def _run_bulk_workers(self, receipts: Iterable[Union[ReceiptData, ReceiptRowError]],
+                          progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                          stop_check: Optional[Callable[[], bool]] = None,
+                          precheck: Optional[Callable[[ReceiptData], Optional[ProcessingResult]]] = None,
+                          process: Optional[Callable[[ReceiptData], ProcessingResult]] = None
+                          ) -> List[ProcessingResult]:
+        """
+        Issue receipts through a bounded worker pool.
+        
+        At most ``self.max_workers`` receipts are in flight at any time. Receipts are
+        pulled from ``receipts`` only when a worker is free, so a generator is consumed
+        lazily. Results are returned in input order regardless of completion order.
+        When ``stop_check`` returns True no new receipts are started, but receipts
+        already in flight are allowed to finish so their outcome is recorded.
+        Request pacing is left to the WebClient's shared rate limiter.
+        
+        Args:
+            receipts: Receipts to process (list or iterable); ReceiptRowError items become Failed results
+            progress_callback: Optional callback (completed, total, message), invoked on the calling thread;
+                               for iterables, total is the number of items read so far
+            stop_check: Optional callback to check if processing should stop
+            precheck: Optional callback returning a ready result for receipts that must not be issued
+            process: Issues one receipt (default: _process_single_receipt)
+            
+        Returns:
+            Processing results in input order (only for receipts that were started)
+        """
+        known_total = len(receipts) if isinstance(receipts, Sequence) else None
+        if known_total == 0:
+            return []
+        
+        ordered_results: Dict[int, ProcessingResult] = {}
+        workers = min(self.max_workers, known_total) if known_total else self.max_workers
+        if known_total:
+            logger.info(f"Issuing {known_total} receipts with up to {workers} in flight")
+        else:
+            logger.info(f"Issuing streamed receipts with up to {workers} in flight")
+        
+        source = iter(receipts)
+        completed = 0
+        next_index = 0
+        exhausted = False
+        stopped = False
+        
+        def report(receipt_contract_id):
+            if progress_callback:
+                progress_callback(completed, known_total or next_index, f"Processed contract {receipt_contract_id}")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="receipt-worker") as executor:
+            in_flight = {}
+            
+            while in_flight or not (exhausted or stopped):
+                # Top up the pool without exceeding the in-flight limit
+                while not (exhausted or stopped) and len(in_flight) < workers:
+                    if stop_check and stop_check():
+                        logger.info("Processing stopped by user request")
+                        stopped = True
+                        break
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    index = next_index
+                    next_index += 1
+                    
+                    ready = self._ready_result(item, precheck)
+                    if ready is not None:
+                        ordered_results[index] = ready
+                        completed += 1
+                        report(ready.contract_id)
+                        continue
+                    
+                    future = executor.submit(process or self._process_single_receipt, item)
+                    in_flight[future] = (index, item)
+                
+                if not in_flight:
+                    continue
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, receipt = in_flight.pop(future)
+                    try:
+                        ordered_results[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Worker failed for contract {receipt.contract_id}: {str(e)}")
+                        ordered_results[index] = ProcessingResult(
+                            contract_id=receipt.contract_id,
+                            success=False,
+                            error_message=str(e),
+                            timestamp=datetime.now().isoformat(),
+                            status="Failed"
+                        )
+                    completed += 1
+                    report(receipt.contract_id)
+        
+        return [ordered_results[index] for index in sorted(ordered_results)]
+    
+    def _ready_result(self, item: Union[ReceiptData, ReceiptRowError],
+                      precheck: Optional[Callable[[ReceiptData], Optional[ProcessingResult]]]) -> Optional[ProcessingResult]:
+        """Result for items that are not issued (row errors, failed prechecks), or None to issue."""
+        if isinstance(item, ReceiptRowError):
+            logger.warning(f"Not issuing row {item.row_number}: {item.message}")
+            return ProcessingResult(
+                contract_id="",
+                success=False,
+                error_message=item.message,
+                timestamp=datetime.now().isoformat(),
+                status="Failed"
+            )
+        return precheck(item) if precheck else None
+    
+    def resume_run(self, journal: Union[RunJournal, str],
+                   receipts: Optional[Iterable[Union[ReceiptData, ReceiptRowError]]] = None,
+                   progress_callback: Callable[[int, int, str], None] = None,
+                   validate_contracts: bool = True,
+                   stop_check: Callable[[], bool] = None) -> List[ProcessingResult]:
+        """
+        Continue an interrupted bulk run from its journal.
+        
+        Receipts the journal records as issued are returned from the journal without any
+        request. Receipts that were being submitted when the run stopped, or whose
+        submission ended ambiguously, are reported as ambiguous and not submitted until
+        they are checked on the portal by hand and released with RunJournal.mark_not_issued.
+        Everything else is processed as in process_receipts_bulk.
+        
+        Args:
+            journal: RunJournal or path of the journal file
+            receipts: Receipts of the run; defaults to those recorded in the journal (pass
+                      the original receipts if the run was streamed and stopped before
+                      reading them all)
+            progress_callback: Optional callback for progress updates (current, total, message)
+            validate_contracts: Whether to validate contract IDs before processing
+            stop_check: Optional callback to check if processing should stop
+            
+        Returns:
+            List of processing results for the whole run
+        """
+        if isinstance(journal, str):
+            journal = RunJournal(journal)
+        
+        if receipts is None:
+            receipts = [ReceiptData(**data) for data in journal.receipts()]
+        
+        logger.info(f"Resuming run from journal {journal.path}: {journal.summary()}")
+        return self.process_receipts_bulk(receipts, progress_callback, validate_contracts, stop_check, journal=journal)
+    
+    def _journal_precheck(self, journal: RunJournal) -> Callable[[ReceiptData], Optional[ProcessingResult]]:
+        """Precheck returning the recorded result of receipts the journal shows as issued."""
+        result_fields = {f.name for f in fields(ProcessingResult)}
+        
+        def precheck(receipt: ReceiptData) -> Optional[ProcessingResult]:
+            recorded = journal.completed_result(receipt)
+            if recorded is None:
+                return None
+            logger.info(f"Contract {receipt.contract_id} ({receipt.from_date} to {receipt.to_date}) already issued "
+                        f"as #{recorded.get('receipt_number')} - skipping")
+            return ProcessingResult(**{k: v for k, v in recorded.items() if k in result_fields})
+        
+        return precheck
+    
+    def _process_journaled(self, receipt: ReceiptData, journal: RunJournal) -> ProcessingResult:
+        """Issue one receipt, recording intent and outcome in the journal."""
+        if journal.needs_recheck(receipt):
+            result = self._unconfirmed_result(receipt)
+            journal.record_outcome(receipt, result)
+            return result
+        
+        journal.record_intent(receipt)
+        result = self._process_single_receipt(receipt)
+        journal.record_outcome(receipt, result)
+        return result
+    
+    def _unconfirmed_result(self, receipt: ReceiptData) -> ProcessingResult:
+        """Ambiguous Failed result for a receipt that may have been issued before the run stopped."""
+        logger.error(f"Contract {receipt.contract_id} ({receipt.from_date} to {receipt.to_date}) may already "
+                     f"have been issued - not issuing")
+        return ProcessingResult(
+            contract_id=receipt.contract_id,
+            from_date=receipt.from_date,
+            to_date=receipt.to_date,
+            value=receipt.value,
+            timestamp=datetime.now().isoformat(),
+            payment_date=receipt.payment_date,
+            success=False,
+            ambiguous=True,
+            error_message=("Could not confirm whether the receipt was issued - check the portal and, "
+                           "if it is not there, mark it as not issued in the run journal"),
+            status="Failed"
+        )
+    
     def process_receipts_step_by_step(self, receipts: List[ReceiptData],
                                     confirmation_callback: Callable[[ReceiptData, Dict], str],
                                     stop_check: Callable[[], bool] = None) -> List[ProcessingResult]:
@@ -268,11 +579,45 @@ class ReceiptProcessor:
             logger.info(f"Step-by-step ({mode}): Processing {len(valid_receipts)} receipts with valid contracts (skipping {len(receipts) - len(valid_receipts)} invalid contracts)")
             receipts = valid_receipts
         
-        for receipt in receipts:
+        # Resolve missing rent values for all receipts up front instead of one request per receipt
+        fetched_rent_values = self._fetch_missing_rent_values(receipts)
+        
+        # Fetch forms for upcoming receipts while the user is confirming the current one
+        if not self.dry_run and self.prefetch_lookahead > 0:
+            self._form_prefetcher = FormPrefetcher(self.web_client.get_receipt_form, self.prefetch_lookahead)
+        
+        try:
+            self._run_step_by_step(receipts, confirmation_callback, stop_check, fetched_rent_values)
+        finally:
+            if self._form_prefetcher:
+                self._form_prefetcher.cancel()
+                self._form_prefetcher = None
+        
+        logger.info(f"Step-by-step processing completed. Success: {self._count_successful()}, Failed: {self._count_failed()}")
+        return self.results.copy()
+    
+    def _run_step_by_step(self, receipts: List[ReceiptData],
+                          confirmation_callback: Callable[[ReceiptData, Dict], str],
+                          stop_check: Optional[Callable[[], bool]],
+                          fetched_rent_values: Dict[str, float]):
+        """
+        Confirmation loop of step-by-step processing; results are appended to self.results.
+        
+        Args:
+            receipts: Receipts with valid contracts
+            confirmation_callback: Callback for user confirmation
+            stop_check: Optional callback to check if processing should stop
+            fetched_rent_values: Rent values looked up for receipts without a CSV value
+        """
+        for index, receipt in enumerate(receipts):
             # Check if stop was requested
             if stop_check and stop_check():
                 logger.info("Step-by-step processing stopped by user request")
                 break
+            
+            if self._form_prefetcher:
+                window = receipts[index:index + 1 + self.prefetch_lookahead]
+                self._form_prefetcher.prefetch(r.contract_id for r in window)
                 
             # Get tenant information from cached contract data (no additional API call)
             form_data = {}
@@ -332,12 +677,11 @@ class ReceiptProcessor:
                     if rent_value:
                         logger.info(f" Using cached rent value from contract data: €{rent_value}")
                 
-                # Only make API call if not found in cache
+                # Otherwise use the value looked up from the API before the loop
                 if not rent_value:
-                    logger.info(f"Rent value not in cache, fetching from API for contract {receipt.contract_id}")
-                    success, rent_value = self.web_client.get_contract_rent_value(str(receipt.contract_id))
-                    if not success or not rent_value:
-                        rent_value = None
+                    rent_value = fetched_rent_values.get(contract_id_str)
+                    if rent_value:
+                        logger.info(f" Using rent value fetched from API: €{rent_value}")
                 
                 if rent_value and rent_value > 0.0:
                     receipt.value = rent_value
@@ -388,9 +732,44 @@ class ReceiptProcessor:
             if action in ['confirm', 'edit']:
                 result = self._process_single_receipt(receipt, form_data)
                 self.results.append(result)
+    
+    def _fetch_missing_rent_values(self, receipts: List[ReceiptData]) -> Dict[str, float]:
+        """
+        Look up rent values for receipts without a CSV value that the contracts cache cannot fill.
         
-        logger.info(f"Step-by-step processing completed. Success: {self._count_successful()}, Failed: {self._count_failed()}")
-        return self.results.copy()
+        Args:
+            receipts: Receipts about to be processed
+            
+        Returns:
+            Dict of contract ID -> rent value
+        """
+        missing_ids = []
+        for receipt in receipts:
+            if receipt.value == -1.0 or receipt.value == 0.0:
+                contract_id_str = str(receipt.contract_id)
+                if not self._contracts_data_cache.get(contract_id_str, {}).get('valorRenda'):
+                    missing_ids.append(contract_id_str)
+        
+        if not missing_ids:
+            return {}
+        
+        logger.info(f"Fetching rent values from API for {len(set(missing_ids))} contract(s) not in cache")
+        rent_values = self.web_client.get_contract_rent_values(
+            missing_ids,
+            contracts_data=list(self._contracts_data_cache.values())
+        )
+        return rent_values if isinstance(rent_values, dict) else {}
+    
+    def _get_receipt_form(self, contract_id: str) -> Tuple[bool, Optional[Dict]]:
+        """Get the receipt form, using the prefetched one when available."""
+        if self._form_prefetcher:
+            prefetched = self._form_prefetcher.take(contract_id)
+            if prefetched is not None and prefetched[0]:
+                logger.info(f"Using prefetched receipt form for contract {contract_id}")
+                return prefetched
+            if prefetched is not None:
+                logger.info(f"Prefetched receipt form for contract {contract_id} failed - fetching it again")
+        return self.web_client.get_receipt_form(contract_id)
     
     def _process_single_receipt(self, receipt: ReceiptData, form_data: Dict = None) -> ProcessingResult:
         """
@@ -450,7 +829,7 @@ class ReceiptProcessor:
                 # For actual submission (not dry run), always fetch the full form to get all required fields
                 if not self.dry_run:
                     logger.info(f"FETCHING FULL FORM DATA: Contract {receipt.contract_id} needs complete submission data")
-                    success, full_form_data = self.web_client.get_receipt_form(receipt.contract_id)
+                    success, full_form_data = self._get_receipt_form(receipt.contract_id)
                     if not success:
                         logger.error(f"FORM DATA FAILED: Could not get receipt form for contract {receipt.contract_id}")
                         result.error_message = "Failed to get form data"
@@ -485,7 +864,7 @@ class ReceiptProcessor:
                 else:
                     # No cache - fetch form data
                     logger.info(f"FETCHING RECEIPT FORM: Getting form data for contract {receipt.contract_id} (not in cache)")
-                    success, form_data = self.web_client.get_receipt_form(receipt.contract_id)
+                    success, form_data = self._get_receipt_form(receipt.contract_id)
                     if not success:
                         logger.error(f"FORM DATA FAILED: Could not get receipt form for contract {receipt.contract_id}")
                         result.error_message = "Failed to get form data"
@@ -544,6 +923,7 @@ class ReceiptProcessor:
                     # Extract error message from response or use fallback
                     if response:
                         result.error_message = response.get('error', response.get('errorMessage', 'Unknown error'))
+                        result.ambiguous = bool(response.get('ambiguous'))
                         # Capture field errors if present
                         field_errors = response.get('fieldErrors', {})
                         if field_errors:
@@ -4,9 +4,12 @@ Verifies receipts exist in Portal das Finanças and exports detailed reports.
 """
 
 import csv
-from typing import List, Dict, Tuple, Optional
+import threading
+from typing import List, Dict, Tuple, Optional, Callable
 from datetime import datetime
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
 try:
     from .web_client import WebClient
@@ -22,6 +25,11 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# Default number of receipts verified in parallel
+DEFAULT_VERIFY_WORKERS = 4
+# Maximum concurrent detail page requests to a single portal host
+MAX_REQUESTS_PER_HOST = 4
+
 
 @dataclass
 class VerifiedReceipt:
@@ -51,17 +59,28 @@ class ReceiptVerifier:
         """
         self.web_client = web_client
         self.verified_receipts: List[VerifiedReceipt] = []
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
     
     def verify_processing_results(self, 
-                                 processing_results: List[ProcessingResult]) -> List[VerifiedReceipt]:
+                                 processing_results: List[ProcessingResult],
+                                 max_workers: int = DEFAULT_VERIFY_WORKERS,
+                                 result_callback: Optional[Callable[[int, int, VerifiedReceipt], None]] = None
+                                 ) -> List[VerifiedReceipt]:
         """
         Verify all successfully processed receipts exist in the portal.
         
+        Receipts are verified by a pool of max_workers threads (1 verifies sequentially),
+        with at most MAX_REQUESTS_PER_HOST requests in flight per portal host.
+        
         Args:
             processing_results: List of processing results from receipt processor
+            max_workers: Maximum receipts verified in parallel
+            result_callback: Optional callback (completed, total, verified_receipt) called
+                             as each receipt finishes, in completion order
             
         Returns:
-            List of verified receipt data
+            List of verified receipt data, in the order of processing_results
         """
         logger.info("=" * 80)
         logger.info("STARTING RECEIPT VERIFICATION")
@@ -83,12 +102,31 @@ class ReceiptVerifier:
             return self.verified_receipts
         
         # Verify each receipt in the portal
-        for i, result in enumerate(successful_results, 1):
-            logger.info(f"Verifying receipt {i}/{len(successful_results)}: "
-                       f"Contract {result.contract_id}, Receipt #{result.receipt_number}")
-            
-            verified_receipt = self._verify_single_receipt(result)
-            self.verified_receipts.append(verified_receipt)
+        total = len(successful_results)
+        verified_by_index: Dict[int, VerifiedReceipt] = {}
+        
+        def record(index: int, verified_receipt: VerifiedReceipt):
+            verified_by_index[index] = verified_receipt
+            if result_callback:
+                try:
+                    result_callback(len(verified_by_index), total, verified_receipt)
+                except Exception as e:
+                    logger.warning(f"Verification progress callback failed: {e}")
+        
+        workers = max(1, min(int(max_workers), total))
+        if workers == 1:
+            for i, result in enumerate(successful_results):
+                record(i, self._verify_result(i, total, result))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='verify') as executor:
+                futures = {
+                    executor.submit(self._verify_result, i, total, result): i
+                    for i, result in enumerate(successful_results)
+                }
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+        
+        self.verified_receipts.extend(verified_by_index[i] for i in range(total))
         
         # Log summary
         verified_count = sum(1 for r in self.verified_receipts if r.verification_status == "Verified")
@@ -105,6 +143,22 @@ class ReceiptVerifier:
         
         return self.verified_receipts
     
+    def _verify_result(self, index: int, total: int, result: ProcessingResult) -> VerifiedReceipt:
+        """Verify one receipt from its detail page."""
+        logger.info(f"Verifying receipt {index + 1}/{total}: "
+                   f"Contract {result.contract_id}, Receipt #{result.receipt_number}")
+        with self._host_slot():
+            return self._verify_single_receipt(result)
+    
+    def _host_slot(self) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent requests to the receipts host."""
+        base_url = getattr(self.web_client, 'receipts_base_url', '')
+        host = urlparse(base_url).netloc if isinstance(base_url, str) else ''
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+            return self._host_slots[host]
+    
     def _verify_single_receipt(self, result: ProcessingResult) -> VerifiedReceipt:
         """
         Verify a single receipt exists in the portal.
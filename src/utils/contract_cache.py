@@ -0,0 +1,90 @@
+"""
+In-memory contract cache for Portal das Finanças contract data.
+
+Keeps the contracts list returned by obterElementosContratosEmissaoRecibos/locador
+per user NIF, with a TTL and the HTTP validators (ETag / Last-Modified) needed for
+conditional revalidation. The list holds tenant NIFs and names, so it is never
+written to disk and lives only as long as the WebClient (and is dropped on logout).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Cached contracts are served without any round-trip for this long
+DEFAULT_TTL_SECONDS = 600
+
+
+@dataclass
+class CachedContracts:
+    """Contracts list cached for one user."""
+    contracts: List[Dict[str, Any]]
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        """Seconds since the data was fetched or last revalidated."""
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Check whether the entry can be used without revalidation."""
+        return self.age() < ttl
+
+
+class ContractCache:
+    """Per-NIF contract cache with TTL, held in memory only."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, CachedContracts] = {}
+        self._lock = threading.Lock()
+
+    def get(self, nif: str) -> Optional[CachedContracts]:
+        """
+        Get the cached entry for a NIF, fresh or stale.
+
+        Args:
+            nif: User NIF the contracts belong to
+
+        Returns:
+            Cached entry, or None if nothing is cached
+        """
+        with self._lock:
+            return self._entries.get(nif)
+
+    def put(self, nif: str, contracts: List[Dict[str, Any]],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> CachedContracts:
+        """Store a freshly fetched contracts list."""
+        entry = CachedContracts(
+            contracts=contracts,
+            fetched_at=time.time(),
+            etag=etag if isinstance(etag, str) else None,
+            last_modified=last_modified if isinstance(last_modified, str) else None
+        )
+        with self._lock:
+            self._entries[nif] = entry
+        return entry
+
+    def touch(self, nif: str) -> Optional[CachedContracts]:
+        """Mark an entry as revalidated (e.g. after HTTP 304 Not Modified)."""
+        with self._lock:
+            entry = self._entries.get(nif)
+            if entry is None:
+                return None
+            entry.fetched_at = time.time()
+            return entry
+
+    def invalidate(self, nif: str):
+        """Drop the cached entry for a NIF."""
+        with self._lock:
+            self._entries.pop(nif, None)
+        logger.info("Contract cache invalidated")
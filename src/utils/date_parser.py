@@ -0,0 +1,177 @@
+"""
+Fast date parsing for receipt files.
+
+Recognises the date formats CSVHandler has always accepted with precompiled
+patterns instead of trying datetime.strptime format by format, learns the
+file's dominant format from the first values it sees and memoises repeated
+date strings (a receipts file repeats the same few dates on every row).
+"""
+
+import re
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Dates are accepted in this precedence order (first format that parses wins):
+# ISO date, ISO datetime (Excel exports), DD/MM/YYYY, MM/DD/YYYY, YYYY/MM/DD, DD-MM-YYYY.
+# The slash formats share one pattern and keep day-first precedence.
+LEGACY_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%Y-%m-%d',
+]
+
+_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_ISO_DATETIME = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.\d{1,6})?')
+_SLASH_DAY_FIRST = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+_SLASH_YEAR_FIRST = re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})')
+_DASH_DAY_FIRST = re.compile(r'(\d{1,2})-(\d{1,2})-(\d{4})')
+
+# Number of values used to learn the dominant format
+DEFAULT_SAMPLE_SIZE = 64
+# Memo size bound; the memo is simply cleared when full
+MAX_MEMO_ENTRIES = 50000
+
+
+def _make_date(year: str, month: str, day: str) -> Optional[date]:
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _iso_date(match) -> Optional[date]:
+    return _make_date(*match.groups())
+
+
+def _iso_datetime(match) -> Optional[date]:
+    year, month, day, hour, minute, second = match.groups()
+    # Same time ranges strptime accepts
+    if int(hour) > 23 or int(minute) > 59 or int(second) > 61:
+        return None
+    return _make_date(year, month, day)
+
+
+def _slash_day_first(match) -> Optional[date]:
+    first, second, year = match.groups()
+    return _make_date(year, second, first) or _make_date(year, first, second)
+
+
+def _year_first(match) -> Optional[date]:
+    return _make_date(*match.groups())
+
+
+def _dash_day_first(match) -> Optional[date]:
+    day, month, year = match.groups()
+    return _make_date(year, month, day)
+
+
+# (name, pattern, builder); the patterns never match the same string
+_SHAPES: List[Tuple[str, 're.Pattern', Callable]] = [
+    ('iso', _ISO_DATE, _iso_date),
+    ('iso_datetime', _ISO_DATETIME, _iso_datetime),
+    ('slash', _SLASH_DAY_FIRST, _slash_day_first),
+    ('year_slash', _SLASH_YEAR_FIRST, _year_first),
+    ('dash', _DASH_DAY_FIRST, _dash_day_first),
+]
+
+
+def parse_iso_date(value: str) -> date:
+    """
+    Parse a strict YYYY-MM-DD date.
+
+    Raises:
+        ValueError: with datetime.strptime's message if the value is not a valid date
+    """
+    match = _ISO_DATE.fullmatch(value) if isinstance(value, str) else None
+    parsed = _iso_date(match) if match else None
+    if parsed is None:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return parsed
+
+
+class DateParser:
+    """Memoising date parser that learns a file's dominant date format."""
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._shapes = list(_SHAPES)
+        self._hits: Dict[str, int] = {name: 0 for name, _, _ in _SHAPES}
+        self._sampled = 0
+        self._memo: Dict[str, Optional[date]] = {}
+
+    @property
+    def dominant_format(self) -> Optional[str]:
+        """Name of the format tried first, once learned from the sample."""
+        if self._sampled < self.sample_size:
+            return None
+        return self._shapes[0][0]
+
+    def parse(self, value: str) -> Optional[date]:
+        """
+        Parse a date cell in any supported format.
+
+        Args:
+            value: Date string (surrounding whitespace is ignored), or a
+                   date/datetime cell value from an Excel sheet
+
+        Returns:
+            Parsed date, or None if the value is not a valid date
+        """
+        if isinstance(value, date):
+            return value.date() if isinstance(value, datetime) else value
+        if not value:
+            return None
+        key = str(value).strip()
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        parsed = self._parse_uncached(key)
+        if len(self._memo) >= MAX_MEMO_ENTRIES:
+            self._memo.clear()
+        self._memo[key] = parsed
+        return parsed
+
+    def normalize(self, value: str) -> str:
+        """
+        Normalize a date cell to YYYY-MM-DD.
+
+        Returns:
+            Normalized date, '' for empty values, or the stripped input when it
+            cannot be parsed (so it fails validation later)
+        """
+        if not value:
+            return ''
+        parsed = self.parse(value)
+        return parsed.isoformat() if parsed else str(value).strip()
+
+    def _parse_uncached(self, value: str) -> Optional[date]:
+        for name, pattern, builder in self._shapes:
+            match = pattern.fullmatch(value)
+            if match:
+                parsed = builder(match)
+                if parsed is not None:
+                    self._record(name)
+                return parsed
+
+        # Anything the patterns do not cover goes through the full strptime chain
+        for fmt in LEGACY_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+        return None
+
+    def _record(self, name: str):
+        """Count format hits and fix the try order once the sample is complete."""
+        if self._sampled >= self.sample_size:
+            return
+        self._hits[name] += 1
+        self._sampled += 1
+        if self._sampled == self.sample_size:
+            self._shapes.sort(key=lambda shape: -self._hits[shape[0]])
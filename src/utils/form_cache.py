@@ -0,0 +1,131 @@
+"""
+In-memory cache of parsed receipt forms.
+
+Form data (locadores, locatarios, imoveis, versaoContrato) only changes when a
+contract gets a new version, so parsed criarRecibo forms are kept per
+(contract ID, versaoContrato) in an LRU with a TTL. Entries for a contract are
+dropped as soon as the contracts list reports a different version.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Any
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_FORM_CACHE_SIZE = 128
+DEFAULT_FORM_CACHE_TTL_SECONDS = 1800
+
+FormKey = Tuple[str, Optional[int]]
+
+
+def contract_version(contract: Dict[str, Any]) -> Optional[int]:
+    """Contract version reported in contract/form data, if any."""
+    for key in ('versaoContrato', 'versao'):
+        value = contract.get(key)
+        if value not in (None, ''):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class ReceiptFormCache:
+    """LRU + TTL cache of parsed receipt forms keyed by (contract ID, versaoContrato)."""
+
+    def __init__(self, max_entries: int = DEFAULT_FORM_CACHE_SIZE,
+                 ttl: float = DEFAULT_FORM_CACHE_TTL_SECONDS):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._entries: "OrderedDict[FormKey, Tuple[float, Dict]]" = OrderedDict()
+        self._reported_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, contract_id: str) -> Optional[Dict]:
+        """
+        Get the cached form for a contract.
+
+        Args:
+            contract_id: Contract ID
+
+        Returns:
+            Copy of the form data, or None if nothing fresh is cached for the
+            contract's current version
+        """
+        contract_id = str(contract_id)
+        with self._lock:
+            key = self._find_key(contract_id)
+            if key is None:
+                return None
+
+            stored_at, form_data = self._entries[key]
+            if time.time() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return copy.deepcopy(form_data)
+
+    def put(self, contract_id: str, form_data: Dict):
+        """Cache a parsed form under its contract version."""
+        contract_id = str(contract_id)
+        key = (contract_id, contract_version(form_data))
+        with self._lock:
+            # Only one version per contract is kept
+            for stale_key in [k for k in self._entries if k[0] == contract_id and k != key]:
+                del self._entries[stale_key]
+
+            self._entries[key] = (time.time(), copy.deepcopy(form_data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def sync_versions(self, contracts: Iterable[Dict[str, Any]]):
+        """
+        Record the contract versions reported by the contracts list and drop
+        cached forms of any other version.
+
+        Args:
+            contracts: Contracts list entries (numero plus a version field)
+        """
+        with self._lock:
+            for contract in contracts:
+                if not isinstance(contract, dict):
+                    continue
+                version = contract_version(contract)
+                if version is None:
+                    continue
+
+                contract_id = str(contract.get('numero', ''))
+                self._reported_versions[contract_id] = version
+                stale_keys = [k for k in self._entries if k[0] == contract_id and k[1] != version]
+                for stale_key in stale_keys:
+                    del self._entries[stale_key]
+                if stale_keys:
+                    logger.info(f"Contract {contract_id} is now at version {version}, cached receipt form dropped")
+
+    def invalidate(self, contract_id: Optional[str] = None):
+        """Drop the cached form for one contract, or everything if no ID is given."""
+        with self._lock:
+            if contract_id is None:
+                self._entries.clear()
+                self._reported_versions.clear()
+                return
+            for key in [k for k in self._entries if k[0] == str(contract_id)]:
+                del self._entries[key]
+
+    def _find_key(self, contract_id: str) -> Optional[FormKey]:
+        """Key of the entry matching the contract's reported version (caller holds the lock)."""
+        reported = self._reported_versions.get(contract_id)
+        for key in self._entries:
+            if key[0] == contract_id and (reported is None or key[1] == reported):
+                return key
+        return None
@@ -0,0 +1,115 @@
+"""
+Lookahead prefetching of receipt forms for step-by-step processing.
+
+While the user is looking at the confirmation dialog for one receipt, the
+forms for the next few receipts are fetched in the background so confirming
+does not have to wait on the criarRecibo round-trip.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Receipts ahead of the current one whose forms are fetched in the background
+DEFAULT_PREFETCH_LOOKAHEAD = 3
+
+
+class FormPrefetcher:
+    """Fetches receipt forms ahead of use and keeps them in a bounded cache."""
+
+    def __init__(self, fetch_form: Callable[[str], Tuple[bool, Optional[Dict]]],
+                 lookahead: int = DEFAULT_PREFETCH_LOOKAHEAD, max_workers: int = 2):
+        """
+        Args:
+            fetch_form: Function returning (success, form_data) for a contract ID
+            lookahead: Number of upcoming receipts to prefetch
+            max_workers: Maximum concurrent background fetches
+        """
+        self.fetch_form = fetch_form
+        self.lookahead = max(1, int(lookahead))
+        # Room for the current receipt, the lookahead window and one consumed entry
+        self.max_entries = self.lookahead + 2
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix='form-prefetch')
+
+    def prefetch(self, contract_ids: Iterable[str]):
+        """
+        Start background fetches for contracts not already cached or in flight.
+
+        Args:
+            contract_ids: Upcoming contract IDs, nearest first
+        """
+        with self._lock:
+            if self._cancelled:
+                return
+
+            for contract_id in contract_ids:
+                contract_id = str(contract_id)
+                if contract_id in self._futures:
+                    self._futures.move_to_end(contract_id)
+                    continue
+
+                self._futures[contract_id] = self._executor.submit(self._fetch, contract_id)
+                logger.debug(f"Prefetching receipt form for contract {contract_id}")
+
+                # Evict the least recently used entries beyond the cache bound
+                while len(self._futures) > self.max_entries:
+                    _, evicted = self._futures.popitem(last=False)
+                    evicted.cancel()
+
+    def take(self, contract_id: str) -> Optional[Tuple[bool, Optional[Dict]]]:
+        """
+        Get the prefetched form for a contract, waiting if the fetch is still running.
+
+        Args:
+            contract_id: Contract ID
+
+        Returns:
+            (success, form_data) as returned by fetch_form, or None if the form
+            was not prefetched or the background fetch raised
+        """
+        with self._lock:
+            future = self._futures.get(str(contract_id))
+            if future is None or future.cancelled():
+                return None
+            self._futures.move_to_end(str(contract_id))
+
+        try:
+            success, form_data = future.result()
+        except Exception as e:
+            logger.warning(f"Prefetched receipt form for contract {contract_id} failed: {e}")
+            return None
+
+        # Callers add keys (e.g. tenant_name) to the form, so hand out a copy
+        return success, dict(form_data) if isinstance(form_data, dict) else form_data
+
+    def cancel(self):
+        """Cancel pending fetches and stop accepting new ones."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            pending = list(self._futures.values())
+            self._futures.clear()
+
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.debug("Receipt form prefetching stopped")
+
+    def _fetch(self, contract_id: str) -> Tuple[bool, Optional[Dict]]:
+        """Background fetch; skipped if prefetching was cancelled meanwhile."""
+        if self._cancelled:
+            return False, None
+        return self.fetch_form(contract_id)
@@ -0,0 +1,79 @@
+"""
+Request header profiles and timeouts for the portal endpoints.
+
+The portal calls fall into three kinds of request: page navigation, XHR calls
+that exchange JSON, and XHR calls made the way the portal's jQuery code makes
+them (form-encoded). Each kind gets one prebuilt read-only header mapping,
+shared by every call, instead of a dict literal rebuilt on each request.
+Timeouts are (connect, read) tuples so an unreachable host fails fast while
+slow portal responses still get their full read time.
+"""
+
+from types import MappingProxyType
+from typing import Mapping
+
+AUTH_BASE_URL = "https://www.acesso.gov.pt"
+PORTAL_BASE_URL = "https://imoveis.portaldasfinancas.gov.pt"
+CONTRACTS_PAGE_URL = f"{PORTAL_BASE_URL}/arrendamento/consultarElementosContratos/locador"
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36')
+ACCEPT_LANGUAGE = 'pt-PT,pt;q=0.9,en;q=0.8'
+
+# Seconds to establish a connection
+CONNECT_TIMEOUT = 5
+# (connect, read) timeouts per kind of call
+AUTH_TIMEOUT = (CONNECT_TIMEOUT, 10)     # Login pages, logout, connection test
+PAGE_TIMEOUT = (CONNECT_TIMEOUT, 15)     # Portal navigation and contract lists
+API_TIMEOUT = (CONNECT_TIMEOUT, 30)      # Receipt forms, rent values, receipt lookups
+SUBMIT_TIMEOUT = (CONNECT_TIMEOUT, 60)   # Receipt issuing
+
+# Opening a portal page, as a browser navigating from the contracts page
+NAVIGATE_HEADERS: Mapping[str, str] = MappingProxyType({
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': ACCEPT_LANGUAGE,
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Referer': CONTRACTS_PAGE_URL,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+# XHR calls to the portal's JSON API
+XHR_JSON_HEADERS: Mapping[str, str] = MappingProxyType({
+    'User-Agent': USER_AGENT,
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': ACCEPT_LANGUAGE,
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Content-Type': 'application/json;charset=UTF-8',
+    'Referer': CONTRACTS_PAGE_URL,
+    'Origin': PORTAL_BASE_URL,
+    'Connection': 'keep-alive',
+    'X-Requested-With': 'XMLHttpRequest',
+})
+
+# jQuery-style AJAX calls (form-encoded, never served from cache)
+XHR_FORM_HEADERS: Mapping[str, str] = MappingProxyType({
+    'User-Agent': USER_AGENT,
+    'Accept': 'application/json, text/javascript, */*; q=0.01',
+    'Accept-Language': ACCEPT_LANGUAGE,
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+    'X-Requested-With': 'XMLHttpRequest',
+    'Referer': CONTRACTS_PAGE_URL,
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin',
+})
+
+
+def with_headers(profile: Mapping[str, str], **overrides: str) -> Mapping[str, str]:
+    """
+    Profile with some headers replaced, for the few calls that need a per-call value.
+
+    Keyword names use underscores for dashes (Referer=..., If_None_Match=...).
+    """
+    headers = dict(profile)
+    headers.update((name.replace('_', '-'), value) for name, value in overrides.items())
+    return headers
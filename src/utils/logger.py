@@ -1,11 +1,25 @@
 """
 Logger utility for the receipts application.
+
+Records are handed to a queue and written to the log file and console by a
+background listener thread, so threads that log (processing workers, the
+web client) never wait on disk or console I/O. GUI log views use
+BufferedGUIHandler, which the Tk main loop drains in batches.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Callable, List, Optional
+
+# How often GUI log views take buffered lines (milliseconds)
+GUI_FLUSH_INTERVAL_MS = 100
+
+_listener: Optional[logging.handlers.QueueListener] = None
 
 def setup_logger(log_level: int = logging.INFO) -> logging.Logger:
     """
@@ -43,13 +57,20 @@ def setup_logger(log_level: int = logging.INFO) -> logging.Logger:
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # File and console output happen on the listener thread; the logger only enqueues
+    global _listener
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
     
     # Keep propagation enabled so GUI handler on this logger catches child logger messages
     # Child loggers will propagate to this parent logger
@@ -59,6 +80,15 @@ def setup_logger(log_level: int = logging.INFO) -> logging.Logger:
     
     return logger
 
+def shutdown_logger():
+    """Write out queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger for a specific module.
@@ -71,6 +101,63 @@ def get_logger(name: str) -> logging.Logger:
     """
     return logging.getLogger(f'receipts_app.{name}')
 
+class BufferedGUIHandler(logging.Handler):
+    """
+    Logging handler for Tk log views.
+    
+    emit() only formats the record and appends it to a bounded buffer, from any
+    thread. The GUI thread takes everything buffered every GUI_FLUSH_INTERVAL_MS
+    (see start) and hands it to append_lines in one call, so the Tk event queue
+    holds at most one pending flush however fast records arrive.
+    """
+    
+    def __init__(self, append_lines: Callable[[List[str]], None], max_buffered: int = 1000):
+        """
+        Args:
+            append_lines: Called on the GUI thread with the formatted lines
+            max_buffered: Lines kept between flushes (oldest are dropped first)
+        """
+        super().__init__()
+        self.append_lines = append_lines
+        self._buffer = deque(maxlen=max_buffered)
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+    
+    def flush_to_gui(self):
+        """Pass buffered lines to append_lines (call on the GUI thread)."""
+        lines = []
+        while True:
+            try:
+                lines.append(self._buffer.popleft())
+            except IndexError:
+                break
+        if lines:
+            self.append_lines(lines)
+    
+    def start(self, widget, interval_ms: int = GUI_FLUSH_INTERVAL_MS):
+        """
+        Flush periodically from the widget's event loop until it is destroyed.
+        
+        Args:
+            widget: Any Tk widget (provides after())
+            interval_ms: Flush interval in milliseconds
+        """
+        def poll():
+            try:
+                self.flush_to_gui()
+            except Exception:
+                pass
+            try:
+                widget.after(interval_ms, poll)
+            except Exception:
+                pass  # Widget destroyed
+        
+        widget.after(interval_ms, poll)
+
 class LogHandler:
     """Custom log handler for the application."""
     
@@ -0,0 +1,119 @@
+"""
+Level-gated, lazily rendered logging of request/response payloads.
+
+Portal payloads and responses are large, and serialising them for a log line
+that is then filtered out by level still costs the json.dumps. log_payload
+checks the level first and passes a LazyPayload to the logger, so the
+rendering happens only when a handler actually formats the record. Each
+endpoint has a policy with a size cap and a sampling interval so batch runs do
+not write every payload in full.
+"""
+
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PayloadLogPolicy:
+    """How much of an endpoint's payloads to log."""
+    max_chars: int = 4000  # Rendered text is cut to this length
+    sample_every: int = 1  # Log one payload in every N (1 = all)
+
+
+DEFAULT_POLICY = PayloadLogPolicy()
+
+# Per-endpoint policies; keys are the endpoint names passed to log_payload
+PAYLOAD_LOG_POLICIES: Dict[str, PayloadLogPolicy] = {
+    'emitirRecibo.payload': PayloadLogPolicy(max_chars=4000, sample_every=10),
+    'emitirRecibo.response': PayloadLogPolicy(max_chars=2000, sample_every=10),
+    'contracts.headers': PayloadLogPolicy(max_chars=2000),
+    'contracts.preview': PayloadLogPolicy(max_chars=500),
+}
+
+_counters: Dict[str, Iterator[int]] = {}
+_counters_lock = threading.Lock()
+
+
+def render_json(value: Any) -> str:
+    """Pretty-printed JSON, as the portal payloads were always logged."""
+    return json.dumps(value, indent=2, ensure_ascii=False, default=str)
+
+
+def render_text(value: Any) -> str:
+    """Response text on one line."""
+    return str(value).replace('\n', ' ').replace('\r', '')
+
+
+class LazyPayload:
+    """Log argument that renders (and truncates) its payload only when formatted."""
+
+    __slots__ = ('payload', 'renderer', 'max_chars')
+
+    def __init__(self, payload: Any, renderer: Callable[[Any], str] = render_json,
+                 max_chars: int = DEFAULT_POLICY.max_chars):
+        self.payload = payload
+        self.renderer = renderer
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        try:
+            text = self.renderer(self.payload)
+        except Exception as e:
+            return f"<unrenderable payload: {e}>"
+        if self.max_chars and len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... [truncated {len(text) - self.max_chars} chars]"
+        return text
+
+
+def _next_count(endpoint: str) -> int:
+    counter = _counters.get(endpoint)
+    if counter is None:
+        with _counters_lock:
+            counter = _counters.setdefault(endpoint, itertools.count())
+    return next(counter)
+
+
+def log_payload(log: logging.Logger, level: int, endpoint: str, label: str, payload: Any,
+                renderer: Callable[[Any], str] = render_json, force: bool = False) -> bool:
+    """
+    Log a payload under the endpoint's policy.
+
+    Args:
+        log: Logger to write to
+        level: Logging level of the record
+        endpoint: Policy key (see PAYLOAD_LOG_POLICIES)
+        label: Text logged before the payload
+        payload: Object to render
+        renderer: Turns the payload into text (default: pretty JSON)
+        force: Log even if sampling would skip it (e.g. for failed calls)
+
+    Returns:
+        True if a record was logged
+    """
+    if not log.isEnabledFor(level):
+        return False
+
+    policy = PAYLOAD_LOG_POLICIES.get(endpoint, DEFAULT_POLICY)
+    count = _next_count(endpoint)
+    if not force and policy.sample_every > 1 and count % policy.sample_every:
+        return False
+
+    log.log(level, "%s:\n%s", label, LazyPayload(payload, renderer, policy.max_chars))
+    return True
+
+
+def reset_sampling():
+    """Restart every endpoint's sampling count (the next payload is logged)."""
+    with _counters_lock:
+        _counters.clear()
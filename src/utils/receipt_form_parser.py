@@ -0,0 +1,287 @@
+"""
+Receipt form parser for the Portal das Finanças criarRecibo page.
+
+Extracts the contract data the page embeds for its Angular controller
+(numContrato, versaoContrato, locadores, locatarios, imoveis, ...) without
+building an HTML tree: the script holding the data is located with plain
+string searches, every wanted key is found in one pass with a single
+precompiled pattern, and each value is decoded directly with ``json``.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys read from the embedded receipt data
+FORM_KEYS = (
+    'numContrato', 'nifEmitente', 'nomeEmitente', 'versaoContrato', 'valorRenda',
+    'locatarios', 'locadores', 'hasNifHerancaIndivisa', 'locadoresHerancaIndivisa',
+    'herdeiros', 'imoveis'
+)
+
+# One combined pattern for all keys; the value is decoded from the match end
+_KEY_PATTERN = re.compile(r'"(' + '|'.join(FORM_KEYS) + r')"\s*:\s*')
+_TRAILING_COMMA_PATTERN = re.compile(r',\s*([}\]])')
+_PARTY_OBJECT_PATTERN = re.compile(r'\{[^}]*"nif"[^}]*\}', re.DOTALL)
+_NIF_PATTERN = re.compile(r'"nif":\s*(\d+)')
+_NAME_PATTERN = re.compile(r'"nome":\s*"([^"]+)"')
+_QUOTA_PATTERN = re.compile(r'"quotaParte":\s*"([^"]+)"')
+_ADDRESS_PATTERN = re.compile(r'"morada":\s*"([^"]+)"')
+
+_decoder = json.JSONDecoder()
+
+# Defaults used when tenant objects can only be recovered field by field
+DEFAULT_TENANT_COUNTRY = {"codigo": "2724", "label": "PORTUGAL"}
+DEFAULT_TENANT_WITHHOLDING = {
+    "taxa": 0,
+    "codigo": "RIRS03",
+    "label": "Dispensa de retenção - artigo 101.º-B, n.º 1, do CIRS"
+}
+
+
+def find_receipt_script(html: str) -> Optional[str]:
+    """
+    Find the inline script that holds the receipt data.
+
+    Args:
+        html: Full criarRecibo page HTML
+
+    Returns:
+        Script text, or None if the page has no receipt data
+    """
+    if not html:
+        return None
+
+    position = html.find('numContrato')
+    while position != -1:
+        start = html.rfind('<script', 0, position)
+        if start != -1:
+            content_start = html.find('>', start) + 1
+            end = html.find('</script', position)
+            # Only accept the match if it sits inside this script element
+            if 0 < content_start <= position and end != -1 and html.rfind('</script', start, position) == -1:
+                script = html[content_start:end]
+                if 'recibo' in script:
+                    return script
+                position = end
+        position = html.find('numContrato', position + 1)
+
+    return None
+
+
+def _balanced_end(text: str, start: int) -> int:
+    """Index just past the object/array opening at ``start``, honouring strings."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return -1
+
+
+def _decode_value(text: str, start: int) -> Tuple[bool, Any, str]:
+    """
+    Decode the JSON value starting at ``start``.
+
+    Returns:
+        Tuple of (success, value, raw_text); raw_text is set for objects/arrays
+        so callers can fall back to field-by-field extraction
+    """
+    try:
+        value, _ = _decoder.raw_decode(text, start)
+        return True, value, ''
+    except ValueError:
+        pass
+
+    # Lenient retry for JavaScript-style literals with trailing commas
+    if start < len(text) and text[start] in '{[':
+        end = _balanced_end(text, start)
+        raw = text[start:end] if end != -1 else text[start:]
+        try:
+            return True, json.loads(_TRAILING_COMMA_PATTERN.sub(r'\1', raw)), raw
+        except ValueError:
+            return False, None, raw
+
+    return False, None, ''
+
+
+def _parse_parties(raw: str, landlords: bool) -> List[Dict]:
+    """Recover tenant/landlord objects field by field from an undecodable array."""
+    parties = []
+    for party_obj in _PARTY_OBJECT_PATTERN.findall(raw):
+        nif_match = _NIF_PATTERN.search(party_obj)
+        name_match = _NAME_PATTERN.search(party_obj)
+        if not (nif_match or name_match):
+            continue
+
+        party = {
+            'nif': int(nif_match.group(1)) if nif_match else None,
+            'nome': name_match.group(1).strip() if name_match else ''
+        }
+        if landlords:
+            quota_match = _QUOTA_PATTERN.search(party_obj)
+            party['quotaParte'] = quota_match.group(1) if quota_match else '1/1'
+            party['sujeitoPassivo'] = 'V'
+        else:
+            party['pais'] = dict(DEFAULT_TENANT_COUNTRY)
+            party['retencao'] = dict(DEFAULT_TENANT_WITHHOLDING)
+        parties.append(party)
+    return parties
+
+
+def extract_form_values(script: str) -> Dict[str, Tuple[bool, Any, str]]:
+    """
+    Decode the first occurrence of every form key in one pass over the script.
+
+    Args:
+        script: Script text holding the receipt data
+
+    Returns:
+        Dict of key -> (success, value, raw_text) as returned by the decoder
+    """
+    values = {}
+    for match in _KEY_PATTERN.finditer(script):
+        key = match.group(1)
+        if key in values:
+            continue
+        values[key] = _decode_value(script, match.end())
+        if len(values) == len(FORM_KEYS):
+            break
+    return values
+
+
+def parse_receipt_form(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract contract details from the criarRecibo page.
+
+    The result has the same keys get_receipt_form has always exposed, including
+    the backward-compatible tenant_nif/tenant_name, landlord_nif/landlord_name
+    and property_address shortcuts.
+
+    Args:
+        html: Full criarRecibo page HTML
+
+    Returns:
+        Dict of contract details, or None if the page holds no receipt data
+    """
+    script = find_receipt_script(html)
+    if script is None:
+        return None
+
+    values = extract_form_values(script)
+    details = {}
+
+    def scalar(key, cast):
+        success, value, _ = values.get(key, (False, None, ''))
+        if success and value is not None and not isinstance(value, (bool, dict, list)):
+            try:
+                details[key] = cast(value)
+            except (TypeError, ValueError):
+                pass
+
+    scalar('numContrato', int)
+    scalar('nifEmitente', int)
+    scalar('versaoContrato', int)
+    scalar('valorRenda', float)
+    success, value, _ = values.get('nomeEmitente', (False, None, ''))
+    if success and isinstance(value, str):
+        details['nomeEmitente'] = value.strip()
+
+    # Tenants
+    if 'locatarios' in values:
+        success, tenants, raw = values['locatarios']
+        if success and isinstance(tenants, list):
+            tenants_list = [{
+                'nif': tenant.get('nif'),
+                'nome': (tenant.get('nome') or '').strip(),
+                'pais': tenant.get('pais', {}),
+                'retencao': tenant.get('retencao', {})
+            } for tenant in tenants if isinstance(tenant, dict)]
+        else:
+            logger.warning("Failed to decode locatarios, recovering tenants field by field")
+            tenants_list = _parse_parties(raw, landlords=False)
+
+        details['locatarios'] = tenants_list
+        details['tenant_count'] = len(tenants_list)
+        if tenants_list:
+            details['tenant_nif'] = tenants_list[0]['nif']
+            details['tenant_name'] = tenants_list[0]['nome']
+
+    # Landlords
+    if 'locadores' in values:
+        success, landlords, raw = values['locadores']
+        if success and isinstance(landlords, list):
+            landlords_list = [{
+                'nif': landlord.get('nif'),
+                'nome': (landlord.get('nome') or '').strip(),
+                'quotaParte': landlord.get('quotaParte', '1/1'),
+                'sujeitoPassivo': landlord.get('sujeitoPassivo', 'V')
+            } for landlord in landlords if isinstance(landlord, dict)]
+        else:
+            logger.warning("Failed to decode locadores, recovering landlords field by field")
+            landlords_list = _parse_parties(raw, landlords=True)
+
+        details['locadores'] = landlords_list
+        details['landlord_count'] = len(landlords_list)
+        if landlords_list:
+            details['landlord_nif'] = landlords_list[0]['nif']
+            details['landlord_name'] = landlords_list[0]['nome']
+
+    # Inheritance (herança indivisa)
+    success, has_inheritance, _ = values.get('hasNifHerancaIndivisa', (False, None, ''))
+    details['hasNifHerancaIndivisa'] = has_inheritance is True if success else False
+    details['locadoresHerancaIndivisa'] = []
+    details['herdeiros'] = []
+    if details['hasNifHerancaIndivisa']:
+        for key in ('locadoresHerancaIndivisa', 'herdeiros'):
+            success, value, _ = values.get(key, (False, None, ''))
+            if success and isinstance(value, list):
+                details[key] = value
+            elif key in values:
+                logger.warning(f"Failed to decode {key}")
+
+    # Properties
+    if 'imoveis' in values:
+        success, properties, raw = values['imoveis']
+        if success and isinstance(properties, list):
+            details['imoveis'] = properties
+            if properties and isinstance(properties[0], dict):
+                details['property_address'] = properties[0].get('morada', '')
+        else:
+            logger.warning("Failed to decode imoveis, falling back to minimal property structure")
+            address_match = _ADDRESS_PATTERN.search(raw)
+            if address_match:
+                details['property_address'] = address_match.group(1).strip()
+                details['imoveis'] = [{
+                    "morada": details['property_address'],
+                    "tipo": {"codigo": "U", "label": "Urbano"},
+                    "parteComum": False,
+                    "bemOmisso": False,
+                    "novo": False,
+                    "editableMode": False,
+                    "ordem": 1
+                }]
+
+    return details
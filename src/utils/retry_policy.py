@@ -0,0 +1,164 @@
+"""
+Retry policies for portal requests.
+
+GETs are idempotent and are retried with exponential backoff and full jitter
+after timeouts, connection errors and transient HTTP statuses. A receipt POST
+is not: if it fails without a clear answer the receipt may or may not have
+been issued, so it is never re-sent automatically - the failure is reported as
+ambiguous and left to the operator (or the run journal) to resolve.
+receipt_dedup_key identifies a receipt for refusing duplicate submissions
+within a session.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+import requests
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses worth retrying: rate limiting and gateway/server overload
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+    max_attempts: int = 3      # Total attempts, including the first
+    base_delay: float = 0.5    # Backoff cap before the 2nd attempt (seconds)
+    max_delay: float = 8.0     # Upper bound for any backoff
+    jitter: bool = True        # Sleep a random time up to the backoff instead of all of it
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def wait(self, attempt: int, reason: str = "") -> float:
+        """Sleep before the next attempt and return the time slept."""
+        delay = self.backoff(attempt)
+        logger.warning(f"Attempt {attempt}/{self.max_attempts} failed{f' ({reason})' if reason else ''} - "
+                       f"retrying in {delay:.2f}s")
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+GET_RETRY_POLICY = RetryPolicy()
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a request exception may succeed on retry (timeouts, dropped connections)."""
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def is_transient_status(status_code: int) -> bool:
+    """Whether an HTTP status may succeed on retry."""
+    return status_code in RETRYABLE_STATUSES
+
+
+def _normalise_date(value: Any) -> str:
+    return str(value or '').strip()[:10]
+
+
+def _normalise_value(value: Any) -> str:
+    try:
+        return f"{float(value):.2f}"
+    except (TypeError, ValueError):
+        return str(value or '').strip()
+
+
+def receipt_dedup_key(data: Dict) -> Tuple[str, str, str, str]:
+    """
+    Identity of a receipt: (contract, dataInicio, dataFim, valor) of an emitirRecibo payload.
+    """
+    return (
+        str(data.get('numContrato', '')).strip(),
+        _normalise_date(data.get('dataInicio')),
+        _normalise_date(data.get('dataFim')),
+        _normalise_value(data.get('valor'))
+    )
+
+
+class SubmissionRegistry:
+    """Receipts issued, being submitted or of unknown outcome in this session, by dedup key."""
+
+    def __init__(self):
+        self._issued: Dict[Tuple[str, str, str, str], Dict] = {}
+        self._in_flight: Set[Tuple[str, str, str, str]] = set()
+        self._unconfirmed: Set[Tuple[str, str, str, str]] = set()  # Ambiguous submissions
+        self._lock = threading.Lock()
+
+    def claim(self, key: Tuple[str, str, str, str]) -> Tuple[Optional[Dict], bool]:
+        """
+        Ask to submit a receipt.
+
+        Returns:
+            Tuple of (result of the earlier submission if the receipt was already
+            issued, whether the caller may submit it now)
+        """
+        with self._lock:
+            issued = self._issued.get(key)
+            if issued is not None or key in self._in_flight or key in self._unconfirmed:
+                return issued, False
+            self._in_flight.add(key)
+            return None, True
+
+    def release(self, key: Tuple[str, str, str, str], issued: Optional[Dict] = None, ambiguous: bool = False):
+        """
+        End a claimed submission.
+
+        Args:
+            key: Dedup key passed to claim
+            issued: Result of the submission if the receipt was issued
+            ambiguous: The receipt may have been issued; refuse further claims for it
+        """
+        with self._lock:
+            self._in_flight.discard(key)
+            if issued is not None:
+                self._issued[key] = issued
+            elif ambiguous:
+                self._unconfirmed.add(key)
+
+    def is_unconfirmed(self, key: Tuple[str, str, str, str]) -> bool:
+        """Whether an earlier submission of the receipt ended without a clear answer."""
+        with self._lock:
+            return key in self._unconfirmed
+
+    def mark_not_issued(self, key: Tuple[str, ...]) -> int:
+        """
+        Record that unconfirmed receipts were checked on the portal and not issued.
+
+        Args:
+            key: Dedup key, or its leading (contract, dataInicio, dataFim) part to
+                 match the receipt whatever value was submitted
+
+        Returns:
+            Number of receipts that may be submitted again
+        """
+        key = tuple(key)
+        with self._lock:
+            matches = {unconfirmed for unconfirmed in self._unconfirmed if unconfirmed[:len(key)] == key}
+            self._unconfirmed -= matches
+            return len(matches)
+
+    def clear(self) -> int:
+        """
+        Forget issued and unconfirmed receipts (claims in flight stay until released).
+
+        Returns:
+            Number of unconfirmed receipts forgotten
+        """
+        with self._lock:
+            forgotten = len(self._unconfirmed)
+            self._issued.clear()
+            self._unconfirmed.clear()
+            return forgotten
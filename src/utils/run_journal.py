@@ -0,0 +1,226 @@
+"""
+Write-ahead journal for bulk receipt runs.
+
+A bulk run keeps its results in memory, so a crash or an expired session part
+way through loses the record of which receipts were already issued. The
+journal is an append-only JSON-lines file, flushed and fsynced per record:
+
+    {"event": "planned", "key": ..., "receipt": {...}}   - receipt queued for the run
+    {"event": "intent",  "key": ..., "receipt": {...}}   - about to be submitted
+    {"event": "outcome", "key": ..., "receipt": {...}, "success": ..., "ambiguous": ..., "result": {...}}
+
+Receipts are keyed by (contract, from date, to date, value), the same identity
+the web client uses to deduplicate submissions. Replaying the file gives each
+receipt's state: an outcome with success is completed; an intent without an
+outcome (the run died mid-submission) or an ambiguous outcome must be checked
+on the portal before it is issued again - it stays ambiguous until an operator
+has done so and recorded it with mark_not_issued. A torn last line is ignored.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .logger import get_logger
+    from .retry_policy import receipt_dedup_key
+except ImportError:
+    from utils.logger import get_logger
+    from utils.retry_policy import receipt_dedup_key
+
+logger = get_logger(__name__)
+
+# Receipt states after replaying the journal
+PENDING = 'pending'        # Planned, never started
+IN_FLIGHT = 'in_flight'    # Intent without outcome
+COMPLETED = 'completed'
+AMBIGUOUS = 'ambiguous'    # Submitted, but whether it was issued is unknown
+FAILED = 'failed'
+
+
+def _as_dict(value: Any) -> Dict:
+    """Fields of a receipt or result (dataclass, receipt_batch.ReceiptRow view or mapping)."""
+    if hasattr(value, 'to_receipt'):
+        value = value.to_receipt()
+    return asdict(value) if is_dataclass(value) else dict(value)
+
+
+class RunJournal:
+    """Append-only journal of one bulk run (see module docstring)."""
+
+    def __init__(self, path: str):
+        """
+        Open a journal, replaying any records already in the file.
+
+        Args:
+            path: Journal file (created on the first write)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries: Dict[str, Dict] = {}  # key -> {'receipt', 'state', 'result'}, in first-seen order
+        self._replay()
+
+    def __enter__(self) -> 'RunJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def receipt_key(receipt: Any) -> str:
+        """Journal key of a receipt (ReceiptData, ReceiptRow or dict with its fields)."""
+        data = _as_dict(receipt)
+        return '|'.join(receipt_dedup_key({
+            'numContrato': data.get('contract_id'),
+            'dataInicio': data.get('from_date'),
+            'dataFim': data.get('to_date'),
+            'valor': data.get('value'),
+        }))
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                self._apply(record)
+
+        logger.info(f"Replayed run journal {self.path}: {self.summary()}")
+
+    def _apply(self, record: Dict):
+        """Update the in-memory state with one record."""
+        event = record.get('event')
+        key = record.get('key')
+        if not key or event not in ('planned', 'intent', 'outcome'):
+            return
+
+        entry = self._entries.setdefault(key, {'receipt': None, 'state': PENDING, 'result': None})
+        if record.get('receipt') is not None:
+            entry['receipt'] = record['receipt']
+        if event == 'intent':
+            entry['state'] = IN_FLIGHT
+        elif event == 'outcome':
+            entry['result'] = record.get('result')
+            if record.get('success'):
+                entry['state'] = COMPLETED
+            elif record.get('ambiguous'):
+                entry['state'] = AMBIGUOUS
+            else:
+                entry['state'] = FAILED
+
+    def _write(self, records: List[Dict]):
+        """Append records and make them durable before returning."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            for record in records:
+                self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                self._apply(record)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def plan(self, receipts: Iterable[Any]) -> int:
+        """
+        Record the receipts of a run that the journal does not know yet.
+
+        Returns:
+            Number of receipts added
+        """
+        records = []
+        seen = set()
+        for receipt in receipts:
+            key = self.receipt_key(receipt)
+            if key in self._entries or key in seen:
+                continue
+            seen.add(key)
+            records.append({'event': 'planned', 'key': key, 'receipt': _as_dict(receipt)})
+        if records:
+            self._write(records)
+        return len(records)
+
+    def record_intent(self, receipt: Any):
+        """Record that a receipt is about to be submitted."""
+        self._write([{
+            'event': 'intent',
+            'key': self.receipt_key(receipt),
+            'receipt': _as_dict(receipt),
+            'at': datetime.now().isoformat(),
+        }])
+
+    def record_outcome(self, receipt: Any, result: Any):
+        """
+        Record a receipt's processing result.
+
+        Args:
+            receipt: The receipt
+            result: ProcessingResult (or dict) with success and, optionally, ambiguous
+        """
+        result_data = _as_dict(result)
+        self._write([{
+            'event': 'outcome',
+            'key': self.receipt_key(receipt),
+            'receipt': _as_dict(receipt),
+            'success': bool(result_data.get('success')),
+            'ambiguous': bool(result_data.get('ambiguous')),
+            'result': result_data,
+            'at': datetime.now().isoformat(),
+        }])
+
+    def mark_not_issued(self, receipt: Any):
+        """
+        Record that an in-flight or ambiguous receipt was checked on the portal and not issued.
+
+        The next run submits it again. Only call this after checking the portal by
+        hand; the journal never concludes it by itself.
+        """
+        self._write([{
+            'event': 'outcome',
+            'key': self.receipt_key(receipt),
+            'receipt': _as_dict(receipt),
+            'success': False,
+            'ambiguous': False,
+            'result': {'success': False, 'error_message': 'Checked on the portal: not issued'},
+            'at': datetime.now().isoformat(),
+        }])
+
+    def state(self, receipt: Any) -> Optional[str]:
+        """Journal state of a receipt, or None if the journal does not know it."""
+        entry = self._entries.get(self.receipt_key(receipt))
+        return entry['state'] if entry else None
+
+    def completed_result(self, receipt: Any) -> Optional[Dict]:
+        """Recorded result of a receipt that was issued, else None."""
+        entry = self._entries.get(self.receipt_key(receipt))
+        return entry['result'] if entry and entry['state'] == COMPLETED else None
+
+    def needs_recheck(self, receipt: Any) -> bool:
+        """Whether the receipt may have been issued without the journal knowing."""
+        return self.state(receipt) in (IN_FLIGHT, AMBIGUOUS)
+
+    def receipts(self) -> List[Dict]:
+        """Fields of every receipt in the journal, in the order they were first recorded."""
+        return [entry['receipt'] for entry in self._entries.values() if entry['receipt'] is not None]
+
+    def summary(self) -> Dict[str, int]:
+        """Number of receipts per state."""
+        counts = {state: 0 for state in (PENDING, IN_FLIGHT, COMPLETED, AMBIGUOUS, FAILED)}
+        for entry in self._entries.values():
+            counts[entry['state']] += 1
+        return counts
@@ -0,0 +1,215 @@
+"""
+Append-only row log behind the Excel session report.
+
+Session reports accumulate rows across many processing runs. Rewriting the
+.xlsx on every export means loading and saving the whole workbook each time,
+so the rows are kept in a sidecar JSON-lines log next to the report instead:
+appending writes only the new rows, and a small metadata file keeps the header
+and the running maximum text length of each column. The .xlsx is materialised
+from the log on demand with openpyxl's write-only mode, streaming the rows
+once with column widths already known.
+
+The metadata also records the modification time and size of the .xlsx as last
+written or read by the log. If the report changes on disk after that (rows
+added or edited in Excel), the log is stale and is re-seeded from the workbook
+before the next append, keeping any rows not yet materialised.
+
+Files for a report at ``report.xlsx``:
+    report.xlsx.rows.jsonl  - one JSON array of cell values per row
+    report.xlsx.meta.json   - {"headers": [...], "max_lengths": [...], "rows": n,
+                               "report": [mtime_ns, size] or null, "materialized_rows": n}
+"""
+
+import itertools
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SHEET_TITLE = "Session Report"
+MAX_COLUMN_WIDTH = 50
+
+
+def _text_length(value: Any) -> int:
+    """Length counted for column widths (empty cells do not count)."""
+    return len(str(value)) if value else 0
+
+
+class SessionReportLog:
+    """Sidecar row log for one Excel session report."""
+
+    def __init__(self, report_path: str):
+        self.report_path = report_path
+        self.log_path = f"{report_path}.rows.jsonl"
+        self.meta_path = f"{report_path}.meta.json"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.log_path) and os.path.exists(self.meta_path)
+
+    def is_stale(self) -> bool:
+        """Whether the .xlsx changed on disk since the log last wrote or read it."""
+        stamp = self._report_stamp()
+        return stamp is not None and stamp != self._read_meta().get('report')
+
+    def reset(self, headers: List[str]):
+        """Start an empty log with the given header (an existing .xlsx is superseded)."""
+        with open(self.log_path, 'w', encoding='utf-8'):
+            pass
+        self._write_meta({
+            'headers': list(headers),
+            'max_lengths': [len(str(header)) for header in headers],
+            'rows': 0,
+            'report': self._report_stamp(),
+            'materialized_rows': 0,
+        })
+
+    def seed_from_workbook(self):
+        """
+        Build the log from an existing report written before the log existed.
+
+        The workbook is streamed once in read-only mode.
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.report_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            headers = [str(value) for value in header if value is not None] if header else []
+            self.reset(headers)
+            count = self.append_values(list(row[:len(headers)]) for row in rows
+                                       if any(value is not None for value in row))
+        finally:
+            workbook.close()
+        self._mark_materialized()
+        logger.info(f"Seeded session report log with {count} rows from {self.report_path}")
+
+    def resync(self):
+        """
+        Re-seed the log from a report that was changed outside the log.
+
+        Rows appended since the last materialisation are not in the workbook
+        yet, so they are carried over after the re-read rows.
+        """
+        meta = self._read_meta()
+        pending = list(itertools.islice(self.iter_rows(), meta.get('materialized_rows', meta['rows']), None))
+        self.seed_from_workbook()
+        if pending:
+            self.append_values(pending)
+        logger.info(f"Re-read {self.report_path} after it changed on disk, "
+                    f"keeping {len(pending)} rows not yet written to it")
+
+    @property
+    def headers(self) -> List[str]:
+        return self._read_meta()['headers']
+
+    def append(self, report_data: List[Dict]) -> int:
+        """
+        Append report rows, ordering each row's values by the log header.
+
+        Returns:
+            Number of rows appended
+        """
+        headers = self.headers
+        return self.append_values(
+            [data_row.get(key) for key in headers] if set(headers) <= data_row.keys()
+            else list(data_row.values())
+            for data_row in report_data
+        )
+
+    def append_values(self, rows) -> int:
+        """Append rows given as value lists and update the running column maxima."""
+        meta = self._read_meta()
+        max_lengths = meta['max_lengths']
+        count = 0
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            for values in rows:
+                log_file.write(json.dumps(values, ensure_ascii=False, default=str))
+                log_file.write('\n')
+                for index, value in enumerate(values):
+                    length = _text_length(value)
+                    if index >= len(max_lengths):
+                        max_lengths.append(length)
+                    elif length > max_lengths[index]:
+                        max_lengths[index] = length
+                count += 1
+        meta['rows'] += count
+        self._write_meta(meta)
+        return count
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        with open(self.log_path, 'r', encoding='utf-8') as log_file:
+            for line in log_file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def materialize(self):
+        """
+        Write the consolidated .xlsx from the log.
+
+        Uses a write-only workbook so rows are streamed straight to the file,
+        then replaces the report in one step.
+        """
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+
+        meta = self._read_meta()
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(SHEET_TITLE)
+
+        # Column widths must be set before any row is written in write-only mode
+        for index, max_length in enumerate(meta['max_lengths'], start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = min(max_length + 2, MAX_COLUMN_WIDTH)
+
+        header_cells = []
+        for header in meta['headers']:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill(start_color="3B82F6", end_color="3B82F6", fill_type="solid")
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header_cells.append(cell)
+        sheet.append(header_cells)
+
+        for values in self.iter_rows():
+            sheet.append(values)
+
+        temp_path = f"{self.report_path}.tmp"
+        try:
+            workbook.save(temp_path)
+            os.replace(temp_path, self.report_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._mark_materialized()
+        logger.info(f"Materialised {meta['rows']} session report rows to {self.report_path}")
+
+    def _report_stamp(self) -> Optional[List[int]]:
+        """[mtime_ns, size] of the .xlsx, or None if it does not exist."""
+        try:
+            stat = os.stat(self.report_path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _mark_materialized(self):
+        """Record that the .xlsx on disk now holds every logged row."""
+        meta = self._read_meta()
+        meta['report'] = self._report_stamp()
+        meta['materialized_rows'] = meta['rows']
+        self._write_meta(meta)
+
+    def _read_meta(self) -> Dict[str, Any]:
+        with open(self.meta_path, 'r', encoding='utf-8') as meta_file:
+            return json.load(meta_file)
+
+    def _write_meta(self, meta: Dict[str, Any]):
+        with open(self.meta_path, 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file, ensure_ascii=False)
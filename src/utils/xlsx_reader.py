@@ -0,0 +1,305 @@
+"""
+Streaming reader for raw .xlsx sheet XML.
+
+Some landlord workbooks (exported by third-party tools) open in openpyxl with
+no sheets at all. This reader goes straight to the package parts instead:
+sheet names come from xl/workbook.xml, each sheet's part is resolved through
+xl/_rels/workbook.xml.rels, and rows are streamed with iterparse, clearing
+parsed elements so memory stays at roughly one row. Cell values are converted
+the way openpyxl (data_only=True) converts them: shared and inline strings,
+booleans, ints/floats and date-formatted numbers as datetimes.
+"""
+
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+STRICT_REL_NS = 'http://purl.oclc.org/ooxml/officeDocument/relationships'
+
+# Built-in number formats that display dates/times
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+# Format code parts that never make it a date: quoted text, escapes, [Red]/[$-409] sections
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+
+
+def _local(tag: str) -> str:
+    """Tag name without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_index(letters: str) -> int:
+    """0-based column index of a column reference such as 'H' or 'AB'."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _is_date_format(format_code: str) -> bool:
+    code = _FORMAT_NOISE.sub('', format_code).lower()
+    return any(char in code for char in 'dmyhs')
+
+
+def _cast_number(text: str):
+    """Number as openpyxl returns it: int unless it has a decimal point or exponent."""
+    if '.' in text or 'E' in text or 'e' in text:
+        return float(text)
+    return int(text)
+
+
+class XlsxReader:
+    """Row reader for .xlsx files that does not depend on openpyxl."""
+
+    def __init__(self, file_path: str):
+        """
+        Open the package and read the workbook index.
+
+        Raises:
+            ValueError: If the file is not a readable .xlsx package
+        """
+        try:
+            self._zip = zipfile.ZipFile(file_path, 'r')
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Not a valid .xlsx file: {e}")
+
+        self._names = set(self._zip.namelist())
+        self._sheets: List[Tuple[str, str]] = []  # (name, part path)
+        self._active_index = 0
+        self._epoch = datetime(1899, 12, 30)
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Optional[Set[int]] = None
+        try:
+            self._read_workbook()
+        except Exception:
+            self._zip.close()
+            raise
+
+    def __enter__(self) -> 'XlsxReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order."""
+        return [name for name, _ in self._sheets]
+
+    @property
+    def active_sheet(self) -> Optional[str]:
+        """Name of the sheet Excel opens on, if the workbook has any."""
+        if not self._sheets:
+            return None
+        return self._sheets[min(self._active_index, len(self._sheets) - 1)][0]
+
+    def iter_rows(self, sheet_name: Optional[str] = None,
+                  max_row: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream a sheet's rows as value tuples, like openpyxl's iter_rows(values_only=True).
+
+        Rows missing from the XML are yielded as empty tuples so row positions
+        match Excel's row numbers.
+
+        Args:
+            sheet_name: Sheet to read (default: the active sheet)
+            max_row: Stop after this row number
+
+        Raises:
+            ValueError: If the sheet does not exist
+        """
+        part = self._sheet_part(sheet_name)
+        shared_strings = self._load_shared_strings()
+        date_styles = self._load_date_styles()
+
+        expected_row = 1
+        with self._zip.open(part) as sheet_file:
+            sheet_data = None
+            for event, elem in ET.iterparse(sheet_file, events=('start', 'end')):
+                tag = _local(elem.tag)
+                if event == 'start':
+                    if tag == 'sheetData':
+                        sheet_data = elem
+                    continue
+                if tag != 'row':
+                    continue
+
+                row_number = int(elem.get('r', expected_row))
+                if max_row is not None and row_number > max_row:
+                    break
+                while expected_row < row_number:
+                    yield ()
+                    expected_row += 1
+
+                yield self._row_values(elem, shared_strings, date_styles)
+                expected_row = row_number + 1
+
+                # Drop the parsed row so the tree never holds more than one
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+    def _row_values(self, row_elem, shared_strings: List[str], date_styles: Set[int]) -> Tuple[Any, ...]:
+        values: Dict[int, Any] = {}
+        position = 0
+        for cell in row_elem:
+            if _local(cell.tag) != 'c':
+                continue
+            match = _CELL_REF.match(cell.get('r', ''))
+            if match:
+                position = _column_index(match.group(1))
+            values[position] = self._cell_value(cell, shared_strings, date_styles)
+            position += 1
+
+        if not values:
+            return ()
+        row = [None] * (max(values) + 1)
+        for index, value in values.items():
+            row[index] = value
+        return tuple(row)
+
+    def _cell_value(self, cell, shared_strings: List[str], date_styles: Set[int]):
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            for child in cell:
+                if _local(child.tag) == 'is':
+                    return ''.join(t.text or '' for t in child.iter() if _local(t.tag) == 't')
+            return None
+
+        text = None
+        for child in cell:
+            if _local(child.tag) == 'v':
+                text = child.text
+                break
+        if text is None:
+            return None
+
+        if cell_type == 's':
+            index = int(text)
+            return shared_strings[index] if 0 <= index < len(shared_strings) else text
+        if cell_type == 'b':
+            return text == '1'
+        if cell_type in ('str', 'e'):
+            return text
+        if cell_type == 'd':
+            try:
+                return datetime.fromisoformat(text)
+            except ValueError:
+                return text
+
+        try:
+            number = _cast_number(text)
+        except ValueError:
+            return text
+        if int(cell.get('s', 0)) in date_styles:
+            try:
+                return self._epoch + timedelta(days=number)
+            except OverflowError:
+                return number
+        return number
+
+    def _read_workbook(self):
+        """Sheet names, their parts (via workbook.xml.rels), date system and active tab."""
+        if 'xl/workbook.xml' not in self._names:
+            raise ValueError("Not a valid .xlsx file: xl/workbook.xml is missing")
+
+        targets: Dict[str, str] = {}
+        if 'xl/_rels/workbook.xml.rels' in self._names:
+            with self._zip.open('xl/_rels/workbook.xml.rels') as rels_file:
+                for rel in ET.parse(rels_file).getroot():
+                    target = rel.get('Target', '')
+                    # Targets are relative to xl/ unless absolute within the package
+                    path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                    targets[rel.get('Id')] = path
+
+        with self._zip.open('xl/workbook.xml') as workbook_file:
+            root = ET.parse(workbook_file).getroot()
+
+        for elem in root.iter():
+            tag = _local(elem.tag)
+            if tag == 'workbookPr' and elem.get('date1904') in ('1', 'true'):
+                self._epoch = datetime(1904, 1, 1)
+            elif tag == 'workbookView':
+                self._active_index = int(elem.get('activeTab', 0))
+            elif tag == 'sheet':
+                rel_id = elem.get(f'{{{REL_NS}}}id') or elem.get(f'{{{STRICT_REL_NS}}}id')
+                part = targets.get(rel_id)
+                if part is None:
+                    # No relationship: fall back to the conventional part name
+                    part = f"xl/worksheets/sheet{len(self._sheets) + 1}.xml"
+                self._sheets.append((elem.get('name', f"Sheet{len(self._sheets) + 1}"), part))
+
+        logger.debug(f"Workbook sheets: {self._sheets}")
+
+    def _sheet_part(self, sheet_name: Optional[str]) -> str:
+        if sheet_name is None:
+            sheet_name = self.active_sheet
+        for name, part in self._sheets:
+            if name == sheet_name:
+                if part not in self._names:
+                    raise ValueError(f"Sheet '{name}' data ({part}) is missing from the file")
+                return part
+        raise ValueError(f"Sheet '{sheet_name}' not found in workbook. Available sheets: {', '.join(self.sheet_names)}")
+
+    def _load_shared_strings(self) -> List[str]:
+        """Shared string table, streamed and cleared item by item."""
+        if self._shared_strings is not None:
+            return self._shared_strings
+
+        strings: List[str] = []
+        if 'xl/sharedStrings.xml' in self._names:
+            with self._zip.open('xl/sharedStrings.xml') as strings_file:
+                for _, elem in ET.iterparse(strings_file, events=('end',)):
+                    if _local(elem.tag) != 'si':
+                        continue
+                    # Plain text or rich-text runs; phonetic hints (rPh) are not part of the value
+                    parts = []
+                    for child in elem:
+                        child_tag = _local(child.tag)
+                        if child_tag == 't':
+                            parts.append(child.text or '')
+                        elif child_tag == 'r':
+                            parts.extend(t.text or '' for t in child if _local(t.tag) == 't')
+                    strings.append(''.join(parts))
+                    elem.clear()
+
+        self._shared_strings = strings
+        return strings
+
+    def _load_date_styles(self) -> Set[int]:
+        """Indexes of cell styles (cellXfs) whose number format is a date."""
+        if self._date_styles is not None:
+            return self._date_styles
+
+        date_styles: Set[int] = set()
+        if 'xl/styles.xml' in self._names:
+            with self._zip.open('xl/styles.xml') as styles_file:
+                root = ET.parse(styles_file).getroot()
+
+            custom_dates = {int(fmt.get('numFmtId')) for fmt in root.iter()
+                            if _local(fmt.tag) == 'numFmt' and _is_date_format(fmt.get('formatCode', ''))}
+            for section in root:
+                if _local(section.tag) != 'cellXfs':
+                    continue
+                for index, xf in enumerate(child for child in section if _local(child.tag) == 'xf'):
+                    fmt_id = int(xf.get('numFmtId', 0))
+                    if fmt_id in BUILTIN_DATE_FORMATS or fmt_id in custom_dates:
+                        date_styles.add(index)
+
+        self._date_styles = date_styles
+        return date_styles
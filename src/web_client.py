@@ -4,28 +4,205 @@ This module handles real authentication and web interactions with the Portuguese
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import time
 import re
 import json
-from typing import Dict, Tuple, Any, Optional, List
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Tuple, Any, Optional, List, Mapping
 from urllib.parse import urljoin, urlparse
 
 try:
     from .utils.logger import get_logger
     from .utils.api_monitor import APIMonitor
+    from .utils.contract_cache import ContractCache
+    from .utils.receipt_form_parser import parse_receipt_form
+    from .utils.form_cache import ReceiptFormCache
+    from .utils.payload_log import log_payload, render_text
+    from .utils.retry_policy import (
+        GET_RETRY_POLICY, SubmissionRegistry, is_transient_error, is_transient_status,
+        receipt_dedup_key
+    )
+    from .utils.http_profiles import (
+        AUTH_BASE_URL, PORTAL_BASE_URL, AUTH_TIMEOUT, PAGE_TIMEOUT, API_TIMEOUT, SUBMIT_TIMEOUT,
+        NAVIGATE_HEADERS, XHR_JSON_HEADERS, XHR_FORM_HEADERS, USER_AGENT, with_headers
+    )
 except ImportError:
     # Fallback for when imported directly
     from utils.logger import get_logger
     from utils.api_monitor import APIMonitor
+    from utils.contract_cache import ContractCache
+    from utils.receipt_form_parser import parse_receipt_form
+    from utils.form_cache import ReceiptFormCache
+    from utils.payload_log import log_payload, render_text
+    from utils.retry_policy import (
+        GET_RETRY_POLICY, SubmissionRegistry, is_transient_error, is_transient_status,
+        receipt_dedup_key
+    )
+    from utils.http_profiles import (
+        AUTH_BASE_URL, PORTAL_BASE_URL, AUTH_TIMEOUT, PAGE_TIMEOUT, API_TIMEOUT, SUBMIT_TIMEOUT,
+        NAVIGATE_HEADERS, XHR_JSON_HEADERS, XHR_FORM_HEADERS, USER_AGENT, with_headers
+    )
 
 logger = get_logger(__name__)
 
+# Connections kept per portal host; covers the bulk processing and verification workers
+DEFAULT_POOL_SIZE = 10
+
+# Contract data (with rent values) for the logged-in landlord
+CONTRACTS_API_URL = f"{PORTAL_BASE_URL}/arrendamento/api/obterElementosContratosEmissaoRecibos/locador"
+
+
+def active_contracts(contracts_data: Optional[List[Dict]]) -> List[Dict]:
+    """Contracts from the contracts list whose estado is active (receipts can only be issued for these)."""
+    active = []
+    for contract in contracts_data or []:
+        estado = contract.get('estado', {})
+        if isinstance(estado, dict):
+            if estado.get('codigo', '').upper() == 'ACTIVO':
+                active.append(contract)
+        elif isinstance(estado, str):
+            # Handle case where estado might be a string
+            if estado.upper() in ['ACTIVO', 'ATIVO', 'ACTIVE']:
+                active.append(contract)
+    return active
+
+
+class AdaptiveRateLimiter:
+    """
+    Shared token-bucket rate limiter with AIMD rate adaptation.
+    
+    Every outbound request takes one token. Tokens refill at ``rate`` requests per
+    second up to ``burst``. The rate grows additively while the portal answers
+    quickly and is cut multiplicatively on 429/5xx responses, network failures or
+    when the smoothed response time rises above ``latency_threshold`` seconds.
+    """
+    
+    def __init__(self, initial_rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 8.0,
+                 burst: int = 4, increase_step: float = 0.25, decrease_factor: float = 0.5,
+                 latency_threshold: float = 2.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.burst = burst
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.latency_ewma: Optional[float] = None
+        
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+    
+    def _refill(self, now: float):
+        """Add the tokens earned since the last refill (caller holds the lock)."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._last_refill = now
+    
+    def acquire(self) -> float:
+        """
+        Block until the caller may send one request.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def reserve(self) -> float:
+        """
+        Take one token without waiting (for callers that wait asynchronously).
+        
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve a token now; a negative balance is the caller's place in the queue
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+    
+    def record_response(self, status_code: int, elapsed: float, retry_after: Optional[str] = None):
+        """Adapt the rate from the outcome of a completed request."""
+        with self._lock:
+            if status_code == 429 or status_code >= 500:
+                self._decrease(f"HTTP {status_code}")
+                if retry_after:
+                    try:
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + float(retry_after))
+                    except ValueError:
+                        pass
+                return
+            
+            if self.latency_ewma is None:
+                self.latency_ewma = elapsed
+            else:
+                self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * elapsed
+            
+            if self.latency_ewma > self.latency_threshold:
+                self._decrease(f"latency {self.latency_ewma:.2f}s")
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+    
+    def record_failure(self):
+        """Back off after a request failed without a response (timeout, connection error)."""
+        with self._lock:
+            self._decrease("request failure")
+    
+    def _decrease(self, reason: str):
+        """Multiplicative decrease (caller holds the lock)."""
+        new_rate = max(self.min_rate, self.rate * self.decrease_factor)
+        if new_rate < self.rate:
+            logger.warning(f"Rate limiter backing off ({reason}): {self.rate:.2f} -> {new_rate:.2f} req/s")
+        self.rate = new_rate
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter that routes every request through an AdaptiveRateLimiter."""
+    
+    def __init__(self, rate_limiter: AdaptiveRateLimiter, *args, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, *args, **kwargs):
+        self.rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.rate_limiter.record_failure()
+            raise
+        self.rate_limiter.record_response(
+            response.status_code,
+            time.monotonic() - started,
+            response.headers.get('Retry-After')
+        )
+        return response
+
+
 class WebClient:
     """Web client for Portal das Finanças interactions."""
     
-    def __init__(self):
-        """Initialize WebClient."""
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize WebClient.
+        
+        Args:
+            pool_size: Connections kept open per portal host; should be at least the
+                       number of threads issuing requests concurrently
+        """
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
@@ -45,12 +222,19 @@ class WebClient:
         })
         self.authenticated = False
         self.pending_2fa = False  # Flag to track if 2FA is pending
-        self.auth_base_url = "https://www.acesso.gov.pt"
+        self.auth_base_url = AUTH_BASE_URL
         # Updated login URLs based on actual Portuguese government authentication system
         # Using the original /v2/login endpoint that matches the HTTP request
         self.login_page_url = f"{self.auth_base_url}/v2/loginForm?partID=PFAP"
         self.login_url = f"{self.auth_base_url}/v2/login"
-        self.receipts_base_url = "https://imoveis.portaldasfinancas.gov.pt"
+        self.receipts_base_url = PORTAL_BASE_URL
+        # SICI redirect that transfers the acesso.gov.pt login to the rental portal
+        self.sici_redirect_url = f"{self.auth_base_url}/v2/loginForm?partID=SICI&path=/arrendamento/consultarElementosContratos/locador"
+        self.portal_page_url = f"{self.receipts_base_url}/arrendamento/consultarElementosContratos/locador"
+        self._portal_session_established = False  # Set after a successful SICI handshake
+        # Held while login, logout or the SICI handshake change the session's cookies and
+        # flags; worker threads wait for it before sending (requests.Session is shared)
+        self._session_lock = threading.RLock()
         self._csrf_token = None
         self._session_id = None
         self.login_attempts = 0
@@ -60,6 +244,33 @@ class WebClient:
         # Initialize API monitor
         self.api_monitor = APIMonitor()
         
+        # Contract list cache keyed by the logged-in user's NIF
+        self.contract_cache = ContractCache()
+        self.form_cache = ReceiptFormCache()  # Parsed receipt forms per (contract, versaoContrato)
+        
+        # All outbound calls share one adaptive request budget
+        self.rate_limiter = AdaptiveRateLimiter()
+        self._mount_adapters(pool_size)
+        
+        # Retries for idempotent portal reads (receipt submissions are never retried)
+        self.get_retry_policy = GET_RETRY_POLICY
+        self.submissions = SubmissionRegistry()  # Receipts issued in this session by dedup key
+        
+        # Navigation from the SICI redirect to the rental portal page (built once, read-only)
+        self._portal_navigation_profile = MappingProxyType({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+            'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
+            'Cache-Control': 'max-age=0',
+            'Connection': 'keep-alive',
+            'Referer': self.sici_redirect_url,
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'cross-site',
+            'Sec-Fetch-User': '?1',
+            'Upgrade-Insecure-Requests': '1',
+            'User-Agent': USER_AGENT
+        })
+        
         # Keep SSL verification enabled for security
         self.session.verify = True
         
@@ -70,6 +281,69 @@ class WebClient:
     
 
     
+    def _mount_adapters(self, pool_size: int):
+        """
+        Mount rate-limited transport adapters with a dedicated pool per portal host.
+        
+        The authentication and rental portal hosts each get pool_size keep-alive
+        connections; pool_block makes extra threads wait for a free connection
+        instead of opening one that would be discarded. Connection failures (where
+        nothing reached the server) are retried twice with backoff; anything else is
+        left to the caller.
+        """
+        retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1)
+        for base_url in (AUTH_BASE_URL, PORTAL_BASE_URL):
+            self.session.mount(f"{base_url}/", RateLimitedAdapter(
+                self.rate_limiter,
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                pool_block=True,
+                max_retries=retries
+            ))
+        
+        # Any other host (redirect targets, logout endpoints)
+        default_adapter = RateLimitedAdapter(self.rate_limiter, max_retries=retries)
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET a portal resource, retrying transient failures with backoff.
+        
+        Timeouts, connection errors and transient statuses (429, 5xx) are retried
+        under get_retry_policy. Only for idempotent reads - never for submissions.
+        
+        Args:
+            url: URL to fetch
+            **kwargs: Passed to session.get
+            
+        Returns:
+            The first non-transient response, or the last response once attempts run out
+            
+        Raises:
+            requests.exceptions.RequestException: If the last attempt raised
+        """
+        policy = self.get_retry_policy
+        attempt = 1
+        while True:
+            self._wait_for_session()
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if attempt >= policy.max_attempts or not is_transient_error(e):
+                    raise
+                policy.wait(attempt, f"{type(e).__name__} on {url}")
+            else:
+                if attempt >= policy.max_attempts or not is_transient_status(response.status_code):
+                    return response
+                policy.wait(attempt, f"HTTP {response.status_code} on {url}")
+            attempt += 1
+    
+    def _wait_for_session(self):
+        """Block while another thread is logging in, logging out or doing the SICI handshake."""
+        with self._session_lock:
+            pass
+    
     def _find_credential_fields(self) -> Tuple[str, str]:
         """Find the actual username and password field names for SPA authentication."""
         # For the Portuguese government SPA, the field names are standard
@@ -111,7 +385,7 @@ class WebClient:
         try:
             logger.info("Testing connection to Autenticação.Gov...")
             
-            response = self.session.get(self.login_page_url, timeout=10)
+            response = self.session.get(self.login_page_url, timeout=AUTH_TIMEOUT)
             response.raise_for_status()
             
             logger.info(f"Connection response: Status {response.status_code}, URL: {response.url}")
@@ -146,7 +420,7 @@ class WebClient:
         try:
             logger.info("Extracting CSRF token data from login page...")
             
-            response = self.session.get(self.login_page_url, timeout=10)
+            response = self.session.get(self.login_page_url, timeout=AUTH_TIMEOUT)
             response.raise_for_status()
             
             import re
@@ -255,7 +529,7 @@ class WebClient:
             logger.info("Fetching login form data from modern SPA...")
             
             # Make sure we visit the login page first to establish session cookies
-            response = self.session.get(self.login_page_url, timeout=10)
+            response = self.session.get(self.login_page_url, timeout=AUTH_TIMEOUT)
             response.raise_for_status()
             
             logger.info(f"Login page response: Status {response.status_code}")
@@ -334,13 +608,13 @@ class WebClient:
             
             # Visit the main portal first to establish session
             portal_url = "https://www.portaldasfinancas.gov.pt"
-            response = self.session.get(portal_url, timeout=10)
+            response = self.session.get(portal_url, timeout=AUTH_TIMEOUT)
             response.raise_for_status()
             
             logger.info(f"Portal visit successful: {response.status_code}")
             
             # Then visit the login page to get proper cookies
-            response = self.session.get(self.login_page_url, timeout=10)
+            response = self.session.get(self.login_page_url, timeout=AUTH_TIMEOUT)
             response.raise_for_status()
             
             logger.info(f"Login page visit successful: {response.status_code}")
@@ -354,6 +628,14 @@ class WebClient:
 
     def login(self, username: str, password: str, sms_code: str = None) -> Tuple[bool, str]:
         """Login to Autenticação.Gov with optional 2FA SMS verification."""
+        with self._session_lock:
+            success, message = self._login(username, password, sms_code)
+            if success:
+                self._reset_submissions()
+            return success, message
+    
+    def _login(self, username: str, password: str, sms_code: str = None) -> Tuple[bool, str]:
+        """Login steps; the caller holds _session_lock."""
         if self.login_attempts >= self.max_login_attempts:
             return False, "Maximum login attempts exceeded. Please wait before trying again."
         
@@ -423,7 +705,7 @@ class WebClient:
                     self.login_url,
                     json=form_data,
                     headers=json_headers,
-                    timeout=15,
+                    timeout=PAGE_TIMEOUT,
                     allow_redirects=False  # Handle redirects manually
                 )
                 
@@ -438,7 +720,7 @@ class WebClient:
                     redirect_url = json_response.headers.get('Location')
                     if redirect_url:
                         logger.info(f"Following redirect to: {redirect_url}")
-                        redirect_response = self.session.get(redirect_url, timeout=15)
+                        redirect_response = self.session.get(redirect_url, timeout=PAGE_TIMEOUT)
                         return self._analyze_login_response(redirect_response)
                 elif json_response.status_code == 403:
                     if 'invalidCsrfToken' in json_response.text:
@@ -464,7 +746,7 @@ class WebClient:
             response = self.session.post(
                 self.login_url,
                 data=form_data,
-                timeout=15,
+                timeout=PAGE_TIMEOUT,
                 allow_redirects=True
             )
             response.raise_for_status()
@@ -663,7 +945,7 @@ class WebClient:
             response = self.session.post(
                 self.login_url,
                 data=form_data,
-                timeout=15,
+                timeout=PAGE_TIMEOUT,
                 allow_redirects=True
             )
             response.raise_for_status()
@@ -732,6 +1014,11 @@ class WebClient:
     
     def logout(self) -> Tuple[bool, str]:
         """Logout from the current session."""
+        with self._session_lock:
+            return self._logout()
+    
+    def _logout(self) -> Tuple[bool, str]:
+        """Logout steps; the caller holds _session_lock."""
         if not self.authenticated:
             return True, "Already logged out"
         
@@ -748,13 +1035,17 @@ class WebClient:
                 logout_url,
                 params=logout_params,
                 allow_redirects=True,
-                timeout=10
+                timeout=AUTH_TIMEOUT
             )
             
             logger.info(f"Logout response status: {response.status_code}")
             
             # Clear client-side session data
+            self._clear_cache()
+            self.form_cache.invalidate()
+            self._reset_submissions()
             self.authenticated = False
+            self._portal_session_established = False
             self.session.cookies.clear()
             self.login_attempts = 0  # Reset login attempts
             self._current_username = None  # Clear stored username
@@ -766,17 +1057,24 @@ class WebClient:
         except Exception as e:
             logger.error(f"Error during logout: {str(e)}")
             # Still clear client-side data even if server call fails
+            self._clear_cache()
+            self.form_cache.invalidate()
+            self._reset_submissions()
             self.authenticated = False
+            self._portal_session_established = False
             self.session.cookies.clear()
             self.login_attempts = 0
             self._current_username = None
             self.pending_2fa = False
             return False, f"Logout failed: {str(e)}"
     
-    def get_contracts_list(self) -> Tuple[bool, Any]:
+    def get_contracts_list(self, force_refresh: bool = False) -> Tuple[bool, Any]:
         """
         Get the list of available contracts from Portal das Finanças.
         This method would be implemented to fetch rental contracts.
+        
+        Args:
+            force_refresh: Revalidate with the portal instead of using cached contract data
         """
         if not self.authenticated:
             return False, "Not authenticated"
@@ -786,7 +1084,7 @@ class WebClient:
         logger.info("Getting contracts list - Real API call in testing mode")
         
         # Call the real method which returns 3 values: (success, data, message)
-        success, contracts_data, message = self.get_contracts_with_tenant_data()
+        success, contracts_data, message = self.get_contracts_with_tenant_data(force_refresh=force_refresh)
         
         if not success:
             logger.error(f"Failed to retrieve contracts: {message}")
@@ -819,13 +1117,17 @@ class WebClient:
         # This is a placeholder - actual implementation would submit receipt data
         return True, "Receipt submitted successfully"
     
-    def get_receipt_form(self, contract_id: str) -> Tuple[bool, Dict]:
+    def get_receipt_form(self, contract_id: str, use_cache: bool = True) -> Tuple[bool, Dict]:
         """
         Get receipt form data for a specific contract.
           CRITICAL: This method should ONLY be called when actually issuing receipts!
         
+        Parsed forms are cached per (contract ID, versaoContrato), so retries and
+        re-runs in the same session skip the criarRecibo fetch.
+        
         Args:
             contract_id: Contract ID to get form data for
+            use_cache: Return a cached form for the contract's current version if available
             
         Returns:
             Tuple of (success, form_data)
@@ -844,30 +1146,40 @@ class WebClient:
         logger.info("CRITICAL: This call should only happen during actual receipt issuing!")
         
         try:
+            if use_cache:
+                cached_form = self.form_cache.get(contract_id)
+                if cached_form is not None:
+                    logger.info(f"Using cached receipt form for contract {contract_id} (version {cached_form.get('versaoContrato')})")
+                    return True, cached_form
+            
             # Get the receipt creation form for the specific contract
             form_url = f"{self.receipts_base_url}/arrendamento/criarRecibo/{contract_id}"
             logger.info(f"Fetching receipt form from: {form_url}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': f'{self.receipts_base_url}/arrendamento/consultarElementosContratos/locador',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
+            response = self._get(form_url, headers=NAVIGATE_HEADERS, timeout=API_TIMEOUT)
+            return self._process_receipt_form_response(contract_id, form_url, response)
             
-            response = self.session.get(form_url, headers=headers, timeout=30)
+        except Exception as e:
+            logger.error(f"Error getting receipt form for contract {contract_id}: {str(e)}")
+            return False, None
+    
+    def _process_receipt_form_response(self, contract_id: str, form_url: str, response) -> Tuple[bool, Dict]:
+        """
+        Turn a criarRecibo page response into form data and cache it.
+        
+        Args:
+            contract_id: Contract the form belongs to
+            form_url: URL the form was fetched from
+            response: requests.Response or async_web_client.PortalResponse
             
+        Returns:
+            Tuple of (success, form_data)
+        """
+        try:
             if response.status_code != 200:
                 logger.error(f"Failed to get receipt form. Status: {response.status_code}")
                 return False, None
             
-            # Parse the HTML to extract form data
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # Extract contract information from the page
             form_data = {
                 'contractId': contract_id,
@@ -875,317 +1187,47 @@ class WebClient:
                 'html_content': response.text[:1000]  # First 1000 chars for debugging
             }
             
-            # Look for Angular scope data that contains contract details
-            script_tags = soup.find_all('script')
-            contract_details = {}
-            
-            for script in script_tags:
-                if script.string and 'recibo' in script.string:
-                    # Extract contract data from JavaScript
-                    script_content = script.string
-                    if 'numContrato' in script_content:
-                        # Found the contract data - try to extract key information
-                        logger.info("Found contract data in JavaScript")
-                        
-                        # Try to extract contract number
-                        contract_match = re.search(r'"numContrato":\s*(\d+)', script_content)
-                        if contract_match:
-                            contract_details['numContrato'] = int(contract_match.group(1))
-                        
-                        # Try to extract NIF emitente
-                        nif_match = re.search(r'"nifEmitente":\s*(\d+)', script_content)
-                        if nif_match:
-                            contract_details['nifEmitente'] = int(nif_match.group(1))
-                        
-                        # Try to extract landlord name
-                        landlord_match = re.search(r'"nomeEmitente":\s*"([^"]+)"', script_content)
-                        if landlord_match:
-                            contract_details['nomeEmitente'] = landlord_match.group(1).strip()
-                        
-                        # Try to extract contract version
-                        version_match = re.search(r'"versaoContrato":\s*(\d+)', script_content)
-                        if version_match:
-                            contract_details['versaoContrato'] = int(version_match.group(1))
-                        
-                        # Try to extract rent value (valorRenda) - PREFERRED SOURCE
-                        rent_value_match = re.search(r'"valorRenda":\s*([0-9]+\.?[0-9]*)', script_content)
-                        if rent_value_match:
-                            contract_details['valorRenda'] = float(rent_value_match.group(1))
-                            logger.info(f"EXTRACTED valorRenda from receipt form: €{contract_details['valorRenda']}")
-                        else:
-                            logger.info("valorRenda not found in receipt form JavaScript")
-                        
-                        # Try to extract tenant data including NIF for ALL tenants
-                        # Look for locatarios array in the JavaScript
-                        locatarios_pattern = r'"locatarios":\s*\[(.*?)\]'
-                        locatarios_match = re.search(locatarios_pattern, script_content, re.DOTALL)
-                        if locatarios_match:
-                            locatarios_data = locatarios_match.group(1)
-                            logger.info("Found locatarios data in JavaScript")
-                            
-                            # Parse all tenants from the array
-                            tenants_list = []
-                            
-                            # Try to parse the full JSON structure first
-                            try:
-                                import json
-                                # Extract the full locatarios array as valid JSON
-                                full_array_pattern = r'"locatarios":\s*(\[.*?\])'
-                                full_array_match = re.search(full_array_pattern, script_content, re.DOTALL)
-                                if full_array_match:
-                                    locatarios_json = full_array_match.group(1)
-                                    # Clean up the JSON (remove any trailing commas, etc.)
-                                    locatarios_json = re.sub(r',\s*}', '}', locatarios_json)
-                                    locatarios_json = re.sub(r',\s*]', ']', locatarios_json)
-                                    
-                                    tenants_array = json.loads(locatarios_json)
-                                    
-                                    for i, tenant in enumerate(tenants_array):
-                                        tenant_info = {
-                                            'nif': tenant.get('nif'),
-                                            'nome': tenant.get('nome', '').strip(),
-                                            'pais': tenant.get('pais', {}),
-                                            'retencao': tenant.get('retencao', {})
-                                        }
-                                        tenants_list.append(tenant_info)
-                                        logger.info(f"Extracted tenant {i+1}: NIF={tenant_info['nif']}, Name={tenant_info['nome']}")
-                                    
-                                    contract_details['locatarios'] = tenants_list
-                                    contract_details['tenant_count'] = len(tenants_list)
-                                    logger.info(f"Extracted {len(tenants_list)} tenants from JavaScript")
-                                    
-                            except (json.JSONDecodeError, ValueError) as e:
-                                logger.warning(f"Failed to parse locatarios JSON, falling back to regex: {e}")
-                                
-                                # Fallback to regex parsing for individual tenant objects
-                                # Find all tenant objects in the array
-                                tenant_objects = re.findall(r'\{[^}]*"nif"[^}]*\}', locatarios_data, re.DOTALL)
-                                
-                                for i, tenant_obj in enumerate(tenant_objects):
-                                    # Extract NIF
-                                    nif_match = re.search(r'"nif":\s*(\d+)', tenant_obj)
-                                    # Extract name
-                                    name_match = re.search(r'"nome":\s*"([^"]+)"', tenant_obj)
-                                    
-                                    if nif_match or name_match:
-                                        tenant_info = {
-                                            'nif': int(nif_match.group(1)) if nif_match else None,
-                                            'nome': name_match.group(1).strip() if name_match else '',
-                                            'pais': {"codigo": "2724", "label": "PORTUGAL"},
-                                            'retencao': {
-                                                "taxa": 0,
-                                                "codigo": "RIRS03", 
-                                                "label": "Dispensa de retenção - artigo 101.º-B, n.º 1, do CIRS"
-                                            }
-                                        }
-                                        tenants_list.append(tenant_info)
-                                        logger.info(f"Extracted tenant {i+1} (regex): NIF={tenant_info['nif']}, Name={tenant_info['nome']}")
-                                
-                                contract_details['locatarios'] = tenants_list
-                                contract_details['tenant_count'] = len(tenants_list)
-                                logger.info(f"Extracted {len(tenants_list)} tenants using regex fallback")
-                            
-                            # For backward compatibility, also set the first tenant's data individually
-                            if tenants_list:
-                                contract_details['tenant_nif'] = tenants_list[0]['nif']
-                                contract_details['tenant_name'] = tenants_list[0]['nome']
-                                logger.info(f"Primary tenant: NIF={contract_details['tenant_nif']}, Name={contract_details['tenant_name']}")
-                            else:
-                                logger.warning("No tenant data could be extracted from locatarios array")
-                        
-                        # Try to extract landlord data including NIF for ALL landlords
-                        # Look for locadores array in the JavaScript
-                        locadores_pattern = r'"locadores":\s*\[(.*?)\]'
-                        locadores_match = re.search(locadores_pattern, script_content, re.DOTALL)
-                        if locadores_match:
-                            logger.info("Found locadores data in JavaScript")
-                            
-                            # Parse all landlords from the array
-                            landlords_list = []
-                            
-                            try:
-                                # Try to parse the full JSON structure first
-                                full_array_pattern = r'"locadores":\s*(\[.*?\])'
-                                full_array_match = re.search(full_array_pattern, script_content, re.DOTALL)
-                                if full_array_match:
-                                    locadores_json = full_array_match.group(1)
-                                    # Clean up the JSON
-                                    locadores_json = re.sub(r',\s*}', '}', locadores_json)
-                                    locadores_json = re.sub(r',\s*]', ']', locadores_json)
-                                    
-                                    landlords_array = json.loads(locadores_json)
-                                    
-                                    for i, landlord in enumerate(landlords_array):
-                                        landlord_info = {
-                                            'nif': landlord.get('nif'),
-                                            'nome': landlord.get('nome', '').strip(),
-                                            'quotaParte': landlord.get('quotaParte', '1/1'),
-                                            'sujeitoPassivo': landlord.get('sujeitoPassivo', 'V')
-                                        }
-                                        landlords_list.append(landlord_info)
-                                        logger.info(f"Extracted landlord {i+1}: NIF={landlord_info['nif']}, Name={landlord_info['nome']}")
-                                    
-                                    contract_details['locadores'] = landlords_list
-                                    contract_details['landlord_count'] = len(landlords_list)
-                                    logger.info(f"Extracted {len(landlords_list)} landlords from JavaScript")
-                                    
-                            except (json.JSONDecodeError, ValueError) as e:
-                                logger.warning(f"Failed to parse locadores JSON, falling back to regex: {e}")
-                                
-                                # Fallback to regex parsing for individual landlord objects
-                                landlord_objects = re.findall(r'\{[^}]*"nif"[^}]*\}', locadores_match.group(1), re.DOTALL)
-                                
-                                for i, landlord_obj in enumerate(landlord_objects):
-                                    # Extract NIF
-                                    nif_match = re.search(r'"nif":\s*(\d+)', landlord_obj)
-                                    # Extract name
-                                    name_match = re.search(r'"nome":\s*"([^"]+)"', landlord_obj)
-                                    # Extract quota parte
-                                    quota_match = re.search(r'"quotaParte":\s*"([^"]+)"', landlord_obj)
-                                    
-                                    if nif_match or name_match:
-                                        landlord_info = {
-                                            'nif': int(nif_match.group(1)) if nif_match else None,
-                                            'nome': name_match.group(1).strip() if name_match else '',
-                                            'quotaParte': quota_match.group(1) if quota_match else '1/1',
-                                            'sujeitoPassivo': 'V'
-                                        }
-                                        landlords_list.append(landlord_info)
-                                        logger.info(f"Extracted landlord {i+1} (regex): NIF={landlord_info['nif']}, Name={landlord_info['nome']}")
-                                
-                                contract_details['locadores'] = landlords_list
-                                contract_details['landlord_count'] = len(landlords_list)
-                                logger.info(f"Extracted {len(landlords_list)} landlords using regex fallback")
-                            
-                            # For backward compatibility, also set the first landlord's data individually
-                            if landlords_list:
-                                contract_details['landlord_nif'] = landlords_list[0]['nif']
-                                contract_details['landlord_name'] = landlords_list[0]['nome']
-                                logger.info(f"Primary landlord: NIF={contract_details['landlord_nif']}, Name={contract_details['landlord_name']}")
-                            else:
-                                logger.warning("No landlord data could be extracted from locadores array")
-                        
-                        # Check for inheritance case (hasNifHerancaIndivisa)
-                        inheritance_match = re.search(r'"hasNifHerancaIndivisa":\s*(true|false)', script_content)
-                        if inheritance_match:
-                            has_inheritance = inheritance_match.group(1) == 'true'
-                            contract_details['hasNifHerancaIndivisa'] = has_inheritance
-                            logger.info(f"Inheritance flag detected: {has_inheritance}")
-                            
-                            if has_inheritance:
-                                # Extract inheritance-specific data
-                                
-                                # Extract locadoresHerancaIndivisa
-                                heranca_pattern = r'"locadoresHerancaIndivisa":\s*(\[.*?\])'
-                                heranca_match = re.search(heranca_pattern, script_content, re.DOTALL)
-                                if heranca_match:
-                                    try:
-                                        heranca_json = heranca_match.group(1)
-                                        heranca_json = re.sub(r',\s*}', '}', heranca_json)
-                                        heranca_json = re.sub(r',\s*]', ']', heranca_json)
-                                        
-                                        heranca_landlords = json.loads(heranca_json)
-                                        contract_details['locadoresHerancaIndivisa'] = heranca_landlords
-                                        logger.info(f"Extracted {len(heranca_landlords)} inheritance landlords")
-                                        
-                                    except (json.JSONDecodeError, ValueError) as e:
-                                        logger.warning(f"Failed to parse locadoresHerancaIndivisa: {e}")
-                                        contract_details['locadoresHerancaIndivisa'] = []
-                                
-                                # Extract herdeiros (heirs)
-                                herdeiros_pattern = r'"herdeiros":\s*(\[.*?\])'
-                                herdeiros_match = re.search(herdeiros_pattern, script_content, re.DOTALL)
-                                if herdeiros_match:
-                                    try:
-                                        herdeiros_json = herdeiros_match.group(1)
-                                        herdeiros_json = re.sub(r',\s*}', '}', herdeiros_json)
-                                        herdeiros_json = re.sub(r',\s*]', ']', herdeiros_json)
-                                        
-                                        heirs = json.loads(herdeiros_json)
-                                        contract_details['herdeiros'] = heirs
-                                        logger.info(f"Extracted {len(heirs)} heirs information")
-                                        
-                                        # Log heir details for debugging
-                                        for i, heir in enumerate(heirs):
-                                            heir_nif = heir.get('nifHerdeiro')
-                                            quota = heir.get('quotaParte')
-                                            logger.info(f"Heir {i+1}: NIF={heir_nif}, Quota={quota}")
-                                        
-                                    except (json.JSONDecodeError, ValueError) as e:
-                                        logger.warning(f"Failed to parse herdeiros: {e}")
-                                        contract_details['herdeiros'] = []
-                                
-                                logger.info("Successfully extracted inheritance data from receipt form")
-                            else:
-                                # Set default empty values for non-inheritance cases
-                                contract_details['locadoresHerancaIndivisa'] = []
-                                contract_details['herdeiros'] = []
-                        else:
-                            # Default values if inheritance flag not found
-                            contract_details['hasNifHerancaIndivisa'] = False
-                            contract_details['locadoresHerancaIndivisa'] = []
-                            contract_details['herdeiros'] = []
-                        
-                        # Try to extract imoveis (property) data - COMPLETE STRUCTURE
-                        imoveis_pattern = r'"imoveis":\s*(\[.*?\])'
-                        imoveis_match = re.search(imoveis_pattern, script_content, re.DOTALL)
-                        if imoveis_match:
-                            logger.info("Found imoveis data in JavaScript")
-                            
-                            try:
-                                # Parse the full imoveis array as JSON
-                                imoveis_json = imoveis_match.group(1)
-                                logger.debug(f"Raw imoveis JSON (first 500 chars): {imoveis_json[:500]}")
-                                
-                                # Clean up the JSON
-                                imoveis_json = re.sub(r',\s*}', '}', imoveis_json)
-                                imoveis_json = re.sub(r',\s*]', ']', imoveis_json)
-                                
-                                imoveis_array = json.loads(imoveis_json)
-                                contract_details['imoveis'] = imoveis_array
-                                logger.info(f"Extracted {len(imoveis_array)} properties from JavaScript")
-                                
-                                # Log property details for debugging
-                                for i, prop in enumerate(imoveis_array):
-                                    prop_address = prop.get('morada', 'N/A')
-                                    prop_artigo = prop.get('artigo', 'N/A')
-                                    prop_alternate_id = prop.get('alternateId', 'N/A')
-                                    prop_codigo_postal = prop.get('codigoPostal', 'N/A')
-                                    logger.info(f"Property {i+1}: Address={prop_address[:50] if prop_address != 'N/A' else 'N/A'}..., Artigo={prop_artigo}, AlternateId={prop_alternate_id}, PostalCode={prop_codigo_postal}")
-                                
-                                # For backward compatibility, also set the first property's address
-                                if imoveis_array:
-                                    contract_details['property_address'] = imoveis_array[0].get('morada', '')
-                                    logger.info(f"Primary property address: {contract_details['property_address'][:50] if contract_details['property_address'] else 'N/A'}...")
-                                    
-                            except (json.JSONDecodeError, ValueError) as e:
-                                logger.error(f"Failed to parse imoveis JSON: {e}")
-                                logger.debug(f"Problematic JSON (first 1000 chars): {imoveis_json[:1000] if 'imoveis_json' in locals() else 'Not extracted'}")
-                                logger.warning("Falling back to minimal imoveis structure")
-                                
-                                # Fallback to extracting just the address
-                                imoveis_data = imoveis_match.group(1)
-                                address_match = re.search(r'"morada":\s*"([^"]+)"', imoveis_data)
-                                if address_match:
-                                    contract_details['property_address'] = address_match.group(1).strip()
-                                    # Create minimal imoveis structure as fallback
-                                    contract_details['imoveis'] = [{
-                                        "morada": contract_details['property_address'],
-                                        "tipo": {"codigo": "U", "label": "Urbano"},
-                                        "parteComum": False,
-                                        "bemOmisso": False,
-                                        "novo": False,
-                                        "editableMode": False,
-                                        "ordem": 1
-                                    }]
-                        
-                        form_data['contract_details'] = contract_details
-                        form_data['has_contract_data'] = True
-                        break
+            # Decode the receipt data embedded for the Angular controller
+            contract_details = parse_receipt_form(response.text) or {}
+            
+            if contract_details:
+                logger.info("Found contract data in JavaScript")
+                if 'valorRenda' in contract_details:
+                    logger.info(f"EXTRACTED valorRenda from receipt form: €{contract_details['valorRenda']}")
+                else:
+                    logger.info("valorRenda not found in receipt form JavaScript")
+                
+                if 'locatarios' in contract_details:
+                    logger.info(f"Extracted {contract_details['tenant_count']} tenants from JavaScript")
+                    if contract_details['locatarios']:
+                        logger.info(f"Primary tenant: NIF={contract_details['tenant_nif']}, Name={contract_details['tenant_name']}")
+                    else:
+                        logger.warning("No tenant data could be extracted from locatarios array")
+                
+                if 'locadores' in contract_details:
+                    logger.info(f"Extracted {contract_details['landlord_count']} landlords from JavaScript")
+                    if contract_details['locadores']:
+                        logger.info(f"Primary landlord: NIF={contract_details['landlord_nif']}, Name={contract_details['landlord_name']}")
+                    else:
+                        logger.warning("No landlord data could be extracted from locadores array")
+                
+                if contract_details['hasNifHerancaIndivisa']:
+                    logger.info(f"Inheritance flag detected: {len(contract_details['locadoresHerancaIndivisa'])} "
+                                f"inheritance landlords, {len(contract_details['herdeiros'])} heirs")
+                
+                if 'imoveis' in contract_details:
+                    logger.info(f"Extracted {len(contract_details['imoveis'])} properties from JavaScript")
+                
+                form_data['contract_details'] = contract_details
+                form_data['has_contract_data'] = True
             
             # Update form_data with extracted details
             form_data.update(contract_details)
             
+            # Only forms with contract data are worth reusing
+            if contract_details:
+                self.form_cache.put(contract_id, form_data)
+            
             logger.info(f"Successfully retrieved receipt form for contract {contract_id}")
             return True, form_data
             
@@ -1197,6 +1239,10 @@ class WebClient:
         """
         Issue a receipt with the provided data.
         
+        A receipt already issued in this session (same contract, dataInicio, dataFim
+        and valor) is not submitted again; its earlier result is returned with
+        'duplicate' set. Ambiguous failures are handled by _submit_receipt.
+        
         Args:
             submission_data: Receipt data to submit
             
@@ -1207,6 +1253,168 @@ class WebClient:
             logger.error(" RECEIPT ISSUE FAILED: Not authenticated")
             return False, None
         
+        contract_id = submission_data.get('numContrato', 'UNKNOWN')
+        receipt_value = submission_data.get('valor', 'UNKNOWN')
+        
+        duplicate_result, dedup_key = self._claim_submission(submission_data)
+        if duplicate_result is not None:
+            return duplicate_result
+        
+        success, response_data = False, None
+        try:
+            success, response_data = self._submit_receipt(submission_data, contract_id, receipt_value)
+            return success, response_data
+        finally:
+            self._release_submission(dedup_key, success, response_data)
+    
+    def _claim_submission(self, submission_data: Dict) -> Tuple[Optional[Tuple[bool, Dict]], Optional[Tuple]]:
+        """
+        Claim a receipt's dedup key before submitting it.
+        
+        Returns:
+            Tuple of (result to return instead of submitting, or None; claimed dedup key
+            to release after submitting, or None when the submission has no complete
+            identity and is not deduplicated)
+        """
+        contract_id = submission_data.get('numContrato', 'UNKNOWN')
+        dedup_key = receipt_dedup_key(submission_data)
+        if not all(dedup_key):
+            return None, None
+        
+        # Never submit a receipt twice in a session, nor while it is being submitted
+        issued, claimed = self.submissions.claim(dedup_key)
+        if issued is not None:
+            logger.warning(f"Receipt for contract {contract_id} ({dedup_key[1]} to {dedup_key[2]}, €{dedup_key[3]}) "
+                           f"already issued in this session as #{issued.get('receiptNumber')} - not submitting again")
+            return (True, {**issued, 'duplicate': True}), None
+        if not claimed and self.submissions.is_unconfirmed(dedup_key):
+            logger.warning(f"Receipt for contract {contract_id} ({dedup_key[1]} to {dedup_key[2]}) may already have been "
+                           f"issued in this session - not submitting again")
+            return (False, {
+                'success': False,
+                'ambiguous': True,
+                'error': 'An earlier submission of this receipt could not be confirmed - check the portal before issuing it again'
+            }), None
+        if not claimed:
+            logger.warning(f"Receipt for contract {contract_id} ({dedup_key[1]} to {dedup_key[2]}) is already being submitted")
+            return (False, {
+                'success': False,
+                'error': 'Duplicate submission: this receipt is already being submitted'
+            }), None
+        return None, dedup_key
+    
+    def _release_submission(self, dedup_key: Optional[Tuple], success: bool, response_data: Optional[Dict]):
+        """Release a claimed dedup key; ambiguous failures keep the receipt from being submitted again."""
+        if dedup_key:
+            ambiguous = not success and bool((response_data or {}).get('ambiguous'))
+            self.submissions.release(dedup_key, response_data if success else None, ambiguous=ambiguous)
+    
+    def mark_not_issued(self, contract_id: str, from_date: str, to_date: str) -> int:
+        """
+        Allow a receipt of unknown outcome to be submitted again in this session.
+        
+        Only call this after checking the portal: the earlier submission may have
+        issued the receipt.
+        
+        Args:
+            contract_id: Contract number
+            from_date: Start of the rent period
+            to_date: End of the rent period
+            
+        Returns:
+            Number of unconfirmed submissions released (0 if none matched)
+        """
+        key = receipt_dedup_key({'numContrato': contract_id, 'dataInicio': from_date, 'dataFim': to_date})[:3]
+        released = self.submissions.mark_not_issued(key)
+        if released:
+            logger.info(f"Receipt for contract {contract_id} ({from_date} to {to_date}) marked as not issued - "
+                        f"it may be submitted again")
+        return released
+    
+    def _reset_submissions(self):
+        """Start a new submission registry; the caller holds _session_lock."""
+        forgotten = self.submissions.clear()
+        if forgotten:
+            logger.warning(f"Forgetting {forgotten} receipt submission(s) of unknown outcome - "
+                           f"check them on the portal before issuing them again")
+    
+    def _submit_receipt(self, submission_data: Dict, contract_id: Any, receipt_value: Any) -> Tuple[bool, Dict]:
+        """
+        POST a receipt once, without ever issuing it twice.
+        
+        After a timeout, dropped connection or transient HTTP status the receipt may
+        or may not have been issued, and the POST is not repeated: see
+        _ambiguous_submission_result.
+        
+        Args:
+            submission_data: Receipt data to submit
+            contract_id: Contract number (for logging)
+            receipt_value: Receipt value (for logging)
+            
+        Returns:
+            Tuple of (success, response_data)
+        """
+        try:
+            api_url, headers, payload = self._prepare_receipt_submission(submission_data)
+            
+            try:
+                # Submit the receipt
+                self._wait_for_session()
+                response = self.session.post(
+                    api_url, 
+                    json=payload, 
+                    headers=headers, 
+                    timeout=SUBMIT_TIMEOUT
+                )
+            except requests.exceptions.RequestException as e:
+                if not is_transient_error(e):
+                    raise
+                _, response_data = self._issue_exception_result(e, submission_data, contract_id, receipt_value)
+                return self._ambiguous_submission_result(response_data, type(e).__name__, contract_id)
+            
+            success, response_data = self._process_issue_response(response, payload, contract_id, receipt_value)
+            if success or not is_transient_status(response.status_code):
+                return success, response_data
+            return self._ambiguous_submission_result(response_data, f"HTTP {response.status_code}", contract_id)
+                
+        except Exception as e:
+            return self._issue_exception_result(e, submission_data, contract_id, receipt_value)
+    
+    def _ambiguous_submission_result(self, response_data: Optional[Dict], reason: str,
+                                     contract_id: Any) -> Tuple[bool, Dict]:
+        """
+        Result of a submission that failed without a clear answer.
+        
+        The receipt may or may not have been issued, so the failure is marked
+        'ambiguous' and the receipt is not submitted again (see SubmissionRegistry).
+        
+        Args:
+            response_data: Failure result of the submission
+            reason: What went wrong (for logging)
+            contract_id: Contract number (for logging)
+            
+        Returns:
+            Tuple of (False, response_data)
+        """
+        logger.error(f"Could not confirm whether the receipt for contract {contract_id} was issued after {reason} "
+                     f"- not resubmitting")
+        return False, {
+            **(response_data or {}),
+            'success': False,
+            'ambiguous': True,
+            'error': f"{reason}: could not confirm whether the receipt was issued - check the portal before retrying"
+        }
+    
+    def _prepare_receipt_submission(self, submission_data: Dict) -> Tuple[str, Mapping[str, str], Dict]:
+        """
+        Log the submission and build the emitirRecibo request.
+        
+        Args:
+            submission_data: Receipt data to submit
+            
+        Returns:
+            Tuple of (api_url, headers, payload)
+        """
         # Heavy logging for receipt issuing - CRITICAL MONITORING
         contract_id = submission_data.get('numContrato', 'UNKNOWN')
         receipt_value = submission_data.get('valor', 'UNKNOWN')
@@ -1224,256 +1432,265 @@ class WebClient:
         logger.info(f"LANDLORD NAME: {submission_data.get('nomeEmitente')}")
         logger.info("=" * 80)
         
-        try:
-            # Prepare the receipt submission
-            api_url = f"{self.receipts_base_url}/arrendamento/api/emitirRecibo"
-            logger.info(f"RECEIPT API ENDPOINT: {api_url}")
-            
-            # Headers for JSON API call
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Content-Type': 'application/json;charset=UTF-8',
-                'Referer': f'{self.receipts_base_url}/arrendamento/criarRecibo/{submission_data.get("numContrato", "")}',
-                'Origin': self.receipts_base_url,
-                'Connection': 'keep-alive',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            logger.info(f"REFERER URL: {headers['Referer']}")
-            
-            # Prepare the payload based on the expected format
-            payload = {
-                "numContrato": submission_data.get('numContrato'),
-                "versaoContrato": submission_data.get('versaoContrato', 1),
-                "nifEmitente": submission_data.get('nifEmitente'),
-                "nomeEmitente": submission_data.get('nomeEmitente'),
-                "isNifEmitenteColetivo": submission_data.get('isNifEmitenteColetivo', False),
-                "valor": submission_data.get('valor'),
-                "tipoContrato": submission_data.get('tipoContrato'),
-                "locadores": submission_data.get('locadores', []),
-                "locatarios": submission_data.get('locatarios', []),
-                "imoveis": submission_data.get('imoveis', []),
-                "hasNifHerancaIndivisa": submission_data.get('hasNifHerancaIndivisa', False),
-                "locadoresHerancaIndivisa": submission_data.get('locadoresHerancaIndivisa', []),
-                "herdeiros": submission_data.get('herdeiros', []),
-                "dataInicio": submission_data.get('dataInicio'),
-                "dataFim": submission_data.get('dataFim'),
-                "dataRecebimento": submission_data.get('dataRecebimento'),
-                "tipoImportancia": submission_data.get('tipoImportancia', {
-                    "codigo": "RENDAC",
-                    "label": "Renda"
-                })
-            }
-            
-            # Log payload details for monitoring
-            logger.info("RECEIPT PAYLOAD DETAILS:")
-            logger.info(f"   Contract Version: {payload.get('versaoContrato')}")
-            logger.info(f"   Value: €{payload.get('valor')}")
-            logger.info(f"   Contract Type: {payload.get('tipoContrato')}")
-            logger.info(f"   Landlords Count: {len(payload.get('locadores', []))}")
-            logger.info(f"   Tenants Count: {len(payload.get('locatarios', []))}")
-            logger.info(f"    Properties Count: {len(payload.get('imoveis', []))}")
-            logger.info(f"     Has Inheritance: {payload.get('hasNifHerancaIndivisa')}")
-            logger.info(f"    Date Range: {payload.get('dataInicio')} → {payload.get('dataFim')}")
-            logger.info(f"    Payment Date: {payload.get('dataRecebimento')}")
-            
-            # Log full payload for debugging (be careful with sensitive data)
-            import json
-            payload_json = json.dumps(payload, indent=2, ensure_ascii=False, default=str)
-            logger.debug(f" FULL PAYLOAD JSON:\n{payload_json}")
-            
-            logger.info(" SUBMITTING RECEIPT TO PORTAL DAS FINANÇAS...")
-            
-            # Validate payload before submission
-            self.api_monitor.validate_api_call(
-                endpoint='/arrendamento/api/emitirRecibo',
-                method='POST',
-                payload=payload,
-                contract_id=str(contract_id)
-            )
-            
-            # Submit the receipt
-            response = self.session.post(
-                api_url, 
-                json=payload, 
-                headers=headers, 
-                timeout=60
-            )
-            
-            logger.info(f" RECEIPT SUBMISSION RESPONSE: HTTP {response.status_code}")
-            logger.info(f" Response Time: {response.elapsed.total_seconds():.2f} seconds")
-            logger.info(f" Response Size: {len(response.text)} bytes")
+        # Prepare the receipt submission
+        api_url = f"{self.receipts_base_url}/arrendamento/api/emitirRecibo"
+        logger.info(f"RECEIPT API ENDPOINT: {api_url}")
+        
+        # Headers for JSON API call; the referer is the contract's receipt form
+        headers = with_headers(
+            XHR_JSON_HEADERS,
+            Referer=f'{self.receipts_base_url}/arrendamento/criarRecibo/{submission_data.get("numContrato", "")}'
+        )
+        
+        logger.info(f"REFERER URL: {headers['Referer']}")
+        
+        # Prepare the payload based on the expected format
+        payload = {
+            "numContrato": submission_data.get('numContrato'),
+            "versaoContrato": submission_data.get('versaoContrato', 1),
+            "nifEmitente": submission_data.get('nifEmitente'),
+            "nomeEmitente": submission_data.get('nomeEmitente'),
+            "isNifEmitenteColetivo": submission_data.get('isNifEmitenteColetivo', False),
+            "valor": submission_data.get('valor'),
+            "tipoContrato": submission_data.get('tipoContrato'),
+            "locadores": submission_data.get('locadores', []),
+            "locatarios": submission_data.get('locatarios', []),
+            "imoveis": submission_data.get('imoveis', []),
+            "hasNifHerancaIndivisa": submission_data.get('hasNifHerancaIndivisa', False),
+            "locadoresHerancaIndivisa": submission_data.get('locadoresHerancaIndivisa', []),
+            "herdeiros": submission_data.get('herdeiros', []),
+            "dataInicio": submission_data.get('dataInicio'),
+            "dataFim": submission_data.get('dataFim'),
+            "dataRecebimento": submission_data.get('dataRecebimento'),
+            "tipoImportancia": submission_data.get('tipoImportancia', {
+                "codigo": "RENDAC",
+                "label": "Renda"
+            })
+        }
+        
+        # Log payload details for monitoring
+        logger.info("RECEIPT PAYLOAD DETAILS:")
+        logger.info(f"   Contract Version: {payload.get('versaoContrato')}")
+        logger.info(f"   Value: €{payload.get('valor')}")
+        logger.info(f"   Contract Type: {payload.get('tipoContrato')}")
+        logger.info(f"   Landlords Count: {len(payload.get('locadores', []))}")
+        logger.info(f"   Tenants Count: {len(payload.get('locatarios', []))}")
+        logger.info(f"    Properties Count: {len(payload.get('imoveis', []))}")
+        logger.info(f"     Has Inheritance: {payload.get('hasNifHerancaIndivisa')}")
+        logger.info(f"    Date Range: {payload.get('dataInicio')} → {payload.get('dataFim')}")
+        logger.info(f"    Payment Date: {payload.get('dataRecebimento')}")
+        
+        # Full payload for debugging (be careful with sensitive data); only
+        # serialised when DEBUG is enabled, sampled and capped per endpoint
+        log_payload(logger, logging.DEBUG, 'emitirRecibo.payload', " FULL PAYLOAD JSON", payload)
+        
+        logger.info(" SUBMITTING RECEIPT TO PORTAL DAS FINANÇAS...")
+        
+        # Validate payload before submission
+        self.api_monitor.validate_api_call(
+            endpoint='/arrendamento/api/emitirRecibo',
+            method='POST',
+            payload=payload,
+            contract_id=str(contract_id)
+        )
+        return api_url, headers, payload
+    
+    def _process_issue_response(self, response, payload: Dict, contract_id: Any, receipt_value: Any) -> Tuple[bool, Dict]:
+        """
+        Interpret the emitirRecibo response.
+        
+        Args:
+            response: requests.Response or async_web_client.PortalResponse
+            payload: Payload that was submitted
+            contract_id: Contract number (for logging)
+            receipt_value: Receipt value (for logging)
             
-            if response.status_code == 200:
-                logger.info(" RECEIPT SUBMISSION: HTTP 200 OK - Processing response...")
-                try:
-                    response_data = response.json()
+        Returns:
+            Tuple of (success, response_data)
+        """
+        logger.info(f" RECEIPT SUBMISSION RESPONSE: HTTP {response.status_code}")
+        logger.info(f" Response Time: {response.elapsed.total_seconds():.2f} seconds")
+        logger.info(f" Response Size: {len(response.text)} bytes")
+        
+        if response.status_code == 200:
+            logger.info(" RECEIPT SUBMISSION: HTTP 200 OK - Processing response...")
+            try:
+                response_data = response.json()
+                
+                # Validate response structure
+                self.api_monitor.validate_api_call(
+                    endpoint='/arrendamento/api/emitirRecibo',
+                    method='POST',
+                    payload=payload,
+                    response_status=200,
+                    response_data=response_data,
+                    contract_id=str(contract_id)
+                )
+                
+                # Heavy logging for response analysis
+                logger.info("RESPONSE DATA ANALYSIS:")
+                logger.info(f"   Response Type: {type(response_data)}")
+                logger.info(f"    Response Keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'Not a dict'}")
+                
+                # Check if the response indicates success or failure
+                platform_success = response_data.get('success', False)
+                
+                # Full response for monitoring; failures are always logged
+                log_payload(logger, logging.DEBUG, 'emitirRecibo.response', "FULL RESPONSE JSON",
+                            response_data, force=not platform_success)
+                receipt_number = response_data.get('numeroRecibo', response_data.get('receiptNumber', 'UNKNOWN'))
+                
+                logger.info(f"PLATFORM SUCCESS FLAG: {platform_success}")
+                logger.info(f"RECEIPT NUMBER: {receipt_number}")
+                
+                if platform_success:
+                    # Contract data changed on the portal side
+                    self._clear_cache()
+                    
+                    logger.info("=" * 80)
+                    logger.info("RECEIPT ISSUED SUCCESSFULLY!")
+                    logger.info(f"Contract: {payload.get('numContrato')}")
+                    logger.info(f"Receipt Number: {receipt_number}")
+                    logger.info(f"Value: €{payload.get('valor')}")
+                    logger.info("=" * 80)
+                    return True, {
+                        'receiptNumber': receipt_number,
+                        'success': True,
+                        'response': response_data
+                    }
+                else:
+                    # Platform returned an error within 200 response
+                    error_msg = response_data.get('errorMessage', response_data.get('error', 'Unknown error from platform'))
+                    field_errors = response_data.get('fieldErrors', {})
                     
-                    # Validate response structure
+                    logger.error("=" * 80)
+                    logger.error(" RECEIPT SUBMISSION FAILED (Platform Error)")
+                    logger.error(f"Contract: {payload.get('numContrato')}")
+                    logger.error(f"Value: €{payload.get('valor')}")
+                    logger.error(f" Error Message: {error_msg}")
+                    
+                    if field_errors:
+                        logger.error(" FIELD ERRORS:")
+                        error_details = []
+                        for field, error in field_errors.items():
+                            error_details.append(f"{field}: {error}")
+                            logger.error(f"    {field}: {error}")
+                        error_msg += f" Field errors: {'; '.join(error_details)}"
+                    
+                    logger.error("=" * 80)
+                    
+                    # Validate and log error
                     self.api_monitor.validate_api_call(
                         endpoint='/arrendamento/api/emitirRecibo',
                         method='POST',
                         payload=payload,
                         response_status=200,
                         response_data=response_data,
+                        error=error_msg,
                         contract_id=str(contract_id)
                     )
                     
-                    # Heavy logging for response analysis
-                    logger.info("RESPONSE DATA ANALYSIS:")
-                    logger.info(f"   Response Type: {type(response_data)}")
-                    logger.info(f"    Response Keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'Not a dict'}")
-                    
-                    # Log full response for monitoring
-                    import json
-                    response_json = json.dumps(response_data, indent=2, ensure_ascii=False, default=str)
-                    logger.info(f"FULL RESPONSE JSON:\n{response_json}")
-                    
-                    # Check if the response indicates success or failure
-                    platform_success = response_data.get('success', False)
-                    receipt_number = response_data.get('numeroRecibo', response_data.get('receiptNumber', 'UNKNOWN'))
-                    
-                    logger.info(f"PLATFORM SUCCESS FLAG: {platform_success}")
-                    logger.info(f"RECEIPT NUMBER: {receipt_number}")
-                    
-                    if platform_success:
-                        logger.info("=" * 80)
-                        logger.info("RECEIPT ISSUED SUCCESSFULLY!")
-                        logger.info(f"Contract: {payload.get('numContrato')}")
-                        logger.info(f"Receipt Number: {receipt_number}")
-                        logger.info(f"Value: €{payload.get('valor')}")
-                        logger.info("=" * 80)
-                        return True, {
-                            'receiptNumber': receipt_number,
-                            'success': True,
-                            'response': response_data
-                        }
-                    else:
-                        # Platform returned an error within 200 response
-                        error_msg = response_data.get('errorMessage', response_data.get('error', 'Unknown error from platform'))
-                        field_errors = response_data.get('fieldErrors', {})
-                        
-                        logger.error("=" * 80)
-                        logger.error(" RECEIPT SUBMISSION FAILED (Platform Error)")
-                        logger.error(f"Contract: {payload.get('numContrato')}")
-                        logger.error(f"Value: €{payload.get('valor')}")
-                        logger.error(f" Error Message: {error_msg}")
-                        
-                        if field_errors:
-                            logger.error(" FIELD ERRORS:")
-                            error_details = []
-                            for field, error in field_errors.items():
-                                error_details.append(f"{field}: {error}")
-                                logger.error(f"    {field}: {error}")
-                            error_msg += f" Field errors: {'; '.join(error_details)}"
-                        
-                        logger.error("=" * 80)
-                        
-                        # Validate and log error
-                        self.api_monitor.validate_api_call(
-                            endpoint='/arrendamento/api/emitirRecibo',
-                            method='POST',
-                            payload=payload,
-                            response_status=200,
-                            response_data=response_data,
-                            error=error_msg,
-                            contract_id=str(contract_id)
-                        )
-                        
-                        return False, {
-                            'success': False,
-                            'error': error_msg,
-                            'errorMessage': error_msg,
-                            'fieldErrors': field_errors,
-                            'platform_response': response_data
-                        }
-                        
-                except ValueError as json_error:
-                    # Response might not be JSON - but still might be success
-                    logger.warning("  RESPONSE NOT JSON - Checking if receipt was issued...")
-                    logger.warning(f"JSON Parse Error: {json_error}")
-                    logger.info(f"Raw Response (first 1000 chars): {response.text[:1000]}")
-                    
-                    # Save full response for debugging
-                    with open('debug_receipt_response.html', 'w', encoding='utf-8') as f:
-                        f.write(response.text)
-                    logger.info(" Full response saved to debug_receipt_response.html")
-                    
-                    # Try to detect success indicators in HTML
-                    success_indicators = ['sucesso', 'êxito', 'receipt', 'recibo', 'emitido']
-                    text_lower = response.text.lower()
-                    found_indicators = [ind for ind in success_indicators if ind in text_lower]
-                    
-                    if found_indicators:
-                        logger.info(f" SUCCESS INDICATORS FOUND: {found_indicators}")
-                        logger.info("ASSUMING RECEIPT ISSUED SUCCESSFULLY (non-JSON response)")
-                        return True, {
-                            'receiptNumber': 'ISSUED_NON_JSON',
-                            'success': True,
-                            'response_text': response.text[:500]
-                        }
-                    else:
-                        logger.error(" NO SUCCESS INDICATORS FOUND in non-JSON response")
-                        return False, {
-                            'success': False,
-                            'error': 'Non-JSON response without success indicators',
-                            'response_text': response.text[:500]
-                        }
-            else:
-                logger.error("=" * 80)
-                logger.error(f" RECEIPT SUBMISSION FAILED: HTTP {response.status_code}")
-                logger.error(f"Contract: {contract_id}")
-                logger.error(f"Value: €{receipt_value}")
-                logger.error(f"Response Preview: {response.text[:500]}")
-                logger.error("=" * 80)
+                    return False, {
+                        'success': False,
+                        'error': error_msg,
+                        'errorMessage': error_msg,
+                        'fieldErrors': field_errors,
+                        'platform_response': response_data
+                    }
+            
+            except ValueError as json_error:
+                # Response might not be JSON - but still might be success
+                logger.warning("  RESPONSE NOT JSON - Checking if receipt was issued...")
+                logger.warning(f"JSON Parse Error: {json_error}")
+                logger.info(f"Raw Response (first 1000 chars): {response.text[:1000]}")
                 
-                # Validate and log HTTP error
-                self.api_monitor.validate_api_call(
-                    endpoint='/arrendamento/api/emitirRecibo',
-                    method='POST',
-                    payload=payload,
-                    response_status=response.status_code,
-                    error=f"HTTP {response.status_code} error",
-                    contract_id=str(contract_id)
-                )
+                # Save full response for debugging
+                with open('debug_receipt_response.html', 'w', encoding='utf-8') as f:
+                    f.write(response.text)
+                logger.info(" Full response saved to debug_receipt_response.html")
                 
-                return False, {
-                    'success': False,
-                    'error': f"HTTP {response.status_code} error",
-                    'status_code': response.status_code,
-                    'response_text': response.text[:500]
-                }
+                # Try to detect success indicators in HTML
+                success_indicators = ['sucesso', 'êxito', 'receipt', 'recibo', 'emitido']
+                text_lower = response.text.lower()
+                found_indicators = [ind for ind in success_indicators if ind in text_lower]
                 
-        except Exception as e:
+                if found_indicators:
+                    self._clear_cache()
+                    logger.info(f" SUCCESS INDICATORS FOUND: {found_indicators}")
+                    logger.info("ASSUMING RECEIPT ISSUED SUCCESSFULLY (non-JSON response)")
+                    return True, {
+                        'receiptNumber': 'ISSUED_NON_JSON',
+                        'success': True,
+                        'response_text': response.text[:500]
+                    }
+                else:
+                    logger.error(" NO SUCCESS INDICATORS FOUND in non-JSON response")
+                    return False, {
+                        'success': False,
+                        'error': 'Non-JSON response without success indicators',
+                        'response_text': response.text[:500]
+                    }
+        else:
             logger.error("=" * 80)
-            logger.error(" RECEIPT SUBMISSION EXCEPTION!")
-            logger.error(f" Contract: {contract_id}")
-            logger.error(f" Value: €{receipt_value}")
-            logger.error(f" Exception Type: {type(e).__name__}")
-            logger.error(f" Exception Message: {str(e)}")
+            logger.error(f" RECEIPT SUBMISSION FAILED: HTTP {response.status_code}")
+            logger.error(f"Contract: {contract_id}")
+            logger.error(f"Value: €{receipt_value}")
+            logger.error(f"Response Preview: {response.text[:500]}")
             logger.error("=" * 80)
             
-            # Validate and log exception
+            # Validate and log HTTP error
             self.api_monitor.validate_api_call(
                 endpoint='/arrendamento/api/emitirRecibo',
                 method='POST',
-                payload=submission_data if 'submission_data' in locals() else None,
-                error=str(e),
+                payload=payload,
+                response_status=response.status_code,
+                error=f"HTTP {response.status_code} error",
                 contract_id=str(contract_id)
             )
             
             return False, {
                 'success': False,
-                'error': str(e)
+                'error': f"HTTP {response.status_code} error",
+                'status_code': response.status_code,
+                'response_text': response.text[:500]
             }
     
-    def get_contracts_with_tenant_data(self) -> Tuple[bool, List[Dict], str]:
+    def _issue_exception_result(self, e: Exception, submission_data: Dict, contract_id: Any,
+                                receipt_value: Any) -> Tuple[bool, Dict]:
+        """Log a submission that raised and build its failure result."""
+        logger.error("=" * 80)
+        logger.error(" RECEIPT SUBMISSION EXCEPTION!")
+        logger.error(f" Contract: {contract_id}")
+        logger.error(f" Value: €{receipt_value}")
+        logger.error(f" Exception Type: {type(e).__name__}")
+        logger.error(f" Exception Message: {str(e)}")
+        logger.error("=" * 80)
+        
+        # Validate and log exception
+        self.api_monitor.validate_api_call(
+            endpoint='/arrendamento/api/emitirRecibo',
+            method='POST',
+            payload=submission_data,
+            error=str(e),
+            contract_id=str(contract_id)
+        )
+        
+        return False, {
+            'success': False,
+            'error': str(e)
+        }
+    
+    def get_contracts_with_tenant_data(self, force_refresh: bool = False) -> Tuple[bool, List[Dict], str]:
         """
         Get complete contract data including tenant names from Portal das Finanças.
         Returns contract data with tenant information.
+        
+        Contract data is cached per user NIF. A fresh cache entry is returned without
+        any round-trip; a stale one (or any entry when force_refresh is set) is
+        revalidated with If-None-Match / If-Modified-Since when the portal sent validators.
+        
+        Args:
+            force_refresh: Skip the TTL check and revalidate with the portal
         """
         if not self.authenticated:
             return False, [], "Not authenticated"
@@ -1481,135 +1698,120 @@ class WebClient:
         # Log entry point for debugging
         logger.info(" ENTERING get_contracts_with_tenant_data method")
 
-        # Always fetch fresh data from API (cache removed)
-        
-        # Allow real API call to get actual contract data
-        
         try:
-            import json
+            cache_key, cached, cached_result = self._cached_contracts(force_refresh)
+            if cached_result is not None:
+                return cached_result
             
             # Log current session state for debugging
             logger.info(f"Current session cookies: {list(self.session.cookies.keys())}")
             logger.info(f"Authentication status: {self.authenticated}")
             
-            # STEP 1: First, navigate through proper authentication redirect
-            logger.info("Step 1: Navigating through authentication redirect to establish session...")
-            
-            # Use the SICI redirect URL that properly transfers authentication
-            redirect_url = "https://www.acesso.gov.pt/v2/loginForm?partID=SICI&path=/arrendamento/consultarElementosContratos/locador"
-            
-            # First navigate through the auth redirect
-            logger.info("Navigating through authentication redirect...")
-            response = self.session.get(redirect_url, timeout=15, allow_redirects=True)
-            
-            logger.info(f"Auth redirect response: Status {response.status_code}, URL: {response.url}")
-            logger.info(f"Auth redirect cookies: {list(self.session.cookies.keys())}")
-            
-            # Check if we're still on the auth domain (session transfer failed)
-            if 'acesso.gov.pt' in response.url:
-                logger.error("Session transfer failed - still on auth domain")
-                # Try to complete the authentication flow
-                if 'loginForm' in response.url:
-                    logger.info("Attempting to complete authentication flow...")
-                    
-                    # Extract form data and submit if needed
-                    from bs4 import BeautifulSoup
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for redirect form or continue button
-                    forms = soup.find_all('form')
-                    for form in forms:
-                        if form.get('action') and 'imoveis.portaldasfinancas.gov.pt' in form.get('action', ''):
-                            logger.info("Found portal redirect form, submitting...")
-                            
-                            # Extract form data
-                            form_data = {}
-                            for input_tag in form.find_all('input'):
-                                name = input_tag.get('name')
-                                value = input_tag.get('value', '')
-                                if name:
-                                    form_data[name] = value
-                            
-                            # Submit the form
-                            form_action = form.get('action')
-                            if not form_action.startswith('http'):
-                                form_action = 'https://www.acesso.gov.pt' + form_action
-                            
-                            response = self.session.post(form_action, data=form_data, timeout=15, allow_redirects=True)
-                            logger.info(f"Form submission response: Status {response.status_code}, URL: {response.url}")
-                            break
-            
-            # Now navigate to the actual portal page
-            portal_page_url = "https://imoveis.portaldasfinancas.gov.pt/arrendamento/consultarElementosContratos/locador"
-            
-            # Set headers for navigating to portal (if we're not already there)
-            if 'imoveis.portaldasfinancas.gov.pt' not in response.url:
-                portal_headers = {
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                    'Cache-Control': 'max-age=0',
-                    'Connection': 'keep-alive',
-                    'Referer': redirect_url,
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'cross-site',
-                    'Sec-Fetch-User': '?1',
-                    'Upgrade-Insecure-Requests': '1',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
-                }
-                
-                # Navigate to portal page
-                response = self.session.get(portal_page_url, headers=portal_headers, timeout=15)
-            
-            logger.info(f"Portal page response: Status {response.status_code}, URL: {response.url}")
-            logger.info(f"Portal page cookies: {list(self.session.cookies.keys())}")
-            
-            # Check if we got redirected to login (session expired)
-            if 'login' in response.url.lower() or 'acesso.gov.pt' in response.url:
-                logger.error("Session expired - redirected to login page when accessing portal")
-                self.authenticated = False
-                return False, [], "Session expired - please re-authenticate"
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to access portal page: HTTP {response.status_code}")
-                return False, [], f"Failed to access portal page: HTTP {response.status_code}"
+            portal_page_url = self.portal_page_url
+            portal_headers = self._portal_navigation_headers()
+            
+            # Only the handshake runs under the session lock, so concurrent callers do one
+            # handshake and workers never send mid-handshake, but the contracts call does not
+            # hold up the workers
+            with self._session_lock:
+                # STEP 1: Reuse an established portal session, otherwise do the SICI handshake
+                handshake_skipped = self._has_portal_session()
+                if handshake_skipped:
+                    logger.info("Step 1: Portal session already established - skipping SICI redirect handshake")
+                else:
+                    established, message = self._establish_portal_session()
+                    if not established:
+                        return False, [], message
             
             # STEP 2: Now try the AJAX endpoint with proper headers
             logger.info("Step 2: Making AJAX request to contracts endpoint...")
-            ajax_url = "https://imoveis.portaldasfinancas.gov.pt/arrendamento/api/obterElementosContratosEmissaoRecibos/locador"
+            ajax_url = CONTRACTS_API_URL
             
             # Log the endpoint being used
             logger.info(f" CONTRACTS ENDPOINT: {ajax_url}")
             logger.info(" This is the primary API endpoint for retrieving contract data with rent values (valorRenda)")
             
-            # Set AJAX headers (important for API call)
-            ajax_headers = {
-                'Accept': 'application/json, text/javascript, */*; q=0.01',
-                'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive',
-                'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
-                'X-Requested-With': 'XMLHttpRequest',
-                'Referer': portal_page_url,
-                'Sec-Fetch-Dest': 'empty',
-                'Sec-Fetch-Mode': 'cors',
-                'Sec-Fetch-Site': 'same-origin',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
-            }
+            # AJAX headers (important for API call)
+            ajax_headers = self._contracts_request_headers(cached)
             
             logger.info(f"Making AJAX request to: {ajax_url}")
             
-            response = self.session.get(ajax_url, headers=ajax_headers, timeout=15)
+            response = self._get(ajax_url, headers=ajax_headers, timeout=PAGE_TIMEOUT)
             
+            if handshake_skipped and ('login' in response.url.lower() or 'acesso.gov.pt' in response.url):
+                # The remembered portal session is gone - redo the full handshake once
+                logger.warning("Portal session no longer valid - falling back to SICI redirect handshake")
+                with self._session_lock:
+                    self._portal_session_established = False
+                    established, message = self._establish_portal_session()
+                if not established:
+                    return False, [], message
+                response = self._get(ajax_url, headers=ajax_headers, timeout=PAGE_TIMEOUT)
+            
+            result = self._process_contracts_response(response, cache_key, cached)
+            if result is None:
+                # STEP 3: Try alternative approach - parse contracts from HTML page
+                return self._fallback_html_parsing(portal_page_url, portal_headers)
+            return result
+                
+        except Exception as e:
+            logger.error(f"Error fetching contract data: {str(e)}")
+            return False, [], f"Error: {str(e)}"
+    
+    def _cached_contracts(self, force_refresh: bool) -> Tuple[Optional[str], Any, Optional[Tuple[bool, List[Dict], str]]]:
+        """
+        Look up the logged-in user's cached contract data.
+        
+        Returns:
+            Tuple of (cache_key, cache entry or None, result to return without a request
+            when the entry is fresh and force_refresh is not set, else None)
+        """
+        cache_key = self._current_username
+        cached = self.contract_cache.get(cache_key) if cache_key else None
+        if cached and not force_refresh and cached.is_fresh(self.contract_cache.ttl):
+            logger.info(f"Using cached contract data: {len(cached.contracts)} contracts (age {cached.age():.0f}s)")
+            self.form_cache.sync_versions(cached.contracts)
+            return cache_key, cached, (True, list(cached.contracts), f"Retrieved {len(cached.contracts)} contracts with tenant data (cached)")
+        return cache_key, cached, None
+    
+    def _contracts_request_headers(self, cached) -> Mapping[str, str]:
+        """AJAX headers for the contracts call, with cache validators when the portal sent them."""
+        if not cached:
+            return XHR_FORM_HEADERS
+        
+        # Conditional revalidation of cached data
+        validators = {}
+        if cached.etag:
+            validators['If_None_Match'] = cached.etag
+        if cached.last_modified:
+            validators['If_Modified_Since'] = cached.last_modified
+        return with_headers(XHR_FORM_HEADERS, **validators) if validators else XHR_FORM_HEADERS
+    
+    def _process_contracts_response(self, response, cache_key: Optional[str],
+                                    cached) -> Optional[Tuple[bool, List[Dict], str]]:
+        """
+        Interpret the contracts AJAX response and update the caches.
+        
+        Args:
+            response: requests.Response or async_web_client.PortalResponse
+            cache_key: Contract cache key of the logged-in user
+            cached: Cache entry the request revalidated, if any
+            
+        Returns:
+            (success, contracts, message), or None when the contracts should be
+            parsed from the portal page instead
+        """
+        try:
             logger.info(f" AJAX Response status: {response.status_code}")
             logger.info(f" AJAX Response URL: {response.url}")
             logger.info(f" AJAX Response content length: {len(response.text)} chars")
-            logger.info(f" AJAX Response headers: {dict(response.headers)}")
+            log_payload(logger, logging.DEBUG, 'contracts.headers', " AJAX Response headers", response.headers,
+                        renderer=lambda headers: str(dict(headers)))
             
-            # Log response content preview (first 500 chars)
+            # Response content preview (capped by the endpoint policy)
             if response.text:
-                preview = response.text[:500].replace('\n', ' ').replace('\r', '')
-                logger.info(f"AJAX Response preview (first 500 chars): {preview}...")
+                log_payload(logger, logging.DEBUG, 'contracts.preview', "AJAX Response preview", response.text,
+                            renderer=render_text)
             else:
                 logger.warning("AJAX Response is empty")
             
@@ -1617,8 +1819,15 @@ class WebClient:
             if 'login' in response.url.lower() or 'acesso.gov.pt' in response.url:
                 logger.error("AJAX request redirected to login page - session expired!")
                 self.authenticated = False
+                self._portal_session_established = False
                 return False, [], "Session expired during AJAX request - please re-authenticate"
             
+            if response.status_code == 304 and cached:
+                self.contract_cache.touch(cache_key)
+                logger.info(f"Contract data not modified - reusing {len(cached.contracts)} cached contracts")
+                self.form_cache.sync_versions(cached.contracts)
+                return True, list(cached.contracts), f"Retrieved {len(cached.contracts)} contracts with tenant data (revalidated)"
+            
             if response.status_code == 200:
                 try:
                     # Parse JSON response
@@ -1656,9 +1865,18 @@ class WebClient:
                         else:
                             logger.info("📭 Contracts array is empty - user has no contracts")
                         
-                        # Cache removed - always fetch fresh data
+                        if cache_key:
+                            self.contract_cache.put(
+                                cache_key,
+                                contracts_data,
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified')
+                            )
                         logger.info(f"Successfully retrieved {len(contracts_data)} contracts from API")
                         
+                        # Drop cached receipt forms of contracts that got a new version
+                        self.form_cache.sync_versions(contracts_data)
+                        
                         return True, contracts_data, f"Retrieved {len(contracts_data)} contracts with tenant data"
                     else:
                         logger.warning(f"Unexpected JSON format: {type(contracts_data)}")
@@ -1678,14 +1896,15 @@ class WebClient:
                     
             elif response.status_code == 401:
                 logger.error("401 Unauthorized - attempting to re-establish portal session...")
+                self._portal_session_established = False
                 
-                # STEP 3: Try alternative approach - parse contracts from HTML page
                 logger.info("Step 3: Falling back to HTML parsing approach...")
-                return self._fallback_html_parsing(portal_page_url, portal_headers)
+                return None
                 
             elif response.status_code == 403:
                 logger.error("Access denied - session may have expired")
                 self.authenticated = False
+                self._portal_session_established = False
                 self._clear_cache()  # Clear cached data on session expiry
                 return False, [], "Access denied - please re-authenticate"
                 
@@ -1695,12 +1914,116 @@ class WebClient:
                 
                 # Try fallback HTML parsing
                 logger.info("Trying fallback HTML parsing approach...")
-                return self._fallback_html_parsing(portal_page_url, portal_headers)
+                return None
                 
         except Exception as e:
             logger.error(f"Error fetching contract data: {str(e)}")
             return False, [], f"Error: {str(e)}"
     
+    def _portal_navigation_headers(self) -> Mapping[str, str]:
+        """Headers for navigating from the SICI redirect to the rental portal page."""
+        return self._portal_navigation_profile
+    
+    def _has_portal_session(self) -> bool:
+        """
+        Check whether a previous SICI handshake left a usable portal session.
+        
+        Requires a successful portal hop in this client and at least one
+        unexpired cookie for the portaldasfinancas.gov.pt domain.
+        """
+        if not self._portal_session_established:
+            return False
+        
+        try:
+            for cookie in self.session.cookies:
+                if cookie.domain.endswith('portaldasfinancas.gov.pt') and not cookie.is_expired():
+                    return True
+        except Exception:
+            return False
+        
+        logger.info("Portal session cookies missing or expired")
+        self._portal_session_established = False
+        return False
+    
+    def _establish_portal_session(self) -> Tuple[bool, str]:
+        """
+        Transfer the acesso.gov.pt login to the rental portal (SICI redirect handshake).
+        
+        Returns:
+            Tuple of (success, error_message)
+        """
+        logger.info("Step 1: Navigating through authentication redirect to establish session...")
+        
+        # Use the SICI redirect URL that properly transfers authentication
+        redirect_url = self.sici_redirect_url
+        
+        # First navigate through the auth redirect
+        logger.info("Navigating through authentication redirect...")
+        response = self.session.get(redirect_url, timeout=PAGE_TIMEOUT, allow_redirects=True)
+        
+        logger.info(f"Auth redirect response: Status {response.status_code}, URL: {response.url}")
+        logger.info(f"Auth redirect cookies: {list(self.session.cookies.keys())}")
+        
+        # Check if we're still on the auth domain (session transfer failed)
+        if 'acesso.gov.pt' in response.url:
+            logger.error("Session transfer failed - still on auth domain")
+            # Try to complete the authentication flow
+            if 'loginForm' in response.url:
+                logger.info("Attempting to complete authentication flow...")
+        
+                # Extract form data and submit if needed
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(response.text, 'html.parser')
+        
+                # Look for redirect form or continue button
+                forms = soup.find_all('form')
+                for form in forms:
+                    if form.get('action') and 'imoveis.portaldasfinancas.gov.pt' in form.get('action', ''):
+                        logger.info("Found portal redirect form, submitting...")
+        
+                        # Extract form data
+                        form_data = {}
+                        for input_tag in form.find_all('input'):
+                            name = input_tag.get('name')
+                            value = input_tag.get('value', '')
+                            if name:
+                                form_data[name] = value
+        
+                        # Submit the form
+                        form_action = form.get('action')
+                        if not form_action.startswith('http'):
+                            form_action = 'https://www.acesso.gov.pt' + form_action
+        
+                        response = self.session.post(form_action, data=form_data, timeout=PAGE_TIMEOUT, allow_redirects=True)
+                        logger.info(f"Form submission response: Status {response.status_code}, URL: {response.url}")
+                        break
+        
+        # Now navigate to the actual portal page (if we're not already there)
+        if 'imoveis.portaldasfinancas.gov.pt' not in response.url:
+            response = self.session.get(self.portal_page_url, headers=self._portal_navigation_headers(), timeout=PAGE_TIMEOUT)
+        
+        logger.info(f"Portal page response: Status {response.status_code}, URL: {response.url}")
+        logger.info(f"Portal page cookies: {list(self.session.cookies.keys())}")
+        
+        # Check if we got redirected to login (session expired)
+        if 'login' in response.url.lower() or 'acesso.gov.pt' in response.url:
+            logger.error("Session expired - redirected to login page when accessing portal")
+            self.authenticated = False
+            return False, "Session expired - please re-authenticate"
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to access portal page: HTTP {response.status_code}")
+            return False, f"Failed to access portal page: HTTP {response.status_code}"
+        
+        self._portal_session_established = True
+        logger.info("Portal session established")
+        return True, ""
+    
+    def _clear_cache(self):
+        """Invalidate cached contract data for the current user."""
+        if self._current_username:
+            self.contract_cache.invalidate(self._current_username)
+    
     def _fallback_html_parsing(self, portal_page_url: str, portal_headers: dict) -> Tuple[bool, List[Dict], str]:
         """
         Fallback method to extract contract data from HTML when AJAX fails.
@@ -1709,7 +2032,7 @@ class WebClient:
             logger.info("Attempting fallback HTML parsing...")
             
             # Re-fetch the portal page
-            response = self.session.get(portal_page_url, headers=portal_headers, timeout=15)
+            response = self.session.get(portal_page_url, headers=portal_headers, timeout=PAGE_TIMEOUT)
             
             if response.status_code != 200:
                 return False, [], f"Fallback failed: HTTP {response.status_code}"
@@ -1741,7 +2064,7 @@ class WebClient:
                     'Referer': portal_page_url
                 }
                 
-                ajax_response = self.session.get(ajax_url, headers=simple_headers, timeout=15)
+                ajax_response = self.session.get(ajax_url, headers=simple_headers, timeout=PAGE_TIMEOUT)
                 logger.info(f"Fallback AJAX response: {ajax_response.status_code}")
                 
                 if ajax_response.status_code == 200:
@@ -1833,16 +2156,16 @@ class WebClient:
             logger.info(f" FALLBACK CONTRACTS ENDPOINT: {contracts_url}")
             logger.info(" This is the HTML fallback endpoint for contract data (used when AJAX fails)")
             logger.info(f"Fetching contracts from: {contracts_url}")
-            response = self.session.get(contracts_url, timeout=15)
+            response = self.session.get(contracts_url, timeout=PAGE_TIMEOUT)
             
             logger.info(f" HTML Response status: {response.status_code}")
             logger.info(f" HTML Response URL: {response.url}")
             logger.info(f" HTML Response content length: {len(response.text)} chars")
             
-            # Log response content preview (first 500 chars)
+            # Response content preview (capped by the endpoint policy)
             if response.text:
-                preview = response.text[:500].replace('\n', ' ').replace('\r', '')
-                logger.info(f"HTML Response preview (first 500 chars): {preview}...")
+                log_payload(logger, logging.DEBUG, 'contracts.preview', "HTML Response preview", response.text,
+                            renderer=render_text)
             
             if response.status_code == 200:
                 logger.info(f"Successfully fetched contracts page (length: {len(response.text)} chars)")
@@ -1928,19 +2251,7 @@ class WebClient:
         success, portal_contracts_data, message = self.get_contracts_with_tenant_data()
         
         # Filter to only include ACTIVE contracts
-        active_portal_contracts = []
-        if success and portal_contracts_data:
-            for contract in portal_contracts_data:
-                # Check if contract is active
-                estado = contract.get('estado', {})
-                if isinstance(estado, dict):
-                    status_code = estado.get('codigo', '').upper()
-                    if status_code == 'ACTIVO':
-                        active_portal_contracts.append(contract)
-                elif isinstance(estado, str):
-                    # Handle case where estado might be a string
-                    if estado.upper() in ['ACTIVO', 'ATIVO', 'ACTIVE']:
-                        active_portal_contracts.append(contract)
+        active_portal_contracts = active_contracts(portal_contracts_data) if success else []
         
         logger.info(f"Filtered to {len(active_portal_contracts)} active contracts from {len(portal_contracts_data) if portal_contracts_data else 0} total contracts")
         
@@ -2088,24 +2399,32 @@ class WebClient:
         
         try:
             # Enhanced debugging: Show which endpoint we're using
-            api_url = f"https://imoveis.portaldasfinancas.gov.pt/arrendamento/api/obterElementosContratosEmissaoRecibos/locador"
+            api_url = CONTRACTS_API_URL
             params = {'contractId': contract_id}
             
             logger.info(f"� RENT VALUE DEBUG: Getting rent value for contract {contract_id}")
             logger.info(f" ENDPOINT: {api_url}?contractId={contract_id}")
             logger.info(f"PURPOSE: This endpoint should return the CURRENT rent value from Portal das Finanças")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': f'{self.receipts_base_url}/arrendamento/consultarElementosContratos/locador',
-                'Connection': 'keep-alive',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
+            response = self._get(api_url, headers=XHR_JSON_HEADERS, params=params, timeout=API_TIMEOUT)
+            return self._process_rent_value_response(contract_id, response)
+                
+        except Exception as e:
+            logger.error(f" Error getting rent value for contract {contract_id}: {str(e)}")
+            return False, 0.0
+
+    def _process_rent_value_response(self, contract_id: str, response) -> Tuple[bool, float]:
+        """
+        Read a contract's rent value from an obterElementosContratosEmissaoRecibos response.
+        
+        Args:
+            contract_id: Contract to look for
+            response: requests.Response or async_web_client.PortalResponse
             
-            response = self.session.get(api_url, headers=headers, params=params, timeout=30)
+        Returns:
+            Tuple of (success, rent_value)
+        """
+        try:
             logger.info(f" Rent value API response: {response.status_code}")
             
             if response.status_code == 200:
@@ -2161,6 +2480,62 @@ class WebClient:
         except Exception as e:
             logger.error(f" Error getting rent value for contract {contract_id}: {str(e)}")
             return False, 0.0
+    
+    def get_contract_rent_values(self, contract_ids: List[str], contracts_data: Optional[List[Dict]] = None,
+                                 max_workers: int = 4) -> Dict[str, float]:
+        """
+        Get rent values for several contracts at once.
+        
+        The contracts list is fetched once (or taken from ``contracts_data`` when the
+        caller already has it) and indexed by contract ID. Only contracts without a
+        usable valorRenda there fall back to individual get_contract_rent_value
+        requests, which run in parallel.
+        
+        Args:
+            contract_ids: Contract IDs to get rent values for
+            contracts_data: Optional already-loaded contracts list
+            max_workers: Maximum parallel individual lookups
+            
+        Returns:
+            Dict of contract ID -> rent value, for contracts where a value was found
+        """
+        if not self.authenticated:
+            logger.error("Not authenticated")
+            return {}
+        
+        wanted = list(dict.fromkeys(str(contract_id) for contract_id in contract_ids))
+        if not wanted:
+            return {}
+        
+        if contracts_data is None:
+            success, contracts_data, message = self.get_contracts_with_tenant_data()
+            if not success:
+                logger.warning(f"Could not load contracts list for rent values: {message}")
+                contracts_data = []
+        
+        # Build the contract ID -> rent value index from the bulk data
+        rent_index = {}
+        for contract in contracts_data:
+            if not isinstance(contract, dict):
+                continue
+            try:
+                rent_value = float(contract.get('valorRenda') or 0)
+            except (TypeError, ValueError):
+                continue
+            if rent_value > 0:
+                rent_index[str(contract.get('numero', ''))] = rent_value
+        
+        rent_values = {contract_id: rent_index[contract_id] for contract_id in wanted if contract_id in rent_index}
+        misses = [contract_id for contract_id in wanted if contract_id not in rent_values]
+        logger.info(f"Rent values: {len(rent_values)} from contracts list, {len(misses)} need individual lookup")
+        
+        if misses:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(misses)))) as executor:
+                for contract_id, (success, rent_value) in zip(misses, executor.map(self.get_contract_rent_value, misses)):
+                    if success and rent_value and rent_value > 0:
+                        rent_values[contract_id] = rent_value
+        
+        return rent_values
 
     def verify_receipt_in_portal(self, contract_id: str, receipt_number: str) -> Tuple[bool, Optional[Dict]]:
         """
@@ -2189,18 +2564,34 @@ class WebClient:
             
             logger.info(f"  Requesting: {receipt_url}")
             
-            # Set appropriate headers
-            headers = {
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'pt-PT,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': f'{self.receipts_base_url}/arrendamento/consultarElementosContratos/locador',
-                'Connection': 'keep-alive'
-            }
-            
             # Make the request
-            response = self.session.get(receipt_url, headers=headers, timeout=30)
+            response = self._get(receipt_url, headers=NAVIGATE_HEADERS, timeout=API_TIMEOUT)
+            return self._process_verify_response(contract_id, receipt_number, receipt_url, response)
+                
+        except requests.exceptions.Timeout:
+            logger.error("   Request timeout")
+            return False, {'error': 'Request timeout'}
+            
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"   Connection error: {str(e)}")
+            return False, {'error': f'Connection error: {str(e)}'}
             
+        except Exception as e:
+            logger.error(f"   Exception during verification: {str(e)}")
+            return False, {'error': f'Exception: {str(e)}'}
+
+    def _process_verify_response(self, contract_id: str, receipt_number: str, receipt_url: str,
+                                 response) -> Tuple[bool, Optional[Dict]]:
+        """
+        Interpret a detalheRecibo response (see verify_receipt_in_portal for the result).
+        
+        Args:
+            contract_id: The contract ID
+            receipt_number: The receipt number
+            receipt_url: URL that was requested
+            response: requests.Response or async_web_client.PortalResponse
+        """
+        try:
             logger.info(f"  Response status: {response.status_code}")
             
             # Handle different response codes
@@ -2285,18 +2676,10 @@ class WebClient:
                     'response_preview': response.text[:200]
                 }
                 
-        except requests.exceptions.Timeout:
-            logger.error("   Request timeout")
-            return False, {'error': 'Request timeout'}
-            
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"   Connection error: {str(e)}")
-            return False, {'error': f'Connection error: {str(e)}'}
-            
         except Exception as e:
             logger.error(f"   Exception during verification: {str(e)}")
             return False, {'error': f'Exception: {str(e)}'}
-
+    
     def generate_prefilled_csv(self, save_directory: str = None) -> Tuple[bool, str]:
         """
         Generate a pre-filled CSV with current month dates and rent values from Portal das Finanças.
@@ -2419,6 +2802,12 @@ class WebClient:
             
             logger.info(f"Processing {len(contracts_data)} contracts for CSV generation...")
             
+            # Resolve every rent value in one pass: bulk data first, individual lookups only for misses
+            rent_values = self.get_contract_rent_values(
+                [str(contract.get('numero', '')) for contract in contracts_data if contract.get('numero')],
+                contracts_data=contracts_data
+            )
+            
             for contract in contracts_data:
                 contract_id = str(contract.get('numero', ''))
                 contracts_processed += 1
@@ -2427,14 +2816,10 @@ class WebClient:
                     logger.warning(f"   Skipped: Contract {contracts_processed} (no contract ID)")
                     continue
                 
-                # First, try to use rent value from the bulk endpoint (already loaded)
-                bulk_rent_value = contract.get('valorRenda')
                 tenant_name = contract.get('nomeLocatario', 'N/A')
+                rent_value = rent_values.get(contract_id)
                 
-                if bulk_rent_value and float(bulk_rent_value) > 0:
-                    rent_value = float(bulk_rent_value)
-                    logger.info(f"    Using bulk data: Contract {contract_id} = €{rent_value}")
-                    
+                if rent_value:
                     row = [
                         contract_id,
                         from_date.strftime('%Y-%m-%d'),
@@ -2446,31 +2831,10 @@ class WebClient:
                     ]
                     csv_rows.append(row)
                     contracts_with_values += 1
+                    logger.info(f"    Added: Contract {contract_id} = €{rent_value}")
                 else:
-                    # Fallback: Try individual API call (but limit to avoid rate limiting)
-                    logger.info(f"No rent value in bulk data for contract {contract_id}, trying individual API call...")
-                    success, rent_value = self.get_contract_rent_value(contract_id)
-                    
-                    if success and rent_value > 0:
-                        row = [
-                            contract_id,
-                            from_date.strftime('%Y-%m-%d'),
-                            to_date.strftime('%Y-%m-%d'),
-                            payment_date.strftime('%Y-%m-%d'),
-                            'rent',
-                            f"{rent_value:.2f}",
-                            tenant_name
-                        ]
-                        csv_rows.append(row)
-                        contracts_with_values += 1
-                        logger.info(f"    Added via API: Contract {contract_id} = €{rent_value}")
-                    else:
-                        logger.warning(f"     Skipped: Contract {contract_id} (no rent value from bulk or API)")
-                        logger.info(f"   Available contract data: {list(contract.keys())}")
-                
-                # Add small delay to avoid rate limiting
-                import time
-                time.sleep(0.1)  # 100ms delay between requests
+                    logger.warning(f"     Skipped: Contract {contract_id} (no rent value from bulk or API)")
+                    logger.info(f"   Available contract data: {list(contract.keys())}")
             
             # Check if we have any data to write
             if not csv_rows:
@@ -0,0 +1,242 @@
+"""
+Unit tests for the asyncio portal client (async_web_client).
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+import async_web_client
+from async_web_client import AsyncWebClient, PortalResponse
+from web_client import WebClient
+
+
+def _client():
+    client = WebClient()
+    client.authenticated = True
+    return client
+
+
+def _run_with_server(routes, scenario):
+    """Serve routes on localhost and run scenario(base_url)."""
+    async def main():
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(f"http://127.0.0.1:{port}")
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+class TestPortalResponse:
+    """Test the response wrapper."""
+
+    def test_json(self):
+        response = PortalResponse(status_code=200, text='{"success": true}', url='https://x/')
+
+        assert response.json() == {'success': True}
+        assert response.elapsed.total_seconds() == 0
+
+
+class TestAsyncRequests:
+    """Test requests against a local server."""
+
+    def test_verify_receipt_found_and_missing(self):
+        async def detail(request):
+            if request.match_info['receipt'] == '7':
+                return web.Response(text='<html><body>Recibo</body></html>', content_type='text/html')
+            return web.Response(status=404)
+
+        routes = [web.get('/arrendamento/detalheRecibo/{contract}/{receipt}', detail)]
+        client = _client()
+
+        async def scenario(base_url):
+            client.receipts_base_url = base_url
+            async with AsyncWebClient(client) as async_client:
+                return await asyncio.gather(
+                    async_client.verify_receipt_in_portal('123', '7'),
+                    async_client.verify_receipt_in_portal('123', '8')
+                )
+
+        found, missing = _run_with_server(routes, scenario)
+
+        assert found[0] and found[1]['exists'] and found[1]['receipt_number'] == '7'
+        assert missing == (True, None)
+
+    def test_cookies_shared_with_sync_session(self):
+        seen = {}
+
+        async def form(request):
+            seen['cookie'] = request.cookies.get('SESSION')
+            response = web.Response(text='<html></html>', content_type='text/html')
+            response.set_cookie('PORTAL', 'new-value', path='/')
+            return response
+
+        routes = [web.get('/arrendamento/criarRecibo/{contract}', form)]
+        client = _client()
+        client.session.cookies.set('SESSION', 'abc', domain='localhost', path='/')
+
+        async def scenario(base_url):
+            # The cookie jar (like a browser) keeps no cookies for IP address hosts
+            client.receipts_base_url = base_url.replace('127.0.0.1', 'localhost')
+            async with AsyncWebClient(client) as async_client:
+                return await async_client.get_receipt_form('123', use_cache=False)
+
+        success, form_data = _run_with_server(routes, scenario)
+
+        assert success and form_data['contractId'] == '123'
+        assert seen['cookie'] == 'abc'
+        assert client.session.cookies.get('PORTAL') == 'new-value'
+
+    def test_requests_feed_shared_rate_limiter(self):
+        async def detail(request):
+            return web.Response(status=503)
+
+        routes = [web.get('/arrendamento/detalheRecibo/{contract}/{receipt}', detail)]
+        client = _client()
+        rate_before = client.rate_limiter.rate
+
+        async def scenario(base_url):
+            client.receipts_base_url = base_url
+            async with AsyncWebClient(client) as async_client:
+                return await async_client.verify_receipt_in_portal('123', '1')
+
+        success, result = _run_with_server(routes, scenario)
+
+        assert not success
+        assert client.rate_limiter.rate < rate_before
+
+    def test_in_flight_cap(self):
+        active = {'now': 0, 'peak': 0}
+
+        async def detail(request):
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+            await asyncio.sleep(0.05)
+            active['now'] -= 1
+            return web.Response(status=404)
+
+        routes = [web.get('/arrendamento/detalheRecibo/{contract}/{receipt}', detail)]
+        client = _client()
+        client.rate_limiter.burst = client.rate_limiter._tokens = 100
+
+        async def scenario(base_url):
+            client.receipts_base_url = base_url
+            async with AsyncWebClient(client, max_in_flight=3) as async_client:
+                return await asyncio.gather(*(async_client.verify_receipt_in_portal('1', str(n)) for n in range(9)))
+
+        results = _run_with_server(routes, scenario)
+
+        assert all(result == (True, None) for result in results)
+        assert active['peak'] == 3
+
+
+class TestAsyncPortalCalls:
+    """Test the portal calls with the transport mocked."""
+
+    def test_not_authenticated(self):
+        async_client = AsyncWebClient(WebClient())
+
+        assert asyncio.run(async_client.issue_receipt({'numContrato': 1})) == (False, None)
+        assert asyncio.run(async_client.get_contract_rent_value('1')) == (False, 0.0)
+
+    def test_issue_receipts_shares_response_handling(self):
+        client = _client()
+        async_client = AsyncWebClient(client)
+        response = PortalResponse(200, '{"success": true, "numeroRecibo": 42}', 'https://portal/')
+
+        with patch.object(async_client, '_request', AsyncMock(return_value=response)) as mock_request, \
+                patch.object(client, '_prepare_receipt_submission',
+                             return_value=('https://portal/api', {}, {'numContrato': 1})):
+            results = asyncio.run(async_client.issue_receipts([{'numContrato': 1}, {'numContrato': 2}]))
+
+        assert [success for success, _ in results] == [True, True]
+        assert results[0][1]['receiptNumber'] == 42
+        assert mock_request.await_args.args[0] == 'POST'
+        assert mock_request.await_args.kwargs['json'] == {'numContrato': 1}
+
+    def test_issue_receipt_exception(self):
+        client = _client()
+        async_client = AsyncWebClient(client)
+
+        with patch.object(async_client, '_request', AsyncMock(side_effect=ValueError("bad payload"))), \
+                patch.object(client, '_prepare_receipt_submission', return_value=('https://portal/api', {}, {})):
+            success, result = asyncio.run(async_client.issue_receipt({'numContrato': 1, 'valor': 100}))
+
+        assert not success
+        assert result['success'] is False
+        assert not result.get('ambiguous')
+
+    def test_issue_receipt_timeout_is_ambiguous(self):
+        client = _client()
+        async_client = AsyncWebClient(client)
+        submission = {'numContrato': 1, 'dataInicio': '2024-07-01', 'dataFim': '2024-07-31', 'valor': 100}
+
+        with patch.object(async_client, '_request', AsyncMock(side_effect=asyncio.TimeoutError())) as mock_request, \
+                patch.object(client, '_prepare_receipt_submission', return_value=('https://portal/api', {}, submission)):
+            first = asyncio.run(async_client.issue_receipt(dict(submission)))
+            second = asyncio.run(async_client.issue_receipt(dict(submission)))
+
+        assert first[0] is False and first[1]['ambiguous']
+        assert second[0] is False and second[1]['ambiguous']
+        assert mock_request.await_count == 1
+        assert client.submissions.is_unconfirmed(('1', '2024-07-01', '2024-07-31', '100.00'))
+
+    def test_verify_timeout(self):
+        async_client = AsyncWebClient(_client())
+
+        with patch.object(async_client, '_request', AsyncMock(side_effect=asyncio.TimeoutError())):
+            assert asyncio.run(async_client.verify_receipt_in_portal('1', '2')) == (False, {'error': 'Request timeout'})
+
+    def test_contracts_without_portal_session_use_sync_handshake(self):
+        client = _client()
+        async_client = AsyncWebClient(client)
+        expected = (True, [{'numero': '1'}], "Retrieved 1 contracts with tenant data")
+
+        async def scenario():
+            async with async_client:
+                with patch.object(async_client, '_request', AsyncMock()) as mock_request, \
+                        patch.object(client, 'get_contracts_with_tenant_data', return_value=expected) as mock_sync:
+                    result = await async_client.get_contracts_with_tenant_data()
+            return result, mock_request, mock_sync
+
+        result, mock_request, mock_sync = asyncio.run(scenario())
+
+        assert result == expected
+        mock_sync.assert_called_once_with(False)
+        mock_request.assert_not_awaited()
+
+    def test_contracts_with_portal_session_call_api(self):
+        client = _client()
+        async_client = AsyncWebClient(client)
+        response = PortalResponse(200, '[]', async_web_client.CONTRACTS_API_URL)
+        expected = (True, [], "Retrieved 0 contracts with tenant data")
+
+        with patch.object(client, '_has_portal_session', return_value=True), \
+                patch.object(async_client, 'open', AsyncMock()), \
+                patch.object(async_client, '_request', AsyncMock(return_value=response)), \
+                patch.object(client, '_process_contracts_response', return_value=expected) as mock_process:
+            result = asyncio.run(async_client.get_contracts_with_tenant_data())
+
+        assert result == expected
+        mock_process.assert_called_once_with(response, None, None)
+
+    def test_missing_aiohttp(self):
+        with patch.object(async_web_client, 'aiohttp', None):
+            with pytest.raises(ImportError, match="pip install aiohttp"):
+                AsyncWebClient(WebClient())
@@ -0,0 +1,157 @@
+"""
+Unit tests for utils.contract_cache and its use by WebClient.
+"""
+
+import sys
+import os
+import pytest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.contract_cache import ContractCache
+from web_client import WebClient
+
+
+CONTRACTS = [
+    {'numero': '12345', 'valorRenda': 500.0, 'estado': {'codigo': 'ACTIVO'}},
+    {'numero': '67890', 'valorRenda': 750.0, 'estado': {'codigo': 'ACTIVO'}}
+]
+
+
+class TestContractCache:
+    """Test the in-memory contract cache."""
+
+    def test_put_and_get(self):
+        """Test that stored contracts are returned for the same NIF only."""
+        cache = ContractCache()
+        cache.put('123456789', CONTRACTS, etag='"abc"')
+
+        entry = cache.get('123456789')
+        assert entry.contracts == CONTRACTS
+        assert entry.etag == '"abc"'
+        assert entry.is_fresh(cache.ttl)
+        assert cache.get('999999999') is None
+
+    def test_nothing_written_to_disk(self):
+        """Test that tenant data is kept in memory only."""
+        cache = ContractCache()
+        with patch('builtins.open') as mock_open:
+            cache.put('123456789', CONTRACTS)
+            cache.touch('123456789')
+            cache.get('123456789')
+            cache.invalidate('123456789')
+        mock_open.assert_not_called()
+
+    def test_ttl_expiry(self):
+        """Test that entries become stale after the TTL."""
+        cache = ContractCache(ttl=60)
+        entry = cache.put('123456789', CONTRACTS)
+        entry.fetched_at -= 120
+
+        assert not cache.get('123456789').is_fresh(cache.ttl)
+        cache.touch('123456789')
+        assert cache.get('123456789').is_fresh(cache.ttl)
+
+    def test_invalidate(self):
+        """Test explicit invalidation."""
+        cache = ContractCache()
+        cache.put('123456789', CONTRACTS)
+        cache.invalidate('123456789')
+
+        assert cache.get('123456789') is None
+
+    def test_non_string_validators_ignored(self):
+        """Test that missing or non-string validators are not stored."""
+        cache = ContractCache()
+        entry = cache.put('123456789', CONTRACTS, etag=Mock(), last_modified=None)
+        assert entry.etag is None
+        assert entry.last_modified is None
+
+
+def _portal_response(url, status_code=200, json_data=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.url = url
+    response.text = '[]' if json_data is not None else '<html></html>'
+    response.headers = headers or {}
+    response.json.return_value = json_data
+    return response
+
+
+@pytest.fixture
+def client():
+    client = WebClient()
+    client.authenticated = True
+    client._current_username = '123456789'
+    client.contract_cache = ContractCache()
+    return client
+
+
+class TestWebClientContractCaching:
+    """Test contract caching in WebClient.get_contracts_with_tenant_data."""
+
+    def _mock_portal(self, client, ajax_status=200, ajax_headers=None):
+        calls = []
+
+        def fake_get(url, **kwargs):
+            calls.append((url, kwargs.get('headers') or {}))
+            if 'obterElementosContratosEmissaoRecibos' in url:
+                return _portal_response(url, ajax_status, CONTRACTS if ajax_status == 200 else None, ajax_headers)
+            return _portal_response('https://imoveis.portaldasfinancas.gov.pt/arrendamento/consultarElementosContratos/locador')
+
+        return calls, patch.object(client.session, 'get', side_effect=fake_get)
+
+    def test_fresh_cache_costs_no_round_trips(self, client):
+        """Test that repeat calls inside the TTL are served from cache."""
+        calls, patcher = self._mock_portal(client, ajax_headers={'ETag': '"v1"'})
+        with patcher:
+            success, first, _ = client.get_contracts_with_tenant_data()
+            request_count = len(calls)
+            success2, second, message = client.get_contracts_with_tenant_data()
+
+        assert success and success2
+        assert first == second == CONTRACTS
+        assert len(calls) == request_count
+        assert 'cached' in message
+
+    def test_force_refresh_revalidates_with_etag(self, client):
+        """Test conditional revalidation and 304 handling."""
+        client.contract_cache.put('123456789', CONTRACTS, etag='"v1"')
+
+        calls, patcher = self._mock_portal(client, ajax_status=304)
+        with patcher:
+            success, contracts, message = client.get_contracts_with_tenant_data(force_refresh=True)
+
+        ajax_headers = [headers for url, headers in calls if 'obterElementosContratosEmissaoRecibos' in url][0]
+        assert ajax_headers['If-None-Match'] == '"v1"'
+        assert success is True
+        assert contracts == CONTRACTS
+        assert 'revalidated' in message
+
+    def test_no_caching_without_user_nif(self, client):
+        """Test that nothing is cached when the user NIF is unknown."""
+        client._current_username = None
+        calls, patcher = self._mock_portal(client)
+        with patcher:
+            client.get_contracts_with_tenant_data()
+            request_count = len(calls)
+            client.get_contracts_with_tenant_data()
+
+        assert len(calls) == 2 * request_count
+
+    def test_issued_receipt_invalidates_cache(self, client):
+        """Test that issuing a receipt drops the cached contract data."""
+        client.contract_cache.put('123456789', CONTRACTS)
+
+        response = Mock()
+        response.status_code = 200
+        response.text = '{}'
+        response.elapsed.total_seconds.return_value = 0.1
+        response.json.return_value = {'success': True, 'numeroRecibo': '42'}
+
+        with patch.object(client.session, 'post', return_value=response):
+            success, _ = client.issue_receipt({'numContrato': 12345, 'valor': 500.0})
+
+        assert success is True
+        assert client.contract_cache.get('123456789') is None
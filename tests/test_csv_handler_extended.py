@@ -13,7 +13,7 @@ from datetime import datetime
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from csv_handler import CSVHandler, ReceiptData
+from csv_handler import CSVHandler, ReceiptData, ReceiptRowError
 
 
 class TestColumnAliasMatching:
@@ -70,81 +70,72 @@ class TestColumnAliasMatching:
         assert handler.column_mapping.get('paymentDate') == 'payment'
 
 
-class TestExcelToCsvConversion:
-    """Test Excel file to CSV conversion logic."""
+class TestDirectExcelSource:
+    """Test loading Excel files straight from the sheet."""
     
-    @patch('openpyxl.load_workbook')
-    def test_excel_conversion_success(self, mock_load_workbook):
-        """Test successful Excel to CSV conversion."""
-        # Mock workbook and sheet
-        mock_sheet = Mock()
-        mock_sheet.title = 'Sheet1'
-        mock_sheet.iter_rows.return_value = [
-            ('contractId', 'fromDate', 'toDate'),
-            ('12345', '2025-01-01', '2025-01-31'),
-            ('67890', '2025-01-01', '2025-01-31'),
-        ]
-        
-        mock_workbook = Mock()
-        mock_workbook.active = mock_sheet
-        mock_load_workbook.return_value = mock_workbook
-        
+    def _write_workbook(self, path, rows):
+        openpyxl = pytest.importorskip('openpyxl')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for row in rows:
+            sheet.append(row)
+        workbook.save(path)
+    
+    def test_typed_cells_loaded(self, tmp_path):
+        """Datetime and numeric cells are used directly."""
+        path = str(tmp_path / 'receipts.xlsx')
+        self._write_workbook(path, [
+            ['contractId', 'fromDate', 'toDate', 'paymentDate', 'value'],
+            [123456, datetime(2024, 1, 1), datetime(2024, 1, 31), datetime(2024, 1, 5), 850],
+            ['789012', '01/02/2024', '29/02/2024', '2024-02-05', '900,50'],
+        ])
         handler = CSVHandler()
-        success, csv_path, error = handler._convert_excel_to_csv('test.xlsx')
         
-        assert success is True
-        assert csv_path != ''
-        assert error == ''
-        assert handler.temp_csv_file is not None
+        success, errors = handler.load_csv(path)
         
-        # Clean up
-        if os.path.exists(csv_path):
-            os.unlink(csv_path)
+        assert success, errors
+        first, second = handler.get_receipts()
+        assert (first.contract_id, first.from_date, first.to_date, first.payment_date, first.value) == \
+            ('123456', '2024-01-01', '2024-01-31', '2024-01-05', 850.0)
+        assert (second.contract_id, second.from_date, second.value) == ('789012', '2024-02-01', 900.5)
     
-    @patch('openpyxl.load_workbook')
-    def test_excel_conversion_empty_file(self, mock_load_workbook):
-        """Test conversion of empty Excel file."""
-        mock_sheet = Mock()
-        mock_sheet.title = 'Sheet1'
-        mock_sheet.iter_rows.return_value = []
+    def test_blank_rows_skipped_and_sheet_row_numbers_kept(self, tmp_path):
+        """Errors point at the row number shown in Excel."""
+        path = str(tmp_path / 'receipts.xlsx')
+        self._write_workbook(path, [
+            ['contractId', 'fromDate', 'toDate', 'paymentDate'],
+            [None, None, None, None],
+            ['123456', datetime(2024, 2, 1), datetime(2024, 1, 1), datetime(2024, 1, 5)],
+        ])
+        handler = CSVHandler()
         
-        mock_workbook = Mock()
-        mock_workbook.active = mock_sheet
-        mock_load_workbook.return_value = mock_workbook
+        items = list(handler.iter_receipts(path))
         
+        assert [item.row_number for item in items] == [3]
+        assert isinstance(items[0], ReceiptRowError)
+        assert items[0].message.startswith("Row 3: From date (2024-02-01)")
+    
+    def test_empty_workbook_is_fatal(self, tmp_path):
+        """A sheet with no rows ends the stream with a fatal error."""
+        path = str(tmp_path / 'empty.xlsx')
+        self._write_workbook(path, [])
         handler = CSVHandler()
-        success, csv_path, error = handler._convert_excel_to_csv('empty.xlsx')
         
-        assert success is False
-        assert 'empty' in error.lower()
+        success, errors = handler.load_csv(path)
+        
+        assert not success
+        assert errors == ["Excel file is empty"]
     
-    @patch('openpyxl.load_workbook')
-    def test_excel_conversion_with_none_values(self, mock_load_workbook):
-        """Test conversion handles None values in cells."""
-        mock_sheet = Mock()
-        mock_sheet.title = 'Sheet1'
-        mock_sheet.iter_rows.return_value = [
-            ('contractId', 'fromDate', 'toDate'),
-            ('12345', None, '2025-01-31'),
-        ]
+    def test_unreadable_workbook_is_fatal(self, tmp_path):
+        """A file that is not a workbook reports the open failure."""
+        path = tmp_path / 'broken.xlsx'
+        path.write_text('not a workbook')
+        handler = CSVHandler()
         
-        mock_workbook = Mock()
-        mock_workbook.active = mock_sheet
-        mock_load_workbook.return_value = mock_workbook
+        success, errors = handler.load_csv(str(path))
         
-        handler = CSVHandler()
-        success, csv_path, error = handler._convert_excel_to_csv('test.xlsx')
-        
-        assert success is True
-        
-        # Verify CSV has empty strings instead of None
-        if csv_path and os.path.exists(csv_path):
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-                assert len(rows) == 2
-                assert rows[1][1] == ''  # None converted to empty string
-            os.unlink(csv_path)
+        assert not success
+        assert errors[0].startswith("Failed to open Excel file:")
 
 
 class TestCsvValidation:
@@ -264,25 +255,75 @@ class TestErrorCollection:
             assert isinstance(errors, list)
         finally:
             os.unlink(temp_path)
+
+
+class TestStreamingIngestion:
+    """Test row-by-row loading with iter_receipts."""
+    
+    def _write(self, tmp_path, rows):
+        path = tmp_path / 'receipts.csv'
+        path.write_text("contractId,fromDate,toDate,paymentDate,value\n" + "\n".join(rows) + "\n", encoding='utf-8-sig')
+        return str(path)
     
-    def test_cleanup_temp_csv_on_success(self):
-        """Test temporary CSV is cleaned up after processing."""
+    def test_yields_receipts_and_errors_in_row_order(self, tmp_path):
+        """Test that valid rows and error records are yielded as the file is read."""
+        path = self._write(tmp_path, [
+            "1,2025-01-01,2025-01-31,2025-01-31,100",
+            "2,2025-02-28,2025-02-01,2025-02-01,-5",
+            "3,2025-03-01,2025-03-31,,100",
+            "4,2025-04-01,2025-04-30,2025-04-30,100"
+        ])
         handler = CSVHandler()
         
-        # Create a real temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write('test')
-            temp_file_path = f.name
+        items = list(handler.iter_receipts(path))
         
-        handler.temp_csv_file = temp_file_path
+        assert [type(item).__name__ for item in items] == [
+            'ReceiptData', 'ReceiptRowError', 'ReceiptRowError', 'ReceiptRowError', 'ReceiptData'
+        ]
+        assert [item.row_number for item in items] == [2, 3, 3, 4, 5]
+        assert handler.receipts == []
+        assert handler.validation_errors == []
+    
+    def test_stream_is_lazy(self, tmp_path):
+        """Test that rows are parsed only as the consumer asks for them."""
+        path = self._write(tmp_path, [f"{i},2025-01-01,2025-01-31,2025-01-31,100" for i in range(1000)])
+        handler = CSVHandler()
         
-        assert os.path.exists(temp_file_path)
-        handler._cleanup_temp_csv()
+        with patch.object(handler, '_parse_row_with_dates', wraps=handler._parse_row_with_dates) as parse_row:
+            stream = handler.iter_receipts(path)
+            first = next(stream)
+            assert parse_row.call_count == 1
+            stream.close()
+        
+        assert first.contract_id == '0'
+    
+    def test_fatal_errors_end_stream(self, tmp_path):
+        """Test that file-level problems are reported as fatal errors."""
+        handler = CSVHandler()
         
-        # After cleanup, temp_csv_file should be None
-        assert handler.temp_csv_file is None
-        # File should be deleted
-        assert not os.path.exists(temp_file_path)
+        missing = list(handler.iter_receipts(str(tmp_path / 'missing.csv')))
+        assert len(missing) == 1 and missing[0].fatal
+        
+        path = tmp_path / 'bad.csv'
+        path.write_text("foo,bar\n1,2\n", encoding='utf-8')
+        bad_header = list(handler.iter_receipts(str(path)))
+        assert all(isinstance(item, ReceiptRowError) and item.fatal for item in bad_header)
+        assert 'contractId' in bad_header[0].message
+    
+    def test_load_csv_collects_stream(self, tmp_path):
+        """Test that load_csv keeps its results on top of the stream."""
+        path = self._write(tmp_path, [
+            "1,2025-01-01,2025-01-31,2025-01-31,100",
+            "2,2025-02-28,2025-02-01,2025-02-01,100"
+        ])
+        handler = CSVHandler()
+        
+        success, errors = handler.load_csv(path)
+        
+        assert success is False
+        assert len(handler.receipts) == 1
+        assert errors == handler.validation_errors
+        assert 'Row 3' in errors[0]
 
 
 class TestDateNormalization:
@@ -0,0 +1,105 @@
+"""
+Unit tests for utils.date_parser and its use by CSVHandler.
+"""
+
+import sys
+import os
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.date_parser import DateParser, parse_iso_date
+from csv_handler import CSVHandler, ReceiptData
+
+
+class TestDateParser:
+    """Test format recognition, precedence and memoisation."""
+
+    @pytest.mark.parametrize('value, expected', [
+        ('2025-01-15', date(2025, 1, 15)),
+        ('2025-1-5', date(2025, 1, 5)),
+        ('2025-11-01 00:00:00', date(2025, 11, 1)),
+        ('2025-11-01 00:00:00.123456', date(2025, 11, 1)),
+        ('15/01/2025', date(2025, 1, 15)),
+        ('01/02/2025', date(2025, 2, 1)),   # Ambiguous: day first, as before
+        ('12/25/2025', date(2025, 12, 25)),  # Only valid month first
+        ('2025/11/01', date(2025, 11, 1)),
+        ('15-01-2025', date(2025, 1, 15)),
+        ('  2025-01-15  ', date(2025, 1, 15)),
+        (datetime(2025, 1, 15, 10, 30), date(2025, 1, 15)),  # Excel cell values
+        (date(2025, 1, 15), date(2025, 1, 15)),
+    ])
+    def test_supported_formats(self, value, expected):
+        """Test every format CSVHandler accepted before."""
+        assert DateParser().parse(value) == expected
+
+    @pytest.mark.parametrize('value', ['', None, 'not-a-date', '2025-02-30', '32/13/2025',
+                                       '2025-01-15 25:00:00', '15.01.2025'])
+    def test_invalid_values(self, value):
+        """Test values that are not dates."""
+        assert DateParser().parse(value) is None
+
+    def test_normalize(self):
+        """Test normalisation keeps unparseable input for validation to report."""
+        parser = DateParser()
+
+        assert parser.normalize('15/01/2025') == '2025-01-15'
+        assert parser.normalize('') == ''
+        assert parser.normalize(' invalid ') == 'invalid'
+
+    def test_dominant_format_learned_from_sample(self):
+        """Test the try order is fixed after the sample without changing results."""
+        parser = DateParser(sample_size=3)
+        for day in (10, 11, 12):
+            parser.parse(f'{day}-01-2025')
+
+        assert parser.dominant_format == 'dash'
+        assert parser.parse('2025-01-15') == date(2025, 1, 15)
+        assert parser.parse('01/02/2025') == date(2025, 2, 1)
+
+    def test_repeated_values_are_memoised(self):
+        """Test that a repeated date string is parsed once."""
+        parser = DateParser()
+
+        with patch.object(parser, '_parse_uncached', wraps=parser._parse_uncached) as parse:
+            for _ in range(5):
+                assert parser.parse('15/01/2025') == date(2025, 1, 15)
+
+        assert parse.call_count == 1
+
+    def test_parse_iso_date_is_strict(self):
+        """Test strict ISO parsing keeps strptime's error."""
+        assert parse_iso_date('2025-01-15') == date(2025, 1, 15)
+        with pytest.raises(ValueError, match="does not match format"):
+            parse_iso_date('15/01/2025')
+
+
+class TestCSVHandlerDateParsing:
+    """Test that CSVHandler parses each date once."""
+
+    def test_dates_parsed_once_per_row(self, tmp_path):
+        """Test validation reuses the dates parsed from the row."""
+        path = tmp_path / 'receipts.csv'
+        path.write_text('contractId,fromDate,toDate,paymentDate,value\n'
+                        '1,01/01/2025,31/01/2025,31/01/2025,100\n'
+                        '2,01/02/2025,28/02/2025,28/02/2025,100\n', encoding='utf-8')
+        handler = CSVHandler()
+
+        with patch('csv_handler.parse_iso_date') as iso_parse:
+            items = list(handler.iter_receipts(str(path)))
+
+        iso_parse.assert_not_called()
+        assert [item.from_date for item in items] == ['2025-01-01', '2025-02-01']
+
+    def test_validation_of_constructed_receipt(self):
+        """Test receipts built in code are still validated from their strings."""
+        handler = CSVHandler()
+        receipt = ReceiptData(contract_id='1', from_date='2025-02-01', to_date='2025-01-01',
+                              receipt_type='rent', value=100.0, payment_date='2025-01-01', row_number=2)
+
+        errors = handler._receipt_errors(receipt)
+
+        assert any('cannot be later than' in error for error in errors)
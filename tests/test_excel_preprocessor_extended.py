@@ -17,86 +17,46 @@ from excel_preprocessor import (
     PaymentInfo,
     ProcessingAlert,
     ReceiptData,
-    MONTH_COLUMNS
+    MONTH_COLUMNS,
+    parse_excel_batch
 )
 
 
 class TestExcelStructureValidation:
     """Test Excel file structure validation."""
     
-    def test_validate_excel_structure_valid(self):
+    def test_validate_header_valid(self):
         """Test validation passes for valid Excel structure."""
         processor = LandlordExcelProcessor()
         
-        # Mock worksheet with valid structure
-        mock_worksheet = Mock()
-        mock_worksheet.max_row = 3
-        
-        # Mock header row
-        mock_row = [Mock(), Mock(), Mock(), Mock(), Mock(), Mock(), Mock()]
-        mock_row[0].value = 'Contract'
-        mock_row[1].value = 'Name'
-        mock_row[2].value = 'Rent'
-        mock_row[3].value = 'RentDeposit'
-        mock_row[4].value = 'MonthsLate'
-        mock_row[5].value = 'PaidCurrentMonth'
-        mock_row[6].value = 'Jan'
-        
-        mock_worksheet.__getitem__ = lambda self, key: mock_row if key == 1 else []
-        
-        processor._validate_excel_structure(mock_worksheet)
+        processor._validate_header(['Contract', 'Name', 'Rent', 'RentDeposit',
+                                    'MonthsLate', 'PaidCurrentMonth', 'Jan'])
         assert len(processor.validation_errors) == 0
     
-    def test_validate_excel_structure_empty_file(self):
+    def test_validate_header_empty_file(self):
         """Test validation fails for empty Excel file."""
         processor = LandlordExcelProcessor()
         
-        mock_worksheet = Mock()
-        mock_worksheet.max_row = 1  # Only header or empty
-        
-        processor._validate_excel_structure(mock_worksheet)
+        processor._validate_header([], has_data_rows=False)
         assert len(processor.validation_errors) > 0
         assert any('empty' in err.lower() for err in processor.validation_errors)
     
-    def test_validate_excel_structure_missing_required_columns(self):
+    def test_validate_header_missing_required_columns(self):
         """Test validation fails when required columns are missing."""
         processor = LandlordExcelProcessor()
         
-        mock_worksheet = Mock()
-        mock_worksheet.max_row = 3
-        
-        # Mock header row missing 'Rent' column
-        mock_row = [Mock(), Mock(), Mock(), Mock(), Mock()]
-        mock_row[0].value = 'Contract'
-        mock_row[1].value = 'Name'
-        mock_row[2].value = 'RentDeposit'
-        mock_row[3].value = 'MonthsLate'
-        mock_row[4].value = 'PaidCurrentMonth'
-        
-        mock_worksheet.__getitem__ = lambda self, key: mock_row if key == 1 else []
-        
-        processor._validate_excel_structure(mock_worksheet)
+        # Header row missing 'Rent' column
+        processor._validate_header(['Contract', 'Name', 'RentDeposit',
+                                    'MonthsLate', 'PaidCurrentMonth'])
         assert len(processor.validation_errors) > 0
     
-    def test_validate_excel_structure_no_month_columns(self):
+    def test_validate_header_no_month_columns(self):
         """Test validation fails when no month columns present."""
         processor = LandlordExcelProcessor()
         
-        mock_worksheet = Mock()
-        mock_worksheet.max_row = 3
-        
-        # Mock header row without month columns
-        mock_row = [Mock(), Mock(), Mock(), Mock(), Mock(), Mock()]
-        mock_row[0].value = 'Contract'
-        mock_row[1].value = 'Name'
-        mock_row[2].value = 'Rent'
-        mock_row[3].value = 'RentDeposit'
-        mock_row[4].value = 'MonthsLate'
-        mock_row[5].value = 'PaidCurrentMonth'
-        
-        mock_worksheet.__getitem__ = lambda self, key: mock_row if key == 1 else []
-        
-        processor._validate_excel_structure(mock_worksheet)
+        # Header row without month columns
+        processor._validate_header(['Contract', 'Name', 'Rent', 'RentDeposit',
+                                    'MonthsLate', 'PaidCurrentMonth'])
         assert len(processor.validation_errors) > 0
         assert any('month' in err.lower() for err in processor.validation_errors)
 
@@ -257,55 +217,20 @@ class TestLandlordSeparatorDetection:
 class TestEmptyRowFiltering:
     """Test filtering of empty rows and columns."""
     
-    def test_parse_tenants_skips_empty_rows(self):
+    def test_parse_tenant_rows_skips_empty_rows(self):
         """Test that completely empty rows are skipped."""
         processor = LandlordExcelProcessor()
         
-        # Mock worksheet
-        mock_worksheet = Mock()
-        
-        # Header row
-        header_cells = [Mock() for _ in range(8)]
-        header_cells[0].value = 'Contract'
-        header_cells[1].value = 'Name'
-        header_cells[2].value = 'Rent'
-        header_cells[3].value = 'RentDeposit'
-        header_cells[4].value = 'Mes Caucao'
-        header_cells[5].value = 'MonthsLate'
-        header_cells[6].value = 'PaidCurrentMonth'
-        header_cells[7].value = 'Jan'
-        
-        # Data row 1 (valid)
-        row1_cells = [Mock() for _ in range(8)]
-        row1_cells[0].value = '12345'
-        row1_cells[1].value = 'John Doe'
-        row1_cells[2].value = 1000.00
-        row1_cells[3].value = 1
-        row1_cells[4].value = 0
-        row1_cells[5].value = 1  # Mes Caucao
-        row1_cells[6].value = 0
-        row1_cells[7].value = 'No'
-        
-        # Data row 2 (empty)
-        row2_cells = [Mock() for _ in range(8)]
-        for cell in row2_cells:
-            cell.value = None
-        
-        # Data row 3 (valid)
-        row3_cells = [Mock() for _ in range(8)]
-        row3_cells[0].value = '67890'
-        row3_cells[1].value = 'Jane Smith'
-        row3_cells[2].value = 1500.00
-        row3_cells[3].value = 1
-        row3_cells[4].value = 0
-        row3_cells[5].value = 1  # Mes Caucao
-        row3_cells[6].value = 0
-        row3_cells[7].value = 'No'
-        
-        mock_worksheet.__getitem__ = lambda self, idx: header_cells if idx == 1 else []
-        mock_worksheet.iter_rows.return_value = [row1_cells, row2_cells, row3_cells]
-        
-        tenants = processor._parse_tenants(mock_worksheet)
+        header_row = ['Contract', 'Name', 'Rent', 'RentDeposit', 'Mes Caucao',
+                      'MonthsLate', 'PaidCurrentMonth', 'Jan']
+        rows = [
+            ['12345', 'John Doe', 1000.00, 1, 0, 1, 0, 'No'],  # valid
+            [None] * 8,                                        # empty
+            ['67890', 'Jane Smith', 1500.00, 1, 0, 1, 0, 'No'],  # valid
+        ]
+        
+        col_map = processor._build_column_map(header_row)
+        tenants = processor._parse_tenant_rows(rows, col_map)
         
         # Should only parse 2 tenants (skip empty row)
         assert len(tenants) == 2
@@ -341,8 +266,8 @@ class TestMultiSheetHandling:
         mock_row[5].value = 'PaidCurrentMonth'
         mock_row[6].value = 'Jan'
         
-        mock_sheet.__getitem__ = lambda self, key: mock_row if key == 1 else []
-        mock_sheet.iter_rows.return_value = []
+        # Rows are streamed as values: header plus one empty data row
+        mock_sheet.iter_rows.return_value = [tuple(cell.value for cell in mock_row), (None,) * 7]
         
         mock_workbook.__getitem__ = lambda self, name: mock_sheet if name == 'Tenants' else None
         mock_load_workbook.return_value = mock_workbook
@@ -398,8 +323,8 @@ class TestMultiSheetHandling:
         mock_row[5].value = 'PaidCurrentMonth'
         mock_row[6].value = 'Jan'
         
-        mock_sheet.__getitem__ = lambda self, key: mock_row if key == 1 else []
-        mock_sheet.iter_rows.return_value = []
+        # Rows are streamed as values: header plus one empty data row
+        mock_sheet.iter_rows.return_value = [tuple(cell.value for cell in mock_row), (None,) * 7]
         mock_workbook.active = mock_sheet
         
         mock_load_workbook.return_value = mock_workbook
@@ -431,8 +356,6 @@ class TestPaymentDateCalculation:
             row_number=2
         )
         
-        # Mock a minimal worksheet with required structure
-        mock_worksheet = Mock()
         col_map = {
             'contract': 0,
             'name': 1,
@@ -445,7 +368,7 @@ class TestPaymentDateCalculation:
         }
         
         # Call the method with all required parameters
-        receipts = processor._prepare_receipt_records([tenant], 1, 2025, mock_worksheet, col_map)
+        receipts = processor._prepare_receipt_records([tenant], 1, 2025, col_map)
         
         # Should return a list (may be empty if no payment column data)
         assert isinstance(receipts, list)
@@ -490,3 +413,170 @@ class TestProcessingAlerts:
             processor.processing_alerts = []
             
             assert len(processor.processing_alerts) == 0
+
+
+class TestStreamingParse:
+    """Test the single-pass read-only parsing of parse_excel."""
+    
+    def _write_workbook(self, path):
+        from openpyxl import Workbook
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Ignored'
+        ws.append(['first sheet'])
+        ws = wb.create_sheet('2025')
+        ws.append(['Contract', 'Name', 'Rent', 'RentDeposit', 'Mes Caucao', 'MonthsLate',
+                   'PaidCurrentMonth', 'Jan', 'Feb'])
+        ws.append(['[LANDLORD] Owner A'])
+        ws.append(['111', 'Tenant A', 500.0, 1, 0, 0, 'No', 5, None])
+        ws.append([None] * 9)
+        ws.append(['222', 'Tenant B', 700.0, 1, 1, 0, 'No', '08-01-2025', 12])
+        wb.save(path)
+        wb.close()
+    
+    def test_month_cells_captured_during_scan(self, tmp_path):
+        """Test receipts come from the cells captured in the tenant scan."""
+        path = str(tmp_path / 'landlord.xlsx')
+        self._write_workbook(path)
+        processor = LandlordExcelProcessor()
+        
+        receipts, alerts = processor.parse_excel(path, 1, 2025, sheet_name='2025')
+        
+        assert [(r.contract_id, r.payment_date, r.from_date) for r in receipts] == [
+            ('111', date(2025, 1, 5), date(2025, 1, 1)),
+            ('222', date(2025, 1, 8), date(2025, 2, 1)),
+        ]
+        assert alerts == []
+    
+    def test_workbook_opened_read_only(self, tmp_path):
+        """Test the workbook is streamed and closed."""
+        import openpyxl
+        path = str(tmp_path / 'landlord.xlsx')
+        self._write_workbook(path)
+        opened = []
+        real_load_workbook = openpyxl.load_workbook
+        
+        def load(*args, **kwargs):
+            workbook = real_load_workbook(*args, **kwargs)
+            opened.append((kwargs, workbook))
+            return workbook
+        
+        with patch('excel_preprocessor.openpyxl.load_workbook', side_effect=load):
+            receipts, _ = LandlordExcelProcessor().parse_excel(path, 2, 2025, sheet_name='2025')
+        
+        kwargs, workbook = opened[0]
+        assert kwargs == {'read_only': True, 'data_only': True}
+        assert [r.contract_id for r in receipts] == ['222']
+    
+    def test_header_only_sheet_rejected(self, tmp_path):
+        """Test the empty-file check without relying on max_row."""
+        from openpyxl import Workbook
+        path = str(tmp_path / 'empty.xlsx')
+        wb = Workbook()
+        wb.active.append(['Contract', 'Name', 'Rent', 'RentDeposit', 'MonthsLate', 'PaidCurrentMonth', 'Jan'])
+        wb.save(path)
+        
+        with pytest.raises(ValueError, match='empty'):
+            LandlordExcelProcessor().parse_excel(path, 1, 2025)
+
+
+class TestMultiMonthParse:
+    """Test receipts for several months from one workbook load."""
+    
+    _write_workbook = TestStreamingParse._write_workbook
+    
+    def test_month_range_in_one_load(self, tmp_path):
+        """Test each month matches a single-month parse and the file is opened once."""
+        import openpyxl
+        path = str(tmp_path / 'landlord.xlsx')
+        self._write_workbook(path)
+        processor = LandlordExcelProcessor()
+        
+        with patch('excel_preprocessor.openpyxl.load_workbook', wraps=openpyxl.load_workbook) as load:
+            by_month, alerts = processor.parse_excel_months(path, 2025, range(1, 4), sheet_name='2025')
+        
+        assert load.call_count == 1
+        assert list(by_month) == [1, 2, 3]
+        assert by_month[1] == LandlordExcelProcessor().parse_excel(path, 1, 2025, sheet_name='2025')[0]
+        assert [(r.contract_id, r.payment_date) for r in by_month[2]] == [('222', date(2025, 2, 12))]
+        assert by_month[3] == []  # No March column
+        assert alerts == []
+    
+    def test_all_months_with_payments(self, tmp_path):
+        """Test that months=None selects the month columns that have payments."""
+        path = str(tmp_path / 'landlord.xlsx')
+        self._write_workbook(path)
+        
+        by_month, _ = LandlordExcelProcessor().parse_excel_months(path, 2025, sheet_name='2025')
+        
+        assert {month: len(receipts) for month, receipts in by_month.items()} == {1: 2, 2: 1}
+    
+    def test_invalid_month(self, tmp_path):
+        """Test months outside 1-12 are rejected before opening the file."""
+        with pytest.raises(ValueError, match='13'):
+            LandlordExcelProcessor().parse_excel_months(str(tmp_path / 'missing.xlsx'), 2025, [12, 13])
+
+
+class TestBatchImport:
+    """Test parse_excel_batch over several workbooks and sheets."""
+    
+    def _write(self, path, sheets):
+        from openpyxl import Workbook
+        wb = Workbook()
+        wb.remove(wb.active)
+        for title, rows in sheets.items():
+            ws = wb.create_sheet(title)
+            ws.append(['Contract', 'Name', 'Rent', 'RentDeposit', 'Mes Caucao', 'MonthsLate',
+                       'PaidCurrentMonth', 'Jan', 'Feb'])
+            for row in rows:
+                ws.append(row)
+        wb.save(path)
+        return str(path)
+    
+    def _sources(self, tmp_path):
+        owner_a = self._write(tmp_path / 'owner_a.xlsx', {
+            '2024': [['111', 'A', 500.0, 1, 0, 0, 'No', 3, 3]],
+            '2025': [['111', 'A', 500.0, 1, 0, 0, 'No', 4, None]],
+        })
+        owner_b = self._write(tmp_path / 'owner_b.xlsx', {
+            '2025': [['111', 'A', 500.0, 1, 0, 0, 'No', 9, None],
+                     ['222', 'B', 700.0, 1, 0, 0, 'No', 6, 6]],
+        })
+        return [(owner_a, '2024'), (owner_a, '2025'), (owner_b, '2025')]
+    
+    def _summary(self, imported):
+        return [(os.path.basename(i.source_file), i.sheet_name, i.month, i.receipt.contract_id, i.receipt.payment_date)
+                for i in imported]
+    
+    def test_merge_with_provenance_and_dedup(self, tmp_path):
+        """Test receipts keep their source and repeated contract periods are dropped."""
+        result = parse_excel_batch(self._sources(tmp_path), max_workers=1)
+        
+        assert self._summary(result.receipts) == [
+            ('owner_a.xlsx', '2024', 1, '111', date(2024, 1, 3)),
+            ('owner_a.xlsx', '2024', 2, '111', date(2024, 2, 3)),
+            ('owner_a.xlsx', '2025', 1, '111', date(2025, 1, 4)),
+            ('owner_b.xlsx', '2025', 1, '222', date(2025, 1, 6)),
+            ('owner_b.xlsx', '2025', 2, '222', date(2025, 2, 6)),
+        ]
+        assert self._summary(result.duplicates) == [('owner_b.xlsx', '2025', 1, '111', date(2025, 1, 9))]
+        assert result.errors == []
+    
+    def test_process_pool_matches_serial(self, tmp_path):
+        """Test the worker pool merges the same result in source order."""
+        sources = self._sources(tmp_path)
+        
+        serial = parse_excel_batch(sources, months=[1], max_workers=1)
+        parallel = parse_excel_batch(sources, months=[1], max_workers=3)
+        
+        assert self._summary(parallel.receipts) == self._summary(serial.receipts)
+        assert self._summary(parallel.duplicates) == self._summary(serial.duplicates)
+    
+    def test_failed_source_reported(self, tmp_path):
+        """Test a broken source does not stop the others."""
+        sources = self._sources(tmp_path)[:1] + [(str(tmp_path / 'owner_a.xlsx'), 'Notes')]
+        
+        result = parse_excel_batch(sources, max_workers=1)
+        
+        assert len(result.receipts) == 2
+        assert len(result.errors) == 1 and 'owner_a.xlsx [Notes]' in result.errors[0]
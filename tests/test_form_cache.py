@@ -0,0 +1,161 @@
+"""
+Unit tests for utils.form_cache and receipt form caching in WebClient.
+"""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.form_cache import ReceiptFormCache
+from web_client import WebClient
+
+
+FORM = {'numContrato': 123456, 'versaoContrato': 2, 'locatarios': [{'nif': 987654321, 'nome': 'MARIA'}]}
+
+
+class TestReceiptFormCache:
+    """Test the LRU + TTL receipt form cache."""
+
+    def test_put_and_get_returns_copies(self):
+        """Test that cached forms cannot be modified through returned data."""
+        cache = ReceiptFormCache()
+        cache.put('123456', FORM)
+
+        form = cache.get('123456')
+        form['locatarios'].append({'nif': 1})
+
+        assert cache.get('123456') == FORM
+        assert cache.get('999999') is None
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = ReceiptFormCache(ttl=0)
+        cache.put('123456', FORM)
+        assert cache.get('123456') is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used form is evicted first."""
+        cache = ReceiptFormCache(max_entries=2)
+        cache.put('1', {'versaoContrato': 1})
+        cache.put('2', {'versaoContrato': 1})
+        cache.get('1')
+        cache.put('3', {'versaoContrato': 1})
+
+        assert cache.get('1') is not None
+        assert cache.get('2') is None
+        assert cache.get('3') is not None
+
+    def test_new_contract_version_drops_form(self):
+        """Test invalidation when the contracts list reports another version."""
+        cache = ReceiptFormCache()
+        cache.put('123456', FORM)
+
+        cache.sync_versions([{'numero': '123456', 'versaoContrato': 2}])
+        assert cache.get('123456') is not None
+
+        cache.sync_versions([{'numero': '123456', 'versaoContrato': 3}])
+        assert cache.get('123456') is None
+
+        # A form of an older version is not served once a newer one is known
+        cache.put('123456', FORM)
+        assert cache.get('123456') is None
+
+    def test_invalidate(self):
+        """Test dropping one contract or everything."""
+        cache = ReceiptFormCache()
+        cache.put('1', FORM)
+        cache.put('2', FORM)
+
+        cache.invalidate('1')
+        assert cache.get('1') is None
+        assert cache.get('2') is not None
+
+        cache.invalidate()
+        assert cache.get('2') is None
+
+
+class TestGetReceiptFormCaching:
+    """Test WebClient.get_receipt_form reuse of parsed forms."""
+
+    PAGE = ('<html><script>$scope.recibo = {"numContrato": 123456, "versaoContrato": 2, '
+            '"nifEmitente": 123456789, "locatarios": [{"nif": 987654321, "nome": "MARIA"}]};</script></html>')
+
+    def _client(self):
+        client = WebClient()
+        client.authenticated = True
+        return client
+
+    def test_second_fetch_served_from_cache(self):
+        """Test that retries skip the criarRecibo fetch."""
+        client = self._client()
+        response = Mock(status_code=200, text=self.PAGE)
+
+        with patch.object(client.session, 'get', return_value=response) as mock_get:
+            success, first = client.get_receipt_form('123456')
+            success2, second = client.get_receipt_form('123456')
+
+        assert success and success2
+        assert first == second
+        assert mock_get.call_count == 1
+
+    def test_use_cache_false_refetches(self):
+        """Test that callers can bypass the cache."""
+        client = self._client()
+        response = Mock(status_code=200, text=self.PAGE)
+
+        with patch.object(client.session, 'get', return_value=response) as mock_get:
+            client.get_receipt_form('123456')
+            client.get_receipt_form('123456', use_cache=False)
+
+        assert mock_get.call_count == 2
+
+    def test_forms_without_contract_data_not_cached(self):
+        """Test that incomplete pages are fetched again."""
+        client = self._client()
+        response = Mock(status_code=200, text='<html></html>')
+
+        with patch.object(client.session, 'get', return_value=response) as mock_get:
+            client.get_receipt_form('123456')
+            client.get_receipt_form('123456')
+
+        assert mock_get.call_count == 2
+
+    def test_logout_clears_forms(self):
+        """Test that forms are not reused across sessions."""
+        client = self._client()
+        client.form_cache.put('123456', FORM)
+
+        with patch.object(client.session, 'get', return_value=Mock(status_code=200)):
+            client.logout()
+
+        assert client.form_cache.get('123456') is None
+
+    def test_failed_logout_clears_forms(self):
+        """Test that forms are dropped even when the server logout call fails."""
+        client = self._client()
+        client.form_cache.put('123456', FORM)
+
+        with patch.object(client.session, 'get', side_effect=requests.exceptions.ConnectionError("down")):
+            success, _ = client.logout()
+
+        assert not success
+        assert client.form_cache.get('123456') is None
+
+    def test_contracts_list_version_change_invalidates(self):
+        """Test that loading the contracts list drops forms of outdated versions."""
+        from utils.contract_cache import ContractCache
+
+        client = self._client()
+        client._current_username = '123456789'
+        client.contract_cache = ContractCache()
+        client.contract_cache.put('123456789', [{'numero': '123456', 'versaoContrato': 3}])
+        client.form_cache.put('123456', FORM)
+
+        success, _, _ = client.get_contracts_with_tenant_data()
+
+        assert success is True
+        assert client.form_cache.get('123456') is None
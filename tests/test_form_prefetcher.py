@@ -0,0 +1,149 @@
+"""
+Unit tests for utils.form_prefetcher and step-by-step form prefetching.
+"""
+
+import sys
+import os
+import threading
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.form_prefetcher import FormPrefetcher
+from receipt_processor import ReceiptProcessor
+from csv_handler import ReceiptData
+from web_client import WebClient
+
+
+class TestFormPrefetcher:
+    """Test the lookahead form prefetcher."""
+
+    def test_prefetched_form_is_reused(self):
+        """Test that each contract is fetched once and handed out as a copy."""
+        fetch = Mock(side_effect=lambda contract_id: (True, {'numContrato': contract_id}))
+        prefetcher = FormPrefetcher(fetch, lookahead=2)
+
+        prefetcher.prefetch(['1', '2', '1'])
+        first = prefetcher.take('1')
+        first[1]['tenant_name'] = 'changed'
+        second = prefetcher.take('1')
+        prefetcher.take('2')
+        prefetcher.cancel()
+
+        assert first[0] is True
+        assert second == (True, {'numContrato': '1'})
+        assert sorted(call.args[0] for call in fetch.call_args_list) == ['1', '2']
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entries are evicted."""
+        prefetcher = FormPrefetcher(lambda contract_id: (True, {}), lookahead=1)
+
+        prefetcher.prefetch(['1', '2', '3', '4'])
+
+        assert prefetcher.take('1') is None
+        assert prefetcher.take('4') == (True, {})
+        prefetcher.cancel()
+
+    def test_failed_fetch_returns_none(self):
+        """Test that an exception in the background fetch is not propagated."""
+        prefetcher = FormPrefetcher(Mock(side_effect=RuntimeError("network down")))
+
+        prefetcher.prefetch(['1'])
+        assert prefetcher.take('1') is None
+        assert prefetcher.take('2') is None
+        prefetcher.cancel()
+
+    def test_cancel_skips_pending_fetches(self):
+        """Test that fetches queued before cancel never run."""
+        release = threading.Event()
+        fetched = []
+
+        def slow_fetch(contract_id):
+            release.wait(2)
+            fetched.append(contract_id)
+            return True, {}
+
+        prefetcher = FormPrefetcher(slow_fetch, lookahead=4, max_workers=1)
+        prefetcher.prefetch(['1', '2', '3'])
+        prefetcher.cancel()
+        release.set()
+        prefetcher._executor.shutdown(wait=True)
+
+        assert fetched in ([], ['1'])
+        assert prefetcher.take('1') is None
+        prefetcher.prefetch(['4'])
+        assert prefetcher.take('4') is None
+
+
+class TestStepByStepPrefetching:
+    """Test form prefetching in ReceiptProcessor.process_receipts_step_by_step."""
+
+    def _client(self, contract_ids):
+        client = Mock(spec=WebClient)
+        client.validate_csv_contracts.return_value = {
+            'success': True,
+            'invalid_contracts': [],
+            'valid_contracts': contract_ids,
+            'validation_errors': [],
+            'portal_contracts_count': len(contract_ids),
+            'portal_contracts_data': [{'numero': contract_id, 'locatarios': []} for contract_id in contract_ids]
+        }
+        client.get_receipt_form.return_value = (True, {'nifEmitente': '123456789', 'versaoContrato': 1})
+        return client
+
+    def test_forms_fetched_before_confirmation(self):
+        """Test that the upcoming forms are requested while the dialog is open."""
+        client = self._client(['1', '2', '3'])
+        processor = ReceiptProcessor(client)
+        receipts = [ReceiptData(contract_id, '2025-01-01', '2025-01-31', 'rent', 100.0) for contract_id in ['1', '2', '3']]
+        seen_at_first_confirmation = []
+
+        def confirm(receipt_data, form_data):
+            if not seen_at_first_confirmation:
+                processor._form_prefetcher.take('2')
+                seen_at_first_confirmation.extend(call.args[0] for call in client.get_receipt_form.call_args_list)
+            return 'confirm'
+
+        results = processor.process_receipts_step_by_step(receipts, confirm)
+
+        assert '2' in seen_at_first_confirmation
+        assert len(results) == 3
+        assert client.get_receipt_form.call_count == 3
+        assert processor._form_prefetcher is None
+
+    def test_failed_prefetch_is_fetched_again(self):
+        """Test that a failed prefetched form falls back to a direct fetch."""
+        client = self._client(['1'])
+        form = {'nifEmitente': '123456789', 'versaoContrato': 1}
+        client.get_receipt_form.side_effect = [(False, None), (True, form)]
+        processor = ReceiptProcessor(client)
+        processor._form_prefetcher = FormPrefetcher(client.get_receipt_form)
+        processor._form_prefetcher.prefetch(['1'])
+
+        assert processor._get_receipt_form('1') == (True, form)
+        assert client.get_receipt_form.call_count == 2
+        processor._form_prefetcher.cancel()
+
+    def test_cancel_stops_prefetcher(self):
+        """Test that cancelling the run shuts the prefetcher down."""
+        client = self._client(['1', '2'])
+        processor = ReceiptProcessor(client)
+        receipts = [ReceiptData(contract_id, '2025-01-01', '2025-01-31', 'rent', 100.0) for contract_id in ['1', '2']]
+
+        results = processor.process_receipts_step_by_step(receipts, lambda receipt_data, form_data: 'cancel')
+
+        assert results == []
+        assert processor._form_prefetcher is None
+
+    def test_no_prefetching_in_dry_run(self):
+        """Test that dry runs never fetch forms."""
+        client = self._client(['1'])
+        processor = ReceiptProcessor(client)
+        processor.set_dry_run(True)
+
+        processor.process_receipts_step_by_step(
+            [ReceiptData('1', '2025-01-01', '2025-01-31', 'rent', 100.0)],
+            lambda receipt_data, form_data: 'confirm'
+        )
+
+        client.get_receipt_form.assert_not_called()
@@ -14,7 +14,9 @@ from io import StringIO
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils.logger import setup_logger, get_logger, LogHandler
+import logging.handlers
+
+from utils.logger import setup_logger, get_logger, LogHandler, BufferedGUIHandler
 
 
 class TestLogHandlerAddEntry:
@@ -296,6 +298,77 @@ class TestSetupLogger:
         assert isinstance(logger, logging.Logger)
 
 
+class TestQueuedLogging:
+    """Test that file and console output go through the queue listener."""
+    
+    def test_logger_only_enqueues(self):
+        """Test that the app logger's own handler is a QueueHandler."""
+        logger = setup_logger()
+        
+        assert any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
+        assert not any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+
+
+class TestBufferedGUIHandler:
+    """Test batched delivery of log lines to the GUI."""
+    
+    def _handler(self, **kwargs):
+        batches = []
+        handler = BufferedGUIHandler(batches.append, **kwargs)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        return handler, batches
+    
+    def _record(self, message):
+        return logging.LogRecord('receipts_app.test', logging.INFO, __file__, 1, message, None, None)
+    
+    def test_emit_buffers_until_flush(self):
+        """Test that records are delivered in one batch per flush."""
+        handler, batches = self._handler()
+        
+        for i in range(3):
+            handler.emit(self._record(f"line {i}"))
+        assert batches == []
+        
+        handler.flush_to_gui()
+        handler.flush_to_gui()  # Nothing buffered: no call
+        
+        assert batches == [['INFO line 0', 'INFO line 1', 'INFO line 2']]
+    
+    def test_buffer_is_bounded(self):
+        """Test that the oldest lines are dropped when the GUI falls behind."""
+        handler, batches = self._handler(max_buffered=2)
+        
+        for i in range(5):
+            handler.emit(self._record(f"line {i}"))
+        handler.flush_to_gui()
+        
+        assert batches == [['INFO line 3', 'INFO line 4']]
+    
+    def test_start_polls_widget(self):
+        """Test that start schedules periodic flushes on the widget."""
+        handler, batches = self._handler()
+        widget = Mock()
+        
+        handler.start(widget, interval_ms=50)
+        interval, poll = widget.after.call_args[0]
+        handler.emit(self._record("hello"))
+        poll()
+        
+        assert interval == 50
+        assert batches == [['INFO hello']]
+        assert widget.after.call_count == 2  # Rescheduled itself
+    
+    def test_poll_stops_when_widget_destroyed(self):
+        """Test that a destroyed widget ends the polling quietly."""
+        handler, _ = self._handler()
+        widget = Mock()
+        handler.start(widget)
+        poll = widget.after.call_args[0][1]
+        widget.after.side_effect = RuntimeError("application has been destroyed")
+        
+        poll()  # Does not raise
+
+
 class TestGetLogger:
     """Test get_logger functionality."""
     
@@ -0,0 +1,99 @@
+"""
+Unit tests for utils.payload_log.
+"""
+
+import logging
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import payload_log
+from utils.payload_log import LazyPayload, PayloadLogPolicy, log_payload, render_text
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters():
+    payload_log.reset_sampling()
+    yield
+    payload_log.reset_sampling()
+
+
+def _logger(enabled=True):
+    log = Mock(spec=logging.Logger)
+    log.isEnabledFor.return_value = enabled
+    return log
+
+
+class TestLazyPayload:
+    """Test deferred rendering."""
+
+    def test_renders_only_when_formatted(self):
+        renderer = Mock(return_value='{"a": 1}')
+        lazy = LazyPayload({'a': 1}, renderer)
+
+        renderer.assert_not_called()
+        assert str(lazy) == '{"a": 1}'
+        renderer.assert_called_once_with({'a': 1})
+
+    def test_truncates_to_cap(self):
+        lazy = LazyPayload('x' * 30, render_text, max_chars=10)
+
+        assert str(lazy) == 'x' * 10 + '... [truncated 20 chars]'
+
+    def test_render_failure_does_not_raise(self):
+        lazy = LazyPayload(object(), Mock(side_effect=TypeError("boom")))
+
+        assert str(lazy) == '<unrenderable payload: boom>'
+
+
+class TestLogPayload:
+    """Test level gating and sampling."""
+
+    def test_disabled_level_skips_rendering(self):
+        log = _logger(enabled=False)
+        renderer = Mock()
+
+        assert not log_payload(log, logging.DEBUG, 'test', "Payload", {'a': 1}, renderer=renderer)
+
+        log.log.assert_not_called()
+        renderer.assert_not_called()
+
+    def test_logs_lazy_argument(self):
+        log = _logger()
+
+        assert log_payload(log, logging.DEBUG, 'test', "Payload", {'a': 1})
+
+        level, fmt, label, lazy = log.log.call_args[0]
+        assert (level, fmt % (label, lazy)) == (logging.DEBUG, 'Payload:\n{\n  "a": 1\n}')
+
+    def test_sampling_per_endpoint(self):
+        log = _logger()
+        policies = {'sampled': PayloadLogPolicy(sample_every=3)}
+
+        with patch.dict(payload_log.PAYLOAD_LOG_POLICIES, policies):
+            logged = [log_payload(log, logging.DEBUG, 'sampled', "P", i) for i in range(7)]
+            other = log_payload(log, logging.DEBUG, 'unsampled', "P", 0)
+
+        assert logged == [True, False, False, True, False, False, True]
+        assert other
+
+    def test_force_bypasses_sampling(self):
+        log = _logger()
+        policies = {'sampled': PayloadLogPolicy(sample_every=100)}
+
+        with patch.dict(payload_log.PAYLOAD_LOG_POLICIES, policies):
+            log_payload(log, logging.DEBUG, 'sampled', "P", 1)
+            assert log_payload(log, logging.DEBUG, 'sampled', "P", 2, force=True)
+
+    def test_policy_cap_applied(self):
+        log = _logger()
+        policies = {'capped': PayloadLogPolicy(max_chars=5)}
+
+        with patch.dict(payload_log.PAYLOAD_LOG_POLICIES, policies):
+            log_payload(log, logging.INFO, 'capped', "P", 'abcdefgh', renderer=render_text)
+
+        assert str(log.log.call_args[0][3]) == 'abcde... [truncated 3 chars]'
@@ -79,10 +79,11 @@ class TestPrefilledCSVGeneration:
         ], "Success")
         
         # Mock rent value API returns valid values
-        mock_get_rent.side_effect = [
-            (True, 500.00),  # First contract
-            (True, 750.50)   # Second contract
-        ]
+        rent_by_contract = {
+            '12345': (True, 500.00),
+            '67890': (True, 750.50)
+        }
+        mock_get_rent.side_effect = lambda contract_id: rent_by_contract[contract_id]
         
         with tempfile.TemporaryDirectory() as temp_dir:
             success, result = client.generate_prefilled_csv(save_directory=temp_dir)
@@ -112,11 +113,13 @@ class TestPrefilledCSVGeneration:
             {'numero': '67890', 'estado': {'codigo': 'ACTIVO', 'label': 'Ativo'}},  # Will not have rent value
             {'numero': '11111', 'estado': {'codigo': 'ACTIVO', 'label': 'Ativo'}}   # Will have rent value
         ], "Success")        # Mock mixed rent value results
-        mock_get_rent.side_effect = [
-            (True, 500.00),    # First contract - success
-            (False, 0.0),      # Second contract - no rent value
-            (True, 300.25)     # Third contract - success
-        ]
+        # Keyed by contract ID: the fallback lookups run in parallel
+        rent_by_contract = {
+            '12345': (True, 500.00),   # success
+            '67890': (False, 0.0),     # no rent value
+            '11111': (True, 300.25)    # success
+        }
+        mock_get_rent.side_effect = lambda contract_id: rent_by_contract[contract_id]
         
         with tempfile.TemporaryDirectory() as temp_dir:
             success, result = client.generate_prefilled_csv(save_directory=temp_dir)
@@ -0,0 +1,147 @@
+"""
+Unit tests for the columnar ReceiptBatch and its use by CSVHandler and ReceiptProcessor.
+"""
+
+import sys
+import os
+from datetime import date
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from receipt_batch import ReceiptBatch, ReceiptRow
+from csv_handler import CSVHandler, ReceiptData
+from excel_preprocessor import ReceiptData as PreprocessedReceipt
+from receipt_processor import ReceiptProcessor
+
+
+def _receipt(contract_id='123', from_date='2025-01-01', to_date='2025-01-31', value=100.0,
+             payment_date='2025-01-31', row_number=2, **flags):
+    return ReceiptData(contract_id=contract_id, from_date=from_date, to_date=to_date,
+                       receipt_type='rent', value=value, payment_date=payment_date,
+                       row_number=row_number, **flags)
+
+
+class TestReceiptBatch:
+    """Test storage, views and column-wise operations."""
+
+    def test_round_trip(self):
+        """Test that rows read back exactly as the receipts that were stored."""
+        receipts = [_receipt(), _receipt('456', value=-1.0, value_defaulted=True, row_number=3)]
+        batch = ReceiptBatch.from_receipts(receipts)
+
+        assert len(batch) == 2
+        assert batch.to_receipts() == receipts
+        assert batch[1] == receipts[1]
+        assert batch[-1].value_defaulted is True
+        assert batch[0].payment_date_defaulted is False
+
+    def test_preprocessor_receipts_with_date_objects(self):
+        """Test excel_preprocessor receipts (date objects, no flags) are accepted."""
+        receipt = PreprocessedReceipt('789', date(2025, 2, 1), date(2025, 2, 28), date(2025, 2, 5), 'rent', 500.0)
+        row = ReceiptBatch.from_receipts([receipt])[0]
+
+        assert (row.from_date, row.to_date, row.payment_date) == ('2025-02-01', '2025-02-28', '2025-02-05')
+        assert row.row_number == 0
+
+    def test_views_write_through(self):
+        """Test that views do not copy the row."""
+        batch = ReceiptBatch.from_receipts([_receipt(value=-1.0, value_defaulted=True)])
+        view = batch[0]
+
+        view.value = 850.0
+        view.value_defaulted = False
+        view.from_date = date(2025, 1, 2)
+
+        assert isinstance(view, ReceiptRow)
+        assert batch[0].value == 850.0
+        assert batch[0].value_defaulted is False
+        assert batch[0].from_date == '2025-01-02'
+
+    def test_contract_mask_and_filter(self):
+        """Test index-mask filtering by contract."""
+        batch = ReceiptBatch.from_receipts([_receipt('1'), _receipt('2'), _receipt(' 1 '), _receipt('3')])
+
+        mask = batch.contract_mask(['1', '3'])
+        filtered = batch.filter(mask)
+
+        assert list(mask) == [1, 0, 1, 1]
+        assert [row.contract_id for row in filtered] == ['1', ' 1 ', '3']
+        assert len(batch) == 4
+        assert batch.contract_counts() == {'1': 1, '2': 1, ' 1 ': 1, '3': 1}
+        assert [row.contract_id for row in batch[1:3]] == ['2', ' 1 ']
+
+    def test_validate(self):
+        """Test the column-wise checks and that errors come out in row order."""
+        batch = ReceiptBatch.from_receipts([
+            _receipt(row_number=2),
+            _receipt(from_date='2025-02-01', value=-5.0, row_number=3),
+            _receipt('', payment_date='2025-06-01', row_number=4),
+            _receipt(value=-1.0, value_defaulted=True, row_number=5),
+        ])
+
+        errors = batch.validate(today=date(2025, 3, 1))
+
+        assert errors == [
+            "Row 3: From date (2025-02-01) cannot be later than to date (2025-01-31)",
+            "Row 3: Value cannot be negative (got -5.0)",
+            "Row 4: Contract ID cannot be empty",
+            "Row 4: Payment date (2025-06-01) cannot be in the future",
+        ]
+
+    def test_validate_matches_row_validation(self):
+        """Test the batch reports what CSVHandler._receipt_errors reports."""
+        receipts = [_receipt(from_date='2025-03-01', row_number=2), _receipt(value=-2.0, row_number=3)]
+        handler = CSVHandler()
+
+        expected = [error for receipt in receipts for error in handler._receipt_errors(receipt)]
+
+        assert ReceiptBatch.from_receipts(receipts).validate() == expected
+
+    def test_validate_missing_date_matches_row_validation(self):
+        """Test a missing date gets the row parser's message."""
+        batch = ReceiptBatch.from_receipts([_receipt(to_date='', row_number=2)])
+
+        expected = CSVHandler()._receipt_errors(batch[0].to_receipt())
+
+        assert batch.validate() == expected
+        assert expected[0].startswith("Row 2: Invalid date format. Use YYYY-MM-DD. Error: ")
+
+
+class TestColumnarLoading:
+    """Test CSVHandler and ReceiptProcessor with a columnar batch."""
+
+    def _write(self, tmp_path):
+        path = tmp_path / 'receipts.csv'
+        path.write_text('contractId,fromDate,toDate,paymentDate,value\n'
+                        '1,2025-01-01,2025-01-31,2025-01-31,100\n'
+                        '2,2025-01-01,2025-01-31,2025-01-31,\n'
+                        '1,2025-02-01,2025-02-28,2025-02-28,100\n', encoding='utf-8')
+        return str(path)
+
+    def test_load_and_filter(self, tmp_path):
+        """Test columnar loading, summaries and contract filtering."""
+        handler = CSVHandler()
+        success, errors = handler.load_csv(self._write(tmp_path), columnar=True)
+
+        assert success, errors
+        assert isinstance(handler.get_receipts(), ReceiptBatch)
+        assert handler.get_contract_ids() == ['1', '2']
+        assert handler.get_contracts_summary() == {'1': 2, '2': 1}
+        assert handler.receipts[1].value_defaulted is True
+
+        assert handler.filter_receipts_by_contracts(['1']) == 1
+        assert [row.row_number for row in handler.get_receipts()] == [2, 4]
+        assert handler.filter_receipts_by_contracts([]) == 2
+        assert len(handler.get_receipts()) == 0
+
+    def test_bulk_processing_accepts_batch(self, tmp_path):
+        """Test that a batch is processed like a list, not as a stream."""
+        handler = CSVHandler()
+        handler.load_csv(self._write(tmp_path), columnar=True)
+        processor = ReceiptProcessor(Mock())
+        processor.set_dry_run(True)
+
+        results = processor.process_receipts_bulk(handler.get_receipts(), validate_contracts=False)
+
+        assert [result.contract_id for result in results] == ['1', '2', '1']
@@ -12,6 +12,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from web_client import WebClient
 from receipt_processor import ReceiptProcessor
 from csv_handler import ReceiptData
+from utils.retry_policy import SubmissionRegistry
 
 @patch.object(WebClient, '__init__')
 @patch.object(WebClient, 'submit_receipt')
@@ -32,6 +33,7 @@ def test_receipt_issuing_with_error_handling(mock_submit, mock_init):
     web_client.receipts_base_url = "https://portaldefinancas.gov.pt/pt/aRecibosOnlineForm"
     web_client.session = MagicMock()
     web_client.api_monitor = MagicMock()
+    web_client.submissions = SubmissionRegistry()
     print("✓ Web client initialized in testing mode")
     
     # Create receipt processor
@@ -0,0 +1,135 @@
+"""
+Unit tests for utils.receipt_form_parser and its use by WebClient.get_receipt_form.
+"""
+
+import sys
+import os
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.receipt_form_parser import parse_receipt_form, find_receipt_script
+from web_client import WebClient
+
+
+RECEIPT_SCRIPT = '''
+    var app = angular.module('recibos');
+    $scope.recibo = {
+        "numContrato": 123456,
+        "versaoContrato": 2,
+        "nifEmitente": 123456789,
+        "nomeEmitente": " TEST LANDLORD ",
+        "valorRenda": 750.5,
+        "locadores": [
+            {"nif": 123456789, "nome": "TEST LANDLORD", "quotaParte": "1/2", "sujeitoPassivo": "V"},
+            {"nif": 111111111, "nome": "SECOND LANDLORD"}
+        ],
+        "locatarios": [
+            {"nif": 987654321, "nome": "MARIA SANTOS", "pais": {"codigo": "2724", "label": "PORTUGAL"},
+             "retencao": {"taxa": 0, "codigo": "RIRS03", "label": "Dispensa [art. 101.º-B]"}}
+        ],
+        "imoveis": [
+            {"morada": "RUA A, 1", "tipo": {"codigo": "U", "label": "Urbano"}, "partes": [[1, 2], [3]]}
+        ],
+        "hasNifHerancaIndivisa": false
+    };
+'''
+
+
+def _page(script=RECEIPT_SCRIPT):
+    return (
+        '<html><head><script src="/js/app.js"></script>'
+        '<script>var other = {"numContrato": 0};</script></head>'
+        f'<body><script type="text/javascript">{script}</script></body></html>'
+    )
+
+
+class TestReceiptFormParser:
+    """Test extraction of the embedded receipt data."""
+
+    def test_extracts_contract_fields(self):
+        """Test scalar fields and the backward-compatible shortcuts."""
+        details = parse_receipt_form(_page())
+
+        assert details['numContrato'] == 123456
+        assert details['versaoContrato'] == 2
+        assert details['nifEmitente'] == 123456789
+        assert details['nomeEmitente'] == 'TEST LANDLORD'
+        assert details['valorRenda'] == 750.5
+        assert details['tenant_nif'] == 987654321
+        assert details['tenant_name'] == 'MARIA SANTOS'
+        assert details['landlord_count'] == 2
+        assert details['locadores'][1]['quotaParte'] == '1/1'
+        assert details['property_address'] == 'RUA A, 1'
+        assert details['hasNifHerancaIndivisa'] is False
+        assert details['herdeiros'] == []
+
+    def test_nested_arrays_and_brackets_in_strings(self):
+        """Test that arrays are decoded whole, not cut at the first closing bracket."""
+        details = parse_receipt_form(_page())
+
+        assert details['imoveis'][0]['partes'] == [[1, 2], [3]]
+        assert details['locatarios'][0]['retencao']['label'] == 'Dispensa [art. 101.º-B]'
+
+    def test_trailing_commas_tolerated(self):
+        """Test JavaScript-style trailing commas in the embedded literal."""
+        script = '$scope.recibo = {"numContrato": 1, "locatarios": [{"nif": 2, "nome": "A",},], "imoveis": [{"morada": "X",},]};'
+        details = parse_receipt_form(_page(script))
+
+        assert details['locatarios'][0]['nif'] == 2
+        assert details['imoveis'] == [{'morada': 'X'}]
+
+    def test_undecodable_tenants_recovered_field_by_field(self):
+        """Test the field-by-field fallback for broken arrays."""
+        script = '$scope.recibo = {"numContrato": 1, "locatarios": [{"nif": 2, "nome": "A", "pais": undefined}]};'
+        details = parse_receipt_form(_page(script))
+
+        assert details['tenant_nif'] == 2
+        assert details['locatarios'][0]['pais']['codigo'] == '2724'
+
+    def test_inheritance_data(self):
+        """Test inheritance arrays are read only when the flag is set."""
+        script = ('$scope.recibo = {"numContrato": 1, "hasNifHerancaIndivisa": true, '
+                  '"locadoresHerancaIndivisa": [{"nif": 3}], "herdeiros": [{"nifHerdeiro": 4, "quotaParte": "1/2"}]};')
+        details = parse_receipt_form(_page(script))
+
+        assert details['hasNifHerancaIndivisa'] is True
+        assert details['locadoresHerancaIndivisa'] == [{'nif': 3}]
+        assert details['herdeiros'][0]['nifHerdeiro'] == 4
+
+    def test_page_without_receipt_data(self):
+        """Test pages without the receipt script."""
+        assert parse_receipt_form('<html><body>Sessão expirada</body></html>') is None
+        assert parse_receipt_form('') is None
+        assert find_receipt_script('<script>var numContrato = 1;</script>') is None
+
+
+class TestGetReceiptFormParsing:
+    """Test WebClient.get_receipt_form with the extractor."""
+
+    def test_form_data_contains_contract_details(self):
+        """Test that the extracted details are merged into form data."""
+        client = WebClient()
+        client.authenticated = True
+        response = Mock(status_code=200, text=_page())
+
+        with patch.object(client.session, 'get', return_value=response):
+            success, form_data = client.get_receipt_form('123456')
+
+        assert success is True
+        assert form_data['has_contract_data'] is True
+        assert form_data['numContrato'] == 123456
+        assert form_data['contract_details']['tenant_count'] == 1
+
+    def test_form_without_contract_data(self):
+        """Test that a page without receipt data still returns basic form data."""
+        client = WebClient()
+        client.authenticated = True
+        response = Mock(status_code=200, text='<html></html>')
+
+        with patch.object(client.session, 'get', return_value=response):
+            success, form_data = client.get_receipt_form('123456')
+
+        assert success is True
+        assert 'has_contract_data' not in form_data
+        assert form_data['contractId'] == '123456'
@@ -12,7 +12,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from receipt_processor import ReceiptProcessor, ProcessingResult
-from csv_handler import ReceiptData
+from csv_handler import ReceiptData, ReceiptRowError
 from web_client import WebClient
 
 
@@ -209,6 +209,36 @@ class TestBulkProcessing:
         assert len(progress_updates) > 0
         assert progress_updates[-1][0] == progress_updates[-1][1]  # Final update
     
+    def test_process_receipts_bulk_mixed_row_errors(self):
+        """Row errors in a list are reported as failures, not validated as contracts."""
+        mock_client = Mock(spec=WebClient)
+        mock_client.validate_csv_contracts.return_value = {
+            'success': True,
+            'invalid_contracts': [],
+            'valid_contracts': ['12345'],
+            'validation_errors': [],
+            'portal_contracts_count': 1,
+            'portal_contracts_data': [{'numero': '12345', 'locatarios': []}]
+        }
+        
+        processor = ReceiptProcessor(mock_client)
+        processor.set_dry_run(True)
+        
+        receipts = [
+            ReceiptData('12345', '2025-01-01', '2025-01-31', 'rent', 1000.00),
+            ReceiptRowError(3, 'bad')
+        ]
+        
+        results = processor.process_receipts_bulk(receipts, validate_contracts=True)
+        
+        assert len(results) == 2
+        validated = mock_client.validate_csv_contracts.call_args[0][0]
+        assert validated == ['12345']
+        failed = [r for r in results if not r.success]
+        assert len(failed) == 1
+        assert failed[0].error_message == 'bad'
+        assert any(r.success for r in results)
+    
     def test_process_receipts_bulk_stop_check(self):
         """Test bulk processing can be stopped mid-execution."""
         mock_client = Mock(spec=WebClient)
@@ -264,6 +294,89 @@ class TestBulkProcessing:
         assert len(results) == 1
 
 
+class TestStreamingBulkProcessing:
+    """Test bulk processing of a receipt stream."""
+    
+    def _client(self, portal_contracts):
+        mock_client = Mock(spec=WebClient)
+        mock_client.get_contracts_with_tenant_data.return_value = (
+            True,
+            [{'numero': c, 'estado': {'codigo': 'ACTIVO'}, 'locatarios': []} for c in portal_contracts],
+            'ok'
+        )
+        return mock_client
+    
+    def test_issuing_starts_before_stream_ends(self):
+        """Test that receipts are issued while later rows are still unread."""
+        processor = ReceiptProcessor(self._client(['1', '2', '3']), max_workers=1)
+        read = []
+        read_when_issued = []
+        
+        def stream():
+            for contract_id in ['1', '2', '3']:
+                read.append(contract_id)
+                yield ReceiptData(contract_id, '2025-01-01', '2025-01-31', 'rent', 100.0)
+        
+        def fake_process(receipt, form_data=None):
+            read_when_issued.append(len(read))
+            return ProcessingResult(contract_id=receipt.contract_id, success=True, status="Success")
+        
+        with patch.object(processor, '_process_single_receipt', side_effect=fake_process):
+            results = processor.process_receipts_bulk(stream())
+        
+        assert read_when_issued[0] == 1
+        assert [r.contract_id for r in results] == ['1', '2', '3']
+    
+    def test_stream_invalid_contracts_and_row_errors(self):
+        """Test that unknown contracts are skipped and row errors reported, in input order."""
+        processor = ReceiptProcessor(self._client(['1']))
+        items = iter([
+            ReceiptData('1', '2025-01-01', '2025-01-31', 'rent', 100.0),
+            ReceiptRowError(3, "Row 3: Value cannot be negative (got -5.0)"),
+            ReceiptData('9', '2025-01-01', '2025-01-31', 'rent', 100.0)
+        ])
+        
+        with patch.object(processor, '_process_single_receipt',
+                          return_value=ProcessingResult(contract_id='1', success=True, status="Success")) as process:
+            results = processor.process_receipts_bulk(items)
+        
+        assert process.call_count == 1
+        assert [r.status for r in results] == ["Success", "Failed", "Skipped"]
+        assert 'negative' in results[1].error_message
+    
+    def test_stream_validation_failure(self):
+        """Test that a failed portal lookup fails every streamed receipt."""
+        mock_client = Mock(spec=WebClient)
+        mock_client.get_contracts_with_tenant_data.return_value = (False, [], 'Not authenticated')
+        processor = ReceiptProcessor(mock_client)
+        
+        with patch.object(processor, '_process_single_receipt') as process:
+            results = processor.process_receipts_bulk(
+                iter([ReceiptData('1', '2025-01-01', '2025-01-31', 'rent', 100.0)])
+            )
+        
+        process.assert_not_called()
+        assert results[0].status == "Failed"
+        assert 'Not authenticated' in results[0].error_message
+    
+    def test_stream_no_active_contracts_rejects_all(self):
+        """Test that an empty portal contract list skips every row instead of disabling the check."""
+        mock_client = self._client([])
+        mock_client.get_contracts_with_tenant_data.return_value = (
+            True, [{'numero': '1', 'estado': {'codigo': 'TERMINADO'}}], 'ok'
+        )
+        processor = ReceiptProcessor(mock_client)
+        
+        with patch.object(processor, '_process_single_receipt') as process:
+            results = processor.process_receipts_bulk(
+                iter([ReceiptData('1', '2025-01-01', '2025-01-31', 'rent', 100.0)])
+            )
+        
+        process.assert_not_called()
+        mock_client.validate_csv_contracts.assert_not_called()
+        assert [r.status for r in results] == ["Skipped"]
+
+
 class TestStepByStepProcessing:
     """Test step-by-step processing with user confirmation."""
     
@@ -351,6 +464,39 @@ class TestStepByStepProcessing:
         assert processed_count[0] <= 2
 
 
+    def test_step_by_step_batches_missing_rent_values(self):
+        """Test that missing rent values are looked up once for all receipts."""
+        mock_client = Mock(spec=WebClient)
+        mock_client.validate_csv_contracts.return_value = {
+            'success': True,
+            'invalid_contracts': [],
+            'valid_contracts': ['12345', '67890'],
+            'validation_errors': [],
+            'portal_contracts_count': 2,
+            'portal_contracts_data': [
+                {'numero': '12345', 'valorRenda': 500.0, 'locatarios': []},
+                {'numero': '67890', 'locatarios': []}
+            ]
+        }
+        mock_client.get_contract_rent_values.return_value = {'67890': 750.0}
+        mock_client.get_receipt_form.return_value = (True, {})
+        
+        processor = ReceiptProcessor(mock_client)
+        processor.set_dry_run(True)
+        receipts = [
+            ReceiptData('12345', '2025-01-01', '2025-01-31', 'rent', -1.0),
+            ReceiptData('67890', '2025-01-01', '2025-01-31', 'rent', -1.0),
+            ReceiptData('67890', '2025-02-01', '2025-02-28', 'rent', 0.0)
+        ]
+        
+        processor.process_receipts_step_by_step(receipts, lambda receipt_data, form_data: 'confirm')
+        
+        mock_client.get_contract_rent_values.assert_called_once()
+        assert mock_client.get_contract_rent_values.call_args.args[0] == ['67890', '67890']
+        mock_client.get_contract_rent_value.assert_not_called()
+        assert [receipt.value for receipt in receipts] == [500.0, 750.0, 750.0]
+
+
 class TestTenantNameExtraction:
     """Test tenant name extraction from contract data."""
     
@@ -507,3 +653,121 @@ class TestDryRunMode:
         # Should not call issue_receipt in dry run
         mock_client.issue_receipt.assert_not_called()
         assert 'Dry Run' in result.status or result.status == 'Success'
+
+
+class TestConcurrentBulkProcessing:
+    """Test the bounded worker pool used by bulk processing."""
+    
+    def test_results_keep_input_order(self):
+        """Test that results are returned in input order even when completion order differs."""
+        import time
+        
+        processor = ReceiptProcessor(Mock(spec=WebClient), max_workers=4)
+        processor.set_dry_run(True)
+        
+        delays = {'1': 0.05, '2': 0.0, '3': 0.03, '4': 0.0}
+        
+        def fake_process(receipt, form_data=None):
+            time.sleep(delays[receipt.contract_id])
+            return ProcessingResult(contract_id=receipt.contract_id, success=True)
+        
+        processor._process_single_receipt = fake_process
+        receipts = [ReceiptData(cid, '2025-01-01', '2025-01-31', 'rent', 100.0) for cid in ['1', '2', '3', '4']]
+        
+        results = processor.process_receipts_bulk(receipts, validate_contracts=False)
+        
+        assert [r.contract_id for r in results] == ['1', '2', '3', '4']
+    
+    def test_max_in_flight_is_respected(self):
+        """Test that no more than max_workers receipts are processed at once."""
+        import threading
+        import time
+        
+        processor = ReceiptProcessor(Mock(spec=WebClient))
+        processor.set_dry_run(True)
+        processor.set_max_workers(2)
+        
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def fake_process(receipt, form_data=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return ProcessingResult(contract_id=receipt.contract_id, success=True)
+        
+        processor._process_single_receipt = fake_process
+        receipts = [ReceiptData(str(i), '2025-01-01', '2025-01-31', 'rent', 100.0) for i in range(8)]
+        
+        results = processor.process_receipts_bulk(receipts, validate_contracts=False)
+        
+        assert len(results) == 8
+        assert state['peak'] <= 2
+    
+    def test_worker_exception_becomes_failed_result(self):
+        """Test that an unexpected worker exception is recorded as a failed result."""
+        processor = ReceiptProcessor(Mock(spec=WebClient), max_workers=2)
+        processor.set_dry_run(True)
+        
+        def fake_process(receipt, form_data=None):
+            if receipt.contract_id == '2':
+                raise RuntimeError("boom")
+            return ProcessingResult(contract_id=receipt.contract_id, success=True)
+        
+        processor._process_single_receipt = fake_process
+        receipts = [ReceiptData(cid, '2025-01-01', '2025-01-31', 'rent', 100.0) for cid in ['1', '2', '3']]
+        
+        results = processor.process_receipts_bulk(receipts, validate_contracts=False)
+        
+        assert [r.success for r in results] == [True, False, True]
+        assert results[1].status == "Failed"
+        assert "boom" in results[1].error_message
+    
+    def test_workers_share_one_portal_handshake(self):
+        """Test that workers hitting an expired portal session do one handshake and wait for it."""
+        import threading
+        import time
+        from web_client import CONTRACTS_API_URL
+        
+        client = WebClient()
+        client.authenticated = True
+        lock = threading.Lock()
+        state = {'handshaking': False, 'handshakes': 0, 'sent_mid_handshake': 0}
+        
+        def fake_get(url, **kwargs):
+            if url == client.sici_redirect_url:
+                with lock:
+                    state['handshaking'] = True
+                    state['handshakes'] += 1
+                time.sleep(0.05)
+                client.session.cookies.set('JSESSIONID', 'portal', domain='imoveis.portaldasfinancas.gov.pt', path='/')
+                with lock:
+                    state['handshaking'] = False
+                return Mock(url=client.portal_page_url, status_code=200, text='')
+            with lock:
+                if state['handshaking']:
+                    state['sent_mid_handshake'] += 1
+            if url == CONTRACTS_API_URL:
+                return Mock(url=url, status_code=200, text='[]', headers={}, json=Mock(return_value=[]))
+            return Mock(url=url, status_code=404, text='', headers={})
+        
+        processor = ReceiptProcessor(client, max_workers=4)
+        
+        def fake_process(receipt, form_data=None):
+            # A contracts refresh mid-batch needs the SICI handshake (no portal session yet)
+            client.get_contracts_with_tenant_data(force_refresh=True)
+            client.get_receipt_form(receipt.contract_id, use_cache=False)
+            return ProcessingResult(contract_id=receipt.contract_id, success=True)
+        
+        processor._process_single_receipt = fake_process
+        receipts = [ReceiptData(str(i), '2025-01-01', '2025-01-31', 'rent', 100.0) for i in range(8)]
+        
+        with patch.object(client.session, 'get', side_effect=fake_get):
+            results = processor.process_receipts_bulk(receipts, validate_contracts=False)
+        
+        assert all(r.success for r in results)
+        assert state['handshakes'] == 1
+        assert state['sent_mid_handshake'] == 0
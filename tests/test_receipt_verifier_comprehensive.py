@@ -324,6 +324,89 @@ class TestVerifyProcessingResults:
             assert any("Verified:" in str(call) for call in info_calls)
 
 
+class TestParallelVerification:
+    """Test concurrent verification in verify_processing_results."""
+    
+    def _results(self, count):
+        return [
+            ProcessingResult(success=True, contract_id=str(i), receipt_number=f"R-{i:03d}", value=100.00)
+            for i in range(count)
+        ]
+    
+    def test_results_keep_input_order(self):
+        """Test that results come back in input order whatever the completion order."""
+        import time
+        mock_client = Mock()
+        mock_client.receipts_base_url = "https://imoveis.portaldasfinancas.gov.pt"
+        
+        def mock_verify(contract_id, receipt_number):
+            time.sleep(0.02 * (5 - int(contract_id)))
+            return (True, {'contract_name': f'Contract {contract_id}'})
+        
+        mock_client.verify_receipt_in_portal.side_effect = mock_verify
+        verifier = ReceiptVerifier(mock_client)
+        
+        verified = verifier.verify_processing_results(self._results(5), max_workers=5)
+        
+        assert [v.contract_id for v in verified] == ['0', '1', '2', '3', '4']
+        assert all(v.verification_status == "Verified" for v in verified)
+    
+    def test_callback_streams_progress(self):
+        """Test that the callback is called once per receipt with a running count."""
+        mock_client = Mock()
+        mock_client.verify_receipt_in_portal.return_value = (True, {})
+        verifier = ReceiptVerifier(mock_client)
+        calls = []
+        
+        verifier.verify_processing_results(
+            self._results(6),
+            result_callback=lambda completed, total, receipt: calls.append((completed, total, receipt.receipt_number))
+        )
+        
+        assert [c[0] for c in calls] == [1, 2, 3, 4, 5, 6]
+        assert all(c[1] == 6 for c in calls)
+        assert sorted(c[2] for c in calls) == [f"R-{i:03d}" for i in range(6)]
+    
+    def test_per_host_concurrency_cap(self):
+        """Test that no more than MAX_REQUESTS_PER_HOST requests run at once."""
+        import threading
+        import time
+        import receipt_verifier
+        
+        mock_client = Mock()
+        mock_client.receipts_base_url = "https://imoveis.portaldasfinancas.gov.pt"
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def mock_verify(contract_id, receipt_number):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return (True, {})
+        
+        mock_client.verify_receipt_in_portal.side_effect = mock_verify
+        verifier = ReceiptVerifier(mock_client)
+        
+        verifier.verify_processing_results(self._results(20), max_workers=16)
+        
+        assert 1 <= state['peak'] <= receipt_verifier.MAX_REQUESTS_PER_HOST
+    
+    def test_callback_errors_do_not_stop_verification(self):
+        """Test that a failing progress callback is ignored."""
+        mock_client = Mock()
+        mock_client.verify_receipt_in_portal.return_value = (True, {})
+        verifier = ReceiptVerifier(mock_client)
+        
+        verified = verifier.verify_processing_results(
+            self._results(3), result_callback=Mock(side_effect=RuntimeError("GUI closed"))
+        )
+        
+        assert len(verified) == 3
+
+
 class TestExportToCSV:
     """Test export_to_csv method."""
     
@@ -0,0 +1,127 @@
+"""
+Unit tests for utils.retry_policy.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.retry_policy import (
+    RetryPolicy, SubmissionRegistry, is_transient_error, is_transient_status, receipt_dedup_key
+)
+
+
+class TestRetryPolicy:
+    """Test backoff computation."""
+
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=False)
+
+        assert [policy.backoff(attempt) for attempt in range(1, 5)] == [0.5, 1.0, 2.0, 3.0]
+
+    def test_jitter_stays_within_backoff(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+
+        delays = [policy.backoff(3) for _ in range(50)]
+
+        assert all(0 <= delay <= 4.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_wait_sleeps_for_backoff(self):
+        policy = RetryPolicy(base_delay=0.25, jitter=False)
+
+        with patch('utils.retry_policy.time.sleep') as mock_sleep:
+            assert policy.wait(2, "HTTP 503") == 0.5
+        mock_sleep.assert_called_once_with(0.5)
+
+
+class TestTransientFailures:
+    """Test which failures are retried."""
+
+    @pytest.mark.parametrize("error,expected", [
+        (requests.exceptions.ReadTimeout(), True),
+        (requests.exceptions.ConnectionError(), True),
+        (requests.exceptions.HTTPError(), False),
+        (ValueError(), False),
+    ])
+    def test_errors(self, error, expected):
+        assert is_transient_error(error) is expected
+
+    def test_statuses(self):
+        assert [is_transient_status(code) for code in (200, 404, 429, 503)] == [False, False, True, True]
+
+
+class TestReceiptDedupKey:
+    """Test the receipt identity."""
+
+    def test_equivalent_payloads_match(self):
+        payload = {'numContrato': 123456, 'dataInicio': '2024-07-01', 'dataFim': '2024-07-31', 'valor': 850}
+        other = {'numContrato': '123456', 'dataInicio': '2024-07-01T00:00:00', 'dataFim': '2024-07-31',
+                 'valor': '850.00'}
+
+        assert receipt_dedup_key(payload) == receipt_dedup_key(other) == ('123456', '2024-07-01', '2024-07-31', '850.00')
+
+    def test_missing_fields_are_empty(self):
+        assert receipt_dedup_key({'numContrato': 1}) == ('1', '', '', '')
+
+
+class TestSubmissionRegistry:
+    """Test in-session duplicate detection."""
+
+    KEY = ('1', '2024-07-01', '2024-07-31', '850.00')
+
+    def test_claim_release_and_issued(self):
+        registry = SubmissionRegistry()
+
+        assert registry.claim(self.KEY) == (None, True)
+        assert registry.claim(self.KEY) == (None, False)  # In flight
+
+        registry.release(self.KEY, {'receiptNumber': '7'})
+
+        assert registry.claim(self.KEY) == ({'receiptNumber': '7'}, False)
+
+    def test_failed_submission_can_be_claimed_again(self):
+        registry = SubmissionRegistry()
+        registry.claim(self.KEY)
+
+        registry.release(self.KEY)
+
+        assert registry.claim(self.KEY) == (None, True)
+
+    def test_ambiguous_submission_cannot_be_claimed_again(self):
+        registry = SubmissionRegistry()
+        registry.claim(self.KEY)
+
+        registry.release(self.KEY, ambiguous=True)
+
+        assert registry.is_unconfirmed(self.KEY)
+        assert registry.claim(self.KEY) == (None, False)
+
+    def test_mark_not_issued_allows_claim_again(self):
+        registry = SubmissionRegistry()
+        registry.claim(self.KEY)
+        registry.release(self.KEY, ambiguous=True)
+
+        assert registry.mark_not_issued(self.KEY[:3]) == 1  # Any value
+
+        assert not registry.is_unconfirmed(self.KEY)
+        assert registry.claim(self.KEY) == (None, True)
+        assert registry.mark_not_issued(('2', '2024-07-01', '2024-07-31')) == 0
+
+    def test_clear_forgets_issued_and_unconfirmed(self):
+        registry = SubmissionRegistry()
+        other = ('2',) + self.KEY[1:]
+        for key in (self.KEY, other):
+            registry.claim(key)
+        registry.release(self.KEY, {'receiptNumber': '7'})
+        registry.release(other, ambiguous=True)
+
+        assert registry.clear() == 1
+
+        assert registry.claim(self.KEY) == (None, True)
+        assert registry.claim(other) == (None, True)
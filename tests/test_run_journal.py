@@ -0,0 +1,195 @@
+"""
+Unit tests for the bulk run journal (utils.run_journal) and
+ReceiptProcessor.resume_run.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from csv_handler import ReceiptData
+from receipt_batch import ReceiptBatch
+from receipt_processor import ReceiptProcessor, ProcessingResult
+from utils.run_journal import RunJournal, PENDING, IN_FLIGHT, COMPLETED, AMBIGUOUS, FAILED
+from web_client import WebClient
+
+
+def _receipt(contract_id='1001', value=500.0):
+    return ReceiptData(contract_id=contract_id, from_date='2024-07-01', to_date='2024-07-31',
+                       receipt_type='rent', value=value, payment_date='2024-07-28')
+
+
+def _result(receipt, success=True, ambiguous=False, number='R1'):
+    return ProcessingResult(contract_id=receipt.contract_id, success=success, ambiguous=ambiguous,
+                            receipt_number=number if success else '', value=receipt.value,
+                            status="Success" if success else "Failed")
+
+
+class TestRunJournal:
+    """Test recording and replaying receipt states."""
+
+    def test_states_survive_reopen(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipts = [_receipt(str(n)) for n in range(5)]
+        with RunJournal(path) as journal:
+            journal.plan(receipts)
+            for receipt in receipts[1:]:
+                journal.record_intent(receipt)
+            journal.record_outcome(receipts[1], _result(receipts[1]))
+            journal.record_outcome(receipts[2], _result(receipts[2], success=False))
+            journal.record_outcome(receipts[3], _result(receipts[3], success=False, ambiguous=True))
+
+        journal = RunJournal(path)
+
+        assert [journal.state(r) for r in receipts] == [PENDING, COMPLETED, FAILED, AMBIGUOUS, IN_FLIGHT]
+        assert journal.completed_result(receipts[1])['receipt_number'] == 'R1'
+        assert [journal.needs_recheck(r) for r in receipts] == [False, False, False, True, True]
+        assert [r['contract_id'] for r in journal.receipts()] == ['0', '1', '2', '3', '4']
+
+    def test_torn_last_line_ignored(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipt = _receipt()
+        with RunJournal(path) as journal:
+            journal.record_intent(receipt)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"event": "outcome", "key": ')
+
+        assert RunJournal(path).state(receipt) == IN_FLIGHT
+
+    def test_plan_skips_known_receipts(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        with RunJournal(path) as journal:
+            assert journal.plan([_receipt('1'), _receipt('2'), _receipt('1')]) == 2
+            assert journal.plan([_receipt('2'), _receipt('3')]) == 1
+
+        with open(path, encoding='utf-8') as f:
+            assert [json.loads(line)['event'] for line in f] == ['planned'] * 3
+
+    def test_batch_rows_recorded_as_receipts(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipt = _receipt()
+        row = ReceiptBatch.from_receipts([receipt])[0]
+        with RunJournal(path) as journal:
+            assert journal.plan([row]) == 1
+            journal.record_intent(row)
+
+        journal = RunJournal(path)
+        assert journal.state(receipt) == IN_FLIGHT
+        assert journal.receipts()[0]['contract_id'] == '1001'
+
+    def test_mark_not_issued(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipt = _receipt()
+        with RunJournal(path) as journal:
+            journal.record_intent(receipt)
+            journal.record_outcome(receipt, _result(receipt, success=False, ambiguous=True))
+            journal.mark_not_issued(receipt)
+
+        journal = RunJournal(path)
+        assert journal.state(receipt) == FAILED
+        assert not journal.needs_recheck(receipt)
+
+    def test_key_matches_value_formats(self):
+        assert RunJournal.receipt_key(_receipt(value=500)) == RunJournal.receipt_key({
+            'contract_id': '1001', 'from_date': '2024-07-01', 'to_date': '2024-07-31', 'value': '500.00'
+        })
+
+
+class TestResumeRun:
+    """Test resuming an interrupted bulk run."""
+
+    def _processor(self):
+        processor = ReceiptProcessor(Mock(spec=WebClient), max_workers=2)
+        processor._process_single_receipt = Mock(side_effect=lambda r: _result(r, number=f"NEW-{r.contract_id}"))
+        return processor
+
+    def test_bulk_run_journals_outcomes(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        processor = self._processor()
+        receipts = [_receipt('1'), _receipt('2')]
+
+        with RunJournal(path) as journal:
+            processor.process_receipts_bulk(receipts, validate_contracts=False, journal=journal)
+
+        journal = RunJournal(path)
+        assert [journal.state(r) for r in receipts] == [COMPLETED, COMPLETED]
+
+    def test_batch_run_journals_and_resumes(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipts = [_receipt('1'), _receipt('2'), _receipt('3')]
+        processor = self._processor()
+        processor._process_single_receipt.side_effect = lambda r: _result(
+            r, success=r.contract_id != '2', number=f"NEW-{r.contract_id}")
+
+        with RunJournal(path) as journal:
+            processor.process_receipts_bulk(ReceiptBatch.from_receipts(receipts), validate_contracts=False,
+                                            journal=journal)
+
+        assert [RunJournal(path).state(r) for r in receipts] == [COMPLETED, FAILED, COMPLETED]
+
+        processor = self._processor()
+        results = processor.resume_run(path, validate_contracts=False)
+
+        assert [r.receipt_number for r in results] == ['NEW-1', 'NEW-2', 'NEW-3']
+        issued = [call.args[0].contract_id for call in processor._process_single_receipt.call_args_list]
+        assert issued == ['2']
+        assert RunJournal(path).summary()[COMPLETED] == 3
+
+    def test_streamed_run_skips_completed(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipts = [_receipt('1'), _receipt('2')]
+        with RunJournal(path) as journal:
+            journal.record_outcome(receipts[0], _result(receipts[0], number='OLD-1'))
+
+        processor = self._processor()
+        with RunJournal(path) as journal:
+            results = processor.process_receipts_bulk(iter(receipts), validate_contracts=False, journal=journal)
+
+        assert [r.receipt_number for r in results] == ['OLD-1', 'NEW-2']
+        assert [r['contract_id'] for r in RunJournal(path).receipts()] == ['1', '2']
+
+    def test_resume_skips_completed_and_holds_back_in_flight(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipts = [_receipt(str(n)) for n in range(4)]
+        with RunJournal(path) as journal:
+            journal.plan(receipts)
+            journal.record_intent(receipts[0])
+            journal.record_outcome(receipts[0], _result(receipts[0], number='OLD-0'))
+            journal.record_intent(receipts[1])  # Crashed mid-submission
+            journal.record_intent(receipts[2])
+            journal.record_outcome(receipts[2], _result(receipts[2], success=False, ambiguous=True))
+
+        processor = self._processor()
+        results = processor.resume_run(path, validate_contracts=False)
+
+        assert [r.receipt_number for r in results] == ['OLD-0', '', '', 'NEW-3']
+        assert [r.success for r in results] == [True, False, False, True]
+        assert results[1].ambiguous and results[2].ambiguous
+        issued = [call.args[0].contract_id for call in processor._process_single_receipt.call_args_list]
+        assert issued == ['3']
+        journal = RunJournal(path)
+        assert [journal.state(r) for r in receipts] == [COMPLETED, AMBIGUOUS, AMBIGUOUS, COMPLETED]
+
+    def test_receipt_marked_not_issued_is_issued_on_resume(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        receipt = _receipt()
+        with RunJournal(path) as journal:
+            journal.record_intent(receipt)
+            journal.mark_not_issued(receipt)
+
+        processor = self._processor()
+        results = processor.resume_run(path, validate_contracts=False)
+
+        assert results[0].success and results[0].receipt_number == 'NEW-1001'
+
+    def test_dry_run_does_not_write_journal(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        processor = self._processor()
+        processor.set_dry_run(True)
+
+        processor.process_receipts_bulk([_receipt()], validate_contracts=False, journal=RunJournal(path))
+
+        assert not os.path.exists(path)
@@ -0,0 +1,156 @@
+"""
+Unit tests for the Excel session report row log (utils.session_report_log)
+and CSVHandler.export_session_report_excel.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+openpyxl = pytest.importorskip('openpyxl')
+
+from csv_handler import CSVHandler
+from utils.session_report_log import SessionReportLog
+
+
+def _rows(count, start=0):
+    return [{'Contract ID': str(100000 + i), 'Tenant': f"Tenant {i}", 'Value': 500.0 + i}
+            for i in range(start, start + count)]
+
+
+def _read_report(path):
+    workbook = openpyxl.load_workbook(path)
+    sheet = workbook.active
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    widths = {letter: dim.width for letter, dim in sheet.column_dimensions.items()}
+    return sheet.title, values, widths
+
+
+class TestExportSessionReportExcel:
+    """Test appending through the row log."""
+
+    def test_new_report(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+
+        assert CSVHandler().export_session_report_excel(_rows(2), path, append=True)
+
+        title, values, _ = _read_report(path)
+        assert title == 'Session Report'
+        assert values == [['Contract ID', 'Tenant', 'Value'],
+                          ['100000', 'Tenant 0', 500.0],
+                          ['100001', 'Tenant 1', 501.0]]
+        assert SessionReportLog(path).exists()
+
+    def test_append_does_not_load_workbook(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel(_rows(2), path)
+
+        with patch('openpyxl.load_workbook') as mock_load:
+            assert handler.export_session_report_excel(_rows(1, start=2), path, append=True)
+        mock_load.assert_not_called()
+
+        _, values, _ = _read_report(path)
+        assert [row[0] for row in values[1:]] == ['100000', '100001', '100002']
+
+    def test_column_widths_from_running_maxima(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel([{'Contract ID': '1', 'Tenant': 'Ana'}], path)
+        handler.export_session_report_excel([{'Contract ID': '2', 'Tenant': 'A' * 30}], path)
+        handler.export_session_report_excel([{'Contract ID': '3', 'Tenant': 'B' * 80}], path)
+
+        _, _, widths = _read_report(path)
+        assert widths['A'] == len('Contract ID') + 2
+        assert widths['B'] == 50  # Capped
+
+    def test_overwrite_resets_log(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel(_rows(3), path)
+
+        handler.export_session_report_excel(_rows(1, start=7), path, append=False)
+
+        _, values, _ = _read_report(path)
+        assert values[1:] == [['100007', 'Tenant 7', 507.0]]
+
+    def test_deferred_materialization(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel(_rows(1), path)
+
+        handler.export_session_report_excel(_rows(1, start=1), path, materialize=False)
+        handler.export_session_report_excel(_rows(1, start=2), path, materialize=False)
+        assert len(_read_report(path)[1]) == 2
+
+        assert handler.materialize_session_report_excel(path)
+        assert len(_read_report(path)[1]) == 4
+
+    def test_deferred_appends_before_first_materialization(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+
+        for start in range(3):
+            assert handler.export_session_report_excel(_rows(1, start=start), path,
+                                                       append=True, materialize=False)
+        assert not os.path.exists(path)
+
+        assert handler.materialize_session_report_excel(path)
+        _, values, _ = _read_report(path)
+        assert [row[0] for row in values[1:]] == ['100000', '100001', '100002']
+
+    def test_existing_report_without_log_is_seeded(self, tmp_path):
+        path = str(tmp_path / 'old.xlsx')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['Contract ID', 'Tenant', 'Value'])
+        sheet.append(['999999', 'Old tenant', 400.0])
+        workbook.save(path)
+
+        assert CSVHandler().export_session_report_excel(_rows(1), path, append=True)
+
+        _, values, _ = _read_report(path)
+        assert values[1:] == [['999999', 'Old tenant', 400.0], ['100000', 'Tenant 0', 500.0]]
+
+    def _add_row_in_excel(self, path, row):
+        workbook = openpyxl.load_workbook(path)
+        workbook.active.append(row)
+        workbook.save(path)
+
+    def test_rows_added_in_excel_survive_append(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel(_rows(1), path)
+        self._add_row_in_excel(path, ['555555', 'Added by hand', 300.0])
+        assert SessionReportLog(path).is_stale()
+
+        assert handler.export_session_report_excel(_rows(1, start=1), path, append=True)
+
+        _, values, _ = _read_report(path)
+        assert values[1:] == [['100000', 'Tenant 0', 500.0],
+                              ['555555', 'Added by hand', 300.0],
+                              ['100001', 'Tenant 1', 501.0]]
+        assert not SessionReportLog(path).is_stale()
+
+    def test_edit_in_excel_keeps_deferred_rows(self, tmp_path):
+        path = str(tmp_path / 'session.xlsx')
+        handler = CSVHandler()
+        handler.export_session_report_excel(_rows(1), path)
+        handler.export_session_report_excel(_rows(1, start=1), path, materialize=False)
+        self._add_row_in_excel(path, ['555555', 'Added by hand', 300.0])
+
+        handler.export_session_report_excel(_rows(1, start=2), path, materialize=False)
+        assert handler.materialize_session_report_excel(path)
+
+        _, values, _ = _read_report(path)
+        assert [row[0] for row in values[1:]] == ['100000', '555555', '100001', '100002']
+
+    def test_materialize_without_log(self, tmp_path):
+        assert not CSVHandler().materialize_session_report_excel(str(tmp_path / 'missing.xlsx'))
+
+    def test_empty_report_data(self, tmp_path):
+        assert not CSVHandler().export_session_report_excel([], str(tmp_path / 'session.xlsx'))
@@ -12,6 +12,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from web_client import WebClient
+from utils.retry_policy import RetryPolicy, receipt_dedup_key
 
 
 class TestAuthenticationErrors:
@@ -469,3 +470,286 @@ class TestURLConfiguration:
         assert client.login_page_url.startswith('https://')
         assert client.login_url.startswith('https://')
         assert 'login' in client.login_url.lower()
+
+
+class TestPortalSessionReuse:
+    """Test skipping the SICI redirect handshake for an established portal session."""
+    
+    PORTAL_URL = 'https://imoveis.portaldasfinancas.gov.pt/arrendamento/consultarElementosContratos/locador'
+    
+    def _client(self):
+        client = WebClient()
+        client.authenticated = True
+        return client
+    
+    def _fake_get(self, client, calls, expired_once=None):
+        def fake_get(url, **kwargs):
+            calls.append(url)
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            response.text = '[]'
+            if 'obterElementosContratosEmissaoRecibos' in url and expired_once:
+                expired_once.pop()
+                response.url = 'https://www.acesso.gov.pt/v2/loginForm?partID=SICI'
+            elif 'obterElementosContratosEmissaoRecibos' in url:
+                response.url = url
+                response.json.return_value = [{'numero': '12345'}]
+            else:
+                client.session.cookies.set('JSESSIONID', 'abc', domain='imoveis.portaldasfinancas.gov.pt')
+                response.url = self.PORTAL_URL
+            return response
+        return fake_get
+    
+    def test_second_call_skips_handshake(self):
+        """Test that the SICI redirect is only followed once per portal session."""
+        client = self._client()
+        calls = []
+        
+        with patch.object(client.session, 'get', side_effect=self._fake_get(client, calls)):
+            assert client.get_contracts_with_tenant_data()[0] is True
+            first_calls = list(calls)
+            calls.clear()
+            assert client.get_contracts_with_tenant_data()[0] is True
+        
+        assert any('partID=SICI' in url for url in first_calls)
+        assert len(calls) == 1
+        assert 'obterElementosContratosEmissaoRecibos' in calls[0]
+    
+    def test_handshake_not_skipped_without_portal_cookie(self):
+        """Test that a remembered hop without portal cookies redoes the handshake."""
+        client = self._client()
+        client._portal_session_established = True
+        
+        assert client._has_portal_session() is False
+        assert client._portal_session_established is False
+    
+    def test_login_redirect_falls_back_to_handshake(self):
+        """Test that a login redirect on the AJAX call triggers the full handshake once."""
+        client = self._client()
+        client._portal_session_established = True
+        client.session.cookies.set('JSESSIONID', 'stale', domain='imoveis.portaldasfinancas.gov.pt')
+        calls = []
+        
+        with patch.object(client.session, 'get', side_effect=self._fake_get(client, calls, expired_once=[True])):
+            success, contracts, _ = client.get_contracts_with_tenant_data()
+        
+        assert success is True
+        assert contracts == [{'numero': '12345'}]
+        assert any('partID=SICI' in url for url in calls)
+        assert client._portal_session_established is True
+    
+    def test_contracts_call_does_not_block_other_requests(self):
+        """Test that a slow contracts call does not hold the session lock."""
+        import threading
+        
+        client = self._client()
+        client._portal_session_established = True
+        client.session.cookies.set('JSESSIONID', 'abc', domain='imoveis.portaldasfinancas.gov.pt')
+        contracts_started = threading.Event()
+        form_sent = threading.Event()
+        state = {}
+        
+        def fake_get(url, **kwargs):
+            if 'obterElementosContratosEmissaoRecibos' in url:
+                contracts_started.set()
+                state['form_sent_meanwhile'] = form_sent.wait(timeout=1)
+                return Mock(status_code=200, url=url, text='[]', headers={}, json=Mock(return_value=[]))
+            form_sent.set()
+            return Mock(status_code=404, url=url, text='', headers={})
+        
+        with patch.object(client.session, 'get', side_effect=fake_get):
+            refresh = threading.Thread(target=client.get_contracts_with_tenant_data, kwargs={'force_refresh': True})
+            refresh.start()
+            contracts_started.wait(timeout=1)
+            client.get_receipt_form('12345', use_cache=False)
+            refresh.join()
+        
+        assert state['form_sent_meanwhile'] is True
+    
+    def test_logout_forgets_portal_session(self):
+        """Test that logout resets the portal session state."""
+        client = self._client()
+        client._portal_session_established = True
+        
+        with patch.object(client.session, 'get', return_value=Mock(status_code=200)):
+            client.logout()
+        
+        assert client._portal_session_established is False
+
+
+class TestBatchRentValues:
+    """Test batched rent value lookup."""
+    
+    def _client(self):
+        client = WebClient()
+        client.authenticated = True
+        return client
+    
+    def test_values_taken_from_contracts_list(self):
+        """Test that bulk valorRenda is used without individual lookups."""
+        client = self._client()
+        contracts = [{'numero': 12345, 'valorRenda': 500.0}, {'numero': '67890', 'valorRenda': '750.5'}]
+        
+        with patch.object(client, 'get_contract_rent_value') as mock_single:
+            values = client.get_contract_rent_values(['12345', '67890'], contracts_data=contracts)
+        
+        assert values == {'12345': 500.0, '67890': 750.5}
+        mock_single.assert_not_called()
+    
+    def test_only_misses_fetched_individually(self):
+        """Test that contracts without a bulk value fall back to one request each."""
+        client = self._client()
+        contracts = [{'numero': '12345', 'valorRenda': 500.0}, {'numero': '67890', 'valorRenda': 0}]
+        
+        with patch.object(client, 'get_contracts_with_tenant_data', return_value=(True, contracts, "ok")) as mock_list, \
+             patch.object(client, 'get_contract_rent_value', return_value=(True, 300.0)) as mock_single:
+            values = client.get_contract_rent_values(['12345', '67890', '11111', '67890'])
+        
+        assert values == {'12345': 500.0, '67890': 300.0, '11111': 300.0}
+        mock_list.assert_called_once()
+        assert sorted(call.args[0] for call in mock_single.call_args_list) == ['11111', '67890']
+    
+    def test_failed_lookups_omitted(self):
+        """Test that contracts without any rent value are left out."""
+        client = self._client()
+        
+        with patch.object(client, 'get_contract_rent_value', return_value=(False, 0.0)):
+            values = client.get_contract_rent_values(['12345'], contracts_data=[])
+        
+        assert values == {}
+    
+    def test_not_authenticated(self):
+        """Test that nothing is looked up without authentication."""
+        client = WebClient()
+        
+        with patch.object(client, 'get_contract_rent_value') as mock_single:
+            assert client.get_contract_rent_values(['12345']) == {}
+        mock_single.assert_not_called()
+
+
+class TestRetryAndDedup:
+    """Test GET retries and idempotent receipt submission."""
+    
+    SUBMISSION = {'numContrato': 12345, 'dataInicio': '2024-07-01', 'dataFim': '2024-07-31', 'valor': 850.0}
+    
+    def _client(self):
+        client = WebClient()
+        client.authenticated = True
+        client.get_retry_policy = RetryPolicy(base_delay=0)
+        return client
+    
+    def _issued_response(self, number='REC001'):
+        response = Mock(status_code=200, text='{}')
+        response.elapsed.total_seconds.return_value = 0.1
+        response.json.return_value = {'success': True, 'numeroRecibo': number}
+        return response
+    
+    def test_get_retries_transient_failures(self):
+        """Test that portal GETs retry timeouts and 503s, then return the response."""
+        client = self._client()
+        ok = Mock(status_code=200)
+        
+        with patch.object(client.session, 'get', side_effect=[requests.Timeout(), Mock(status_code=503), ok]) as mock_get:
+            assert client._get('https://portal/x') is ok
+        assert mock_get.call_count == 3
+    
+    def test_get_does_not_retry_client_errors(self):
+        """Test that non-transient responses are returned at once."""
+        client = self._client()
+        
+        with patch.object(client.session, 'get', return_value=Mock(status_code=404)) as mock_get:
+            assert client._get('https://portal/x').status_code == 404
+        assert mock_get.call_count == 1
+    
+    def test_same_receipt_not_submitted_twice(self):
+        """Test that a receipt issued in this session is not posted again."""
+        client = self._client()
+        
+        with patch.object(client.session, 'post', return_value=self._issued_response()) as mock_post:
+            first = client.issue_receipt(dict(self.SUBMISSION))
+            second = client.issue_receipt(dict(self.SUBMISSION, valor='850.00'))
+        
+        assert first[0] and second[0]
+        assert second[1]['receiptNumber'] == 'REC001' and second[1]['duplicate']
+        assert mock_post.call_count == 1
+    
+    def test_timeout_is_ambiguous_and_not_resubmitted(self):
+        """Test that a receipt POST that timed out is reported as ambiguous, not re-posted."""
+        client = self._client()
+        
+        with patch.object(client.session, 'post', side_effect=[requests.ReadTimeout(), self._issued_response('REC002')]) as mock_post:
+            success, result = client.issue_receipt(dict(self.SUBMISSION))
+        
+        assert success is False and result['ambiguous']
+        assert mock_post.call_count == 1
+    
+    def test_transient_status_is_ambiguous(self):
+        """Test that a 503 answer to the POST is ambiguous."""
+        client = self._client()
+        response = self._issued_response()
+        response.status_code = 503
+        response.json.return_value = {'success': False}
+        
+        with patch.object(client.session, 'post', return_value=response) as mock_post:
+            success, result = client.issue_receipt(dict(self.SUBMISSION))
+        
+        assert success is False and result['ambiguous']
+        assert mock_post.call_count == 1
+    
+    def test_ambiguous_receipt_not_submitted_again_in_session(self):
+        """Test that an ambiguous submission blocks later submissions of the same receipt."""
+        client = self._client()
+        
+        with patch.object(client.session, 'post', side_effect=[requests.ReadTimeout(), self._issued_response()]) as mock_post:
+            client.issue_receipt(dict(self.SUBMISSION))
+            success, result = client.issue_receipt(dict(self.SUBMISSION))
+        
+        assert success is False and result['ambiguous']
+        assert mock_post.call_count == 1
+    
+    def test_ambiguous_receipt_submitted_again_after_mark_not_issued(self):
+        """Test that a receipt checked on the portal and marked as not issued can be submitted again."""
+        client = self._client()
+        
+        with patch.object(client.session, 'post', side_effect=[requests.ReadTimeout(), self._issued_response()]) as mock_post:
+            client.issue_receipt(dict(self.SUBMISSION))
+            assert client.mark_not_issued('12345', '2024-07-01', '2024-07-31') == 1
+            success, result = client.issue_receipt(dict(self.SUBMISSION))
+        
+        assert success is True
+        assert mock_post.call_count == 2
+    
+    def test_logout_resets_submission_registry(self):
+        """Test that logging out forgets the receipts submitted in the session."""
+        client = self._client()
+        with patch.object(client.session, 'post', side_effect=requests.ReadTimeout()):
+            client.issue_receipt(dict(self.SUBMISSION))
+        
+        with patch.object(client.session, 'get', return_value=Mock(status_code=200)):
+            client.logout()
+        
+        assert client.submissions.claim(receipt_dedup_key(self.SUBMISSION)) == (None, True)
+    
+    def test_login_resets_submission_registry(self):
+        """Test that a successful login starts with an empty submission registry."""
+        client = self._client()
+        with patch.object(client.session, 'post', side_effect=requests.ReadTimeout()):
+            client.issue_receipt(dict(self.SUBMISSION))
+        
+        with patch.object(client, '_login', return_value=(True, "Login successful")):
+            client.login('user', 'password')
+        
+        assert not client.submissions.is_unconfirmed(receipt_dedup_key(self.SUBMISSION))
+    
+    def test_platform_rejection_not_retried(self):
+        """Test that a clear rejection is returned as a plain failure."""
+        client = self._client()
+        response = self._issued_response()
+        response.json.return_value = {'success': False, 'errorMessage': 'Invalid'}
+        
+        with patch.object(client.session, 'post', return_value=response) as mock_post:
+            success, result = client.issue_receipt(dict(self.SUBMISSION))
+        
+        assert success is False and not result.get('ambiguous')
+        assert mock_post.call_count == 1
@@ -11,7 +11,8 @@ from unittest.mock import Mock, MagicMock, patch
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from web_client import WebClient
+from web_client import WebClient, AdaptiveRateLimiter, RateLimitedAdapter
+from utils.http_profiles import XHR_JSON_HEADERS, with_headers
 
 
 class TestWebClientInit:
@@ -285,3 +286,100 @@ class TestSessionPersistence:
         
         # Cookie should still exist
         assert 'test_cookie' in client.session.cookies
+
+
+class TestHeaderProfiles:
+    """Test the shared request header profiles."""
+    
+    def test_profiles_are_read_only(self):
+        """Test that a call cannot modify a shared profile."""
+        with pytest.raises(TypeError):
+            XHR_JSON_HEADERS['Referer'] = 'https://example.com/'
+    
+    def test_with_headers_overrides_copy(self):
+        """Test per-call overrides leave the profile unchanged."""
+        headers = with_headers(XHR_JSON_HEADERS, Referer='https://example.com/', If_None_Match='"v1"')
+        
+        assert headers['Referer'] == 'https://example.com/'
+        assert headers['If-None-Match'] == '"v1"'
+        assert headers['Accept'] == XHR_JSON_HEADERS['Accept']
+        assert XHR_JSON_HEADERS['Referer'] != 'https://example.com/'
+
+
+class TestAdaptiveRateLimiter:
+    """Test the shared AIMD rate limiter."""
+    
+    def test_client_mounts_rate_limited_adapter(self):
+        """Test that every outbound call goes through the shared limiter."""
+        client = WebClient()
+        adapter = client.session.get_adapter('https://imoveis.portaldasfinancas.gov.pt/')
+        assert isinstance(adapter, RateLimitedAdapter)
+        assert adapter.rate_limiter is client.rate_limiter
+        auth_adapter = client.session.get_adapter('https://www.acesso.gov.pt/')
+        assert isinstance(auth_adapter, RateLimitedAdapter)
+        assert auth_adapter.rate_limiter is client.rate_limiter
+        assert isinstance(client.session.get_adapter('https://example.com/'), RateLimitedAdapter)
+    
+    def test_client_mounts_pool_per_portal_host(self):
+        """Test that each portal host has its own pool sized for the workers."""
+        client = WebClient(pool_size=6)
+        portal = client.session.get_adapter('https://imoveis.portaldasfinancas.gov.pt/arrendamento/')
+        auth = client.session.get_adapter('https://www.acesso.gov.pt/v2/login')
+        
+        assert portal is not auth
+        for adapter in (portal, auth):
+            assert adapter._pool_maxsize == 6
+            assert adapter._pool_block is True
+            assert adapter.max_retries.connect == 2
+            assert adapter.max_retries.read == 0
+    
+    def test_fast_responses_increase_rate(self):
+        """Test additive increase while latency stays low."""
+        limiter = AdaptiveRateLimiter(initial_rate=1.0, increase_step=0.5, max_rate=2.0)
+        limiter.record_response(200, 0.1)
+        assert limiter.rate == 1.5
+        limiter.record_response(200, 0.1)
+        limiter.record_response(200, 0.1)
+        assert limiter.rate == 2.0  # capped at max_rate
+    
+    def test_throttling_responses_decrease_rate(self):
+        """Test multiplicative decrease on 429 and 5xx."""
+        limiter = AdaptiveRateLimiter(initial_rate=4.0, decrease_factor=0.5, min_rate=0.5)
+        limiter.record_response(429, 0.1)
+        assert limiter.rate == 2.0
+        limiter.record_response(503, 0.1)
+        assert limiter.rate == 1.0
+        limiter.record_failure()
+        limiter.record_failure()
+        assert limiter.rate == 0.5  # floored at min_rate
+    
+    def test_rising_latency_decreases_rate(self):
+        """Test that slow responses make the limiter back off."""
+        limiter = AdaptiveRateLimiter(initial_rate=4.0, latency_threshold=1.0)
+        limiter.record_response(200, 5.0)
+        assert limiter.rate < 4.0
+    
+    def test_burst_does_not_wait(self):
+        """Test that requests within the burst allowance are not delayed."""
+        limiter = AdaptiveRateLimiter(initial_rate=1.0, burst=3)
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+    
+    def test_exhausted_bucket_waits(self):
+        """Test that callers wait once the bucket is empty."""
+        limiter = AdaptiveRateLimiter(initial_rate=1.0, burst=1)
+        limiter.acquire()
+        with patch('web_client.time.sleep') as mock_sleep:
+            waited = limiter.acquire()
+        assert waited > 0.5
+        mock_sleep.assert_called_once()
+    
+    def test_retry_after_blocks_requests(self):
+        """Test that a Retry-After header pauses the shared budget."""
+        limiter = AdaptiveRateLimiter(burst=5)
+        limiter.record_response(429, 0.1, retry_after='3')
+        with patch('web_client.time.sleep') as mock_sleep:
+            waited = limiter.acquire()
+        assert waited > 2.5
+        mock_sleep.assert_called_once()
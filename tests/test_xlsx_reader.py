@@ -0,0 +1,143 @@
+"""
+Unit tests for utils.xlsx_reader and the processor's raw-XML fallback.
+"""
+
+import sys
+import os
+import zipfile
+from datetime import datetime, date
+from unittest.mock import patch
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.xlsx_reader import XlsxReader
+from excel_preprocessor import LandlordExcelProcessor
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def _raw_package(path, date1904=False):
+    """Hand-built package: sheet parts not named sheetN.xml, rich and inline strings."""
+    workbook = (f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+                f'<workbookPr date1904="{1 if date1904 else 0}"/>'
+                '<bookViews><workbookView activeTab="1"/></bookViews><sheets>'
+                '<sheet name="Notes" sheetId="1" r:id="rId7"/>'
+                '<sheet name="2025" sheetId="2" r:id="rId3"/></sheets></workbook>')
+    rels = ('<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId3" Target="worksheets/data_b.xml"/>'
+            '<Relationship Id="rId7" Target="/xl/worksheets/data_a.xml"/></Relationships>')
+    shared = (f'<sst xmlns="{MAIN_NS}"><si><t>Contract</t></si>'
+              '<si><r><t>Ren</t></r><r><t>t</t></r><rPh><t>x</t></rPh></si><si><t>01</t></si></sst>')
+    styles = (f'<styleSheet xmlns="{MAIN_NS}"><numFmts><numFmt numFmtId="164" formatCode="dd/mm/yyyy"/>'
+              '<numFmt numFmtId="165" formatCode="&quot;Day&quot; 0"/></numFmts>'
+              '<cellXfs><xf numFmtId="0"/><xf numFmtId="164"/><xf numFmtId="165"/><xf numFmtId="14"/></cellXfs>'
+              '</styleSheet>')
+    sheet_b = (f'<worksheet xmlns="{MAIN_NS}"><sheetData>'
+               '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="D1" t="s"><v>2</v></c></row>'
+               '<row r="3"><c r="A3" t="inlineStr"><is><t>111</t></is></c><c r="B3"><v>500.5</v></c>'
+               '<c r="C3" t="b"><v>1</v></c><c r="D3" s="1"><v>45658</v></c><c r="E3" s="2"><v>7</v></c></row>'
+               '</sheetData></worksheet>')
+    sheet_a = f'<worksheet xmlns="{MAIN_NS}"><sheetData><row r="1"><c r="A1"><v>1</v></c></row></sheetData></worksheet>'
+    with zipfile.ZipFile(path, 'w') as package:
+        package.writestr('xl/workbook.xml', workbook)
+        package.writestr('xl/_rels/workbook.xml.rels', rels)
+        package.writestr('xl/sharedStrings.xml', shared)
+        package.writestr('xl/styles.xml', styles)
+        package.writestr('xl/worksheets/data_b.xml', sheet_b)
+        package.writestr('xl/worksheets/data_a.xml', sheet_a)
+    return str(path)
+
+
+class TestXlsxReader:
+    """Test sheet resolution and value conversion."""
+
+    def test_sheets_resolved_through_relationships(self, tmp_path):
+        """Test sheet names map to their parts via workbook.xml.rels."""
+        with XlsxReader(_raw_package(tmp_path / 'raw.xlsx')) as reader:
+            assert reader.sheet_names == ['Notes', '2025']
+            assert reader.active_sheet == '2025'
+            assert list(reader.iter_rows('Notes')) == [(1,)]
+            rows = list(reader.iter_rows())
+
+        assert rows == [
+            ('Contract', 'Rent', None, '01'),
+            (),
+            ('111', 500.5, True, datetime(2025, 1, 1), 7),
+        ]
+
+    def test_1904_date_system(self, tmp_path):
+        """Test date serials follow the workbook's date system."""
+        with XlsxReader(_raw_package(tmp_path / 'raw.xlsx', date1904=True)) as reader:
+            assert list(reader.iter_rows('2025'))[2][3] == datetime(2029, 1, 2)
+
+    def test_matches_openpyxl(self, tmp_path):
+        """Test rows read like openpyxl's values_only rows."""
+        path = str(tmp_path / 'book.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Contract', 'Name', 'Rent', '01'])
+        ws.append(['111', 'Ana', 500, datetime(2025, 2, 3)])
+        ws.append(['222', None, 1.5e3, 12])
+        wb.save(path)
+
+        expected = list(load_workbook(path, read_only=True, data_only=True).active.iter_rows(values_only=True))
+        with XlsxReader(path) as reader:
+            assert list(reader.iter_rows(max_row=2)) == expected[:2]
+            assert list(reader.iter_rows()) == expected
+
+    def test_missing_sheet_and_invalid_file(self, tmp_path):
+        """Test errors for unknown sheets and non-xlsx files."""
+        with XlsxReader(_raw_package(tmp_path / 'raw.xlsx')) as reader:
+            with pytest.raises(ValueError, match="not found"):
+                list(reader.iter_rows('2030'))
+
+        bad = tmp_path / 'bad.xlsx'
+        bad.write_text('not a zip')
+        with pytest.raises(ValueError):
+            XlsxReader(str(bad))
+
+
+class TestProcessorRawFallback:
+    """Test LandlordExcelProcessor reads the XML directly when openpyxl cannot."""
+
+    def _write(self, path):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = '2025'
+        ws.append(['Contract', 'Name', 'Rent', 'RentDeposit', 'Mes Caucao', 'MonthsLate', 'PaidCurrentMonth', '01'])
+        ws.append(['111', 'Ana', 500.0, 1, 0, 0, 'No', 5])
+        wb.save(path)
+        return str(path)
+
+    def test_openpyxl_error_falls_back(self, tmp_path):
+        """Test parsing continues from the raw XML without an intermediate file."""
+        path = self._write(tmp_path / 'book.xlsx')
+
+        with patch('excel_preprocessor.openpyxl.load_workbook', side_effect=KeyError('styles')):
+            receipts, _ = LandlordExcelProcessor().parse_excel(path, 1, 2025, sheet_name='2025')
+
+        assert [(r.contract_id, r.payment_date) for r in receipts] == [('111', date(2025, 1, 5))]
+        assert os.listdir(tmp_path) == ['book.xlsx']
+
+    def test_no_sheets_in_openpyxl_falls_back(self, tmp_path):
+        """Test workbooks that open in openpyxl without sheets."""
+        path = self._write(tmp_path / 'book.xlsx')
+        empty = Workbook()
+        empty._sheets = []
+
+        with patch('excel_preprocessor.openpyxl.load_workbook', return_value=empty):
+            receipts, _ = LandlordExcelProcessor().parse_excel(path, 1, 2025)
+
+        assert len(receipts) == 1
+
+    def test_unreadable_file_reports_openpyxl_error(self, tmp_path):
+        """Test files neither reader can open."""
+        bad = tmp_path / 'bad.xlsx'
+        bad.write_text('not a zip')
+
+        with pytest.raises(ValueError, match="Cannot open Excel file"):
+            LandlordExcelProcessor().parse_excel(str(bad), 1, 2025)